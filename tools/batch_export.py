@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+PPT Master - 批量导出工具
+
+在一个进程中导出多个项目：解释器启动、库导入与渲染器检测只进行一次，
+所有项目的 PNG 渲染任务提交到同一个共享进程池，项目之间不会出现
+"上一个项目收尾时进程池空闲"的情况。完成后输出每个项目的耗时与失败页面，
+并可保存为 JSON 汇总（供夜间任务等自动化流程读取）。
+
+用法:
+    python3 tools/batch_export.py examples/*                  # shell 展开
+    python3 tools/batch_export.py "examples/*" -s final -j 8  # 由工具展开通配符
+    python3 tools/batch_export.py projects/a projects/b --output-dir dist --summary summary.json
+"""
+
+import sys
+import glob
+import json
+import time
+import argparse
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from svg_to_pptx import (
+    PNG_RENDERER, export_project, get_png_renderer_info, resolve_jobs
+)
+from pptx_package import ZipCompressionPolicy
+
+
+def expand_projects(patterns: List[str]) -> List[Path]:
+    """
+    展开项目列表（支持通配符），去重并保持顺序
+
+    通配符匹配到的目录只保留包含 svg_output/ 或 svg_final/ 的项目；
+    直接指定的目录原样保留（不存在或没有 SVG 时在导出阶段报错）。
+    """
+    projects: List[Path] = []
+    seen = set()
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            matches = [Path(p) for p in sorted(glob.glob(pattern))]
+            matches = [p for p in matches
+                       if p.is_dir() and ((p / 'svg_output').is_dir() or (p / 'svg_final').is_dir())]
+        else:
+            matches = [Path(pattern)]
+        for project in matches:
+            key = str(project.resolve())
+            if key not in seen:
+                seen.add(key)
+                projects.append(project)
+    return projects
+
+
+def output_names(projects: List[Path]) -> List[str]:
+    """
+    --output-dir 下各项目的输出文件名（不含扩展名），保证互不相同
+
+    默认为项目目录名；不同上级目录下的同名项目加上上级目录名（<项目名>_<上级目录名>），
+    仍然重名时再加序号。比较时忽略大小写（大小写不敏感的文件系统上同样不会互相覆盖）。
+    """
+    resolved = [project.resolve() for project in projects]
+    names = [path.name for path in resolved]
+    counts = Counter(name.lower() for name in names)
+    names = [name if counts[name.lower()] == 1 else f'{name}_{path.parent.name}'
+             for name, path in zip(names, resolved)]
+    counts = Counter(name.lower() for name in names)
+    return [name if counts[name.lower()] == 1 else f'{name}_{index}'
+            for index, name in enumerate(names, 1)]
+
+
+def export_one(project: Path, options: dict, output: Optional[Path], executor) -> dict:
+    """
+    导出单个项目，返回汇总条目（异常记录为 error，不中断批量导出）
+
+    output 为 None 时输出到项目目录下带时间戳的文件名。
+    """
+    start = time.perf_counter()
+    entry = {
+        'project': str(project),
+        'status': 'error',
+        'output': None,
+        'slides': 0,
+        'success': 0,
+        'failed': [],
+        'elapsed': None,
+        'error': None,
+    }
+    try:
+        result = export_project(project, output=output, executor=executor, **options)
+        entry.update({
+            'status': 'ok' if not result['failed'] else 'failed',
+            'output': result['output'],
+            'slides': result['total'],
+            'success': result['success'],
+            'failed': result['failed'],
+            'png_fallbacks': result['png_fallbacks'],
+            'cache_hits': result['cache_hits'],
+        })
+    except Exception as e:
+        entry['error'] = str(e) or e.__class__.__name__
+    entry['elapsed'] = round(time.perf_counter() - start, 3)
+    return entry
+
+
+def batch_export(
+    projects: List[Path],
+    options: dict,
+    jobs: int = 1,
+    output_dir: Optional[Path] = None,
+    on_done=None
+) -> dict:
+    """
+    批量导出多个项目
+
+    Args:
+        projects: 项目目录列表
+        options: 传递给 export_project 的参数（source、native、use_compat_mode 等）
+        jobs: 共享渲染进程池大小（1 表示逐个项目串行导出）
+        output_dir: 输出目录（文件名见 output_names；默认各项目目录下带时间戳的文件名）
+        on_done: 每个项目完成时的回调 (汇总条目)
+
+    Returns:
+        汇总字典：renderer/jobs/elapsed/projects（每个项目的条目，顺序与输入一致）/totals
+    """
+    start = time.perf_counter()
+    jobs = resolve_jobs(jobs)
+    outputs: List[Optional[Path]] = [None] * len(projects)
+    if output_dir is not None:
+        output_dir.mkdir(parents=True, exist_ok=True)
+        outputs = [output_dir / f'{name}.pptx' for name in output_names(projects)]
+
+    renders = options.get('use_compat_mode', True) and not options.get('native') and PNG_RENDERER is not None
+    executor = ProcessPoolExecutor(max_workers=jobs) if jobs > 1 and renders else None
+    # 打包在主进程的线程中进行；同时打开的项目数受限，避免大量演示文稿同时驻留内存
+    project_threads = min(len(projects), max(2, jobs)) if jobs > 1 else 1
+
+    entries: List[Optional[dict]] = [None] * len(projects)
+    lock = threading.Lock()
+
+    def run(index: int):
+        entry = export_one(projects[index], options, outputs[index], executor)
+        with lock:
+            entries[index] = entry
+            if on_done is not None:
+                on_done(entry)
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, project_threads)) as threads:
+            for future in as_completed([threads.submit(run, i) for i in range(len(projects))]):
+                future.result()
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    renderer_name, renderer_status, _ = get_png_renderer_info()
+    return {
+        'renderer': f"{renderer_name} {renderer_status}" if renderer_name else None,
+        'jobs': jobs,
+        'elapsed': round(time.perf_counter() - start, 3),
+        'projects': entries,
+        'totals': {
+            'projects': len(entries),
+            'ok': sum(1 for e in entries if e['status'] == 'ok'),
+            'failed': sum(1 for e in entries if e['status'] == 'failed'),
+            'errors': sum(1 for e in entries if e['status'] == 'error'),
+            'slides': sum(e['slides'] for e in entries),
+            'failed_slides': sum(len(e['failed']) for e in entries),
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='PPT Master - 批量导出工具',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+示例:
+  %(prog)s examples/* -s final                        # 导出 examples/ 下全部项目
+  %(prog)s "projects/*" -s final -j 8 --output-dir dist
+  %(prog)s "examples/*" -s final --summary summary.json -q
+
+汇总 JSON 结构:
+  {"elapsed": 秒, "jobs": N, "renderer": "...",
+   "projects": [{"project", "status": ok/failed/error, "output", "slides",
+                 "success", "failed": [失败页面], "elapsed", "error"}],
+   "totals": {"projects", "ok", "failed", "errors", "slides", "failed_slides"}}
+
+退出码: 全部项目成功为 0，否则为 1
+        '''
+    )
+    parser.add_argument('projects', nargs='+', help='项目目录（支持通配符，如 "examples/*"）')
+    parser.add_argument('-s', '--source', default='output', help='SVG 来源: output/final 或任意子目录名 (推荐 final)')
+    parser.add_argument('-j', '--jobs', type=int, default=0,
+                        help='共享渲染进程数 (默认: 0，使用全部 CPU 核心；1 表示逐个项目串行)')
+    parser.add_argument('--output-dir', type=str, default=None,
+                        help='输出目录（文件名为项目目录名，同名项目加上级目录名；默认各项目目录下带时间戳的文件名）')
+    parser.add_argument('--summary', type=str, default=None, metavar='FILE', help='将汇总保存为 JSON')
+    parser.add_argument('--json', action='store_true', help='以 JSON 输出汇总（不输出文本进度）')
+    parser.add_argument('--native', action='store_true', help='转换为 PowerPoint 原生形状')
+    parser.add_argument('--no-compat', action='store_true', help='禁用 Office 兼容模式（纯 SVG）')
+    parser.add_argument('--no-notes', action='store_true', help='禁用演讲备注嵌入')
+    parser.add_argument('--no-cache', action='store_true', help='不使用 PNG 渲染缓存')
+    parser.add_argument('--zip-level', type=int, choices=range(0, 10), default=6, metavar='0-9',
+                        help='XML/SVG 部件的压缩级别 (默认: 6)')
+    parser.add_argument('-q', '--quiet', action='store_true', help='只输出最终汇总')
+
+    args = parser.parse_args()
+
+    projects = expand_projects(args.projects)
+    if not projects:
+        print("错误: 未找到可导出的项目")
+        sys.exit(1)
+
+    options = {
+        'source': args.source,
+        'native': args.native,
+        'use_compat_mode': not args.no_compat,
+        'enable_notes': not args.no_notes,
+        'use_cache': not args.no_cache,
+        'compression': ZipCompressionPolicy(xml_level=args.zip_level),
+    }
+    verbose = not args.quiet and not args.json
+
+    if verbose:
+        print("PPT Master - 批量导出工具")
+        print("=" * 50)
+        print(f"  项目数: {len(projects)}")
+        print(f"  渲染进程: {resolve_jobs(args.jobs)}（所有项目共享）")
+        print()
+
+    done_count = [0]
+
+    def report(entry: dict):
+        done_count[0] += 1
+        if not verbose:
+            return
+        name = Path(entry['project']).name
+        prefix = f"  [{done_count[0]}/{len(projects)}] {name}"
+        if entry['status'] == 'error':
+            print(f"{prefix} - 错误: {entry['error']}")
+            return
+        mark = '[OK]' if entry['status'] == 'ok' else '[FAIL]'
+        print(f"{prefix} {mark} {entry['success']}/{entry['slides']} 页, {entry['elapsed']:.2f} s")
+        for slide_name in entry['failed']:
+            print(f"      - 失败: {slide_name}")
+
+    summary = batch_export(
+        projects, options, jobs=args.jobs,
+        output_dir=Path(args.output_dir) if args.output_dir else None,
+        on_done=report
+    )
+
+    if args.summary:
+        Path(args.summary).write_text(json.dumps(summary, ensure_ascii=False, indent=2), encoding='utf-8')
+
+    if args.json:
+        print(json.dumps(summary, ensure_ascii=False, indent=2))
+    else:
+        totals = summary['totals']
+        if verbose:
+            print()
+        print(f"[完成] {totals['projects']} 个项目, {totals['slides']} 页, 耗时 {summary['elapsed']:.2f} s")
+        print(f"  成功: {totals['ok']}, 部分失败: {totals['failed']}, 错误: {totals['errors']}")
+        if args.summary:
+            print(f"  汇总: {args.summary}")
+
+    all_ok = summary['totals']['ok'] == summary['totals']['projects']
+    sys.exit(0 if all_ok else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,449 @@
+#!/usr/bin/env python3
+"""
+PPT Master - 性能基准工具
+
+对示例项目运行导出流程并统计耗时与产物大小，用于评估优化效果与回归。
+
+用法:
+    python3 tools/benchmark.py export [项目目录 ...]
+
+子命令:
+    export       对比 zip 压缩策略：旧版（全部 deflate）与按部件压缩策略的导出耗时和文件大小
+    png-quality  对比 PNG 后备图片质量档位（low/standard/hidpi）的渲染耗时与文件大小
+    finalize     对比 finalize_svg 逐步骤读写文件（legacy）与单次解析流水线的
+                 XML 解析/序列化次数、磁盘读写量与耗时
+    icons        对比图标嵌入旧版实现（每个占位符读取图标文件、逐个切片拼接）与
+                 图标索引 + 单次扫描拼接（合成的大量占位符演示文稿与 examples/）
+
+示例:
+    python3 tools/benchmark.py export                      # 默认使用 examples/ 下全部项目
+    python3 tools/benchmark.py export examples/ppt169_demo --repeat 5
+    python3 tools/benchmark.py png-quality examples/ppt169_demo
+    python3 tools/benchmark.py finalize
+    python3 tools/benchmark.py icons --distinct 40
+"""
+
+import io
+import re
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import contextlib
+from pathlib import Path
+from typing import Dict, List, Callable, Optional, Tuple
+from xml.etree import ElementTree as ET
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+# 默认示例目录
+DEFAULT_EXAMPLES_DIR = Path(__file__).parent.parent / 'examples'
+
+
+def find_benchmark_projects(paths: List[str]) -> List[Path]:
+    """解析基准项目列表（默认使用 examples/ 下全部项目）"""
+    if paths:
+        return [Path(p) for p in paths if Path(p).is_dir()]
+    return sorted(p for p in DEFAULT_EXAMPLES_DIR.iterdir()
+                  if p.is_dir() and ((p / 'svg_final').exists() or (p / 'svg_output').exists()))
+
+
+def time_best(func: Callable[[], None], repeat: int) -> float:
+    """多次运行取最短耗时（秒）"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def format_size(size_bytes: int) -> str:
+    """将字节数转换为可读的大小"""
+    if size_bytes < 1024 * 1024:
+        return f"{size_bytes / 1024:.1f} KB"
+    return f"{size_bytes / (1024 * 1024):.2f} MB"
+
+
+def print_table(headers: List[str], rows: List[List[str]]):
+    """输出对齐的文本表格"""
+    widths = [max(len(str(row[i])) for row in [headers] + rows) for i in range(len(headers))]
+    print('  '.join(str(h).ljust(w) for h, w in zip(headers, widths)))
+    print('  '.join('-' * w for w in widths))
+    for row in rows:
+        print('  '.join(str(c).ljust(w) for c, w in zip(row, widths)))
+
+
+def read_process_io() -> Optional[Tuple[int, int]]:
+    """当前进程累计读写字节数 (rchar, wchar)，仅 Linux 可用，其他平台返回 None"""
+    try:
+        with open('/proc/self/io') as f:
+            fields = dict(line.split(':', 1) for line in f if ':' in line)
+        return int(fields['rchar']), int(fields['wchar'])
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+@contextlib.contextmanager
+def count_xml_calls():
+    """
+    统计期间的 XML 解析与序列化次数
+
+    包装 ElementTree 的 parse/fromstring（解析）与 tostring/ElementTree.write（序列化），
+    嵌套调用（如 tostring 内部调用 write）只计一次。
+    """
+    counts = {'parse': 0, 'serialize': 0}
+    depth = [0]
+    patches = [(ET, 'parse', 'parse'), (ET, 'fromstring', 'parse'),
+               (ET, 'tostring', 'serialize'), (ET.ElementTree, 'write', 'serialize')]
+    originals = [(owner, name, getattr(owner, name)) for owner, name, _ in patches]
+
+    def wrap(func, kind):
+        def wrapper(*args, **kwargs):
+            if depth[0] == 0:
+                counts[kind] += 1
+            depth[0] += 1
+            try:
+                return func(*args, **kwargs)
+            finally:
+                depth[0] -= 1
+        return wrapper
+
+    for (owner, name, kind), (_, _, func) in zip(patches, originals):
+        setattr(owner, name, wrap(func, kind))
+    try:
+        yield counts
+    finally:
+        for owner, name, func in originals:
+            setattr(owner, name, func)
+
+
+def benchmark_finalize(projects: List[Path], repeat: int):
+    """对比 finalize_svg 逐步骤读写文件与单次解析流水线（全部处理步骤）"""
+    from finalize_svg import (FINALIZE_STEPS, finalize_svg_file, finalize_svg_file_legacy,
+                              prepare_svg_final)
+
+    options = {key: True for key, _, _, _ in FINALIZE_STEPS}
+    variants = [('legacy', finalize_svg_file_legacy), ('single', finalize_svg_file)]
+
+    rows = []
+    totals: Dict[str, List[float]] = {name: [0, 0, 0, 0, 0.0] for name, _ in variants}
+    has_io = read_process_io() is not None
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for project in projects:
+            if not (project / 'svg_output').exists():
+                continue
+            # 在临时副本上运行（裁剪图片会写入 images/cropped/）
+            work_dir = Path(tmp_dir) / project.name
+            shutil.copytree(project / 'svg_output', work_dir / 'svg_output')
+            if (project / 'images').exists():
+                shutil.copytree(project / 'images', work_dir / 'images')
+            page_count = len(list((work_dir / 'svg_output').glob('*.svg')))
+
+            row = [project.name[:40], str(page_count)]
+            for name, finalize in variants:
+                stats = {}
+
+                def run():
+                    svg_final = prepare_svg_final(work_dir)
+                    svg_files = sorted(svg_final.glob('*.svg'))
+                    io_before = read_process_io()
+                    with count_xml_calls() as calls, contextlib.redirect_stdout(io.StringIO()):
+                        for svg_file in svg_files:
+                            finalize(svg_file, options)
+                    io_after = read_process_io()
+                    stats.update(calls)
+                    if io_before and io_after:
+                        stats['read'] = io_after[0] - io_before[0]
+                        stats['write'] = io_after[1] - io_before[1]
+
+                elapsed = time_best(run, repeat)
+                values = [stats['parse'], stats['serialize'], stats.get('read', 0), stats.get('write', 0), elapsed]
+                totals[name] = [total + value for total, value in zip(totals[name], values)]
+                row += [str(stats['parse']), str(stats['serialize'])]
+                if has_io:
+                    row += [format_size(stats['read']), format_size(stats['write'])]
+                row.append(f'{elapsed * 1000:.0f} ms')
+            rows.append(row)
+
+    headers = ['项目', '页数']
+    for name, _ in variants:
+        headers += [f'{name} 解析', f'{name} 序列化']
+        if has_io:
+            headers += [f'{name} 读', f'{name} 写']
+        headers.append(f'{name} 耗时')
+    print_table(headers, rows)
+
+    print()
+    for name, _ in variants:
+        parse_count, serialize_count, read_bytes, write_bytes, elapsed = totals[name]
+        line = f"{name}: 解析 {parse_count} 次, 序列化 {serialize_count} 次"
+        if has_io:
+            line += f", 读 {format_size(read_bytes)}, 写 {format_size(write_bytes)}"
+        print(line + f", 耗时 {elapsed:.2f} s")
+
+    legacy, single = totals['legacy'], totals['single']
+    changes = []
+    for label, index in [('解析', 0), ('序列化', 1)] + ([('读', 2), ('写', 3)] if has_io else []) + [('耗时', 4)]:
+        if legacy[index] > 0:
+            changes.append(f"{label} {(single[index] / legacy[index] - 1) * 100:+.1f}%")
+    if changes:
+        print(f"  single 相对 legacy: {', '.join(changes)}")
+
+
+def _embed_icons_legacy(content: str, icons_dir: Path) -> Tuple[str, int]:
+    """旧版图标嵌入（对照基线）：每个占位符重新读取、解析图标文件，从后向前逐个切片替换"""
+    from embed_icons import USE_PATTERN, extract_paths_from_icon, generate_icon_group, parse_use_element
+
+    new_content = content
+    replaced_count = 0
+    for match in reversed(list(USE_PATTERN.finditer(content))):
+        attrs = parse_use_element(match.group(0))
+        if not attrs.get('icon'):
+            continue
+        paths = extract_paths_from_icon(icons_dir / f"{attrs['icon']}.svg")
+        if not paths:
+            continue
+        new_content = new_content[:match.start()] + generate_icon_group(attrs, paths) + new_content[match.end():]
+        replaced_count += 1
+    return new_content, replaced_count
+
+
+def make_icon_deck(base_slides: List[str], icon_names: List[str], slide_count: int,
+                   per_slide: int) -> List[str]:
+    """合成演示文稿：以示例页面为底，每页插入 per_slide 个图标占位符（图标循环取自 icon_names）"""
+    deck = []
+    for slide_index in range(slide_count):
+        uses = []
+        for i in range(per_slide):
+            name = icon_names[(slide_index * per_slide + i) % len(icon_names)]
+            uses.append(f'<use data-icon="{name}" x="{(i % 20) * 60}" y="{(i // 20) * 60}" '
+                        f'width="32" height="32" fill="#0076A8"/>')
+        base = base_slides[slide_index % len(base_slides)]
+        deck.append(base.replace('</svg>', '\n'.join(uses) + '\n</svg>'))
+    return deck
+
+
+def benchmark_icons(projects: List[Path], repeat: int, distinct: int):
+    """对比图标嵌入的旧版实现与图标索引 + 单次扫描拼接"""
+    from embed_icons import DEFAULT_ICONS_DIR, IconIndex, get_icon_index, replace_icon_placeholders
+
+    icons_dir = DEFAULT_ICONS_DIR
+    icon_names = sorted(path.stem for path in icons_dir.glob('*.svg'))[:distinct]
+    base_slides = []
+    for project in projects:
+        base_slides += [path.read_text(encoding='utf-8') for path in sorted((project / 'svg_output').glob('*.svg'))
+                        if 'data-icon=' not in path.read_text(encoding='utf-8')][:2]
+    if not icon_names or not base_slides:
+        print("错误: 未找到图标库或示例页面")
+        return
+
+    decks = [(f'合成 {slides}×{per_slide}', make_icon_deck(base_slides, icon_names, slides, per_slide))
+             for slides, per_slide in [(10, 20), (20, 25), (50, 40)]]
+    decks.append(('examples/ 全部项目', [path.read_text(encoding='utf-8') for project in projects
+                                     for path in sorted((project / 'svg_output').glob('*.svg'))]))
+
+    # 编译耗时（一次性开销）
+    compile_index = IconIndex(icons_dir)
+    compile_time = time_best(compile_index.compile, 1)
+    index = get_icon_index(icons_dir)
+    index.compile()
+
+    rows = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for label, deck in decks:
+            legacy_outputs, indexed_outputs = [], []
+
+            def run_legacy():
+                legacy_outputs[:] = [_embed_icons_legacy(content, icons_dir) for content in deck]
+
+            def run_indexed():
+                indexed_outputs[:] = [replace_icon_placeholders(content, icons_dir) for content in deck]
+
+            legacy_time = time_best(run_legacy, repeat)
+            loads_before = index.loads
+            indexed_time = time_best(run_indexed, repeat)
+            placeholders = sum(count for _, count in legacy_outputs)
+            used = len({name for content in deck for name in re.findall(r'data-icon="([^"]+)"', content)})
+            rows.append([label, str(len(deck)), str(placeholders), str(used),
+                         f'{legacy_time * 1000:.1f} ms', str(placeholders),
+                         f'{indexed_time * 1000:.1f} ms', str(index.loads - loads_before),
+                         f'{legacy_time / indexed_time:.1f}x' if indexed_time > 0 else '-',
+                         '是' if legacy_outputs == indexed_outputs else '否'])
+
+    print_table(['演示文稿', '页数', '占位符', '图标种类', 'legacy 耗时', 'legacy 读图标',
+                 'index 耗时', 'index 读图标', '加速', '结果一致'], rows)
+    print()
+    print(f"图标索引编译: {len(compile_index.entries)} 个图标, {compile_time * 1000:.1f} ms（每个进程一次）")
+
+
+def benchmark_export(projects: List[Path], repeat: int, use_compat_mode: bool):
+    """对比旧版与按部件压缩策略的导出耗时和文件大小"""
+    from svg_to_pptx import create_pptx_with_native_svg, find_svg_files, find_notes_files
+    from pptx_package import ZipCompressionPolicy
+
+    policies = [
+        ('legacy', ZipCompressionPolicy.legacy()),
+        ('policy', ZipCompressionPolicy()),
+    ]
+
+    rows = []
+    totals = {name: [0.0, 0] for name, _ in policies}
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for project in projects:
+            svg_files, _ = find_svg_files(project, 'final')
+            if not svg_files:
+                continue
+            notes = find_notes_files(project, svg_files)
+
+            def export(policy, output):
+                create_pptx_with_native_svg(
+                    svg_files, output, verbose=False, use_compat_mode=use_compat_mode,
+                    notes=notes, compression=policy
+                )
+
+            # 预热：填充 PNG 渲染缓存，使计时集中在打包阶段
+            export(ZipCompressionPolicy(), Path(tmp_dir) / 'warmup.pptx')
+
+            row = [project.name[:40], str(len(svg_files))]
+            for name, policy in policies:
+                output = Path(tmp_dir) / f'{name}.pptx'
+                elapsed = time_best(lambda: export(policy, output), repeat)
+                size = output.stat().st_size
+                totals[name][0] += elapsed
+                totals[name][1] += size
+                row += [f'{elapsed * 1000:.0f} ms', format_size(size)]
+            rows.append(row)
+
+    headers = ['项目', '页数']
+    for name, _ in policies:
+        headers += [f'{name} 耗时', f'{name} 大小']
+    print_table(headers, rows)
+
+    legacy_time, legacy_size = totals['legacy']
+    policy_time, policy_size = totals['policy']
+    print()
+    print(f"合计: legacy {legacy_time:.2f} s / {format_size(legacy_size)}, "
+          f"policy {policy_time:.2f} s / {format_size(policy_size)}")
+    if legacy_time > 0 and legacy_size > 0:
+        print(f"  耗时变化: {(policy_time / legacy_time - 1) * 100:+.1f}%, "
+              f"大小变化: {(policy_size / legacy_size - 1) * 100:+.1f}%")
+
+
+def benchmark_png_quality(projects: List[Path], repeat: int, tiers: List[str]):
+    """对比各 PNG 质量档位的渲染耗时与导出文件大小（不使用渲染缓存）"""
+    from svg_to_pptx import create_pptx_with_native_svg, find_svg_files, find_notes_files, PNG_RENDERER
+    from export_profiler import ExportProfiler
+
+    if PNG_RENDERER is None:
+        print("错误: 未安装 PNG 渲染库，无法对比 PNG 质量档位")
+        return
+
+    rows = []
+    totals = {tier: [0.0, 0.0, 0] for tier in tiers}
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for project in projects:
+            svg_files, _ = find_svg_files(project, 'final', log=None)
+            if not svg_files:
+                continue
+            notes = find_notes_files(project, svg_files)
+
+            row = [project.name[:40], str(len(svg_files))]
+            for tier in tiers:
+                output = Path(tmp_dir) / f'{tier}.pptx'
+                render_times = []
+
+                def export():
+                    profiler = ExportProfiler()
+                    create_pptx_with_native_svg(
+                        svg_files, output, verbose=False, notes=notes,
+                        use_cache=False, png_quality=tier, profiler=profiler
+                    )
+                    render_times.append(profiler.stage_totals().get('render', {}).get('wall', 0.0))
+
+                elapsed = time_best(export, repeat)
+                render = min(render_times)
+                size = output.stat().st_size
+                totals[tier][0] += elapsed
+                totals[tier][1] += render
+                totals[tier][2] += size
+                row += [f'{render * 1000:.0f} ms', format_size(size)]
+            rows.append(row)
+
+    headers = ['项目', '页数']
+    for tier in tiers:
+        headers += [f'{tier} 渲染', f'{tier} 大小']
+    print_table(headers, rows)
+
+    print()
+    base = totals.get('standard')
+    for tier in tiers:
+        elapsed, render, size = totals[tier]
+        line = f"{tier}: 导出 {elapsed:.2f} s, 渲染 {render:.2f} s, 大小 {format_size(size)}"
+        if base and tier != 'standard' and base[1] > 0 and base[2] > 0:
+            line += (f"（相对 standard: 渲染 {(render / base[1] - 1) * 100:+.1f}%, "
+                     f"大小 {(size / base[2] - 1) * 100:+.1f}%）")
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='PPT Master - 性能基准工具',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+示例:
+  %(prog)s export                          # 对 examples/ 全部项目对比压缩策略
+  %(prog)s export examples/ppt169_demo --repeat 5
+  %(prog)s export --no-compat              # 纯 SVG 模式（不含 PNG 后备图片）
+  %(prog)s png-quality                     # 对比 PNG 后备图片质量档位
+  %(prog)s png-quality examples/ppt169_demo --tiers low standard
+  %(prog)s finalize                        # 对比 finalize_svg 单次解析流水线
+  %(prog)s icons                           # 对比图标嵌入（图标索引 + 单次扫描拼接）
+        '''
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    export_parser = subparsers.add_parser('export', help='对比 zip 压缩策略的导出耗时与文件大小')
+    export_parser.add_argument('projects', nargs='*', help='项目目录（默认 examples/ 下全部项目）')
+    export_parser.add_argument('--repeat', type=int, default=3, help='每项重复次数，取最短耗时 (默认: 3)')
+    export_parser.add_argument('--no-compat', action='store_true', help='使用纯 SVG 模式')
+
+    quality_parser = subparsers.add_parser('png-quality', help='对比 PNG 质量档位的渲染耗时与文件大小')
+    quality_parser.add_argument('projects', nargs='*', help='项目目录（默认 examples/ 下全部项目）')
+    quality_parser.add_argument('--repeat', type=int, default=1, help='每项重复次数，取最短耗时 (默认: 1)')
+    quality_parser.add_argument('--tiers', nargs='+', choices=['low', 'standard', 'hidpi'],
+                                default=['low', 'standard', 'hidpi'], help='参与对比的档位 (默认: 全部)')
+
+    finalize_parser = subparsers.add_parser('finalize', help='对比 finalize_svg 的解析/序列化次数、磁盘读写与耗时')
+    finalize_parser.add_argument('projects', nargs='*', help='项目目录（默认 examples/ 下全部项目）')
+    finalize_parser.add_argument('--repeat', type=int, default=3, help='每项重复次数，取最短耗时 (默认: 3)')
+
+    icons_parser = subparsers.add_parser('icons', help='对比图标嵌入旧版实现与图标索引的耗时')
+    icons_parser.add_argument('projects', nargs='*', help='项目目录（默认 examples/ 下全部项目）')
+    icons_parser.add_argument('--repeat', type=int, default=3, help='每项重复次数，取最短耗时 (默认: 3)')
+    icons_parser.add_argument('--distinct', type=int, default=40,
+                              help='合成演示文稿使用的图标种类数 (默认: 40)')
+
+    args = parser.parse_args()
+
+    projects = find_benchmark_projects(args.projects)
+    if not projects:
+        print("错误: 未找到可用于基准测试的项目")
+        sys.exit(1)
+
+    if args.command == 'export':
+        benchmark_export(projects, args.repeat, not args.no_compat)
+    elif args.command == 'png-quality':
+        benchmark_png_quality(projects, args.repeat, args.tiers)
+    elif args.command == 'finalize':
+        benchmark_finalize(projects, args.repeat)
+    elif args.command == 'icons':
+        benchmark_icons(projects, args.repeat, args.distinct)
+
+
+if __name__ == '__main__':
+    main()
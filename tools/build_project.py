@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+PPT Master - 一键构建工具（后处理 + 导出流水线）
+
+相当于依次执行 finalize_svg.py 与 svg_to_pptx.py -s final，但两个阶段
+按页重叠进行：后处理线程（生产者）逐页处理 svg_final/ 中的文件，每完成
+一页，导出端（消费者）立即读取该页并提交 PNG 渲染，渲染进程不必等待
+全部页面后处理完成；页面仍按顺序写入 PPTX（流式导出，内存占用恒定）。
+
+后处理按 svg_final/ 中的增量清单进行（同 finalize_svg.py）：未变化的页面
+直接放行给导出端，只有过期的页面进入后处理线程，完成后更新清单。
+
+输出的 svg_final/ 与 PPTX 和分步执行的结果相同。
+
+用法:
+    python3 tools/build_project.py <项目目录>
+    python3 tools/build_project.py <项目目录> -j 8 -o out.pptx
+    python3 tools/build_project.py <项目目录> --no-pipeline   # 分步执行（用于对比）
+    python3 tools/build_project.py <项目目录> --full          # 忽略增量清单，全部重新后处理
+"""
+
+import sys
+import time
+import argparse
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from finalize_svg import FINALIZE_STEPS, ICONS_DIR, finalize_project, finalize_svg_file
+from finalize_manifest import plan_finalize, save_manifest
+from svg_to_pptx import (
+    PNG_RENDERER, SlideProgress, SlideSource, build_pptx, export_project,
+    get_png_renderer_info, plan_project_export, resolve_jobs
+)
+from pptx_package import ZipCompressionPolicy
+from canvas_scan import scan_svg_canvas
+
+
+@dataclass
+class PendingSlide(SlideSource):
+    """后处理完成前 read_svg 会阻塞等待的幻灯片（由后处理线程放行）"""
+    ready: threading.Event = field(default_factory=threading.Event)
+
+    def read_svg(self) -> bytes:
+        self.ready.wait()
+        return super().read_svg()
+
+
+def default_finalize_options(only: Optional[List[str]] = None) -> dict:
+    """后处理选项：only 为 finalize_svg.py --only 的处理名（如 embed-icons），默认全部执行"""
+    return {key: not only or key.replace('_', '-') in only for key, _, _, _ in FINALIZE_STEPS}
+
+
+def build_project(
+    project_dir: Path,
+    finalize_options: Optional[dict] = None,
+    output: Optional[Path] = None,
+    jobs: int = 0,
+    pipeline: bool = True,
+    full: bool = False,
+    enable_notes: bool = True,
+    progress: Optional[Callable[[SlideProgress], None]] = None,
+    log: Optional[Callable[[str], None]] = None,
+    **export_options
+) -> dict:
+    """
+    后处理并导出项目（库接口）
+
+    Args:
+        project_dir: 项目目录（需包含 svg_output/）
+        finalize_options: 后处理选项（见 finalize_svg.FINALIZE_STEPS，默认全部执行）
+        output: 输出路径（默认为项目目录下带时间戳的文件名）
+        jobs: PNG 渲染进程数（0 表示使用全部 CPU 核心）
+        pipeline: 后处理与渲染/打包按页重叠进行；False 时先完成全部后处理再导出
+        full: 忽略 svg_final/ 中的增量清单，全部重新后处理
+        enable_notes: 是否嵌入演讲备注
+        progress: 导出进度回调（同 build_pptx）
+        log: 导出日志输出函数（None 表示不输出）
+        **export_options: 传递给 build_pptx 的其余参数（native、use_compat_mode、transition 等）
+
+    Returns:
+        build_pptx 的结果字典，另含 output、finalize（各处理步骤的数量合计，含复用页面）、
+        finalize_stale（本次后处理的页面）、finalize_reused（复用的页面）、
+        finalize_errors（{页面: 错误}）、finalize_elapsed（后处理累计耗时）、
+        finalize_done（后处理全部完成的时刻，相对开始）、elapsed（总耗时）
+
+    Raises:
+        FileNotFoundError: 项目目录或 svg_output/ 中的 SVG 文件不存在
+    """
+    start = time.perf_counter()
+    project_dir = Path(project_dir)
+    options = finalize_options if finalize_options is not None else default_finalize_options()
+    if not (project_dir / 'svg_output').is_dir() or not list((project_dir / 'svg_output').glob('*.svg')):
+        raise FileNotFoundError(f"未找到 svg_output 中的 SVG 文件: {project_dir}")
+
+    if not pipeline:
+        finalize_project(project_dir, options, quiet=True, full=full)
+        finalize_done = time.perf_counter() - start
+        result = export_project(project_dir, source='final', output=output, enable_notes=enable_notes,
+                                jobs=jobs, streaming=True, progress=progress, log=log, **export_options)
+        result.update({'finalize': None, 'finalize_stale': None, 'finalize_reused': None,
+                       'finalize_errors': {}, 'finalize_elapsed': finalize_done,
+                       'finalize_done': finalize_done, 'elapsed': time.perf_counter() - start})
+        return result
+
+    # 同步 svg_final/：过期页面复制源文件等待处理，未变化的页面保留上一次的处理结果
+    finalize_plan = plan_finalize(project_dir, options, ICONS_DIR, full=full)
+    stale = set(finalize_plan.stale)
+    plan = plan_project_export(project_dir, source='final', output=output, enable_notes=enable_notes)
+    slides = [PendingSlide(name=svg_path.stem, path=svg_path, notes=plan['notes'].get(svg_path.stem, ''))
+              for svg_path in plan['svg_files']]
+    # 画布预扫描读取 svg_output/ 中的源文件（后处理不改变根元素的画布尺寸），
+    # 不读取后处理线程正在改写的 svg_final/ 文件
+    canvases = [scan_svg_canvas(project_dir / 'svg_output' / slide.path.name, slide.name) for slide in slides]
+    # 复用的页面无需等待后处理
+    for slide in slides:
+        if slide.path.name not in stale:
+            slide.ready.set()
+
+    errors: Dict[str, str] = {}
+    finished: set = set()
+    timing = {'elapsed': 0.0, 'done': None}
+
+    def finalize_worker():
+        # 按导出顺序逐页处理过期页面，每完成一页立即放行给导出端
+        try:
+            for slide in slides:
+                if slide.path.name not in stale:
+                    continue
+                slide_start = time.perf_counter()
+                try:
+                    finalize_plan.entries[slide.path.name]['counts'] = finalize_svg_file(slide.path, options)
+                    finished.add(slide.path.name)
+                except Exception as e:
+                    # 处理失败的页面保留 svg_output 的原始副本继续导出
+                    errors[slide.name] = str(e) or e.__class__.__name__
+                timing['elapsed'] += time.perf_counter() - slide_start
+                slide.ready.set()
+        finally:
+            for slide in slides:
+                slide.ready.set()
+            timing['done'] = time.perf_counter() - start
+
+    worker = threading.Thread(target=finalize_worker, name='finalize', daemon=True)
+    worker.start()
+    try:
+        result = build_pptx(
+            slides,
+            plan['output'],
+            canvas_format=plan['canvas_format'],
+            enable_notes=enable_notes,
+            canvases=canvases,
+            jobs=jobs,
+            streaming=True,
+            progress=progress,
+            log=log,
+            **export_options
+        )
+    finally:
+        worker.join()
+        # 未完成或处理失败的页面不写入清单，下一次重新处理
+        for name in finalize_plan.stale:
+            if name not in finished:
+                del finalize_plan.entries[name]
+        finalize_plan.stale = [name for name in finalize_plan.stale if name in finished]
+        save_manifest(finalize_plan)
+
+    totals = finalize_plan.totals()
+    result.update({
+        'output': str(plan['output']),
+        'finalize': {key: totals.get(key, 0) for key, _, _, _ in FINALIZE_STEPS},
+        'finalize_stale': sorted(finished),
+        'finalize_reused': finalize_plan.reused,
+        'finalize_errors': errors,
+        'finalize_elapsed': timing['elapsed'],
+        'finalize_done': timing['done'],
+        'elapsed': time.perf_counter() - start,
+    })
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='PPT Master - 一键构建工具（后处理 + 导出流水线）',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+示例:
+  %(prog)s examples/ppt169_demo                     # 后处理并导出（全部 CPU 核心渲染）
+  %(prog)s examples/ppt169_demo -j 4 -o demo.pptx
+  %(prog)s examples/ppt169_demo --only embed-icons fix-rounded --native
+  %(prog)s examples/ppt169_demo --no-pipeline       # 分步执行，用于对比耗时
+
+说明:
+  后处理在主进程的线程中逐页进行，PNG 渲染在进程池中进行；
+  渲染进程数 > 1 时两个阶段才能真正并行（单核机器上收益有限）。
+        '''
+    )
+    parser.add_argument('project_dir', type=Path, help='项目目录路径')
+    parser.add_argument('-o', '--output', type=Path, default=None, help='输出文件路径')
+    parser.add_argument('-j', '--jobs', type=int, default=0,
+                        help='PNG 渲染进程数 (默认: 0，使用全部 CPU 核心)')
+    parser.add_argument('--only', nargs='+', metavar='OPTION',
+                        choices=[key.replace('_', '-') for key, _, _, _ in FINALIZE_STEPS],
+                        help='只执行指定的后处理（同 finalize_svg.py --only）')
+    parser.add_argument('--no-pipeline', action='store_true', help='先完成全部后处理再导出（不重叠）')
+    parser.add_argument('--full', action='store_true', help='忽略增量清单，删除 svg_final/ 后全部重新后处理')
+    parser.add_argument('--native', action='store_true', help='转换为 PowerPoint 原生形状')
+    parser.add_argument('--no-compat', action='store_true', help='禁用 Office 兼容模式（纯 SVG）')
+    parser.add_argument('--no-notes', action='store_true', help='禁用演讲备注嵌入')
+    parser.add_argument('--no-cache', action='store_true', help='不使用 PNG 渲染缓存')
+    parser.add_argument('--zip-level', type=int, choices=range(0, 10), default=6, metavar='0-9',
+                        help='XML/SVG 部件的压缩级别 (默认: 6)')
+    parser.add_argument('-q', '--quiet', action='store_true', help='只输出最终结果')
+
+    args = parser.parse_args()
+
+    verbose = not args.quiet
+    finalize_options = default_finalize_options(args.only)
+    use_compat_mode = not args.no_compat and not args.native
+
+    if verbose:
+        print("PPT Master - 一键构建工具")
+        print("=" * 50)
+        print(f"  项目: {args.project_dir}")
+        print(f"  流水线: {'关闭（分步执行）' if args.no_pipeline else '开启（后处理与渲染/打包按页重叠）'}")
+        if use_compat_mode and PNG_RENDERER is not None:
+            print(f"  渲染进程: {resolve_jobs(args.jobs)}")
+
+    def report(event: SlideProgress):
+        if event.stage != 'package':
+            return
+        prefix = f"  [{event.index}/{event.total}] {event.name}"
+        if event.error:
+            print(f"{prefix} - 错误: {event.error}")
+            return
+        if event.native:
+            mode_str = " (原生形状)"
+        else:
+            mode_str = " (PNG+SVG)" if event.has_png else " (SVG)"
+        notes_str = " +备注" if event.has_notes else ""
+        print(f"{prefix}{mode_str}{notes_str}")
+        for warning in event.warnings:
+            print(f"      - {warning}")
+
+    try:
+        result = build_project(
+            args.project_dir,
+            finalize_options=finalize_options,
+            output=args.output,
+            jobs=args.jobs,
+            pipeline=not args.no_pipeline,
+            full=args.full,
+            enable_notes=not args.no_notes,
+            progress=report if verbose else None,
+            log=print if verbose else None,
+            native=args.native,
+            use_compat_mode=not args.no_compat,
+            use_cache=not args.no_cache,
+            compression=ZipCompressionPolicy(xml_level=args.zip_level),
+        )
+    except FileNotFoundError as e:
+        print(f"错误: {e}")
+        sys.exit(1)
+
+    if verbose:
+        print()
+        if result['finalize'] is not None:
+            print("后处理:")
+            if result['finalize_stale'] is not None:
+                print(f"  增量: 处理 {len(result['finalize_stale'])} 页，复用 {len(result['finalize_reused'])} 页")
+            for key, title, done_message, empty_message in FINALIZE_STEPS:
+                if finalize_options[key]:
+                    count = result['finalize'][key]
+                    print(f"  {title}: {done_message.format(count) if count else empty_message}")
+        for name, error in result['finalize_errors'].items():
+            print(f"  警告: {name} 后处理失败，使用未处理的 SVG ({error})")
+        print()
+    print(f"[完成] 已保存: {result['output']}")
+    print(f"  成功: {result['success']}, 失败: {len(result['failed'])}")
+    print(f"  耗时: 总计 {result['elapsed']:.2f} s，后处理累计 {result['finalize_elapsed']:.2f} s"
+          f"（第 {result['finalize_done']:.2f} s 全部完成）")
+    if verbose and result['compat'] and PNG_RENDERER == 'svglib':
+        hint = get_png_renderer_info()[2]
+        if hint:
+            print(f"  [提示] {hint}")
+
+    sys.exit(0 if not result['failed'] else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+PPT Master - 画布预扫描模块
+
+只读取每页 SVG 根元素 <svg ...> 的属性（viewBox / width / height），
+一次扫描得到全部页面的画布尺寸，供导出与检查共用：
+
+    - svg_to_pptx.py: 确定演示文稿画布、报告尺寸不一致的页面，
+      并按页面实际画布等比缩放居中（或拆分为单独的演示文稿）
+    - svg_quality_checker.py: 检查目录内各页画布是否一致
+
+从文件扫描时只读取文件开头直到根元素结束（通常不足 1 KB），不解析整个文档。
+
+用法（库接口）:
+    canvases = [scan_svg_canvas(path) for path in svg_files]
+    mismatched = find_canvas_mismatches(canvases, (1280, 720))
+    x, y, w, h = fit_rect(1242, 1660, 12192000, 6858000)
+"""
+
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+try:
+    from config import CANVAS_FORMATS
+except ImportError:
+    CANVAS_FORMATS = {}
+
+
+# 根元素查找的读取上限（根元素之前通常只有 XML 声明与注释）
+HEAD_CHUNK_SIZE = 4096
+HEAD_MAX_SIZE = 64 * 1024
+
+# 根 <svg> 开始标签（属性值中可能含有 '>'）
+ROOT_TAG_PATTERN = re.compile(rb'<svg\b(?:[^>"\']|"[^"]*"|\'[^\']*\')*>')
+ATTRIBUTE_PATTERN = re.compile(rb'([\w:.-]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\')')
+LENGTH_PATTERN = re.compile(r'^\s*([0-9.eE+-]+)\s*(px)?\s*$')
+
+
+@dataclass
+class SlideCanvas:
+    """
+    单页画布信息（根元素的尺寸属性）
+
+    width/height 为像素尺寸（取整）：优先取 viewBox，缺少 viewBox 时取
+    width/height 属性；均无法解析时为 None。
+    """
+    name: str
+    width: Optional[int] = None
+    height: Optional[int] = None
+    viewbox: Optional[Tuple[float, float, float, float]] = None
+    format: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def size(self) -> Optional[Tuple[int, int]]:
+        """像素尺寸 (宽, 高)，未知时为 None"""
+        if self.width is None or self.height is None:
+            return None
+        return self.width, self.height
+
+
+def _parse_length(value: Optional[str]) -> Optional[float]:
+    """解析绝对长度（无单位或 px；百分比等相对长度返回 None）"""
+    if not value:
+        return None
+    match = LENGTH_PATTERN.match(value)
+    if not match:
+        return None
+    try:
+        length = float(match.group(1))
+    except ValueError:
+        return None
+    return length if length > 0 else None
+
+
+def _parse_viewbox(value: Optional[str]) -> Optional[Tuple[float, float, float, float]]:
+    if not value:
+        return None
+    parts = re.split(r'[\s,]+', value.strip())
+    if len(parts) != 4:
+        return None
+    try:
+        numbers = tuple(float(part) for part in parts)
+    except ValueError:
+        return None
+    if numbers[2] <= 0 or numbers[3] <= 0:
+        return None
+    return numbers
+
+
+def match_canvas_format(viewbox: Tuple[float, float, float, float]) -> Optional[str]:
+    """按 viewBox 查找对应的画布格式（见 config.CANVAS_FORMATS）"""
+    for fmt_key, fmt_info in CANVAS_FORMATS.items():
+        if _parse_viewbox(fmt_info.get('viewbox')) == viewbox:
+            return fmt_key
+    return None
+
+
+def find_root_tag(data: bytes) -> Optional[bytes]:
+    """返回根 <svg> 开始标签（未找到完整标签时返回 None）"""
+    match = ROOT_TAG_PATTERN.search(data)
+    return match.group(0) if match else None
+
+
+def parse_svg_canvas(content: Union[bytes, str], name: str = '') -> SlideCanvas:
+    """
+    从 SVG 内容（或其开头部分）解析根元素的画布信息
+
+    Args:
+        content: SVG 内容，至少包含完整的根 <svg> 开始标签
+        name: 页面名称
+    """
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    tag = find_root_tag(content)
+    if tag is None:
+        return SlideCanvas(name, error="未找到 <svg> 根元素")
+
+    attributes: Dict[str, str] = {}
+    for match in ATTRIBUTE_PATTERN.finditer(tag):
+        value = match.group(2) if match.group(2) is not None else match.group(3)
+        attributes[match.group(1).decode('utf-8', errors='ignore')] = value.decode('utf-8', errors='ignore')
+
+    canvas = SlideCanvas(name, viewbox=_parse_viewbox(attributes.get('viewBox')))
+    if canvas.viewbox is not None:
+        width, height = canvas.viewbox[2], canvas.viewbox[3]
+        canvas.format = match_canvas_format(canvas.viewbox)
+    else:
+        width, height = _parse_length(attributes.get('width')), _parse_length(attributes.get('height'))
+    if width and height:
+        canvas.width, canvas.height = max(1, int(round(width))), max(1, int(round(height)))
+    return canvas
+
+
+def read_svg_head(svg_path: Path) -> bytes:
+    """读取 SVG 文件开头直到根元素结束（最多 HEAD_MAX_SIZE 字节）"""
+    data = b''
+    with open(svg_path, 'rb') as f:
+        while len(data) < HEAD_MAX_SIZE:
+            chunk = f.read(HEAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            data += chunk
+            if find_root_tag(data) is not None:
+                break
+    return data
+
+
+def scan_svg_canvas(source: Union[Path, str, bytes], name: Optional[str] = None) -> SlideCanvas:
+    """
+    扫描单页画布
+
+    Args:
+        source: SVG 文件路径（只读取开头部分），或内存中的 SVG 内容（bytes）
+        name: 页面名称（默认取文件名，不含扩展名）
+    """
+    if isinstance(source, bytes):
+        return parse_svg_canvas(source, name or '')
+    svg_path = Path(source)
+    name = name if name is not None else svg_path.stem
+    try:
+        return parse_svg_canvas(read_svg_head(svg_path), name)
+    except OSError as e:
+        return SlideCanvas(name, error=str(e))
+
+
+def find_canvas_mismatches(canvases: List[SlideCanvas], size: Tuple[int, int]) -> List[int]:
+    """返回画布尺寸已知且与 size 不同的页面下标"""
+    return [index for index, canvas in enumerate(canvases)
+            if canvas.size is not None and canvas.size != tuple(size)]
+
+
+def group_by_canvas(canvases: List[SlideCanvas], size: Tuple[int, int]) -> List[Tuple[Tuple[int, int], List[int]]]:
+    """
+    按画布尺寸对页面分组（拆分导出使用）
+
+    与 size 相同或尺寸未知的页面为第一组，其余按首次出现的顺序分组。
+
+    Returns:
+        [(画布尺寸, 页面下标列表)]
+    """
+    groups: Dict[Tuple[int, int], List[int]] = {tuple(size): []}
+    for index, canvas in enumerate(canvases):
+        groups.setdefault(canvas.size or tuple(size), []).append(index)
+    return [(group_size, indices) for group_size, indices in groups.items() if indices]
+
+
+def fit_rect(width: float, height: float, box_width: int, box_height: int) -> Tuple[int, int, int, int]:
+    """
+    将 width × height 的画布等比缩放并居中放入 box_width × box_height
+
+    Returns:
+        (x, y, 宽, 高)，单位与 box 相同（取整）
+    """
+    scale = min(box_width / width, box_height / height)
+    fit_width = min(box_width, int(round(width * scale)))
+    fit_height = min(box_height, int(round(height * scale)))
+    return (box_width - fit_width) // 2, (box_height - fit_height) // 2, fit_width, fit_height
+
+
+def describe_canvas(size: Tuple[int, int]) -> str:
+    """画布尺寸的显示文本，如 '1242x1660 (小红书 3:4)'"""
+    text = f"{size[0]}x{size[1]}"
+    fmt_key = match_canvas_format((0.0, 0.0, float(size[0]), float(size[1])))
+    if fmt_key:
+        text += f" ({CANVAS_FORMATS[fmt_key].get('name', fmt_key)})"
+    return text
@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""
+PPT Master - 页面总览图工具（Contact Sheet）
+
+将演示文稿的全部页面缩小后排成网格，生成一张总览图，评审时无需逐页翻看。
+
+预览图来源（按优先级）:
+    - 项目目录: PNG 渲染缓存中已有的后备图片（任意质量档位）→ 项目目录中
+      最近一次导出（带导出清单）的 PNG → 按预览尺寸重新渲染（并行，结果缓存）
+    - PPTX 文件: 幻灯片中的 PNG 后备图片 → 渲染幻灯片中的 SVG（并行）；
+      原生形状页面（包中没有 SVG）按导出清单的 SVG 哈希在 PPTX 所在项目目录的
+      svg_final/、svg_output/ 中查找源文件渲染 → 第一页使用文档缩略图
+
+用法:
+    python3 tools/contact_sheet.py <项目目录> -s final
+    python3 tools/contact_sheet.py deck.pptx -o sheet.jpg --columns 8
+"""
+
+import sys
+import time
+import zipfile
+import argparse
+from io import BytesIO
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple, Union
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from svg_to_pptx import (
+    EMU_PER_PIXEL, PNG_QUALITY_TIERS, PNG_RENDERER, THUMBNAIL_PART, PngQuality, PreviousExport, SlideSource,
+    find_previous_export, find_svg_files, get_render_id, get_viewbox_dimensions, hash_bytes,
+    render_png_fallbacks, resolve_jobs
+)
+from pptx_package import read_manifest
+from render_cache import RenderCache
+from merge_pptx import RELATIONSHIP_PATTERN, get_attribute, get_slide_size, list_slide_parts, rels_part_name, resolve_target
+
+try:
+    from PIL import Image, ImageDraw, ImageFont
+except ImportError:
+    Image = None
+
+
+# 原生形状页面查找源 SVG 的项目子目录（相对 PPTX 所在目录，按优先级）
+PROJECT_SVG_DIRS = ('svg_final', 'svg_output')
+
+# 网格布局（像素）
+DEFAULT_COLUMNS = 6
+DEFAULT_CELL_WIDTH = 320
+SHEET_MARGIN = 24
+CELL_GAP = 16
+LABEL_HEIGHT = 22
+BACKGROUND_COLOR = (240, 240, 240)
+BORDER_COLOR = (200, 200, 200)
+LABEL_COLOR = (80, 80, 80)
+
+
+def _preview_quality(cell_width: int, width: int) -> PngQuality:
+    """按预览宽度渲染的档位（名称含宽度，缓存键随之区分）"""
+    return PngQuality(f'preview{cell_width}', f'预览 ({cell_width}px)', scale=cell_width / width)
+
+
+def _collect_project(
+    project_path: Path,
+    source: str,
+    cell_width: int,
+    jobs: int,
+    use_cache: bool,
+    log: Optional[Callable[[str], None]]
+) -> Tuple[List[str], List[Optional[bytes]], Tuple[int, int], dict]:
+    """收集项目各页的预览 PNG，返回 (页面名称, PNG, 画布尺寸, 来源统计)"""
+    svg_files, _ = find_svg_files(project_path, source, log=log)
+    if not svg_files:
+        raise FileNotFoundError(f"未找到 SVG 文件: {project_path}")
+    width, height = get_viewbox_dimensions(svg_files[0]) or (1280, 720)
+    slides = [SlideSource.from_file(svg_path) for svg_path in svg_files]
+    pngs: List[Optional[bytes]] = [None] * len(slides)
+    stats = {'cached': 0, 'reused': 0, 'rendered': 0}
+
+    # 1. 渲染缓存中已有的后备图片（导出时生成，任意质量档位）
+    cache = RenderCache() if use_cache and PNG_RENDERER is not None else None
+    svg_contents = [slide.read_svg() for slide in slides]
+    if cache is not None:
+        for index, (slide, svg_data) in enumerate(zip(slides, svg_contents)):
+            for quality in PNG_QUALITY_TIERS.values():
+                key = cache.make_key(svg_data, width, height, get_render_id(quality), svg_dir=slide.base_dir)
+                pngs[index] = cache.get(key)
+                if pngs[index] is not None:
+                    stats['cached'] += 1
+                    break
+
+    # 2. 最近一次导出中的 PNG（不要求导出设置一致，仅用于预览）
+    if any(png is None for png in pngs):
+        previous_pptx = find_previous_export(project_path)
+        if previous_pptx is not None:
+            with zipfile.ZipFile(previous_pptx, 'r') as package:
+                previous = PreviousExport(package, read_manifest(package) or {})
+                for index, svg_data in enumerate(svg_contents):
+                    if pngs[index] is None:
+                        pngs[index] = previous.read_png(hash_bytes(svg_data))
+                        if pngs[index] is not None:
+                            stats['reused'] += 1
+
+    # 3. 其余页面按预览尺寸并行渲染（结果写入缓存，下次直接复用）
+    missing = [index for index, png in enumerate(pngs) if png is None]
+    if missing and PNG_RENDERER is not None:
+        hits_before = cache.hits if cache is not None else 0
+        rendered = render_png_fallbacks(
+            [slides[index] for index in missing], width, height, jobs=jobs, cache=cache, log=log,
+            quality=_preview_quality(cell_width, width)
+        )
+        preview_hits = cache.hits - hits_before if cache is not None else 0
+        stats['cached'] += preview_hits
+        stats['rendered'] += sum(png is not None for png in rendered) - preview_hits
+        for index, png in zip(missing, rendered):
+            pngs[index] = png
+
+    return [slide.name for slide in slides], pngs, (width, height), stats
+
+
+def _find_project_svgs(pptx_path: Path, hashes: set) -> dict:
+    """在 PPTX 所在项目目录中查找内容哈希与导出清单一致的 SVG，返回 {哈希: 路径}"""
+    found = {}
+    for dir_name in PROJECT_SVG_DIRS:
+        svg_dir = pptx_path.parent / dir_name
+        if not svg_dir.is_dir():
+            continue
+        for svg_path in sorted(svg_dir.glob('*.svg')):
+            try:
+                svg_hash = hash_bytes(svg_path.read_bytes())
+            except OSError:
+                continue
+            if svg_hash in hashes and svg_hash not in found:
+                found[svg_hash] = svg_path
+    return found
+
+
+def _collect_pptx(
+    pptx_path: Path,
+    cell_width: int,
+    jobs: int,
+    log: Optional[Callable[[str], None]]
+) -> Tuple[List[str], List[Optional[bytes]], Tuple[int, int], dict]:
+    """收集 PPTX 各页的预览 PNG（优先使用 PNG 后备图片，否则渲染幻灯片中的 SVG）"""
+    stats = {'cached': 0, 'reused': 0, 'rendered': 0}
+    with zipfile.ZipFile(pptx_path, 'r') as package:
+        width_emu, height_emu = get_slide_size(package)
+        width, height = round(width_emu / EMU_PER_PIXEL), round(height_emu / EMU_PER_PIXEL)
+        slide_parts = list_slide_parts(package)
+        pngs: List[Optional[bytes]] = [None] * len(slide_parts)
+        svg_sources = {}
+
+        # 原生形状页面：导出清单中既无 SVG 也无 PNG，页面中的图片是内容而非整页预览
+        manifest = read_manifest(package) or {}
+        manifest_slides = manifest.get('slides') or []
+        native_hashes = {}
+        if len(manifest_slides) == len(slide_parts):
+            native_hashes = {
+                index: entry.get('svg_sha256') for index, entry in enumerate(manifest_slides)
+                if entry.get('svg') is None and entry.get('png') is None
+            }
+        thumbnail_data = None
+        if manifest.get('thumbnail'):
+            try:
+                thumbnail_data = package.read(THUMBNAIL_PART)
+            except KeyError:
+                pass
+
+        for index, slide_part in enumerate(slide_parts):
+            if index in native_hashes:
+                continue
+            try:
+                rels_xml = package.read(rels_part_name(slide_part)).decode('utf-8')
+            except KeyError:
+                continue
+            for element in RELATIONSHIP_PATTERN.findall(rels_xml):
+                target = get_attribute(element, 'Target') or ''
+                if get_attribute(element, 'TargetMode') == 'External':
+                    continue
+                part = resolve_target(slide_part, target)
+                if part.lower().endswith('.png') and pngs[index] is None:
+                    pngs[index] = package.read(part)
+                elif part.lower().endswith('.svg') and index not in svg_sources:
+                    svg_sources[index] = package.read(part)
+            if pngs[index] is not None:
+                stats['reused'] += 1
+
+    # 原生形状页面按哈希使用项目目录中的源 SVG（保留原路径，引用的本地图片可以解析）
+    project_svgs = _find_project_svgs(pptx_path, {h for h in native_hashes.values() if h})
+    slide_sources = {index: SlideSource(name=f'slide{index + 1}', svg=svg_data)
+                     for index, svg_data in svg_sources.items()}
+    for index, svg_hash in native_hashes.items():
+        if svg_hash in project_svgs:
+            slide_sources[index] = SlideSource.from_file(project_svgs[svg_hash])
+
+    missing = [index for index in sorted(slide_sources) if pngs[index] is None]
+    if missing and PNG_RENDERER is not None:
+        rendered = render_png_fallbacks(
+            [slide_sources[index] for index in missing],
+            width, height, jobs=jobs, cache=None, log=log, quality=_preview_quality(cell_width, width)
+        )
+        for index, png in zip(missing, rendered):
+            pngs[index] = png
+            stats['rendered'] += png is not None
+
+    # 仍无法预览的第一页使用导出时以第一页生成的文档缩略图
+    if pngs and pngs[0] is None and thumbnail_data is not None:
+        pngs[0] = thumbnail_data
+        stats['reused'] += 1
+
+    names = [Path(part).stem for part in slide_parts]
+    return names, pngs, (width, height), stats
+
+
+def compose_sheet(
+    pngs: List[Optional[bytes]],
+    canvas_size: Tuple[int, int],
+    columns: int = DEFAULT_COLUMNS,
+    cell_width: int = DEFAULT_CELL_WIDTH
+) -> 'Image.Image':
+    """将各页预览排成网格（缺失的页面显示为空白格），每格下方标注页码"""
+    width, height = canvas_size
+    cell_height = max(1, round(cell_width * height / width))
+    columns = max(1, min(columns, len(pngs)))
+    rows = (len(pngs) + columns - 1) // columns
+    sheet = Image.new('RGB', (
+        SHEET_MARGIN * 2 + columns * cell_width + (columns - 1) * CELL_GAP,
+        SHEET_MARGIN * 2 + rows * (cell_height + LABEL_HEIGHT) + (rows - 1) * CELL_GAP,
+    ), BACKGROUND_COLOR)
+    draw = ImageDraw.Draw(sheet)
+    font = ImageFont.load_default()
+
+    for index, png in enumerate(pngs):
+        x = SHEET_MARGIN + (index % columns) * (cell_width + CELL_GAP)
+        y = SHEET_MARGIN + (index // columns) * (cell_height + LABEL_HEIGHT + CELL_GAP)
+        draw.rectangle([x, y, x + cell_width, y + cell_height], fill=(255, 255, 255))
+        if png is not None:
+            try:
+                with Image.open(BytesIO(png)) as image:
+                    image = image.convert('RGBA')
+                    image.thumbnail((cell_width, cell_height), Image.LANCZOS)
+                    sheet.paste(image, (x + (cell_width - image.width) // 2, y + (cell_height - image.height) // 2),
+                                image)
+            except (OSError, ValueError):
+                pass
+        draw.rectangle([x - 1, y - 1, x + cell_width, y + cell_height], outline=BORDER_COLOR)
+        draw.text((x, y + cell_height + 4), str(index + 1), fill=LABEL_COLOR, font=font)
+    return sheet
+
+
+def create_contact_sheet(
+    input_path: Union[str, Path],
+    output: Union[str, Path],
+    source: str = 'output',
+    columns: int = DEFAULT_COLUMNS,
+    cell_width: int = DEFAULT_CELL_WIDTH,
+    jobs: int = 0,
+    use_cache: bool = True,
+    log: Optional[Callable[[str], None]] = None
+) -> dict:
+    """
+    生成页面总览图（库接口）
+
+    Args:
+        input_path: 项目目录或已导出的 PPTX
+        output: 输出图片路径（.png 或 .jpg）
+        source: 项目目录的 SVG 来源（output/final 或任意子目录名）
+        columns: 每行页数
+        cell_width: 每页预览宽度（像素）
+        jobs: 渲染进程数（0 表示使用全部 CPU 核心）
+        use_cache: 是否使用/写入 PNG 渲染缓存（仅项目目录）
+        log: 警告输出函数（None 表示不输出）
+
+    Returns:
+        {'output', 'slides', 'missing'（缺失预览的页面）, 'cached'（复用渲染缓存）,
+        'reused'（复用已导出的 PNG）, 'rendered'（重新渲染）, 'size', 'elapsed'}
+
+    Raises:
+        RuntimeError: 未安装 Pillow
+        FileNotFoundError: 输入不存在或未找到页面
+    """
+    if Image is None:
+        raise RuntimeError("缺少 Pillow 库，请运行: pip install Pillow")
+    start = time.perf_counter()
+    input_path = Path(input_path)
+    if input_path.is_dir():
+        names, pngs, canvas_size, stats = _collect_project(input_path, source, cell_width, jobs, use_cache, log)
+    elif input_path.suffix.lower() == '.pptx' and input_path.is_file():
+        names, pngs, canvas_size, stats = _collect_pptx(input_path, cell_width, jobs, log)
+    else:
+        raise FileNotFoundError(f"输入不是项目目录或 PPTX 文件: {input_path}")
+    if not names:
+        raise FileNotFoundError(f"未找到页面: {input_path}")
+
+    sheet = compose_sheet(pngs, canvas_size, columns, cell_width)
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    if output.suffix.lower() in ('.jpg', '.jpeg'):
+        sheet.save(output, format='JPEG', quality=85, optimize=True)
+    else:
+        sheet.save(output, format='PNG', optimize=True)
+
+    return {
+        'output': str(output),
+        'slides': len(names),
+        'missing': [name for name, png in zip(names, pngs) if png is None],
+        **stats,
+        'size': output.stat().st_size,
+        'elapsed': time.perf_counter() - start,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='PPT Master - 页面总览图工具（Contact Sheet）',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+示例:
+  %(prog)s examples/ppt169_demo -s final              # 输出到 <项目>/contact_sheet.png
+  %(prog)s examples/ppt169_demo -s final -j 4 --columns 8
+  %(prog)s exported.pptx -o review.jpg                # 直接读取已导出的 PPTX
+
+说明:
+  已导出过的页面直接复用 PNG 后备图片（渲染缓存或最近一次导出），
+  其余页面按预览尺寸并行渲染，结果写入渲染缓存。
+        '''
+    )
+    parser.add_argument('input', type=Path, help='项目目录或 PPTX 文件')
+    parser.add_argument('-o', '--output', type=Path, default=None,
+                        help='输出图片路径 (.png/.jpg，默认: 输入旁的 contact_sheet.png)')
+    parser.add_argument('-s', '--source', type=str, default='output',
+                        help='SVG 来源: output/final 或任意子目录名 (仅项目目录)')
+    parser.add_argument('--columns', type=int, default=DEFAULT_COLUMNS, help=f'每行页数 (默认: {DEFAULT_COLUMNS})')
+    parser.add_argument('--cell-width', type=int, default=DEFAULT_CELL_WIDTH,
+                        help=f'每页预览宽度/像素 (默认: {DEFAULT_CELL_WIDTH})')
+    parser.add_argument('-j', '--jobs', type=int, default=0,
+                        help='渲染进程数 (默认: 0，使用全部 CPU 核心)')
+    parser.add_argument('--no-cache', action='store_true', help='不使用 PNG 渲染缓存')
+    parser.add_argument('-q', '--quiet', action='store_true', help='只输出最终结果')
+
+    args = parser.parse_args()
+    verbose = not args.quiet
+
+    output = args.output
+    if output is None:
+        base = args.input if args.input.is_dir() else args.input.parent
+        output = base / ('contact_sheet.png' if args.input.is_dir() else f'{args.input.stem}_contact_sheet.png')
+
+    if verbose:
+        print("PPT Master - 页面总览图工具")
+        print("=" * 50)
+        print(f"  输入: {args.input}")
+        print(f"  渲染进程: {resolve_jobs(args.jobs)}")
+        print()
+
+    try:
+        result = create_contact_sheet(
+            args.input, output, source=args.source, columns=args.columns, cell_width=args.cell_width,
+            jobs=args.jobs, use_cache=not args.no_cache, log=print if verbose else None
+        )
+    except (FileNotFoundError, RuntimeError, ValueError, zipfile.BadZipFile) as e:
+        print(f"错误: {e}")
+        sys.exit(1)
+
+    print(f"[完成] 已保存: {result['output']}")
+    print(f"  页数: {result['slides']}（复用渲染缓存 {result['cached']}，复用已导出 PNG {result['reused']}，"
+          f"重新渲染 {result['rendered']}）")
+    if result['missing']:
+        print(f"  缺失: {', '.join(result['missing'])}")
+    print(f"  大小: {result['size'] / 1024:.1f} KB，耗时: {result['elapsed']:.2f} s")
+    sys.exit(0 if not result['missing'] else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -136,16 +136,6 @@ def process_svg_images(svg_file: str, output_dir: str = None, dry_run: bool = Fa
         (processed_count, error_count)
     """
     svg_path = Path(svg_file)
-    svg_dir = svg_path.parent
-    
-    # 默认输出目录
-    if output_dir is None:
-        # 查找项目的 images 目录
-        # svg_output 或 svg_final 的父目录下的 images
-        project_dir = svg_dir.parent
-        output_dir = project_dir / 'images' / 'cropped'
-    else:
-        output_dir = Path(output_dir)
     
     # 解析 SVG
     try:
@@ -158,11 +148,43 @@ def process_svg_images(svg_file: str, output_dir: str = None, dry_run: bool = Fa
             print(f"  [ERROR] 解析 SVG 失败: {e}")
         return (0, 1)
     
-    ns = {'svg': 'http://www.w3.org/2000/svg', 'xlink': 'http://www.w3.org/1999/xlink'}
+    processed_count, error_count = crop_images_in_tree(root, svg_path.parent, output_dir, dry_run, verbose)
+    
+    # 保存修改后的 SVG
+    if processed_count > 0 and not dry_run:
+        tree.write(str(svg_path), encoding='unicode', xml_declaration=False)
+    
+    return (processed_count, error_count)
+
+
+def crop_images_in_tree(root: ET.Element, svg_dir: Path, output_dir: str = None, dry_run: bool = False,
+                        verbose: bool = True) -> tuple:
+    """
+    裁剪已解析的 SVG 文档树中的图片（原地修改 href，供 finalize_svg.py 单次解析流水线使用）
+    
+    Args:
+        root: SVG 根元素
+        svg_dir: SVG 文件所在目录（解析相对路径）
+        output_dir: 裁剪后图片的输出目录（默认为 images/cropped/）
+        dry_run: 仅预览，不实际处理
+        verbose: 详细输出
+    
+    Returns:
+        (processed_count, error_count)
+    """
+    svg_dir = Path(svg_dir)
+    
+    # 默认输出目录
+    if output_dir is None:
+        # 查找项目的 images 目录
+        # svg_output 或 svg_final 的父目录下的 images
+        project_dir = svg_dir.parent
+        output_dir = project_dir / 'images' / 'cropped'
+    else:
+        output_dir = Path(output_dir)
     
     processed_count = 0
     error_count = 0
-    modified = False
     
     # 查找所有 image 元素
     for image in root.iter('{http://www.w3.org/2000/svg}image'):
@@ -233,11 +255,13 @@ def process_svg_images(svg_file: str, output_dir: str = None, dry_run: bool = Fa
             output_filename = img_path.name
             output_path = output_dir / output_filename
             
-            # 保存
+            # 保存（先写临时文件再替换：并行处理时其他页面不会读到写了一半的图片）
+            temp_path = output_dir / f'.{output_filename}.{os.getpid()}.tmp'
             if img_path.suffix.lower() == '.png':
-                cropped.save(output_path, 'PNG', optimize=True)
+                cropped.save(temp_path, 'PNG', optimize=True)
             else:
-                cropped.save(output_path, 'JPEG', quality=90, optimize=True)
+                cropped.save(temp_path, 'JPEG', quality=90, optimize=True)
+            os.replace(temp_path, output_path)
             
             if verbose:
                 print(f"    [OK] {img_path.name}: {img.size} -> {target_width}x{target_height} "
@@ -254,7 +278,6 @@ def process_svg_images(svg_file: str, output_dir: str = None, dry_run: bool = Fa
             if 'preserveAspectRatio' in image.attrib:
                 del image.attrib['preserveAspectRatio']
             
-            modified = True
             processed_count += 1
             
         except Exception as e:
@@ -262,10 +285,6 @@ def process_svg_images(svg_file: str, output_dir: str = None, dry_run: bool = Fa
                 print(f"    [ERROR] {img_path.name}: {e}")
             error_count += 1
     
-    # 保存修改后的 SVG
-    if modified and not dry_run:
-        tree.write(str(svg_path), encoding='unicode', xml_declaration=False)
-    
     return (processed_count, error_count)
 
 
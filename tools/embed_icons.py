@@ -20,13 +20,21 @@ SVG 图标嵌入工具
     --icons-dir <path>    图标目录路径（默认：templates/icons/）
     --dry-run             仅显示将要替换的内容，不修改文件
     --verbose             显示详细信息
+
+图标库在首次使用时编译为内存索引（IconIndex：扫描一次图标目录并解析全部图标的
+path 列表），同一进程内重复出现的图标不再重复读取文件；每次查找时比较图标文件的
+修改时间，图标被修改、新增或删除后自动重新解析。
 """
 
 import os
 import re
+import html
 import sys
 import argparse
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from xml.etree import ElementTree as ET
 
 
 # 默认图标目录
@@ -35,6 +43,14 @@ DEFAULT_ICONS_DIR = Path(__file__).parent.parent / 'templates' / 'icons'
 # 图标基础尺寸
 ICON_BASE_SIZE = 16
 
+SVG_NS = 'http://www.w3.org/2000/svg'
+
+# 图标占位符 <use data-icon="xxx" ... /> 及其属性
+USE_PATTERN = re.compile(r'<use\s+[^>]*data-icon="[^"]*"[^>]*/>')
+ICON_ATTR_PATTERN = re.compile(r'data-icon="([^"]+)"')
+NUMBER_ATTR_PATTERNS = {attr: re.compile(rf'{attr}="([^"]+)"') for attr in ['x', 'y', 'width', 'height']}
+FILL_ATTR_PATTERN = re.compile(r'fill="([^"]+)"')
+
 
 def extract_paths_from_icon(icon_path: Path) -> list[str]:
     """
@@ -64,6 +80,79 @@ def extract_paths_from_icon(icon_path: Path) -> list[str]:
     return paths
 
 
+@dataclass
+class IconEntry:
+    """编译后的图标：path 元素字符串与对应的属性字典（按修改时间失效）"""
+    mtime_ns: int
+    paths: List[str]
+    attributes: List[dict]
+
+
+class IconIndex:
+    """
+    图标库内存索引
+    
+    首次查找时扫描图标目录并解析全部图标（约 640 个，数十毫秒），之后的查找
+    只需一次 stat 比较修改时间：未变化时直接返回缓存的 path 列表，图标文件被
+    修改或新增时重新解析该图标，被删除时视为不存在。
+    """
+    
+    def __init__(self, icons_dir: Path):
+        self.icons_dir = Path(icons_dir)
+        self.entries: Optional[Dict[str, IconEntry]] = None
+        self.loads = 0
+    
+    def _load(self, icon_path: Path, mtime_ns: int) -> IconEntry:
+        paths = extract_paths_from_icon(icon_path)
+        self.loads += 1
+        return IconEntry(mtime_ns, paths, [path_attributes(path) for path in paths])
+    
+    def compile(self) -> int:
+        """扫描图标目录，解析全部图标，返回图标数量"""
+        self.entries = {}
+        try:
+            scanned = list(os.scandir(self.icons_dir))
+        except OSError:
+            return 0
+        for entry in scanned:
+            if entry.name.endswith('.svg') and entry.is_file():
+                name = entry.name[:-len('.svg')]
+                self.entries[name] = self._load(Path(entry.path), entry.stat().st_mtime_ns)
+        return len(self.entries)
+    
+    def get(self, name: str) -> Optional[IconEntry]:
+        """查找图标（按修改时间校验缓存），不存在时返回 None"""
+        if self.entries is None:
+            self.compile()
+        icon_path = os.path.join(self.icons_dir, f'{name}.svg')
+        try:
+            mtime_ns = os.stat(icon_path).st_mtime_ns
+        except OSError:
+            self.entries.pop(name, None)
+            return None
+        entry = self.entries.get(name)
+        if entry is None or entry.mtime_ns != mtime_ns:
+            entry = self.entries[name] = self._load(Path(icon_path), mtime_ns)
+        return entry
+    
+    def paths(self, name: str) -> List[str]:
+        """图标的 path 元素列表（与 extract_paths_from_icon 相同，不存在时为空列表）"""
+        entry = self.get(name)
+        return entry.paths if entry is not None else []
+
+
+# 各图标目录的共享索引（同一进程内只编译一次）
+_ICON_INDEXES: Dict[str, IconIndex] = {}
+
+
+def get_icon_index(icons_dir: Path) -> IconIndex:
+    """返回图标目录的共享索引"""
+    key = os.path.abspath(icons_dir)
+    if key not in _ICON_INDEXES:
+        _ICON_INDEXES[key] = IconIndex(Path(key))
+    return _ICON_INDEXES[key]
+
+
 def parse_use_element(use_match: str) -> dict:
     """
     解析 use 元素的属性
@@ -77,24 +166,60 @@ def parse_use_element(use_match: str) -> dict:
     attrs = {}
     
     # 提取 data-icon
-    icon_match = re.search(r'data-icon="([^"]+)"', use_match)
+    icon_match = ICON_ATTR_PATTERN.search(use_match)
     if icon_match:
         attrs['icon'] = icon_match.group(1)
     
     # 提取数值属性
-    for attr in ['x', 'y', 'width', 'height']:
-        match = re.search(rf'{attr}="([^"]+)"', use_match)
+    for attr, pattern in NUMBER_ATTR_PATTERNS.items():
+        match = pattern.search(use_match)
         if match:
             attrs[attr] = float(match.group(1))
     
     # 提取 fill 颜色
-    fill_match = re.search(r'fill="([^"]+)"', use_match)
+    fill_match = FILL_ATTR_PATTERN.search(use_match)
     if fill_match:
         attrs['fill'] = fill_match.group(1)
     
     return attrs
 
 
+def icon_attributes(use_elem: ET.Element) -> dict:
+    """
+    读取 use 元素的属性（与 parse_use_element 相同，用于已解析的文档树）
+    
+    Args:
+        use_elem: <use data-icon="..."/> 元素
+        
+    Returns:
+        属性字典
+    """
+    attrs = {}
+    if use_elem.get('data-icon'):
+        attrs['icon'] = use_elem.get('data-icon')
+    for attr in ['x', 'y', 'width', 'height']:
+        if use_elem.get(attr):
+            attrs[attr] = float(use_elem.get(attr))
+    if use_elem.get('fill'):
+        attrs['fill'] = use_elem.get('fill')
+    return attrs
+
+
+def path_attributes(path: str) -> dict:
+    """解析 extract_paths_from_icon 生成的 <path .../> 字符串的属性"""
+    return {name: html.unescape(value) for name, value in re.findall(r'([\w:.-]+)="([^"]*)"', path)}
+
+
+def icon_transform(attrs: dict) -> str:
+    """计算图标 <g> 的 transform（按 width 等比缩放）"""
+    x = attrs.get('x', 0)
+    y = attrs.get('y', 0)
+    scale = attrs.get('width', ICON_BASE_SIZE) / ICON_BASE_SIZE
+    if scale == 1:
+        return f'translate({x}, {y})'
+    return f'translate({x}, {y}) scale({scale})'
+
+
 def generate_icon_group(attrs: dict, paths: list[str]) -> str:
     """
     生成图标的 <g> 元素
@@ -106,21 +231,9 @@ def generate_icon_group(attrs: dict, paths: list[str]) -> str:
     Returns:
         完整的 <g> 元素字符串
     """
-    x = attrs.get('x', 0)
-    y = attrs.get('y', 0)
-    width = attrs.get('width', ICON_BASE_SIZE)
-    height = attrs.get('height', ICON_BASE_SIZE)
     fill = attrs.get('fill', '#000000')
     icon_name = attrs.get('icon', 'unknown')
-    
-    # 计算缩放比例（基于 width，假设等比缩放）
-    scale = width / ICON_BASE_SIZE
-    
-    # 构建 transform
-    if scale == 1:
-        transform = f'translate({x}, {y})'
-    else:
-        transform = f'translate({x}, {y}) scale({scale})'
+    transform = icon_transform(attrs)
     
     # 生成 <g> 元素
     paths_str = '\n    '.join(paths)
@@ -131,62 +244,143 @@ def generate_icon_group(attrs: dict, paths: list[str]) -> str:
   </g>'''
 
 
-def process_svg_file(svg_path: Path, icons_dir: Path, dry_run: bool = False, verbose: bool = False) -> int:
+def embed_icons_in_tree(root: ET.Element, icons_dir: Path, svg_name: str = '', verbose: bool = False) -> int:
     """
-    处理单个 SVG 文件，替换所有图标占位符
+    在已解析的 SVG 文档树中替换图标占位符（供 finalize_svg.py 单次解析流水线使用）
+    
+    与 process_svg_file 的结果等价：<use data-icon> 替换为 <!-- icon: 名称 --> 注释
+    与带 transform/fill 的 <g>，其中为图标的 path 元素；有图标占位符时同样输出
+    [OK] 文件名 (N icons)。
     
     Args:
-        svg_path: SVG 文件路径
+        root: SVG 根元素（原地修改）
         icons_dir: 图标目录路径
-        dry_run: 是否仅预览不修改
+        svg_name: 文件名（用于提示信息）
         verbose: 是否显示详细信息
         
     Returns:
         替换的图标数量
     """
-    if not svg_path.exists():
-        print(f"[ERROR] 文件不存在: {svg_path}")
-        return 0
-    
-    content = svg_path.read_text(encoding='utf-8')
+    icon_index = get_icon_index(icons_dir)
+    icons: Dict[str, Optional[IconEntry]] = {}  # 本文档中已查找的图标（每个图标只校验一次）
+    placeholders = 0
+    replaced_count = 0
+    for parent in list(root.iter()):
+        offset = 0  # 已插入的注释数量（子元素位置后移）
+        for index, use_elem in enumerate(list(parent)):
+            if use_elem.tag not in (f'{{{SVG_NS}}}use', 'use') or use_elem.get('data-icon') is None:
+                continue
+            placeholders += 1
+            attrs = icon_attributes(use_elem)
+            icon_name = attrs.get('icon')
+            if not icon_name:
+                continue
+            
+            if icon_name not in icons:
+                icons[icon_name] = icon_index.get(icon_name)
+            icon = icons[icon_name]
+            if icon is None or not icon.paths:
+                print(f"[WARN] 图标不存在: {icon_name} (in {svg_name})")
+                continue
+            
+            if verbose:
+                print(f"  [*] {icon_name}: x={attrs.get('x', 0)}, y={attrs.get('y', 0)}, "
+                      f"size={attrs.get('width', 16)}, fill={attrs.get('fill', '#000000')}")
+            
+            comment = ET.Comment(f' icon: {icon_name} ')
+            comment.tail = '\n  '
+            group = ET.Element(f'{{{SVG_NS}}}g', {'transform': icon_transform(attrs),
+                                                  'fill': attrs.get('fill', '#000000')})
+            for attributes in icon.attributes:
+                ET.SubElement(group, f'{{{SVG_NS}}}path', attributes)
+            group.tail = use_elem.tail
+            parent[index + offset] = comment
+            parent.insert(index + offset + 1, group)
+            offset += 1
+            replaced_count += 1
     
-    # 匹配 <use data-icon="xxx" ... /> 元素
-    use_pattern = r'<use\s+[^>]*data-icon="[^"]*"[^>]*/>'
-    matches = list(re.finditer(use_pattern, content))
+    if placeholders:
+        print(f"[OK] {svg_name} ({replaced_count} icons)")
     
-    if not matches:
-        if verbose:
-            print(f"[SKIP] 无图标占位符: {svg_path}")
-        return 0
+    return replaced_count
+
+
+def replace_icon_placeholders(content: str, icons_dir: Path, svg_name: str = '',
+                              verbose: bool = False) -> Tuple[str, int]:
+    """
+    替换 SVG 内容中的全部图标占位符（单次扫描，按顺序拼接结果）
     
+    Args:
+        content: SVG 内容
+        icons_dir: 图标目录路径
+        svg_name: 文件名（用于提示信息）
+        verbose: 是否显示每个图标的信息
+        
+    Returns:
+        (替换后的内容, 替换的图标数量)
+    """
+    index = get_icon_index(icons_dir)
+    icon_paths: Dict[str, List[str]] = {}  # 本次替换中已查找的图标（每个图标只校验一次）
+    parts = []
+    position = 0
     replaced_count = 0
-    new_content = content
     
-    # 从后向前替换，避免位置偏移
-    for match in reversed(matches):
-        use_str = match.group(0)
-        attrs = parse_use_element(use_str)
-        
+    for match in USE_PATTERN.finditer(content):
+        attrs = parse_use_element(match.group(0))
         icon_name = attrs.get('icon')
         if not icon_name:
             continue
         
-        icon_path = icons_dir / f'{icon_name}.svg'
-        paths = extract_paths_from_icon(icon_path)
-        
+        if icon_name not in icon_paths:
+            icon_paths[icon_name] = index.paths(icon_name)
+        paths = icon_paths[icon_name]
         if not paths:
-            print(f"[WARN] 图标不存在: {icon_name} (in {svg_path.name})")
+            print(f"[WARN] 图标不存在: {icon_name} (in {svg_name})")
             continue
         
-        replacement = generate_icon_group(attrs, paths)
-        
-        if verbose or dry_run:
+        if verbose:
             print(f"  [*] {icon_name}: x={attrs.get('x', 0)}, y={attrs.get('y', 0)}, "
                   f"size={attrs.get('width', 16)}, fill={attrs.get('fill', '#000000')}")
         
-        new_content = new_content[:match.start()] + replacement + new_content[match.end():]
+        parts.append(content[position:match.start()])
+        parts.append(generate_icon_group(attrs, paths))
+        position = match.end()
         replaced_count += 1
     
+    if not replaced_count:
+        return content, 0
+    parts.append(content[position:])
+    return ''.join(parts), replaced_count
+
+
+def process_svg_file(svg_path: Path, icons_dir: Path, dry_run: bool = False, verbose: bool = False) -> int:
+    """
+    处理单个 SVG 文件，替换所有图标占位符
+    
+    Args:
+        svg_path: SVG 文件路径
+        icons_dir: 图标目录路径
+        dry_run: 是否仅预览不修改
+        verbose: 是否显示详细信息
+        
+    Returns:
+        替换的图标数量
+    """
+    if not svg_path.exists():
+        print(f"[ERROR] 文件不存在: {svg_path}")
+        return 0
+    
+    content = svg_path.read_text(encoding='utf-8')
+    
+    if not USE_PATTERN.search(content):
+        if verbose:
+            print(f"[SKIP] 无图标占位符: {svg_path}")
+        return 0
+    
+    new_content, replaced_count = replace_icon_placeholders(
+        content, icons_dir, svg_path.name, verbose=verbose or dry_run
+    )
+    
     if not dry_run and replaced_count > 0:
         svg_path.write_text(new_content, encoding='utf-8')
     
@@ -17,6 +17,7 @@ import base64
 import re
 import sys
 import argparse
+from xml.sax.saxutils import escape
 
 def get_mime_type(filename):
     """根据文件扩展名返回 MIME 类型"""
@@ -40,6 +41,64 @@ def get_file_size_str(size_bytes):
     else:
         return f"{size_bytes / (1024 * 1024):.1f} MB"
 
+# 可嵌入的图片引用（与 embed_images_in_svg 的匹配规则一致）
+IMAGE_HREF_PATTERN = re.compile(r'\.(png|jpg|jpeg|gif|webp)$')
+HREF_ATTRIBUTES = ('href', '{http://www.w3.org/1999/xlink}href')
+
+
+def embed_images_in_tree(root, svg_dir, svg_name='', original_size=0):
+    """
+    将已解析的 SVG 文档树中引用的外部图片转换为 Base64 内嵌（供 finalize_svg.py 单次解析流水线使用）
+    
+    输出与 embed_images_in_svg 相同的处理明细（[FILE] / [OK] / [FAIL] / [SIZE]）。
+    
+    Args:
+        root: SVG 根元素（原地修改）
+        svg_dir: SVG 文件所在目录（解析相对路径）
+        svg_name: 文件名（用于处理明细）
+        original_size: 原文件大小（字节，用于 [SIZE] 行；新大小按替换的属性值估算）
+    
+    Returns:
+        嵌入的图片数量
+    """
+    images_found = []
+    images_embedded = 0
+    new_size = original_size
+    for elem in root.iter():
+        for attr in HREF_ATTRIBUTES:
+            img_path = elem.get(attr)
+            if img_path is None or img_path.startswith('data:') or not IMAGE_HREF_PATTERN.search(img_path):
+                continue
+            
+            # 属性值已由解析器解码实体，处理相对路径
+            full_path = img_path if os.path.isabs(img_path) else os.path.join(svg_dir, img_path)
+            if not os.path.exists(full_path):
+                print(f"  [WARN] Image not found: {img_path}")
+                images_found.append((img_path, "NOT FOUND", 0))
+                continue
+            
+            img_size = os.path.getsize(full_path)
+            with open(full_path, 'rb') as img_file:
+                b64_data = base64.b64encode(img_file.read()).decode('utf-8')
+            data_uri = f'data:{get_mime_type(img_path)};base64,{b64_data}'
+            elem.set(attr, data_uri)
+            new_size += len(data_uri) - len(escape(img_path, {'"': '&quot;'}).encode('utf-8'))
+            images_embedded += 1
+            images_found.append((img_path, "EMBEDDED", img_size))
+    
+    # 打印处理的图片
+    if images_found:
+        print(f"\n[FILE] {svg_name}")
+        for img_path, status, size in images_found:
+            if status == "EMBEDDED":
+                print(f"   [OK] {img_path} ({get_file_size_str(size)})")
+            else:
+                print(f"   [FAIL] {img_path} ({status})")
+        print(f"   [SIZE] {get_file_size_str(original_size)} -> {get_file_size_str(new_size)}")
+    
+    return images_embedded
+
+
 def embed_images_in_svg(svg_path, dry_run=False):
     """
     将 SVG 文件中的外部图片转换为 Base64 内嵌
@@ -0,0 +1,622 @@
+#!/usr/bin/env python3
+"""
+PPT Master - PPTX 导出守护进程
+
+常驻后台、监听本机 HTTP 端口的导出服务。每次运行 svg_to_pptx.py 都要重新导入
+python-pptx、cairosvg/svglib/reportlab 并生成骨架演示文稿，对于自动化批量生成的
+短演示文稿，这部分固定开销往往超过导出本身。守护进程在启动时完成这些准备：
+
+    - 工作进程预先导入渲染器并渲染一次空白页（加载字体等）
+    - 常用画布尺寸的骨架 PPTX 预先生成并缓存在工作进程中
+    - 导出任务在固定数量的工作进程中并发执行（--workers），超出的任务排队等待
+
+用法:
+    python3 tools/export_daemon.py serve [--port 8765] [--workers 4]
+    python3 tools/export_daemon.py export <项目路径> [-s final] [-o output.pptx] [--native]
+    python3 tools/export_daemon.py status
+    python3 tools/export_daemon.py stop
+
+HTTP 接口（JSON）:
+    每个请求都需携带请求头 X-PPT-Master-Token（服务启动时生成的令牌，写入仅当前用户
+    可读的令牌文件，默认 ~/.cache/ppt-master/export_daemon_<端口>.token）；
+    POST 请求的 Content-Type 必须为 application/json
+
+    GET  /health      服务状态：渲染器、工作进程数、任务统计
+    POST /export      提交导出任务，默认等待完成后返回结果；"wait": false 时立即返回任务 ID
+    GET  /jobs/<id>   查询任务状态与结果
+    POST /shutdown    停止服务
+
+导出任务参数（POST /export 的 JSON 字段）:
+    project (必填)  项目目录路径（守护进程所在机器上的路径）
+    source          SVG 来源：output/final 或子目录名（默认 output）
+    output          输出路径（.pptx，须位于项目目录内；默认为项目目录下带时间戳的文件名）
+    format          画布格式（默认自动检测）
+    native          转换为原生形状（默认 false）
+    compat          Office 兼容模式（默认 true）
+    notes           嵌入演讲备注（默认 true）
+    cache           使用 PNG 渲染缓存（默认 true）
+    transition / transition_duration / auto_advance / zip_level  同 svg_to_pptx.py
+    wait            是否等待完成（默认 true）
+
+注意:
+    - 服务默认只监听 127.0.0.1，并只接受 Host 为本机地址的请求（防止 DNS 重绑定）；
+      令牌与 Content-Type 校验防止浏览器中的网页跨站提交任务或停止服务
+    - 任务内部的 PNG 渲染为串行，并发度由 --workers 控制
+"""
+
+import os
+import sys
+import hmac
+import json
+import time
+import argparse
+import secrets
+import threading
+import itertools
+import urllib.error
+import urllib.request
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlsplit
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+# 注意: svg_to_pptx 及渲染库只在服务端与工作进程中导入，客户端命令保持轻量
+
+
+# 默认监听地址与端口
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# 令牌文件目录与请求头（令牌文件按端口区分，同一台机器可以运行多个服务）
+DEFAULT_TOKEN_DIR = Path.home() / '.cache' / 'ppt-master'
+TOKEN_HEADER = 'X-PPT-Master-Token'
+
+# 本机地址（监听这些地址时只接受 Host 为本机的请求）
+LOOPBACK_HOSTS = ('127.0.0.1', 'localhost', '::1')
+
+# 保留的已完成任务记录数（超出后丢弃最早的记录）
+MAX_FINISHED_JOBS = 200
+
+# 预热时生成骨架的画布格式
+WARM_FORMATS = ('ppt169', 'ppt43')
+
+# 预热渲染使用的空白页
+WARM_SVG = b'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 16 9" width="16" height="9"><text x="1" y="6" font-size="4">A</text></svg>'
+
+
+# ============================================================
+# 访问控制
+# ============================================================
+
+def get_token_path(port: int, token_dir: Optional[Path] = None) -> Path:
+    """服务令牌文件路径"""
+    return Path(token_dir or DEFAULT_TOKEN_DIR) / f'export_daemon_{port}.token'
+
+
+def write_token(path: Path) -> str:
+    """生成新的服务令牌并写入令牌文件（权限 0600，仅当前用户可读）"""
+    token = secrets.token_urlsafe(32)
+    path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+    fd = os.open(str(path), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        # 文件已存在时 os.open 不会修改权限
+        os.chmod(path, 0o600)
+        f.write(token)
+    return token
+
+
+def read_token(path: Path) -> str:
+    """
+    读取服务令牌
+
+    Raises:
+        ConnectionError: 令牌文件不存在（服务未启动）
+    """
+    try:
+        return path.read_text(encoding='utf-8').strip()
+    except OSError:
+        raise ConnectionError(f"未找到导出服务令牌文件 {path}")
+
+
+def split_host(value: str) -> str:
+    """去掉 Host 请求头中的端口（支持 [::1]:8765 形式）"""
+    return urlsplit(f'//{value}').hostname or ''
+
+
+# ============================================================
+# 工作进程
+# ============================================================
+
+def warm_up():
+    """预热：生成常用尺寸的骨架，并渲染一次空白页以加载渲染器与字体"""
+    from svg_to_pptx import CANVAS_FORMATS, PNG_RENDERER, get_slide_dimensions, create_skeleton, _render_png
+    
+    for canvas_format in WARM_FORMATS:
+        if canvas_format in CANVAS_FORMATS:
+            create_skeleton(*get_slide_dimensions(canvas_format))
+    if PNG_RENDERER is not None:
+        _render_png(None, WARM_SVG, None, 16, 9)
+
+
+def run_export_job(options: dict) -> dict:
+    """在工作进程中执行一个导出任务，返回 build_pptx 的结果及耗时"""
+    from svg_to_pptx import export_project
+    from pptx_package import ZipCompressionPolicy
+    
+    start = time.perf_counter()
+    options = dict(options)
+    zip_level = options.pop('zip_level', 6)
+    result = export_project(
+        options.pop('project'),
+        compression=ZipCompressionPolicy(xml_level=zip_level),
+        jobs=1,
+        **options
+    )
+    result['elapsed'] = round(time.perf_counter() - start, 3)
+    result['worker_pid'] = os.getpid()
+    return result
+
+
+def parse_export_request(payload: dict) -> dict:
+    """
+    校验 POST /export 的参数并转换为 export_project 的参数
+
+    Raises:
+        ValueError: 参数缺失或不合法
+    """
+    from svg_to_pptx import CANVAS_FORMATS, TRANSITIONS
+    
+    if not isinstance(payload, dict):
+        raise ValueError("请求体必须是 JSON 对象")
+    project = payload.get('project')
+    if not project or not isinstance(project, str):
+        raise ValueError("缺少 project（项目目录路径）")
+    if not Path(project).is_dir():
+        raise ValueError(f"项目目录不存在: {project}")
+
+    canvas_format = payload.get('format')
+    if canvas_format is not None and canvas_format not in CANVAS_FORMATS:
+        raise ValueError(f"未知画布格式: {canvas_format}")
+    transition = payload.get('transition')
+    if transition is not None and TRANSITIONS and transition not in TRANSITIONS:
+        raise ValueError(f"未知切换效果: {transition}")
+    zip_level = payload.get('zip_level', 6)
+    if not isinstance(zip_level, int) or not 0 <= zip_level <= 9:
+        raise ValueError("zip_level 必须是 0-9 的整数")
+
+    try:
+        transition_duration = float(payload.get('transition_duration', 0.5))
+        auto_advance = payload.get('auto_advance')
+        auto_advance = float(auto_advance) if auto_advance is not None else None
+    except (TypeError, ValueError):
+        raise ValueError("transition_duration / auto_advance 必须是数字")
+
+    # 输出限定为项目目录内的 .pptx，避免通过接口覆盖任意文件
+    project_path = Path(project).resolve()
+    output = payload.get('output')
+    if output is not None:
+        if not isinstance(output, str) or not output:
+            raise ValueError("output 必须是文件路径")
+        output_path = Path(output)
+        output_path = (output_path if output_path.is_absolute() else project_path / output_path).resolve()
+        if output_path.suffix.lower() != '.pptx':
+            raise ValueError(f"output 必须是 .pptx 文件: {output}")
+        try:
+            output_path.relative_to(project_path)
+        except ValueError:
+            raise ValueError(f"output 必须位于项目目录内: {output}")
+        output = str(output_path)
+    return {
+        'project': str(project_path),
+        'source': str(payload.get('source', 'output')),
+        'output': output,
+        'canvas_format': canvas_format,
+        'native': bool(payload.get('native', False)),
+        'use_compat_mode': bool(payload.get('compat', True)),
+        'enable_notes': bool(payload.get('notes', True)),
+        'use_cache': bool(payload.get('cache', True)),
+        'transition': transition,
+        'transition_duration': transition_duration,
+        'auto_advance': auto_advance,
+        'zip_level': zip_level,
+    }
+
+
+# ============================================================
+# 服务端
+# ============================================================
+
+class ExportService:
+    """导出任务调度：固定数量的预热工作进程 + 任务记录"""
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._jobs: 'OrderedDict[str, dict]' = OrderedDict()
+        self._futures: dict = {}
+        self._done_events: dict = {}
+        self._executor = self._create_executor()
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=warm_up)
+
+    def _replace_broken_executor(self, broken: ProcessPoolExecutor):
+        """
+        重建已损坏的进程池（需持有 self._lock）
+
+        同一进程池上的多个任务都会以 BrokenProcessPool 结束，只有当前进程池
+        仍是损坏的那个时才重建；旧进程池不等待直接关闭（在其回调线程中调用）。
+        """
+        if self._executor is not broken:
+            return
+        self._executor = self._create_executor()
+        broken.shutdown(wait=False)
+
+    def warm(self):
+        """启动全部工作进程并等待预热完成"""
+        futures = [self._executor.submit(os.getpid) for _ in range(self.workers)]
+        for future in futures:
+            future.result()
+
+    def submit(self, options: dict) -> dict:
+        """提交导出任务，返回任务记录"""
+        with self._lock:
+            job_id = str(next(self._ids))
+            job = {
+                'id': job_id,
+                'project': options['project'],
+                'status': 'queued',
+                'submitted_at': time.time(),
+                'finished_at': None,
+                'result': None,
+                'error': None,
+            }
+            self._jobs[job_id] = job
+            self._done_events[job_id] = threading.Event()
+            executor = self._executor
+            try:
+                future = executor.submit(run_export_job, options)
+            except BrokenProcessPool:
+                self._replace_broken_executor(executor)
+                executor = self._executor
+                future = executor.submit(run_export_job, options)
+            self._futures[job_id] = future
+        future.add_done_callback(lambda f: self._finish(job_id, f, executor))
+        return self.get(job_id)
+
+    def _finish(self, job_id: str, future: Future, executor: ProcessPoolExecutor):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            self._futures.pop(job_id, None)
+            done_event = self._done_events.pop(job_id)
+            job['finished_at'] = time.time()
+            error = future.exception()
+            if error is None:
+                job['result'] = future.result()
+                job['status'] = 'done' if not job['result']['failed'] else 'failed'
+                if job['result']['failed']:
+                    job['error'] = f"{len(job['result']['failed'])} 页导出失败"
+            else:
+                job['status'] = 'failed'
+                job['error'] = str(error) or error.__class__.__name__
+                if isinstance(error, BrokenProcessPool):
+                    # 工作进程异常退出（如内存不足被终止），重建进程池供后续任务使用
+                    self._replace_broken_executor(executor)
+            self._trim()
+        done_event.set()
+
+    def _trim(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job['finished_at'] is not None]
+        for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[dict]:
+        """获取任务记录（副本）"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            job = dict(job)
+            future = self._futures.get(job_id)
+            if future is not None and future.running():
+                job['status'] = 'running'
+            return job
+
+    def wait(self, job_id: str) -> Optional[dict]:
+        """等待任务完成并返回任务记录"""
+        with self._lock:
+            done_event = self._done_events.get(job_id)
+        if done_event is not None:
+            done_event.wait()
+        return self.get(job_id)
+
+    def status(self) -> dict:
+        with self._lock:
+            statuses = [job['status'] for job in self._jobs.values()]
+            active = len(self._futures)
+        from svg_to_pptx import get_png_renderer_info
+        renderer_name, renderer_status, _ = get_png_renderer_info()
+        return {
+            'pid': os.getpid(),
+            'uptime': round(time.time() - self.started_at, 1),
+            'workers': self.workers,
+            'renderer': f"{renderer_name} {renderer_status}" if renderer_name else None,
+            'active_jobs': active,
+            'done_jobs': statuses.count('done'),
+            'failed_jobs': statuses.count('failed'),
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+
+class ExportRequestHandler(BaseHTTPRequestHandler):
+    """HTTP 接口（见模块文档）"""
+
+    server_version = 'PPTMasterExportDaemon/1.0'
+
+    @property
+    def service(self) -> ExportService:
+        return self.server.service
+
+    def _check_access(self, post: bool = False) -> bool:
+        """
+        校验请求来源，不通过时直接返回错误响应
+
+        - Host 必须为本机地址（监听本机地址时；防止 DNS 重绑定）
+        - 带 Origin 的请求（浏览器发起）只接受本机页面
+        - POST 的 Content-Type 必须为 application/json（浏览器跨站提交需先经过 CORS 预检）
+        - 必须携带正确的服务令牌
+        """
+        if self.server.check_host:
+            if split_host(self.headers.get('Host', '')) not in LOOPBACK_HOSTS:
+                self._send_json(403, {'error': 'Host 不是本机地址'})
+                return False
+            origin = self.headers.get('Origin')
+            if origin is not None and urlsplit(origin).hostname not in LOOPBACK_HOSTS:
+                self._send_json(403, {'error': f'不接受跨站请求: {origin}'})
+                return False
+        if post:
+            content_type = self.headers.get('Content-Type', '').split(';')[0].strip().lower()
+            if content_type != 'application/json':
+                self._send_json(415, {'error': 'Content-Type 必须为 application/json'})
+                return False
+        if not hmac.compare_digest(self.headers.get(TOKEN_HEADER, '').encode('utf-8'),
+                                   self.server.token.encode('utf-8')):
+            self._send_json(401, {'error': f'缺少或错误的服务令牌（请求头 {TOKEN_HEADER}）'})
+            return False
+        return True
+
+    def do_GET(self):
+        if not self._check_access():
+            return
+        if self.path == '/health':
+            self._send_json(200, self.service.status())
+        elif self.path.startswith('/jobs/'):
+            job = self.service.get(self.path[len('/jobs/'):])
+            if job is None:
+                self._send_json(404, {'error': '任务不存在'})
+            else:
+                self._send_json(200, job)
+        else:
+            self._send_json(404, {'error': f'未知路径: {self.path}'})
+
+    def do_POST(self):
+        if not self._check_access(post=True):
+            return
+        if self.path == '/export':
+            try:
+                payload = self._read_json()
+                options = parse_export_request(payload)
+            except ValueError as e:
+                self._send_json(400, {'error': str(e)})
+                return
+            job = self.service.submit(options)
+            if payload.get('wait', True):
+                self._send_json(200, self.service.wait(job['id']))
+            else:
+                self._send_json(202, job)
+        elif self.path == '/shutdown':
+            self._send_json(200, {'status': 'stopping'})
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+        else:
+            self._send_json(404, {'error': f'未知路径: {self.path}'})
+
+    def _read_json(self) -> dict:
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            return json.loads(self.rfile.read(length).decode('utf-8') or '{}')
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise ValueError(f"请求体不是合法的 JSON: {e}")
+
+    def _send_json(self, status: int, data: dict):
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            sys.stderr.write(f"  [{time.strftime('%H:%M:%S')}] {format % args}\n")
+
+
+def serve(host: str, port: int, workers: int, quiet: bool = False, token_path: Optional[Path] = None):
+    """启动导出服务（阻塞直至收到 /shutdown 或 Ctrl+C；令牌文件在停止时删除）"""
+    service = ExportService(workers)
+    print("PPT Master - PPTX 导出守护进程")
+    print("=" * 50)
+    start = time.perf_counter()
+    service.warm()
+    renderer = service.status()['renderer'] or '未安装（仅纯 SVG 模式）'
+    print(f"  工作进程: {workers}（预热完成，{time.perf_counter() - start:.2f} s）")
+    print(f"  PNG 渲染: {renderer}")
+
+    server = ThreadingHTTPServer((host, port), ExportRequestHandler)
+    server.daemon_threads = True
+    server.service = service
+    server.quiet = quiet
+    server.check_host = host in LOOPBACK_HOSTS
+    token_path = token_path or get_token_path(port)
+    server.token = write_token(token_path)
+    if not server.check_host:
+        print(f"  警告: 监听 {host}，持有令牌的其他机器也可以提交导出任务")
+    print(f"  监听地址: http://{host}:{port}")
+    print(f"  令牌文件: {token_path}")
+    print()
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        try:
+            token_path.unlink()
+        except OSError:
+            pass
+        server.server_close()
+        service.shutdown()
+        print("[OK] 导出服务已停止")
+
+
+# ============================================================
+# 客户端
+# ============================================================
+
+def call_daemon(host: str, port: int, path: str, payload: Optional[dict] = None,
+                timeout: Optional[float] = None, token_path: Optional[Path] = None) -> dict:
+    """
+    调用导出服务接口（令牌从 token_path 读取，默认见 get_token_path）
+
+    Raises:
+        ConnectionError: 无法连接导出服务或未找到令牌文件
+    """
+    url = f'http://{host}:{port}{path}'
+    token = read_token(token_path or get_token_path(port))
+    data = json.dumps(payload).encode('utf-8') if payload is not None else None
+    request = urllib.request.Request(url, data=data, method='POST' if data is not None else 'GET',
+                                     headers={'Content-Type': 'application/json', TOKEN_HEADER: token})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return json.loads(response.read().decode('utf-8'))
+    except urllib.error.HTTPError as e:
+        return json.loads(e.read().decode('utf-8') or '{}')
+    except (urllib.error.URLError, ConnectionError) as e:
+        raise ConnectionError(f"无法连接导出服务 {url} ({getattr(e, 'reason', e)})")
+
+
+def print_job(job: dict):
+    """输出任务结果（格式与 svg_to_pptx.py 的结束信息一致）"""
+    result = job.get('result')
+    if result is None:
+        print(f"错误: {job.get('error')}")
+        return
+    total_time = (job['finished_at'] or time.time()) - job['submitted_at']
+    print(f"[完成] 已保存: {result['output']}")
+    print(f"  成功: {result['success']}, 失败: {len(result['failed'])}")
+    for name in result['failed']:
+        print(f"    - {name}")
+    print(f"  耗时: {total_time:.2f} s（导出 {result['elapsed']:.2f} s，工作进程 {result['worker_pid']}）")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='PPT Master - PPTX 导出守护进程',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+示例:
+  %(prog)s serve --workers 4                     # 启动服务（默认 127.0.0.1:8765）
+  %(prog)s export examples/ppt169_demo -s final  # 通过服务导出
+  %(prog)s export examples/ppt169_demo -s final --native -o examples/ppt169_demo/out.pptx
+  %(prog)s status                                # 查看服务状态
+  %(prog)s stop                                  # 停止服务
+
+  curl -X POST http://127.0.0.1:8765/export -H "Content-Type: application/json" \\
+       -H "X-PPT-Master-Token: $(cat ~/.cache/ppt-master/export_daemon_8765.token)" \\
+       -d '{"project": "/path/to/project", "source": "final"}'
+        '''
+    )
+    parser.add_argument('--host', default=DEFAULT_HOST, help=f'监听/连接地址 (默认: {DEFAULT_HOST})')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f'端口 (默认: {DEFAULT_PORT})')
+    parser.add_argument('--token-file', type=Path, default=None,
+                        help='服务令牌文件 (默认: ~/.cache/ppt-master/export_daemon_<端口>.token)')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = subparsers.add_parser('serve', help='启动导出服务')
+    serve_parser.add_argument('-w', '--workers', type=int, default=0,
+                              help='并发导出的工作进程数 (默认: 0，使用全部 CPU 核心)')
+    serve_parser.add_argument('-q', '--quiet', action='store_true', help='不输出请求日志')
+
+    export_parser = subparsers.add_parser('export', help='通过服务导出项目')
+    export_parser.add_argument('project_path', help='项目目录路径')
+    export_parser.add_argument('-o', '--output', default=None, help='输出文件路径（.pptx，须位于项目目录内）')
+    export_parser.add_argument('-s', '--source', default='output', help='SVG 来源: output/final 或任意子目录名')
+    export_parser.add_argument('-f', '--format', default=None, help='指定画布格式（如 ppt169）')
+    export_parser.add_argument('--native', action='store_true', help='转换为 PowerPoint 原生形状')
+    export_parser.add_argument('--no-compat', action='store_true', help='禁用 Office 兼容模式')
+    export_parser.add_argument('--no-notes', action='store_true', help='禁用演讲备注嵌入')
+    export_parser.add_argument('--no-cache', action='store_true', help='不使用 PNG 渲染缓存')
+    export_parser.add_argument('-t', '--transition', default=None, help='页面切换效果')
+    export_parser.add_argument('--no-wait', action='store_true', help='提交后立即返回任务 ID')
+
+    subparsers.add_parser('status', help='查看服务状态')
+    subparsers.add_parser('stop', help='停止服务')
+
+    args = parser.parse_args()
+
+    if args.command == 'serve':
+        workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+        serve(args.host, args.port, workers, quiet=args.quiet, token_path=args.token_file)
+        return
+
+    try:
+        if args.command == 'export':
+            payload = {
+                'project': str(Path(args.project_path).resolve()),
+                'source': args.source,
+                'output': str(Path(args.output).resolve()) if args.output else None,
+                'format': args.format,
+                'native': args.native,
+                'compat': not args.no_compat,
+                'notes': not args.no_notes,
+                'cache': not args.no_cache,
+                'transition': args.transition,
+                'wait': not args.no_wait,
+            }
+            job = call_daemon(args.host, args.port, '/export', payload, token_path=args.token_file)
+            if 'id' not in job:
+                print(f"错误: {job.get('error')}")
+                sys.exit(1)
+            if args.no_wait:
+                print(f"[OK] 已提交任务 {job['id']}（查询: GET /jobs/{job['id']}）")
+                sys.exit(0)
+            print_job(job)
+            sys.exit(0 if job['status'] == 'done' else 1)
+
+        elif args.command == 'status':
+            status = call_daemon(args.host, args.port, '/health', timeout=5, token_path=args.token_file)
+            print(f"导出服务: http://{args.host}:{args.port} (PID {status['pid']}，已运行 {status['uptime']:.0f} s)")
+            print(f"  工作进程: {status['workers']}")
+            print(f"  PNG 渲染: {status['renderer'] or '未安装'}")
+            print(f"  任务: 进行中 {status['active_jobs']}, 完成 {status['done_jobs']}, 失败 {status['failed_jobs']}")
+
+        elif args.command == 'stop':
+            call_daemon(args.host, args.port, '/shutdown', {}, timeout=5, token_path=args.token_file)
+            print("[OK] 已通知导出服务停止")
+
+    except ConnectionError as e:
+        print(f"错误: {e}")
+        print(f"  请先启动服务: python3 {Path(__file__).name} serve")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
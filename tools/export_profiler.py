@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+PPT Master - 导出性能分析模块
+
+为 svg_to_pptx.py 的 --profile 选项记录每个阶段、每页幻灯片的
+墙钟时间、CPU 时间与写入字节数，输出汇总表，并可导出为 JSON 或
+Chrome Trace（chrome://tracing / Perfetto 可直接打开）。
+
+阶段:
+    detect    画布格式检测（整份演示文稿一次）
+    read      读取 SVG
+    cache     计算缓存键并查询 PNG 渲染缓存 / 增量构建基准
+    render    PNG 后备图片渲染（并行时在子进程中计时）
+    native    转换为原生形状（--native）
+    notes     备注 Markdown 转换与备注页 XML 生成
+    xml       幻灯片 XML 与关系文件生成
+    zip       媒体与幻灯片写入压缩包（写入字节为压缩后大小）
+    skeleton  生成骨架演示文稿（python-pptx）
+    finalize  写入 presentation.xml、内容类型与骨架部件并关闭压缩包
+
+用法（库接口）:
+    profiler = ExportProfiler()
+    build_pptx(slides, output, profiler=profiler)
+    print(profiler.format_report())
+    profiler.write_json('profile.json')
+    profiler.write_chrome_trace('profile.trace.json')
+"""
+
+import os
+import json
+import time
+import unicodedata
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, List, Dict, Union
+
+
+# 汇总表中的阶段顺序（未列出的阶段排在最后）
+STAGE_ORDER = ['detect', 'skeleton', 'read', 'cache', 'render', 'native', 'notes', 'xml', 'zip', 'thumbnail', 'finalize']
+
+
+@dataclass
+class StageRecord:
+    """一次阶段计时"""
+    stage: str
+    slide: Optional[str]
+    start: float
+    wall: float
+    cpu: float
+    bytes: int = 0
+    pid: int = 0
+
+
+class StageTimer:
+    """阶段计时上下文（with 块内可设置 bytes 记录写入字节数）"""
+
+    def __init__(self, profiler: 'ExportProfiler', stage: str, slide: Optional[str]):
+        self._profiler = profiler
+        self._stage = stage
+        self._slide = slide
+        self.bytes = 0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        self._cpu_start = time.process_time()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._profiler.add(
+            self._stage, self._slide,
+            wall=time.perf_counter() - self._start,
+            cpu=time.process_time() - self._cpu_start,
+            bytes_written=self.bytes,
+            start=self._start
+        )
+        return False
+
+
+class _NullTimer:
+    """未启用性能分析时使用的空计时上下文"""
+    bytes = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+class NullProfiler:
+    """不记录任何内容的性能分析器（未启用 --profile 时使用）"""
+
+    def stage(self, stage: str, slide: Optional[str] = None) -> _NullTimer:
+        return _NullTimer()
+
+    def add(self, *args, **kwargs):
+        pass
+
+
+class ExportProfiler:
+    """导出性能分析器：按阶段与页面累计墙钟时间、CPU 时间与写入字节数"""
+
+    def __init__(self):
+        self.records: List[StageRecord] = []
+        self._origin = time.perf_counter()
+        self._cpu_origin = time.process_time()
+        self._end: Optional[float] = None
+        self._cpu_end: Optional[float] = None
+
+    def stage(self, stage: str, slide: Optional[str] = None) -> StageTimer:
+        """
+        计时一个阶段
+
+        示例:
+            with profiler.stage('zip', slide.name) as timer:
+                timer.bytes = writer.write(...)
+        """
+        return StageTimer(self, stage, slide)
+
+    def add(
+        self,
+        stage: str,
+        slide: Optional[str],
+        wall: float,
+        cpu: float,
+        bytes_written: int = 0,
+        start: Optional[float] = None,
+        pid: Optional[int] = None
+    ):
+        """
+        添加一条在其他位置测得的计时（如渲染子进程返回的计时）
+
+        Args:
+            start: time.perf_counter() 起点（缺省时按结束于当前时刻推算）
+            pid: 执行该阶段的进程 ID（缺省为本进程）
+        """
+        if start is None:
+            start = time.perf_counter() - wall
+        self.records.append(StageRecord(
+            stage, slide, start, wall, cpu, bytes_written,
+            pid if pid is not None else os.getpid()
+        ))
+
+    def finish(self):
+        """记录导出结束时刻（报告中的总耗时以此为准，未调用时取生成报告的时刻）"""
+        self._end = time.perf_counter()
+        self._cpu_end = time.process_time()
+
+    @property
+    def elapsed(self) -> float:
+        return (self._end if self._end is not None else time.perf_counter()) - self._origin
+
+    @property
+    def cpu_elapsed(self) -> float:
+        """本进程 CPU 时间（不含渲染子进程）"""
+        return (self._cpu_end if self._cpu_end is not None else time.process_time()) - self._cpu_origin
+
+    def stage_totals(self) -> Dict[str, dict]:
+        """按阶段汇总 {阶段: {count, wall, cpu, bytes}}，按 STAGE_ORDER 排序"""
+        totals: Dict[str, dict] = {}
+        for record in self.records:
+            total = totals.setdefault(record.stage, {'count': 0, 'wall': 0.0, 'cpu': 0.0, 'bytes': 0})
+            total['count'] += 1
+            total['wall'] += record.wall
+            total['cpu'] += record.cpu
+            total['bytes'] += record.bytes
+        order = {stage: i for i, stage in enumerate(STAGE_ORDER)}
+        return dict(sorted(totals.items(), key=lambda item: order.get(item[0], len(order))))
+
+    def slide_totals(self) -> List[dict]:
+        """按页面汇总（保持页面首次出现的顺序）"""
+        slides: Dict[str, dict] = {}
+        for record in self.records:
+            if record.slide is None:
+                continue
+            slide = slides.setdefault(record.slide, {
+                'name': record.slide, 'wall': 0.0, 'cpu': 0.0, 'bytes': 0, 'stages': {}
+            })
+            slide['wall'] += record.wall
+            slide['cpu'] += record.cpu
+            slide['bytes'] += record.bytes
+            stage = slide['stages'].setdefault(record.stage, {'wall': 0.0, 'cpu': 0.0, 'bytes': 0})
+            stage['wall'] += record.wall
+            stage['cpu'] += record.cpu
+            stage['bytes'] += record.bytes
+        return list(slides.values())
+
+    def format_report(self, top: int = 5) -> str:
+        """生成文本汇总表：各阶段合计与最慢的页面"""
+        stages = self.stage_totals()
+        elapsed = self.elapsed
+        total_bytes = sum(total['bytes'] for total in stages.values())
+
+        lines = [f"性能分析: 总耗时 {format_ms(elapsed)}, 本进程 CPU {format_ms(self.cpu_elapsed)}, "
+                 f"写入 {format_bytes(total_bytes)}"]
+        rows = [
+            [stage, str(total['count']), format_ms(total['wall']),
+             f"{total['wall'] / elapsed * 100:.1f}%" if elapsed > 0 else '-',
+             format_ms(total['cpu']), format_bytes(total['bytes']) if total['bytes'] else '-']
+            for stage, total in stages.items()
+        ]
+        lines += format_table(['阶段', '次数', '墙钟时间', '占比', 'CPU 时间', '写入'], rows)
+        if 'render' in stages and any(r.pid != os.getpid() for r in self.records if r.stage == 'render'):
+            lines.append("  注: 并行渲染在子进程中计时，render 为各进程累计时间，占比可能超过 100%")
+
+        slides = sorted(self.slide_totals(), key=lambda s: s['wall'], reverse=True)[:top]
+        if slides:
+            lines.append('')
+            lines.append(f"最慢的页面 (前 {len(slides)}):")
+            rows = []
+            for slide in slides:
+                main_stage = max(slide['stages'].items(), key=lambda item: item[1]['wall'])
+                rows.append([slide['name'], format_ms(slide['wall']), format_ms(slide['cpu']),
+                             f"{main_stage[0]} {format_ms(main_stage[1]['wall'])}",
+                             format_bytes(slide['bytes'])])
+            lines += format_table(['页面', '墙钟时间', 'CPU 时间', '主要阶段', '写入'], rows)
+        return '\n'.join(lines)
+
+    def to_dict(self) -> dict:
+        """导出为 JSON 可序列化的字典（时间单位：秒）"""
+        return {
+            'elapsed': round(self.elapsed, 6),
+            'cpu': round(self.cpu_elapsed, 6),
+            'bytes_written': sum(record.bytes for record in self.records),
+            'stages': {
+                stage: {**total, 'wall': round(total['wall'], 6), 'cpu': round(total['cpu'], 6)}
+                for stage, total in self.stage_totals().items()
+            },
+            'slides': [
+                {
+                    'name': slide['name'],
+                    'wall': round(slide['wall'], 6),
+                    'cpu': round(slide['cpu'], 6),
+                    'bytes': slide['bytes'],
+                    'stages': {
+                        stage: {key: round(value, 6) if isinstance(value, float) else value
+                                for key, value in total.items()}
+                        for stage, total in slide['stages'].items()
+                    },
+                }
+                for slide in self.slide_totals()
+            ],
+        }
+
+    def to_chrome_trace(self) -> dict:
+        """导出为 Chrome Trace Event 格式（每条记录为一个完整事件，按进程分行）"""
+        events = []
+        for pid in sorted({record.pid for record in self.records}):
+            label = '导出主进程' if pid == os.getpid() else f'渲染进程 {pid}'
+            events.append({'name': 'process_name', 'ph': 'M', 'pid': pid, 'tid': 0, 'args': {'name': label}})
+        for record in self.records:
+            args = {'cpu_ms': round(record.cpu * 1000, 3)}
+            if record.slide is not None:
+                args['slide'] = record.slide
+            if record.bytes:
+                args['bytes'] = record.bytes
+            events.append({
+                'name': record.stage if record.slide is None else f'{record.stage} {record.slide}',
+                'cat': record.stage,
+                'ph': 'X',
+                'ts': round((record.start - self._origin) * 1e6, 1),
+                'dur': round(record.wall * 1e6, 1),
+                'pid': record.pid,
+                'tid': 0,
+                'args': args,
+            })
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def write_json(self, path: Union[str, Path]):
+        Path(path).write_text(json.dumps(self.to_dict(), ensure_ascii=False, indent=2), encoding='utf-8')
+
+    def write_chrome_trace(self, path: Union[str, Path]):
+        Path(path).write_text(json.dumps(self.to_chrome_trace(), ensure_ascii=False), encoding='utf-8')
+
+
+def format_ms(seconds: float) -> str:
+    """将秒数格式化为毫秒/秒"""
+    if seconds < 1:
+        return f"{seconds * 1000:.1f} ms"
+    return f"{seconds:.2f} s"
+
+
+def format_bytes(size_bytes: int) -> str:
+    """将字节数转换为可读的大小"""
+    if size_bytes < 1024:
+        return f"{size_bytes} B"
+    elif size_bytes < 1024 * 1024:
+        return f"{size_bytes / 1024:.1f} KB"
+    return f"{size_bytes / (1024 * 1024):.2f} MB"
+
+
+def display_width(text: str) -> int:
+    """终端显示宽度（中文等全角字符占两列）"""
+    return sum(2 if unicodedata.east_asian_width(ch) in ('W', 'F') else 1 for ch in text)
+
+
+def format_table(headers: List[str], rows: List[List[str]]) -> List[str]:
+    """生成对齐的文本表格行"""
+    def pad(text: str, width: int) -> str:
+        return text + ' ' * (width - display_width(text))
+
+    widths = [max(display_width(str(row[i])) for row in [headers] + rows) for i in range(len(headers))]
+    lines = ['  ' + '  '.join(pad(str(h), w) for h, w in zip(headers, widths)).rstrip()]
+    lines.append('  ' + '  '.join('-' * w for w in widths))
+    for row in rows:
+        lines.append('  ' + '  '.join(pad(str(c), w) for c, w in zip(row, widths)).rstrip())
+    return lines
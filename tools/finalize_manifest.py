@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+PPT Master - 后处理增量清单
+
+记录 svg_final/ 中每页的处理依据，重新运行 finalize_svg.py 时只处理过期的页面：
+
+    - 源 SVG（svg_output/ 中的文件）内容哈希
+    - 引用的图标（data-icon）与外部图片（href）的内容哈希
+    - 处理选项（启用的步骤与图标库目录）
+    - 输出文件的大小与修改时间（svg_final/ 中的文件被删除或改动时重新处理）
+
+各页的处理数量一并记录，复用的页面计入汇总，输出与全部重新处理相同。
+依赖文件的哈希按 (大小, 修改时间) 缓存在清单中，文件未变化时不重新读取。
+
+清单保存在 svg_final/.finalize_manifest.json（以 . 开头，不会被 *.svg 匹配）。
+
+用法（库接口）:
+    plan = plan_finalize(project_dir, options, icons_dir)
+    ...处理 plan.stale 中的页面，填入 plan.entries[name]['counts']...
+    save_manifest(plan)
+"""
+
+import json
+import html
+import hashlib
+import os
+import re
+import shutil
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import unquote
+
+from render_cache import EXTERNAL_HREF_PATTERN
+
+
+MANIFEST_NAME = '.finalize_manifest.json'
+
+# 清单格式版本（记录内容变化时递增）
+MANIFEST_VERSION = 1
+
+# 图标占位符 <use data-icon="..."/>
+ICON_REF_PATTERN = re.compile(r'data-icon="([^"]+)"')
+
+
+def hash_bytes(data: bytes) -> str:
+    """计算内容的 SHA-256 哈希"""
+    return hashlib.sha256(data).hexdigest()
+
+
+class FileHasher:
+    """按 (大小, 修改时间) 缓存文件内容哈希，文件未变化时不重新读取"""
+
+    def __init__(self, cache: Optional[dict] = None):
+        self.cache: Dict[str, list] = dict(cache or {})
+        self.used: Dict[str, list] = {}
+
+    def hash(self, path: Path) -> Optional[str]:
+        """文件内容哈希，文件不存在时返回 None"""
+        key = str(path)
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        cached = self.cache.get(key)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            entry = cached
+        else:
+            try:
+                entry = [stat.st_size, stat.st_mtime_ns, hash_bytes(path.read_bytes())]
+            except OSError:
+                return None
+            self.cache[key] = entry
+        self.used[key] = entry
+        return entry[2]
+
+
+def collect_dependencies(svg_data: bytes, svg_dir: Path, options: dict, icons_dir: Path) -> Dict[str, Path]:
+    """
+    源 SVG 引用的依赖文件
+
+    Returns:
+        {依赖标识: 文件路径}，标识如 'icon:rocket'、'href:../images/a.png'
+    """
+    text = svg_data.decode('utf-8', errors='ignore')
+    deps = {}
+    if options.get('embed_icons'):
+        for name in sorted(set(ICON_REF_PATTERN.findall(text))):
+            deps[f'icon:{name}'] = icons_dir / f'{name}.svg'
+    for href in sorted(set(EXTERNAL_HREF_PATTERN.findall(text))):
+        path = Path(unquote(html.unescape(href)))
+        deps[f'href:{href}'] = path if path.is_absolute() else svg_dir / path
+    return deps
+
+
+def output_stat(path: Path) -> Optional[list]:
+    """输出文件的 [大小, 修改时间]，不存在时返回 None"""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def manifest_settings(options: dict, icons_dir: Path) -> dict:
+    """影响处理结果的选项（变化时全部重新处理）"""
+    return {
+        'steps': sorted(key for key, enabled in options.items() if enabled),
+        'icons_dir': str(Path(icons_dir).resolve()),
+    }
+
+
+def load_manifest(svg_final: Path) -> Optional[dict]:
+    """读取清单，不存在或格式不符时返回 None"""
+    try:
+        manifest = json.loads((svg_final / MANIFEST_NAME).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(manifest, dict) or manifest.get('version') != MANIFEST_VERSION:
+        return None
+    return manifest
+
+
+@dataclass
+class FinalizePlan:
+    """一次后处理的增量计划（plan_finalize 已将过期页面的源文件复制到 svg_final/）"""
+    svg_final: Path
+    settings: dict
+    entries: Dict[str, dict]
+    stale: List[str] = field(default_factory=list)
+    reused: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    full: bool = False
+    hasher: FileHasher = field(default_factory=FileHasher)
+
+    @property
+    def stale_files(self) -> List[Path]:
+        """需要处理的 svg_final/ 文件"""
+        return [self.svg_final / name for name in self.stale]
+
+    def totals(self) -> dict:
+        """全部页面（含复用页面）的各步骤数量合计"""
+        totals: Dict[str, int] = {}
+        for entry in self.entries.values():
+            for key, count in entry.get('counts', {}).items():
+                totals[key] = totals.get(key, 0) + count
+        return totals
+
+
+def plan_finalize(project_dir: Path, options: dict, icons_dir: Path, full: bool = False) -> FinalizePlan:
+    """
+    对比清单确定需要处理的页面，并同步 svg_final/
+
+    过期页面的源文件复制到 svg_final/（等待处理）；源文件已删除的页面从
+    svg_final/ 删除。没有可用清单、处理选项变化或 full=True 时，按原方式
+    重建 svg_final/（删除后复制 svg_output/），全部页面重新处理。
+
+    Args:
+        project_dir: 项目目录
+        options: 处理选项字典（键见 finalize_svg.FINALIZE_STEPS）
+        icons_dir: 图标库目录
+        full: 忽略清单，全部重新处理
+    """
+    svg_output = project_dir / 'svg_output'
+    svg_final = project_dir / 'svg_final'
+    settings = manifest_settings(options, icons_dir)
+
+    manifest = load_manifest(svg_final)
+    hasher = FileHasher(manifest.get('hashes') if manifest else None)
+    full = full or manifest is None or manifest.get('settings') != settings
+    previous = {} if full else manifest.get('slides', {})
+
+    if full:
+        if svg_final.exists():
+            shutil.rmtree(svg_final)
+        shutil.copytree(svg_output, svg_final)
+
+    plan = FinalizePlan(svg_final, settings, {}, full=full, hasher=hasher)
+    for source in sorted(svg_output.glob('*.svg')):
+        data = source.read_bytes()
+        deps = collect_dependencies(data, svg_output, options, icons_dir)
+        entry = {
+            'source': hash_bytes(data),
+            'deps': {key: hasher.hash(path) for key, path in deps.items()},
+        }
+        output = svg_final / source.name
+        old = previous.get(source.name)
+        if (old and old.get('source') == entry['source'] and old.get('deps') == entry['deps']
+                and old.get('output') is not None and old.get('output') == output_stat(output)):
+            entry['counts'] = old.get('counts', {})
+            entry['output'] = old['output']
+            plan.reused.append(source.name)
+        else:
+            if not full:
+                output.write_bytes(data)
+            plan.stale.append(source.name)
+        plan.entries[source.name] = entry
+
+    for output in sorted(svg_final.glob('*.svg')):
+        if output.name not in plan.entries:
+            output.unlink()
+            plan.removed.append(output.name)
+
+    return plan
+
+
+def save_manifest(plan: FinalizePlan):
+    """处理完成后写入清单（需已填入过期页面的 counts）"""
+    for name in plan.stale:
+        plan.entries[name]['output'] = output_stat(plan.svg_final / name)
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'settings': plan.settings,
+        'slides': plan.entries,
+        'hashes': plan.hasher.used,
+    }
+    path = plan.svg_final / MANIFEST_NAME
+    temp_path = path.with_name(path.name + '.tmp')
+    temp_path.write_text(json.dumps(manifest, ensure_ascii=False, indent=1), encoding='utf-8')
+    os.replace(temp_path, path)
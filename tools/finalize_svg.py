@@ -11,6 +11,12 @@ PPT Master - SVG 后处理工具（统一入口）
     
     # 只执行部分处理
     python3 tools/finalize_svg.py <项目目录> --only embed-icons fix-rounded
+    
+    # 多进程并行处理（0 表示使用全部 CPU 核心）
+    python3 tools/finalize_svg.py <项目目录> --jobs 4
+    
+    # 忽略增量清单，全部重新处理
+    python3 tools/finalize_svg.py <项目目录> --full
 
 示例：
     python3 tools/finalize_svg.py projects/my_project
@@ -23,20 +29,43 @@ PPT Master - SVG 后处理工具（统一入口）
     embed-images  - 将外部图片转换为 Base64 嵌入
     flatten-text  - 将 <tspan> 转为独立 <text>（用于特殊渲染器）
     fix-rounded   - 将 <rect rx="..."/> 转为 <path>（用于 PPT 转形状）
+
+每个 SVG 只读取、解析一次，全部启用的处理在同一棵文档树上完成，最后只序列化、
+写入一次（无法解析为 XML 的文件回退为逐步骤读写文件的旧流程）。
+
+重复运行时按 svg_final/ 中的清单增量处理：只处理源文件、引用的图标/图片或
+处理选项有变化的页面，并删除源文件已不存在的页面（见 finalize_manifest.py）。
 """
 
+import io
 import os
+import re
 import sys
 import shutil
 import argparse
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
+from typing import Dict, List, Optional
+from xml.etree import ElementTree as ET
 
 # 导入同目录的工具模块
 sys.path.insert(0, str(Path(__file__).parent))
-from embed_icons import process_svg_file as embed_icons_in_file
-from embed_images import embed_images_in_svg
-from fix_image_aspect import fix_image_aspect_in_svg
-from crop_images import process_svg_images as crop_images_in_svg
+from embed_icons import process_svg_file as embed_icons_in_file, embed_icons_in_tree
+from embed_images import embed_images_in_svg, embed_images_in_tree
+from fix_image_aspect import fix_image_aspect_in_svg, fix_image_aspect_in_tree
+from crop_images import process_svg_images as crop_images_in_svg, crop_images_in_tree
+from flatten_tspan import flatten_text_with_tspans
+from svg_rect_to_path import convert_rounded_rects
+from finalize_manifest import FinalizePlan, plan_finalize, save_manifest
+
+
+SVG_NS = 'http://www.w3.org/2000/svg'
+XLINK_NS = 'http://www.w3.org/1999/xlink'
+
+# 原文件的 XML 声明（序列化时保留）
+XML_DECLARATION_PATTERN = re.compile(rb'\s*(<\?xml[^?]*\?>)')
 
 
 def safe_print(text):
@@ -91,19 +120,317 @@ def process_rounded_rect(svg_file: Path, verbose: bool = False) -> int:
         return 0
 
 
-def finalize_project(project_dir: Path, options: dict, dry_run: bool = False, quiet: bool = False):
+# 图标库目录
+ICONS_DIR = Path(__file__).parent.parent / 'templates' / 'icons'
+
+# 处理步骤（按执行顺序）：(选项名, 步骤名称, 有结果时的说明, 无结果时的说明)
+FINALIZE_STEPS = [
+    ('embed_icons', '嵌入图标', '{} 个图标已嵌入', '无图标'),
+    ('crop_images', '智能裁剪图片', '{} 张图片已裁剪', '无需裁剪（无 slice 属性的图片）'),
+    ('fix_aspect', '修复图片宽高比', '{} 张图片已修复', '无图片'),
+    ('embed_images', '嵌入图片', '{} 张图片已嵌入', '无图片'),
+    ('flatten_text', '文本扁平化', '{} 个文件已处理', '无需处理'),
+    ('fix_rounded', '圆角转 Path', '{} 个圆角矩形已转换', '无圆角矩形'),
+]
+
+
+@contextlib.contextmanager
+def capture_step_output(step_output: Optional[Dict[str, str]], key: str):
+    """step_output 不为 None 时，将该步骤的输出（警告与处理明细）收集到 step_output[key]"""
+    if step_output is None:
+        yield
+        return
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        yield
+    if buffer.getvalue():
+        step_output[key] = step_output.get(key, '') + buffer.getvalue()
+
+
+def finalize_svg_document(root: ET.Element, svg_dir: Path, options: dict,
+                          icons_dir: Path = ICONS_DIR, svg_name: str = '', original_size: int = 0,
+                          step_output: Optional[Dict[str, str]] = None) -> dict:
+    """
+    在已解析的 SVG 文档树上依次执行启用的处理步骤（原地修改）
+    
+    Args:
+        root: SVG 根元素
+        svg_dir: SVG 文件所在目录（解析图片相对路径）
+        options: 处理选项字典（键见 FINALIZE_STEPS）
+        icons_dir: 图标库目录
+        svg_name: 文件名（用于提示信息）
+        original_size: 原文件大小（用于图片嵌入明细）
+        step_output: 不为 None 时按步骤收集输出 {选项名: 文本}，不直接打印
+    
+    Returns:
+        各步骤的处理数量 {选项名: 数量}
+    """
+    counts = {}
+    
+    # 嵌入图标
+    if options.get('embed_icons'):
+        with capture_step_output(step_output, 'embed_icons'):
+            counts['embed_icons'] = embed_icons_in_tree(root, icons_dir, svg_name)
+    
+    # 智能裁剪图片（根据 preserveAspectRatio="slice"）
+    if options.get('crop_images'):
+        with capture_step_output(step_output, 'crop_images'):
+            count, _ = crop_images_in_tree(root, svg_dir, dry_run=False, verbose=False)
+        counts['crop_images'] = count
+    
+    # 修复图片宽高比（防止 PPT 转形状时拉伸）
+    if options.get('fix_aspect'):
+        with capture_step_output(step_output, 'fix_aspect'):
+            counts['fix_aspect'] = fix_image_aspect_in_tree(root, str(svg_dir), dry_run=False, verbose=False)
+    
+    # 嵌入图片
+    if options.get('embed_images'):
+        with capture_step_output(step_output, 'embed_images'):
+            counts['embed_images'] = embed_images_in_tree(root, str(svg_dir), svg_name, original_size)
+    
+    # 文本扁平化
+    if options.get('flatten_text'):
+        try:
+            counts['flatten_text'] = 1 if flatten_text_with_tspans(ET.ElementTree(root)) else 0
+        except Exception:
+            counts['flatten_text'] = 0
+    
+    # 圆角转 Path
+    if options.get('fix_rounded'):
+        counts['fix_rounded'] = convert_rounded_rects(root)
+    
+    return counts
+
+
+def serialize_svg_document(root: ET.Element, original: bytes = b'') -> bytes:
+    """将文档树序列化为 UTF-8 字节（保留原文件的 XML 声明）"""
+    # 其他工具可能改写了全局前缀映射（如 fix_image_aspect 注册的 'svg' 前缀）
+    ET.register_namespace('', SVG_NS)
+    ET.register_namespace('xlink', XLINK_NS)
+    
+    data = ET.tostring(root, encoding='unicode').encode('utf-8')
+    match = XML_DECLARATION_PATTERN.match(original)
+    if match:
+        data = match.group(1) + b'\n' + data
+    return data
+
+
+def finalize_svg_file(svg_file: Path, options: dict, icons_dir: Path = ICONS_DIR,
+                      step_output: Optional[Dict[str, str]] = None) -> dict:
+    """
+    对单个 SVG 文件执行启用的处理步骤（原地修改）
+    
+    文件只读取、解析一次（保留 XML 注释），全部步骤在内存中的文档树上完成；
+    有改动时序列化并写回一次（写入临时文件后替换，并发读取方不会读到写了一半的
+    文件），无改动时不写文件。无法解析的文件回退到 finalize_svg_file_legacy。
+    
+    各步骤只读写当前文件（及其引用的图片），因此逐个文件执行全部步骤
+    与逐个步骤处理全部文件的结果相同，可供流水线逐页处理（见 build_project.py）。
+    
+    Args:
+        svg_file: svg_final/ 中的 SVG 文件
+        options: 处理选项字典（键见 FINALIZE_STEPS）
+        icons_dir: 图标库目录
+        step_output: 不为 None 时按步骤收集输出 {选项名: 文本}，不直接打印
+    
+    Returns:
+        各步骤的处理数量 {选项名: 数量}
+    """
+    original = svg_file.read_bytes()
+    try:
+        root = ET.fromstring(original, parser=ET.XMLParser(target=ET.TreeBuilder(insert_comments=True)))
+    except ET.ParseError:
+        return finalize_svg_file_legacy(svg_file, options, icons_dir, step_output)
+    
+    counts = finalize_svg_document(root, svg_file.parent, options, icons_dir, svg_file.name,
+                                   len(original), step_output)
+    if any(counts.values()):
+        temp_path = svg_file.with_name(f'{svg_file.name}.{os.getpid()}.tmp')
+        temp_path.write_bytes(serialize_svg_document(root, original))
+        os.replace(temp_path, svg_file)
+    return counts
+
+
+def finalize_svg_file_legacy(svg_file: Path, options: dict, icons_dir: Path = ICONS_DIR,
+                             step_output: Optional[Dict[str, str]] = None) -> dict:
+    """
+    逐步骤处理单个 SVG 文件（每个步骤各自读取、解析并写回文件）
+    
+    用于无法解析为 XML 的文件（图标/图片嵌入等文本替换步骤仍可生效），
+    也作为 benchmark.py finalize 的对照基线。
+    
+    Args:
+        svg_file: svg_final/ 中的 SVG 文件
+        options: 处理选项字典（键见 FINALIZE_STEPS）
+        icons_dir: 图标库目录
+        step_output: 不为 None 时按步骤收集输出 {选项名: 文本}，不直接打印
+    
+    Returns:
+        各步骤的处理数量 {选项名: 数量}
+    """
+    counts = {}
+    
+    # 嵌入图标
+    if options.get('embed_icons'):
+        with capture_step_output(step_output, 'embed_icons'):
+            counts['embed_icons'] = embed_icons_in_file(svg_file, icons_dir, dry_run=False, verbose=False)
+    
+    # 智能裁剪图片（根据 preserveAspectRatio="slice"）
+    if options.get('crop_images'):
+        with capture_step_output(step_output, 'crop_images'):
+            count, _ = crop_images_in_svg(str(svg_file), dry_run=False, verbose=False)
+        counts['crop_images'] = count
+    
+    # 修复图片宽高比（防止 PPT 转形状时拉伸）
+    if options.get('fix_aspect'):
+        with capture_step_output(step_output, 'fix_aspect'):
+            counts['fix_aspect'] = fix_image_aspect_in_svg(str(svg_file), dry_run=False, verbose=False)
+    
+    # 嵌入图片
+    if options.get('embed_images'):
+        with capture_step_output(step_output, 'embed_images'):
+            count, _ = embed_images_in_svg(str(svg_file), dry_run=False)
+        counts['embed_images'] = count
+    
+    # 文本扁平化
+    if options.get('flatten_text'):
+        counts['flatten_text'] = 1 if process_flatten_text(svg_file, verbose=False) else 0
+    
+    # 圆角转 Path
+    if options.get('fix_rounded'):
+        counts['fix_rounded'] = process_rounded_rect(svg_file, verbose=False)
+    
+    return counts
+
+
+def _finalize_task(task: tuple) -> tuple:
+    """进程池任务：处理单个文件，返回 (各步骤数量, 处理期间的输出, 按步骤收集的输出或 None)"""
+    svg_file, options, icons_dir, capture_steps = task
+    output = io.StringIO()
+    step_output = {} if capture_steps else None
+    with contextlib.redirect_stdout(output):
+        counts = finalize_svg_file(Path(svg_file), options, icons_dir, step_output)
+    return counts, output.getvalue(), step_output
+
+
+def finalize_files(svg_files: List[Path], options: dict, jobs: int = 1,
+                   icons_dir: Path = ICONS_DIR,
+                   step_outputs: Optional[List[Dict[str, str]]] = None) -> List[dict]:
+    """
+    对多个 SVG 文件执行启用的处理步骤，返回各文件的处理数量
+    
+    jobs > 1 时使用进程池逐文件并行处理；各文件处理期间的输出（如缺失图标的警告）
+    由子进程收集后按文件顺序打印，与串行处理的输出一致。
+    
+    Args:
+        svg_files: svg_final/ 中的 SVG 文件列表
+        options: 处理选项字典（键见 FINALIZE_STEPS）
+        jobs: 并行进程数（1 为串行，0 或负数表示使用全部 CPU 核心）
+        icons_dir: 图标库目录
+        step_outputs: 不为 None 时各步骤的输出不直接打印，按文件顺序追加
+            {选项名: 文本}（供调用方按步骤输出，见 finalize_project）
+    
+    Returns:
+        各文件的处理数量 [{选项名: 数量}]（顺序与 svg_files 一致）
+    """
+    results = []
+    capture_steps = step_outputs is not None
+    
+    if jobs <= 0:
+        jobs = os.cpu_count() or 1
+    jobs = min(jobs, len(svg_files))
+    
+    futures = []
+    pool = None
+    warned = False
+    try:
+        if jobs > 1:
+            tasks = [(str(svg_file), options, icons_dir, capture_steps) for svg_file in svg_files]
+            try:
+                pool = ProcessPoolExecutor(max_workers=jobs)
+                futures = [pool.submit(_finalize_task, task) for task in tasks]
+            except (BrokenProcessPool, OSError, NotImplementedError) as e:
+                # 进程池不可用（如受限环境），未提交的文件改为串行处理
+                safe_print(f"[WARN] 并行处理不可用，改为串行 ({e})")
+                warned = True
+        
+        # 按文件顺序取结果，输出顺序与串行处理相同。只有进程池本身的故障（子进程崩溃）
+        # 才在本进程重新处理对应文件；处理文件时的异常与串行处理一样直接抛出
+        for index, svg_file in enumerate(svg_files):
+            outcome = None
+            if index < len(futures):
+                try:
+                    outcome = futures[index].result()
+                except BrokenProcessPool as e:
+                    if not warned:
+                        safe_print(f"[WARN] 并行处理不可用，改为串行 ({e})")
+                        warned = True
+            if outcome is None:
+                step_output = {} if capture_steps else None
+                results.append(finalize_svg_file(svg_file, options, icons_dir, step_output))
+            else:
+                counts, output, step_output = outcome
+                if output:
+                    print(output, end='')
+                results.append(counts)
+            if capture_steps:
+                step_outputs.append(step_output)
+    finally:
+        if pool is not None:
+            # 异常中止时取消尚未开始的文件
+            for future in futures:
+                future.cancel()
+            pool.shutdown(wait=True)
+    
+    return results
+
+
+def prepare_svg_final(project_dir: Path) -> Path:
+    """重建 svg_final/：删除旧目录并复制 svg_output/，返回 svg_final 路径"""
+    svg_output = project_dir / 'svg_output'
+    svg_final = project_dir / 'svg_final'
+    if svg_final.exists():
+        shutil.rmtree(svg_final)
+    shutil.copytree(svg_output, svg_final)
+    return svg_final
+
+
+def run_finalize(project_dir: Path, options: dict, jobs: int = 1, full: bool = False,
+                 icons_dir: Path = ICONS_DIR,
+                 step_outputs: Optional[List[Dict[str, str]]] = None) -> FinalizePlan:
+    """
+    增量处理项目（不输出汇总，供 finalize_project 与 watch_project.py 使用）
+    
+    同步 svg_final/，处理有变化的页面并写入清单。step_outputs 同 finalize_files。
+    
+    Returns:
+        本次的增量计划（stale 为已处理的页面，totals() 为全部页面的数量合计）
+    """
+    plan = plan_finalize(project_dir, options, icons_dir, full=full)
+    results = finalize_files(plan.stale_files, options, jobs, icons_dir, step_outputs)
+    for name, counts in zip(plan.stale, results):
+        plan.entries[name]['counts'] = counts
+    save_manifest(plan)
+    return plan
+
+
+def finalize_project(project_dir: Path, options: dict, dry_run: bool = False, quiet: bool = False,
+                     jobs: int = 1, full: bool = False):
     """
     最终化处理项目中的 SVG 文件
     
+    默认按 svg_final/ 中的清单增量处理，只处理有变化的页面；
+    汇总数量包含复用的页面，与全部重新处理相同。
+    
     Args:
         project_dir: 项目目录路径
         options: 处理选项字典
         dry_run: 是否仅预览不执行
         quiet: 安静模式，减少输出
+        jobs: 并行进程数（默认 1 串行，0 表示使用全部 CPU 核心）
+        full: 忽略清单，删除 svg_final/ 后全部重新处理
     """
     svg_output = project_dir / 'svg_output'
-    svg_final = project_dir / 'svg_final'
-    icons_dir = Path(__file__).parent.parent / 'templates' / 'icons'
     
     # 检查 svg_output 是否存在
     if not svg_output.exists():
@@ -125,99 +452,32 @@ def finalize_project(project_dir: Path, options: dict, dry_run: bool = False, qu
         safe_print("[PREVIEW] 预览模式，不执行操作")
         return True
     
-    # 步骤 1: 复制目录
-    if svg_final.exists():
-        shutil.rmtree(svg_final)
-    shutil.copytree(svg_output, svg_final)
+    # 步骤 1: 同步 svg_final/（对比清单，复制有变化的页面，删除已不存在的页面）
+    # 步骤 2-7: 逐个文件执行启用的处理步骤（各步骤的输出先收集，下面按步骤输出）
+    step_outputs: List[Dict[str, str]] = []
+    plan = run_finalize(project_dir, options, jobs, full, step_outputs=step_outputs)
+    totals = plan.totals()
     
     if not quiet:
         print()
+        if not plan.full:
+            safe_print(f"[增量] 处理 {len(plan.stale)} 页，复用 {len(plan.reused)} 页"
+                       + (f"，删除 {len(plan.removed)} 页" if plan.removed else ""))
     
-    # 步骤 2: 嵌入图标
-    if options.get('embed_icons'):
-        if not quiet:
-            safe_print("[1/6] 嵌入图标...")
-        icons_count = 0
-        for svg_file in svg_final.glob('*.svg'):
-            count = embed_icons_in_file(svg_file, icons_dir, dry_run=False, verbose=False)
-            icons_count += count
-        if not quiet:
-            if icons_count > 0:
-                safe_print(f"      {icons_count} 个图标已嵌入")
-            else:
-                safe_print("      无图标")
-    
-    # 步骤 3: 智能裁剪图片（根据 preserveAspectRatio="slice"）
-    if options.get('crop_images'):
-        if not quiet:
-            safe_print("[2/6] 智能裁剪图片...")
-        crop_count = 0
-        crop_errors = 0
-        for svg_file in svg_final.glob('*.svg'):
-            count, errors = crop_images_in_svg(str(svg_file), dry_run=False, verbose=False)
-            crop_count += count
-            crop_errors += errors
-        if not quiet:
-            if crop_count > 0:
-                safe_print(f"      {crop_count} 张图片已裁剪")
-            else:
-                safe_print("      无需裁剪（无 slice 属性的图片）")
-    
-    # 步骤 4: 修复图片宽高比（防止 PPT 转形状时拉伸）
-    if options.get('fix_aspect'):
-        if not quiet:
-            safe_print("[3/6] 修复图片宽高比...")
-        aspect_count = 0
-        for svg_file in svg_final.glob('*.svg'):
-            count = fix_image_aspect_in_svg(str(svg_file), dry_run=False, verbose=False)
-            aspect_count += count
-        if not quiet:
-            if aspect_count > 0:
-                safe_print(f"      {aspect_count} 张图片已修复")
-            else:
-                safe_print("      无图片")
-    
-    # 步骤 5: 嵌入图片
-    if options.get('embed_images'):
-        if not quiet:
-            safe_print("[4/6] 嵌入图片...")
-        images_count = 0
-        for svg_file in svg_final.glob('*.svg'):
-            count, _ = embed_images_in_svg(str(svg_file), dry_run=False)
-            images_count += count
-        if not quiet:
-            if images_count > 0:
-                safe_print(f"      {images_count} 张图片已嵌入")
-            else:
-                safe_print("      无图片")
-    
-    # 步骤 6: 文本扁平化
-    if options.get('flatten_text'):
-        if not quiet:
-            safe_print("[5/6] 文本扁平化...")
-        flatten_count = 0
-        for svg_file in svg_final.glob('*.svg'):
-            if process_flatten_text(svg_file, verbose=False):
-                flatten_count += 1
-        if not quiet:
-            if flatten_count > 0:
-                safe_print(f"      {flatten_count} 个文件已处理")
-            else:
-                safe_print("      无需处理")
-    
-    # 步骤 7: 圆角转 Path
-    if options.get('fix_rounded'):
+    # 与逐步骤处理相同的输出顺序：步骤标题、各文件的警告与明细、步骤汇总
+    for step_index, (key, title, done_message, empty_message) in enumerate(FINALIZE_STEPS, 1):
+        if not options.get(key):
+            continue
         if not quiet:
-            safe_print("[6/6] 圆角转 Path...")
-        rounded_count = 0
-        for svg_file in svg_final.glob('*.svg'):
-            count = process_rounded_rect(svg_file, verbose=False)
-            rounded_count += count
+            safe_print(f"[{step_index}/{len(FINALIZE_STEPS)}] {title}...")
+        for step_output in step_outputs:
+            if step_output.get(key):
+                print(step_output[key], end='')
         if not quiet:
-            if rounded_count > 0:
-                safe_print(f"      {rounded_count} 个圆角矩形已转换")
+            if totals.get(key, 0) > 0:
+                safe_print(f"      {done_message.format(totals[key])}")
             else:
-                safe_print("      无圆角矩形")
+                safe_print(f"      {empty_message}")
     
     # 完成
     if not quiet:
@@ -239,6 +499,12 @@ def main():
   %(prog)s projects/my_project           # 执行全部处理（默认）
   %(prog)s projects/my_project --only embed-icons fix-rounded
   %(prog)s projects/my_project -q        # 安静模式
+  %(prog)s projects/my_project -j 4      # 4 个进程并行处理（0 表示全部 CPU 核心）
+  %(prog)s projects/my_project --full    # 忽略增量清单，全部重新处理
+
+增量处理：
+  svg_final/.finalize_manifest.json 记录每页源文件、引用的图标与图片的哈希
+  及处理选项；再次运行时只处理有变化的页面，删除源文件已不存在的页面
 
 处理选项（用于 --only）：
   embed-icons   嵌入图标
@@ -258,6 +524,10 @@ def main():
                         help='仅预览操作，不实际执行')
     parser.add_argument('--quiet', '-q', action='store_true',
                         help='安静模式，减少输出')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='并行处理进程数 (默认: 1，0 表示使用全部 CPU 核心)')
+    parser.add_argument('--full', action='store_true',
+                        help='忽略增量清单，删除 svg_final/ 后全部重新处理')
     
     args = parser.parse_args()
     
@@ -287,7 +557,7 @@ def main():
             'fix_rounded': True,
         }
     
-    success = finalize_project(args.project_dir, options, args.dry_run, args.quiet)
+    success = finalize_project(args.project_dir, options, args.dry_run, args.quiet, args.jobs, args.full)
     sys.exit(0 if success else 1)
 
 
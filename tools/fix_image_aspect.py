@@ -231,6 +231,28 @@ def fix_image_aspect_in_svg(svg_path, dry_run=False, verbose=True):
         print(f"  [ERROR] Cannot parse SVG: {e}")
         return 0
     
+    fixed_count = fix_image_aspect_in_tree(root, svg_dir, dry_run, verbose)
+    
+    if not dry_run and fixed_count > 0:
+        # 保存修改
+        tree.write(svg_path, encoding='unicode', xml_declaration=True)
+    
+    return fixed_count
+
+
+def fix_image_aspect_in_tree(root, svg_dir, dry_run=False, verbose=True):
+    """
+    修复已解析的 SVG 文档树中图片的宽高比（原地修改，供 finalize_svg.py 单次解析流水线使用）
+    
+    Args:
+        root: SVG 根元素
+        svg_dir: SVG 文件所在目录（解析相对路径）
+        dry_run: 是否只预览不修改
+        verbose: 是否输出详细信息
+    
+    Returns:
+        修复的图片数量
+    """
     # 查找所有 image 元素
     fixed_count = 0
     
@@ -307,10 +329,6 @@ def fix_image_aspect_in_svg(svg_path, dry_run=False, verbose=True):
             
             fixed_count += 1
     
-    if not dry_run and fixed_count > 0:
-        # 保存修改
-        tree.write(svg_path, encoding='unicode', xml_declaration=True)
-    
     return fixed_count
 
 
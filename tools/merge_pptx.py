@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+PPT Master - PPTX 合并工具
+
+将 svg_to_pptx.py 导出的多个 PPTX 按顺序合并为一个演示文稿，直接复制
+幻灯片、备注与媒体部件，不重新渲染任何页面：
+
+    - 幻灯片、备注页与媒体重新编号，关系文件中的引用随之改写
+    - 内容相同的媒体（如各部分共用的背景 PNG/SVG）只存储一份
+    - 切换效果（位于幻灯片 XML 中）与备注原样保留
+    - [Content_Types].xml 与 presentation.xml 由 PptxPackageWriter 重新生成
+    - 母版、版式、主题等取自第一个输入文件
+    - 所有输入都带有导出清单且导出设置一致时，合并导出清单（可继续用于增量构建）
+
+用法:
+    python3 tools/merge_pptx.py part1.pptx part2.pptx part3.pptx -o master.pptx
+"""
+
+import re
+import sys
+import time
+import argparse
+import posixpath
+import zipfile
+from io import BytesIO
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from pptx_package import (
+    REL_TYPE_EXPORT_MANIFEST, REL_TYPE_SLIDE,
+    PptxPackageWriter, ZipCompressionPolicy, read_manifest
+)
+
+
+# 按输入重新编号、不进入合并骨架的部件目录
+DECK_PART_PREFIXES = ('ppt/slides/', 'ppt/notesSlides/', 'ppt/media/', 'ppt-master/')
+
+REL_TYPE_NOTES_SLIDE = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/notesSlide'
+
+RELATIONSHIP_PATTERN = re.compile(r'<Relationship\b[^>]*?/>')
+
+
+def get_attribute(element: str, name: str) -> Optional[str]:
+    """从 XML 元素文本中读取属性值"""
+    match = re.search(rf'\b{name}="([^"]*)"', element)
+    return match.group(1) if match else None
+
+
+def resolve_target(source_part: str, target: str) -> str:
+    """将关系文件中的相对 Target 解析为包内路径"""
+    if target.startswith('/'):
+        return target.lstrip('/')
+    return posixpath.normpath(posixpath.join(posixpath.dirname(source_part), target))
+
+
+def rels_part_name(part_name: str) -> str:
+    """部件对应的关系文件路径（如 ppt/slides/_rels/slide1.xml.rels）"""
+    directory, filename = posixpath.split(part_name)
+    return posixpath.join(directory, '_rels', filename + '.rels')
+
+
+def get_slide_size(package: zipfile.ZipFile) -> Tuple[int, int]:
+    """读取 presentation.xml 中的幻灯片尺寸（EMU）"""
+    presentation_xml = package.read('ppt/presentation.xml').decode('utf-8')
+    match = re.search(r'<p:sldSz\b[^>]*?\bcx="(\d+)"[^>]*?\bcy="(\d+)"', presentation_xml)
+    if not match:
+        raise ValueError("presentation.xml 中缺少幻灯片尺寸")
+    return int(match.group(1)), int(match.group(2))
+
+
+def list_slide_parts(package: zipfile.ZipFile) -> List[str]:
+    """按演示顺序列出幻灯片部件路径（来自 presentation.xml 的 sldIdLst）"""
+    presentation_xml = package.read('ppt/presentation.xml').decode('utf-8')
+    rels_xml = package.read('ppt/_rels/presentation.xml.rels').decode('utf-8')
+    targets = {}
+    for element in RELATIONSHIP_PATTERN.findall(rels_xml):
+        if get_attribute(element, 'Type') == REL_TYPE_SLIDE:
+            targets[get_attribute(element, 'Id')] = resolve_target('ppt/presentation.xml', get_attribute(element, 'Target'))
+    slide_parts = []
+    for rid in re.findall(r'<p:sldId\b[^>]*?\br:id="([^"]+)"', presentation_xml):
+        if rid not in targets:
+            raise ValueError(f"presentation.xml 引用了不存在的幻灯片关系: {rid}")
+        slide_parts.append(targets[rid])
+    return slide_parts
+
+
+def create_merge_skeleton(package: zipfile.ZipFile) -> bytes:
+    """
+    由第一个输入文件生成合并用骨架：去掉幻灯片、备注页、媒体与导出清单，
+    保留母版、版式、主题、文档属性等部件
+    """
+    buffer = BytesIO()
+    # 骨架只在内存中短暂存在，不压缩以节省时间
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_STORED) as skeleton:
+        for info in package.infolist():
+            name = info.filename
+            if name.startswith(DECK_PART_PREFIXES):
+                continue
+            data = package.read(name)
+            if name == 'ppt/presentation.xml':
+                data = re.sub(rb'<p:sldIdLst>.*?</p:sldIdLst>|<p:sldIdLst/>', b'', data, flags=re.DOTALL)
+            elif name == 'ppt/_rels/presentation.xml.rels':
+                data = re.sub(rb'<Relationship\b[^>]*?Type="' + re.escape(REL_TYPE_SLIDE.encode()) + rb'"[^>]*?/>', b'', data)
+            elif name == '_rels/.rels':
+                data = re.sub(rb'<Relationship\b[^>]*?Type="' + re.escape(REL_TYPE_EXPORT_MANIFEST.encode()) + rb'"[^>]*?/>', b'', data)
+            elif name == '[Content_Types].xml':
+                data = re.sub(rb'<Override\b[^>]*?PartName="/(?:ppt/slides/|ppt/notesSlides/|ppt-master/)[^"]*"[^>]*?/>', b'', data)
+            skeleton.writestr(name, data)
+    return buffer.getvalue()
+
+
+class DeckMerger:
+    """将一个输入文件的幻灯片逐页写入合并中的包"""
+
+    def __init__(self, writer: PptxPackageWriter, skeleton_parts: set):
+        self._writer = writer
+        self._skeleton_parts = skeleton_parts
+        self._media_counter = 0
+
+    def _rewrite_rels(
+        self,
+        package: zipfile.ZipFile,
+        source_part: str,
+        rels_xml: str,
+        slide_map: Dict[str, int],
+        notes_num: int
+    ) -> Tuple[str, Optional[str], List[dict]]:
+        """
+        改写关系文件中的引用
+
+        Returns:
+            (新关系文件, 备注页部件路径, 媒体映射 [{'source', 'target'}])
+        """
+        notes_part = None
+        media = []
+
+        def rewrite(match) -> str:
+            nonlocal notes_part
+            element = match.group(0)
+            target = get_attribute(element, 'Target')
+            if target is None or get_attribute(element, 'TargetMode') == 'External':
+                return element
+            part = resolve_target(source_part, target)
+            if part.startswith('ppt/media/'):
+                ext = part.rsplit('.', 1)[-1] if '.' in part else 'bin'
+                self._media_counter += 1
+                name = self._writer.add_media(f'image{self._media_counter}.{ext}', package.read(part))
+                media.append({'source': posixpath.basename(part), 'target': name})
+                new_target = f'../media/{name}'
+            elif part in slide_map:
+                new_target = f'../slides/slide{slide_map[part]}.xml'
+            elif part.startswith('ppt/notesSlides/'):
+                notes_part = part
+                new_target = f'../notesSlides/notesSlide{notes_num}.xml'
+            elif part in self._skeleton_parts or part not in package.NameToInfo:
+                # 骨架中已有的部件（版式、备注母版等）及输入中本就不存在的引用保持不变
+                return element
+            else:
+                raise ValueError(f"{source_part} 引用了合并后不存在的部件: {part}")
+            return element.replace(f'Target="{target}"', f'Target="{new_target}"')
+
+        return RELATIONSHIP_PATTERN.sub(rewrite, rels_xml), notes_part, media
+
+    def add_deck(self, package: zipfile.ZipFile) -> List[Tuple[str, int, List[dict]]]:
+        """
+        追加一个输入文件的全部幻灯片
+
+        Returns:
+            [(原幻灯片部件路径, 新序号, 媒体映射)]
+        """
+        slide_parts = list_slide_parts(package)
+        first_num = self._writer.next_slide_num
+        slide_map = {part: first_num + i for i, part in enumerate(slide_parts)}
+
+        added = []
+        for slide_part in slide_parts:
+            slide_num = slide_map[slide_part]
+            slide_xml = package.read(slide_part).decode('utf-8')
+            rels_xml, notes_part, media = self._rewrite_rels(
+                package, slide_part, package.read(rels_part_name(slide_part)).decode('utf-8'),
+                slide_map, slide_num
+            )
+
+            notes_xml = notes_rels_xml = None
+            if notes_part is not None:
+                notes_xml = package.read(notes_part).decode('utf-8')
+                notes_rels = rels_part_name(notes_part)
+                if notes_rels in package.namelist():
+                    notes_rels_xml, _, notes_media = self._rewrite_rels(
+                        package, notes_part, package.read(notes_rels).decode('utf-8'), slide_map, slide_num
+                    )
+                    media += notes_media
+
+            self._writer.add_slide(slide_xml, rels_xml, notes_xml, notes_rels_xml)
+            added.append((slide_part, slide_num, media))
+        return added
+
+
+def deck_labels(inputs: List[Union[str, Path]]) -> List[str]:
+    """各输入的标识（文件名，不含扩展名；重名时加上序号）"""
+    stems = [Path(path).stem for path in inputs]
+    return [stem if stems.count(stem) == 1 else f'{index}_{stem}' for index, stem in enumerate(stems, 1)]
+
+
+def merge_manifests(
+    manifests: List[Optional[dict]],
+    slide_media: List[List[List[dict]]],
+    labels: Optional[List[str]] = None
+) -> Optional[dict]:
+    """
+    合并各输入的导出清单（任一输入缺少清单或导出设置不一致时返回 None）
+
+    页面名称在合并后的清单中必须唯一（增量构建按名称对应新旧页面）：
+    各输入之间存在重名页面时，全部页面名称加上所属输入的标识前缀（<标识>/<页面名>）。
+
+    Args:
+        manifests: 各输入的导出清单
+        slide_media: 各输入每页的媒体映射（原文件名 -> 合并后文件名）
+        labels: 各输入的标识（默认为 deck1、deck2...）
+    """
+    if not manifests or any(m is None for m in manifests):
+        return None
+    settings = manifests[0].get('settings')
+    if any(m.get('settings') != settings or m.get('version') != manifests[0].get('version') for m in manifests):
+        return None
+
+    slides = []
+    for manifest, deck_media in zip(manifests, slide_media):
+        entries = manifest.get('slides', [])
+        if len(entries) != len(deck_media):
+            return None
+        for entry, media in zip(entries, deck_media):
+            renamed = {m['source']: m['target'] for m in media}
+            entry = dict(entry)
+            for key in ('svg', 'png'):
+                if entry.get(key):
+                    entry[key] = renamed.get(entry[key], entry[key])
+            slides.append(entry)
+
+    names = [entry.get('name') for entry in slides]
+    if len(set(names)) != len(names):
+        labels = labels or [f'deck{index}' for index in range(1, len(manifests) + 1)]
+        slide_labels = [label for label, manifest in zip(labels, manifests)
+                                 for _ in manifest.get('slides', [])]
+        for entry, label in zip(slides, slide_labels):
+            entry['name'] = f"{label}/{entry.get('name')}"
+    return {'version': manifests[0].get('version'), 'settings': settings, 'slides': slides}
+
+
+def merge_pptx(
+    inputs: List[Union[str, Path]],
+    output: Union[str, Path],
+    compression: Optional[ZipCompressionPolicy] = None,
+    log: Optional[Callable[[str], None]] = None
+) -> dict:
+    """
+    按顺序合并多个 PPTX（库接口）
+
+    Args:
+        inputs: 输入 PPTX 路径列表（需为 svg_to_pptx.py 导出的文件，幻灯片尺寸一致）
+        output: 输出路径（不能与任一输入相同）
+        compression: zip 压缩策略
+        log: 日志输出函数（None 表示不输出）
+
+    Returns:
+        {'slides', 'decks': [{'input', 'slides', 'first_slide'}], 'media_count',
+         'media_deduplicated_bytes', 'manifest'（是否写入合并清单）, 'size', 'elapsed'}
+
+    Raises:
+        ValueError: 输入为空、幻灯片尺寸不一致或文件结构无法识别
+    """
+    start = time.perf_counter()
+    if not inputs:
+        raise ValueError("没有输入文件")
+    output = Path(output)
+    for path in inputs:
+        if Path(path).resolve() == output.resolve():
+            raise ValueError(f"输出文件不能与输入相同: {path}")
+
+    packages = [zipfile.ZipFile(str(path), 'r') for path in inputs]
+    try:
+        size = get_slide_size(packages[0])
+        for path, package in zip(inputs, packages):
+            if get_slide_size(package) != size:
+                raise ValueError(f"幻灯片尺寸不一致: {path} 为 {get_slide_size(package)}，第一个文件为 {size}")
+
+        skeleton = create_merge_skeleton(packages[0])
+        skeleton_parts = set(zipfile.ZipFile(BytesIO(skeleton)).namelist())
+
+        decks = []
+        slide_media = []
+        # 写入器先写临时文件，成功关闭后才替换输出文件
+        with PptxPackageWriter(output, skeleton, compression) as writer:
+            merger = DeckMerger(writer, skeleton_parts)
+            for path, package in zip(inputs, packages):
+                added = merger.add_deck(package)
+                decks.append({'input': str(path), 'slides': len(added),
+                              'first_slide': added[0][1] if added else None})
+                slide_media.append([media for _, _, media in added])
+                if log is not None:
+                    log(f"  {Path(path).name}: {len(added)} 页"
+                        + (f"（第 {added[0][1]}-{added[-1][1]} 页）" if added else ""))
+
+            manifest = merge_manifests([read_manifest(package) for package in packages], slide_media,
+                                       deck_labels(inputs))
+            if manifest is not None:
+                writer.write_manifest(manifest)
+    finally:
+        for package in packages:
+            package.close()
+
+    return {
+        'slides': writer.slide_count,
+        'decks': decks,
+        'media_count': writer.media_count,
+        'media_deduplicated_bytes': writer.media_deduplicated_bytes,
+        'manifest': manifest is not None,
+        'size': output.stat().st_size,
+        'elapsed': time.perf_counter() - start,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='PPT Master - PPTX 合并工具',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+示例:
+  %(prog)s part1.pptx part2.pptx -o master.pptx
+  %(prog)s sections/*.pptx -o master.pptx --zip-level 9
+
+说明:
+  输入需为 svg_to_pptx.py 导出的文件，且幻灯片尺寸一致；
+  合并时直接复制幻灯片、备注与媒体，不重新渲染，相同媒体只存储一份。
+        '''
+    )
+    parser.add_argument('inputs', nargs='+', type=Path, help='输入 PPTX 文件（按顺序合并）')
+    parser.add_argument('-o', '--output', type=Path, required=True, help='输出文件路径')
+    parser.add_argument('--zip-level', type=int, choices=range(0, 10), default=6, metavar='0-9',
+                        help='XML/SVG 部件的压缩级别 (默认: 6)')
+    parser.add_argument('-q', '--quiet', action='store_true', help='只输出最终结果')
+
+    args = parser.parse_args()
+
+    for path in args.inputs:
+        if not path.is_file():
+            print(f"错误: 文件不存在: {path}")
+            sys.exit(1)
+
+    verbose = not args.quiet
+    if verbose:
+        print("PPT Master - PPTX 合并工具")
+        print("=" * 50)
+
+    try:
+        result = merge_pptx(
+            args.inputs, args.output,
+            compression=ZipCompressionPolicy(xml_level=args.zip_level),
+            log=print if verbose else None
+        )
+    except (ValueError, KeyError, zipfile.BadZipFile) as e:
+        print(f"错误: {e}")
+        sys.exit(1)
+
+    if verbose:
+        print()
+    print(f"[完成] 已保存: {args.output}")
+    print(f"  {len(result['decks'])} 个文件, 共 {result['slides']} 页, 耗时 {result['elapsed']:.2f} s")
+    print(f"  媒体: {result['media_count']} 个"
+          f"（去重节省 {result['media_deduplicated_bytes'] / 1024:.1f} KB）")
+    print(f"  文件大小: {result['size'] / 1024:.1f} KB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,453 @@
+#!/usr/bin/env python3
+"""
+PPT Master - PPTX 优化工具
+
+对已导出的 PPTX 做导出后优化，不重新渲染任何页面：
+
+    - 删除未被任何幻灯片使用的版式（python-pptx 默认模板自带 11 个版式，
+      导出只使用其中一个），以及不再被使用的母版与主题
+    - 按关系图清理不可达的部件（孤立的媒体、版式的关系文件等）
+    - 超过显示尺寸的图片按 --max-dpi 缩小到显示分辨率，PNG 无损重新压缩
+      （结果更大时保留原图）
+    - 按最优压缩策略重新打包（XML/SVG 以级别 9 压缩，已压缩媒体直接存储）
+    - 输出优化前后的大小与部件数量
+
+被缩小的 PNG 后备图片会从导出清单中移除，之后的增量构建不会复用它们。
+
+用法:
+    python3 tools/optimize_pptx.py deck.pptx                   # 输出 deck_optimized.pptx
+    python3 tools/optimize_pptx.py deck.pptx --in-place
+    python3 tools/optimize_pptx.py deck.pptx -o small.pptx --max-dpi 96 -j 4
+"""
+
+import re
+import sys
+import json
+import math
+import time
+import argparse
+import zipfile
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple, Union
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from pptx_package import (
+    MANIFEST_PART, ZipCompressionPolicy, create_temp_file, read_manifest, replace_with_temp
+)
+from merge_pptx import RELATIONSHIP_PATTERN, get_attribute, list_slide_parts, rels_part_name, resolve_target
+from svg_to_pptx import resolve_jobs
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+
+REL_TYPE_SLIDE_LAYOUT = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/slideLayout'
+REL_TYPE_SLIDE_MASTER = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/slideMaster'
+
+# 图片显示分辨率上限（默认 192 DPI，即 2x 屏幕分辨率，保留 hidpi 档位的后备图片）
+DEFAULT_MAX_DPI = 192
+EMU_PER_INCH = 914400
+
+# 重新编码的媒体格式
+RECOMPRESSIBLE_EXTENSIONS = {'png', 'jpg', 'jpeg'}
+JPEG_QUALITY = 90
+
+# 最优压缩策略：XML/SVG 一律级别 9，已压缩媒体抽样后直接存储
+OPTIMAL_COMPRESSION = ZipCompressionPolicy(xml_level=9, large_svg_level=9)
+
+PIC_PATTERN = re.compile(r'<p:pic\b.*?</p:pic>', re.DOTALL)
+EMBED_PATTERN = re.compile(r'\br:embed="([^"]+)"')
+EXT_PATTERN = re.compile(r'<a:ext\s+cx="(\d+)"\s+cy="(\d+)"')
+CROP_PATTERN = re.compile(r'<a:srcRect\s+[^/>]*[ltrb]="-?[1-9]')
+
+
+def read_relationships(package: zipfile.ZipFile, part_name: str,
+                       overrides: Dict[str, bytes]) -> List[Tuple[str, str, Optional[str]]]:
+    """读取部件的关系：[(Id, Type, 目标部件路径)]，外部链接的目标为 None"""
+    rels_name = rels_part_name(part_name)
+    try:
+        rels_xml = (overrides.get(rels_name) or package.read(rels_name)).decode('utf-8')
+    except KeyError:
+        return []
+    relationships = []
+    for element in RELATIONSHIP_PATTERN.findall(rels_xml):
+        target = get_attribute(element, 'Target') or ''
+        external = get_attribute(element, 'TargetMode') == 'External'
+        relationships.append((get_attribute(element, 'Id'), get_attribute(element, 'Type'),
+                              None if external else resolve_target(part_name, target)))
+    return relationships
+
+
+def remove_relationships(rels_xml: str, rel_ids: Set[str]) -> str:
+    """从关系文件中删除指定 Id 的关系"""
+    def drop(match):
+        return '' if get_attribute(match.group(0), 'Id') in rel_ids else match.group(0)
+    return RELATIONSHIP_PATTERN.sub(drop, rels_xml)
+
+
+def remove_list_entries(xml: str, element: str, rel_ids: Set[str]) -> str:
+    """删除 <p:sldLayoutId>/<p:sldMasterId> 等引用了指定关系的列表项"""
+    def drop(match):
+        rid = re.search(r'\br:id="([^"]+)"', match.group(0))
+        return '' if rid and rid.group(1) in rel_ids else match.group(0)
+    return re.sub(rf'<p:{element}\b[^>]*?/>', drop, xml)
+
+
+def prune_layouts(package: zipfile.ZipFile, slide_parts: List[str], overrides: Dict[str, bytes]):
+    """从母版中摘除未使用的版式，并从 presentation.xml 中摘除不再有版式的母版"""
+    used_layouts = {
+        target for slide in slide_parts
+        for _, rel_type, target in read_relationships(package, slide, overrides)
+        if rel_type == REL_TYPE_SLIDE_LAYOUT and target
+    }
+    if not used_layouts:
+        return
+
+    unused_masters = set()
+    for master_rid, rel_type, master in read_relationships(package, 'ppt/presentation.xml', overrides):
+        if rel_type != REL_TYPE_SLIDE_MASTER or master not in package.NameToInfo:
+            continue
+        layout_rels = [(rid, target) for rid, t, target in read_relationships(package, master, overrides)
+                       if t == REL_TYPE_SLIDE_LAYOUT]
+        unused = {rid for rid, target in layout_rels if target not in used_layouts}
+        if len(unused) == len(layout_rels):
+            unused_masters.add(master_rid)
+            continue
+        if unused:
+            master_xml = package.read(master).decode('utf-8')
+            overrides[master] = remove_list_entries(master_xml, 'sldLayoutId', unused).encode('utf-8')
+            master_rels = package.read(rels_part_name(master)).decode('utf-8')
+            overrides[rels_part_name(master)] = remove_relationships(master_rels, unused).encode('utf-8')
+
+    if unused_masters:
+        presentation_xml = package.read('ppt/presentation.xml').decode('utf-8')
+        overrides['ppt/presentation.xml'] = remove_list_entries(
+            presentation_xml, 'sldMasterId', unused_masters).encode('utf-8')
+        presentation_rels = package.read('ppt/_rels/presentation.xml.rels').decode('utf-8')
+        overrides['ppt/_rels/presentation.xml.rels'] = remove_relationships(
+            presentation_rels, unused_masters).encode('utf-8')
+
+
+def find_reachable_parts(package: zipfile.ZipFile, overrides: Dict[str, bytes]) -> Set[str]:
+    """从包级关系（_rels/.rels）出发，沿关系图收集所有可达部件（含关系文件本身）"""
+    reachable = {'[Content_Types].xml'}
+    queue = deque([''])  # '' 表示包本身，其关系文件为 _rels/.rels
+    visited = set()
+    while queue:
+        part = queue.popleft()
+        if part in visited:
+            continue
+        visited.add(part)
+        if rels_part_name(part) in package.NameToInfo:
+            reachable.add(rels_part_name(part))
+        for _, _, target in read_relationships(package, part, overrides):
+            # 指向不存在部件的关系（如未生成的备注母版）忽略
+            if target and target in package.NameToInfo and target not in visited:
+                reachable.add(target)
+                queue.append(target)
+    return reachable
+
+
+def collect_display_sizes(package: zipfile.ZipFile, slide_parts: List[str],
+                          overrides: Dict[str, bytes]) -> Dict[str, Optional[Tuple[int, int]]]:
+    """
+    统计幻灯片中各图片的最大显示尺寸（EMU）
+
+    Returns:
+        {媒体部件: (宽, 高)}；无法确定显示尺寸（裁剪、用作填充等）的媒体为 None，不缩小
+    """
+    sizes: Dict[str, Optional[Tuple[int, int]]] = {}
+
+    def record(part: str, size: Optional[Tuple[int, int]]):
+        if part in sizes and (sizes[part] is None or size is None):
+            sizes[part] = None
+        elif part in sizes:
+            sizes[part] = (max(sizes[part][0], size[0]), max(sizes[part][1], size[1]))
+        else:
+            sizes[part] = size
+
+    for slide in slide_parts:
+        targets = {rid: target for rid, _, target in read_relationships(package, slide, overrides) if target}
+        slide_xml = package.read(slide).decode('utf-8')
+        for pic in PIC_PATTERN.findall(slide_xml):
+            ext = EXT_PATTERN.search(pic)
+            size = (int(ext.group(1)), int(ext.group(2))) if ext and not CROP_PATTERN.search(pic) else None
+            for rid in EMBED_PATTERN.findall(pic):
+                if rid in targets:
+                    record(targets[rid], size)
+        # 图片以外的引用（如形状/背景填充）无法确定显示尺寸
+        for rid in set(EMBED_PATTERN.findall(PIC_PATTERN.sub('', slide_xml))):
+            if rid in targets:
+                record(targets[rid], None)
+    return sizes
+
+
+def _optimize_media_task(task: tuple) -> Tuple[str, Optional[bytes], bool]:
+    """
+    进程池任务入口：缩小并重新压缩一个图片
+
+    Returns:
+        (部件名, 更小的新内容或 None, 是否缩小了分辨率)
+    """
+    part_name, data, max_size = task
+    ext = part_name.rsplit('.', 1)[-1].lower()
+    try:
+        image = Image.open(BytesIO(data))
+        image.load()
+        resized = False
+        if max_size is not None and image.width > max_size[0] and image.height > max_size[1]:
+            scale = max(max_size[0] / image.width, max_size[1] / image.height)
+            if image.mode not in ('RGB', 'RGBA', 'L', 'LA'):
+                image = image.convert('RGBA')
+            image = image.resize((max(1, round(image.width * scale)), max(1, round(image.height * scale))),
+                                 Image.LANCZOS)
+            resized = True
+        elif ext != 'png':
+            # JPEG 不做有损的重复编码
+            return part_name, None, False
+        buffer = BytesIO()
+        if ext == 'png':
+            image.save(buffer, format='PNG', optimize=True)
+        else:
+            image.save(buffer, format='JPEG', quality=JPEG_QUALITY, optimize=True)
+    except (OSError, ValueError):
+        return part_name, None, False
+    if len(buffer.getvalue()) >= len(data):
+        return part_name, None, False
+    return part_name, buffer.getvalue(), resized
+
+
+def update_manifest(package: zipfile.ZipFile, resized_media: Set[str]) -> Optional[bytes]:
+    """从导出清单中移除已缩小的 PNG 后备图片（避免增量构建复用降低了分辨率的图片）"""
+    manifest = read_manifest(package)
+    if manifest is None:
+        return None
+    changed = False
+    for slide in manifest.get('slides', []):
+        if slide.get('png') and f"ppt/media/{slide['png']}" in resized_media:
+            slide['png'] = None
+            changed = True
+    if not changed:
+        return None
+    return json.dumps(manifest, ensure_ascii=False, indent=2, sort_keys=True).encode('utf-8')
+
+
+def classify_part(part_name: str) -> str:
+    """按目录归类部件（用于统计；关系文件单独计数，不计入所属部件的类别）"""
+    if part_name.endswith('.rels'):
+        return 'rels'
+    for prefix, category in (('ppt/slideLayouts/', 'layouts'), ('ppt/slideMasters/', 'masters'),
+                             ('ppt/theme/', 'themes'), ('ppt/media/', 'media')):
+        if part_name.startswith(prefix):
+            return category
+    return 'other'
+
+
+def optimize_pptx(
+    input_path: Union[str, Path],
+    output: Optional[Union[str, Path]] = None,
+    max_dpi: Optional[float] = DEFAULT_MAX_DPI,
+    prune: bool = True,
+    media: bool = True,
+    jobs: int = 1,
+    compression: Optional[ZipCompressionPolicy] = None,
+    log: Optional[Callable[[str], None]] = None
+) -> dict:
+    """
+    优化 PPTX（库接口）
+
+    Args:
+        input_path: 输入 PPTX
+        output: 输出路径（默认覆盖输入；先写入临时文件，完成后替换）
+        max_dpi: 图片显示分辨率上限（None 表示不缩小，只做无损重新压缩）
+        prune: 删除未使用的版式/母版/主题与不可达部件
+        media: 重新压缩（并按需缩小）PNG/JPEG 媒体（需要 Pillow）
+        jobs: 媒体处理的并行进程数（0 表示使用全部 CPU 核心）
+        compression: 重新打包的压缩策略（默认 OPTIMAL_COMPRESSION）
+        log: 日志输出函数（None 表示不输出）
+
+    Returns:
+        {'output', 'size_before', 'size_after', 'parts_before', 'parts_after',
+         'removed'（按类别统计的删除部件数）, 'media_recompressed', 'media_downsampled',
+         'media_saved_bytes', 'elapsed'}
+    """
+    start = time.perf_counter()
+    input_path = Path(input_path)
+    output = Path(output) if output is not None else input_path
+    compression = compression or OPTIMAL_COMPRESSION
+    overrides: Dict[str, bytes] = {}
+    media_recompressed = media_downsampled = media_saved = 0
+
+    with zipfile.ZipFile(input_path, 'r') as package:
+        all_parts = [info.filename for info in package.infolist()]
+        slide_parts = list_slide_parts(package)
+
+        removed: Set[str] = set()
+        if prune:
+            prune_layouts(package, slide_parts, overrides)
+            removed = set(all_parts) - find_reachable_parts(package, overrides)
+            if removed:
+                content_types = package.read('[Content_Types].xml').decode('utf-8')
+                content_types = re.sub(
+                    r'<Override\b[^>]*?/>',
+                    lambda m: '' if (get_attribute(m.group(0), 'PartName') or '').lstrip('/') in removed else m.group(0),
+                    content_types
+                )
+                overrides['[Content_Types].xml'] = content_types.encode('utf-8')
+
+        if media and Image is not None:
+            sizes = collect_display_sizes(package, slide_parts, overrides)
+            tasks = []
+            for part in all_parts:
+                if part in removed or not part.startswith('ppt/media/') \
+                        or part.rsplit('.', 1)[-1].lower() not in RECOMPRESSIBLE_EXTENSIONS:
+                    continue
+                size = sizes.get(part)
+                max_size = None
+                if max_dpi and size is not None:
+                    max_size = tuple(math.ceil(emu / EMU_PER_INCH * max_dpi) for emu in size)
+                tasks.append((part, package.read(part), max_size))
+
+            workers = min(resolve_jobs(jobs), len(tasks))
+            if workers > 1:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    outcomes = list(pool.map(_optimize_media_task, tasks))
+            else:
+                outcomes = [_optimize_media_task(task) for task in tasks]
+
+            resized_media = set()
+            for (part, data, _), (_, new_data, resized) in zip(tasks, outcomes):
+                if new_data is None:
+                    continue
+                overrides[part] = new_data
+                media_recompressed += 1
+                media_saved += len(data) - len(new_data)
+                if resized:
+                    media_downsampled += 1
+                    resized_media.add(part)
+            manifest_data = update_manifest(package, resized_media) if resized_media else None
+            if manifest_data is not None:
+                overrides[MANIFEST_PART] = manifest_data
+        elif media and log is not None:
+            log("  警告: 未安装 Pillow，跳过媒体重新压缩")
+
+        # 重新打包：[Content_Types].xml 放在最前（OPC 惯例），其余保持原顺序
+        kept = [part for part in all_parts if part not in removed]
+        kept.sort(key=lambda part: part != '[Content_Types].xml')
+        # 同目录的唯一临时文件（并发运行或已有同名文件时互不覆盖）
+        target = Path(create_temp_file(output))
+        try:
+            with zipfile.ZipFile(target, 'w') as out:
+                for part in kept:
+                    data = overrides[part] if part in overrides else package.read(part)
+                    compress_type, level = compression.choose(part, data)
+                    out.writestr(package.getinfo(part).filename, data,
+                                 compress_type=compress_type, compresslevel=level)
+        except BaseException:
+            if target.exists():
+                target.unlink()
+            raise
+
+    size_before = input_path.stat().st_size
+    try:
+        replace_with_temp(target, output)
+    except BaseException:
+        if target.exists():
+            target.unlink()
+        raise
+    return {
+        'output': str(output),
+        'size_before': size_before,
+        'size_after': output.stat().st_size,
+        'parts_before': len(all_parts),
+        'parts_after': len(kept),
+        'removed': dict(Counter(classify_part(part) for part in removed)),
+        'media_recompressed': media_recompressed,
+        'media_downsampled': media_downsampled,
+        'media_saved_bytes': media_saved,
+        'elapsed': time.perf_counter() - start,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='PPT Master - PPTX 优化工具（导出后优化）',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+示例:
+  %(prog)s deck.pptx                       # 输出 deck_optimized.pptx
+  %(prog)s deck.pptx --in-place            # 直接替换原文件
+  %(prog)s deck.pptx --max-dpi 96 -j 4     # 图片缩小到 1x 屏幕分辨率
+  %(prog)s deck.pptx --no-media            # 只清理部件并重新打包
+
+说明:
+  - 删除未使用的版式、母版、主题以及不可达的部件
+  - 图片超过显示尺寸 × max-dpi 时缩小（裁剪过或用作填充的图片不缩小）；
+    PNG 无损重新压缩，结果更大时保留原图
+  - 默认 max-dpi 为 192（2x），保留 --png-quality hidpi 的后备图片
+        '''
+    )
+    parser.add_argument('input', type=Path, help='输入 PPTX 文件')
+    parser.add_argument('-o', '--output', type=Path, default=None,
+                        help='输出文件路径 (默认: <输入>_optimized.pptx)')
+    parser.add_argument('--in-place', action='store_true', help='直接替换输入文件')
+    parser.add_argument('--max-dpi', type=float, default=DEFAULT_MAX_DPI,
+                        help=f'图片显示分辨率上限 (默认: {DEFAULT_MAX_DPI}，0 表示不缩小)')
+    parser.add_argument('--no-prune', action='store_true', help='不删除未使用的版式/母版/主题')
+    parser.add_argument('--no-media', action='store_true', help='不重新压缩媒体')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='媒体处理并行进程数 (默认: 1，0 表示使用全部 CPU 核心)')
+    parser.add_argument('--zip-level', type=int, choices=range(0, 10), default=9, metavar='0-9',
+                        help='XML/SVG 部件的压缩级别 (默认: 9)')
+    parser.add_argument('-q', '--quiet', action='store_true', help='只输出最终结果')
+
+    args = parser.parse_args()
+    if not args.input.is_file():
+        print(f"错误: 文件不存在: {args.input}")
+        sys.exit(1)
+    output = args.input if args.in_place else (
+        args.output or args.input.with_name(f'{args.input.stem}_optimized.pptx'))
+
+    if not args.quiet:
+        print("PPT Master - PPTX 优化工具")
+        print("=" * 50)
+        print(f"  输入: {args.input}")
+        print(f"  输出: {output}")
+        print()
+
+    try:
+        result = optimize_pptx(
+            args.input, output,
+            max_dpi=args.max_dpi or None,
+            prune=not args.no_prune,
+            media=not args.no_media,
+            jobs=args.jobs,
+            compression=ZipCompressionPolicy(xml_level=args.zip_level, large_svg_level=args.zip_level),
+            log=None if args.quiet else print,
+        )
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile) as e:
+        print(f"错误: {e}")
+        sys.exit(1)
+
+    labels = {'layouts': '版式', 'masters': '母版', 'themes': '主题', 'media': '媒体', 'rels': '关系文件',
+              'other': '其他'}
+    removed = '，'.join(f"{labels[key]} {count}" for key, count in sorted(result['removed'].items()))
+    saved = result['size_before'] - result['size_after']
+    print(f"[完成] 已保存: {result['output']}")
+    print(f"  大小: {result['size_before'] / 1024:.1f} KB -> {result['size_after'] / 1024:.1f} KB"
+          f"（减少 {saved / 1024:.1f} KB，{saved / max(result['size_before'], 1):.1%}）")
+    print(f"  部件: {result['parts_before']} -> {result['parts_after']}" + (f"（删除 {removed}）" if removed else ""))
+    if not args.no_media:
+        print(f"  媒体: 重新压缩 {result['media_recompressed']} 个（其中缩小分辨率 {result['media_downsampled']} 个），"
+              f"节省 {result['media_saved_bytes'] / 1024:.1f} KB")
+    print(f"  耗时: {result['elapsed']:.2f} s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,497 @@
+#!/usr/bin/env python3
+"""
+PPT Master - PPTX 包写入模块
+
+以单次流式写入的方式生成 PPTX（OPC 包），无需解压到临时目录再重新打包。
+
+工作方式:
+    - 幻灯片、关系文件、备注在内存中生成后直接写入压缩包
+    - 媒体文件（SVG/PNG）直接写入 ppt/media/，内容相同的媒体只存储一份
+    - presentation.xml、presentation.xml.rels、_rels/.rels 与 [Content_Types].xml
+      在关闭时根据已写入的部件统一生成
+    - 可选写入导出清单 ppt-master/manifest.json（供增量构建读取）
+    - 骨架中其余未改动的部件（母版、版式、主题等）直接从骨架 zip 复制
+    - 按部件选择压缩方式（见 ZipCompressionPolicy）：已压缩的媒体直接存储，
+      XML 按可配置级别压缩
+    - 输出为文件路径时先写入同目录的临时文件，成功关闭后才替换目标文件；
+      写入中断（异常、Ctrl+C）时删除临时文件，原有文件保持不变
+
+依赖: python-pptx（仅 create_skeleton 需要）
+"""
+
+import os
+import re
+import json
+import stat
+import zlib
+import tempfile
+import hashlib
+import zipfile
+from functools import lru_cache
+from io import BytesIO
+from typing import BinaryIO, List, Optional, Tuple, Union
+from pathlib import Path
+
+try:
+    from pptx import Presentation
+except ImportError:
+    Presentation = None
+
+
+# OPC 关系类型
+REL_TYPE_SLIDE = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/slide'
+REL_TYPE_EXPORT_MANIFEST = 'urn:ppt-master:relationships:export-manifest'
+
+# 导出清单部件（记录每页 SVG/备注哈希与媒体文件，供增量构建使用）
+MANIFEST_PART = 'ppt-master/manifest.json'
+CONTENT_TYPE_JSON = 'application/json'
+
+# 内容类型
+CONTENT_TYPE_SLIDE = 'application/vnd.openxmlformats-officedocument.presentationml.slide+xml'
+CONTENT_TYPE_NOTES_SLIDE = 'application/vnd.openxmlformats-officedocument.presentationml.notesSlide+xml'
+
+# 媒体扩展名 -> 内容类型
+MEDIA_CONTENT_TYPES = {
+    'svg': 'image/svg+xml',
+    'png': 'image/png',
+    'jpeg': 'image/jpeg',
+    'jpg': 'image/jpeg',
+    'gif': 'image/gif',
+}
+
+# 关闭时重新生成的骨架部件（不直接复制）
+GENERATED_PARTS = (
+    '[Content_Types].xml',
+    'ppt/presentation.xml',
+    'ppt/_rels/presentation.xml.rels',
+    '_rels/.rels',
+)
+
+# 幻灯片 ID 起始值（OOXML 规定 sldId >= 256）
+FIRST_SLIDE_ID = 256
+
+# 本身已压缩、再次 deflate 通常没有收益的格式
+PRECOMPRESSED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'webp', 'bin'}
+
+# 压缩率抽样：取开头一段以最低级别试压缩，压缩后/原始大于该比例则直接存储
+COMPRESSIBILITY_SAMPLE_SIZE = 64 * 1024
+STORE_RATIO_THRESHOLD = 0.9
+
+
+def _read_umask() -> int:
+    """读取进程的 umask（os.umask 只能在设置的同时读取，因此只在导入模块时调用一次）"""
+    mask = os.umask(0o022)
+    os.umask(mask)
+    return mask
+
+
+# 新建输出文件的权限（与直接 open() 创建的文件一致）
+NEW_FILE_MODE = 0o666 & ~_read_umask()
+
+
+def create_temp_file(target: Union[str, Path]) -> str:
+    """
+    在目标文件所在目录创建唯一的临时文件（<文件名>.XXXX.tmp），返回其路径
+
+    同目录保证可以原子替换；唯一文件名使并发写入同一目标的任务互不干扰。
+    """
+    directory, name = os.path.split(os.path.abspath(str(target)))
+    fd, temp_path = tempfile.mkstemp(prefix=f'{name}.', suffix='.tmp', dir=directory)
+    os.close(fd)
+    return temp_path
+
+
+def replace_with_temp(temp_path: Union[str, Path], target: Union[str, Path]):
+    """
+    用写好的临时文件原子替换目标文件
+
+    mkstemp 创建的临时文件权限为 0600：替换前改为目标文件原有的权限，
+    目标不存在时按 umask 设置（与直接写入目标文件的结果相同）。
+    """
+    try:
+        mode = stat.S_IMODE(os.stat(str(target)).st_mode)
+    except OSError:
+        mode = NEW_FILE_MODE
+    os.chmod(str(temp_path), mode)
+    os.replace(str(temp_path), str(target))
+
+
+def is_incompressible(data: bytes) -> bool:
+    """抽样判断数据是否已充分压缩（deflate 收益不足）"""
+    sample = data[:COMPRESSIBILITY_SAMPLE_SIZE]
+    if not sample:
+        return True
+    return len(zlib.compress(sample, 1)) > len(sample) * STORE_RATIO_THRESHOLD
+
+
+class ZipCompressionPolicy:
+    """
+    按部件选择压缩方式
+
+    - PNG/JPEG/GIF 等已压缩媒体: 抽样试压缩，收益不足 10% 时 ZIP_STORED（直接存储），
+      否则按 xml_level 压缩（部分渲染器输出的 PNG 压缩并不充分）
+    - XML/rels 等文本部件: ZIP_DEFLATED，级别 xml_level
+    - SVG: ZIP_DEFLATED，级别 svg_level；超过 large_svg_threshold 的大文件
+      （通常内嵌了 base64 图片）使用 large_svg_level，base64 数据在低级别下
+      即可获得几乎全部压缩收益
+    """
+
+    def __init__(
+        self,
+        xml_level: int = 6,
+        svg_level: Optional[int] = None,
+        large_svg_threshold: int = 512 * 1024,
+        large_svg_level: int = 1,
+        store_precompressed: bool = True
+    ):
+        """
+        Args:
+            xml_level: XML 部件的 deflate 级别（0-9）
+            svg_level: SVG 的 deflate 级别（默认与 xml_level 相同）
+            large_svg_threshold: 大 SVG 阈值（字节）
+            large_svg_level: 大 SVG 的 deflate 级别
+            store_precompressed: 已压缩媒体是否直接存储
+        """
+        self.xml_level = xml_level
+        self.svg_level = xml_level if svg_level is None else svg_level
+        self.large_svg_threshold = large_svg_threshold
+        self.large_svg_level = large_svg_level
+        self.store_precompressed = store_precompressed
+
+    @classmethod
+    def legacy(cls) -> 'ZipCompressionPolicy':
+        """旧版行为：所有部件统一 ZIP_DEFLATED 默认级别（用于基准对比）"""
+        return cls(xml_level=6, large_svg_level=6, store_precompressed=False)
+
+    def choose(self, part_name: str, data: bytes) -> Tuple[int, Optional[int]]:
+        """
+        选择部件的压缩方式
+
+        Returns:
+            (compress_type, compresslevel)
+        """
+        ext = part_name.rsplit('.', 1)[-1].lower() if '.' in part_name else ''
+        if ext in PRECOMPRESSED_EXTENSIONS and self.store_precompressed and is_incompressible(data):
+            return zipfile.ZIP_STORED, None
+        if ext == 'svg':
+            level = self.large_svg_level if len(data) >= self.large_svg_threshold else self.svg_level
+        else:
+            level = self.xml_level
+        if level <= 0:
+            return zipfile.ZIP_STORED, None
+        return zipfile.ZIP_DEFLATED, level
+
+
+@lru_cache(maxsize=16)
+def create_skeleton(width_emu: int, height_emu: int) -> bytes:
+    """
+    使用 python-pptx 生成不含幻灯片的基础 PPTX 骨架
+
+    结果按尺寸缓存：同一进程内多次导出（如 export_daemon.py）只生成一次。
+
+    Args:
+        width_emu: 幻灯片宽度（EMU）
+        height_emu: 幻灯片高度（EMU）
+
+    Returns:
+        骨架 PPTX 的字节内容
+    """
+    if Presentation is None:
+        raise ImportError("缺少 python-pptx 库，请运行: pip install python-pptx")
+
+    prs = Presentation()
+    prs.slide_width = width_emu
+    prs.slide_height = height_emu
+
+    buffer = BytesIO()
+    prs.save(buffer)
+    return buffer.getvalue()
+
+
+class PptxPackageWriter:
+    """
+    流式 PPTX 包写入器
+
+    用法:
+        with PptxPackageWriter(output_path, skeleton) as writer:
+            media_name = writer.add_media('image1.svg', svg_bytes)
+            writer.add_slide(slide_xml, rels_xml, notes_xml, notes_rels_xml)
+    """
+
+    def __init__(
+        self,
+        output: Union[str, Path, BinaryIO],
+        skeleton: bytes,
+        compression: Optional[ZipCompressionPolicy] = None
+    ):
+        """
+        Args:
+            output: 输出文件路径或可写的二进制流（路径输出在 close() 成功后才写入目标文件）
+            skeleton: 骨架 PPTX 的字节内容（见 create_skeleton）
+            compression: 压缩策略（默认 ZipCompressionPolicy()）
+        """
+        self._compression = compression or ZipCompressionPolicy()
+        self._skeleton = zipfile.ZipFile(BytesIO(skeleton), 'r')
+        self._output: Optional[str] = None
+        self._temp_path: Optional[str] = None
+        if isinstance(output, (str, Path)):
+            # 同目录的唯一临时文件：并发写入同一输出路径的任务互不干扰
+            self._output = str(output)
+            self._temp_path = create_temp_file(self._output)
+            output = self._temp_path
+        try:
+            self._zip = zipfile.ZipFile(output, 'w', zipfile.ZIP_DEFLATED)
+        except BaseException:
+            self._remove_temp()
+            raise
+        self._written: set = set()
+        self._media_extensions: set = set()
+        self._media_by_hash: dict = {}
+        self.media_added = 0
+        self.media_deduplicated_bytes = 0
+        self.bytes_written = 0
+        self._overrides: List[Tuple[str, str]] = []
+        self._package_rels: List[Tuple[str, str]] = []
+        self._slide_count = 0
+        self._closed = False
+
+    @property
+    def next_slide_num(self) -> int:
+        """下一张幻灯片的序号（从 1 开始）"""
+        return self._slide_count + 1
+
+    @property
+    def slide_count(self) -> int:
+        """已写入的幻灯片数量"""
+        return self._slide_count
+
+    def write_part(self, part_name: str, data: Union[bytes, str], content_type: Optional[str] = None):
+        """
+        写入任意部件
+
+        Args:
+            part_name: 包内路径（不含开头的 /）
+            data: 部件内容
+            content_type: 需要登记为 Override 的内容类型（可选）
+        """
+        self._writestr(part_name, data)
+        self._written.add(part_name)
+        if content_type:
+            self._overrides.append((f'/{part_name}', content_type))
+
+    def add_media(self, filename: str, data: bytes) -> str:
+        """
+        写入媒体文件到 ppt/media/
+
+        按内容去重：与已写入媒体内容（及扩展名）完全相同时不再重复写入，
+        直接返回已有的文件名，各幻灯片关系文件指向同一部件。
+
+        Args:
+            filename: 媒体文件名（如 image1.svg）
+            data: 文件内容
+
+        Returns:
+            实际使用的媒体文件名（供幻灯片关系文件引用）
+        """
+        ext = filename.rsplit('.', 1)[-1].lower()
+        media_key = (ext, hashlib.sha256(data).hexdigest())
+        self.media_added += 1
+
+        existing = self._media_by_hash.get(media_key)
+        if existing is not None:
+            self.media_deduplicated_bytes += len(data)
+            return existing
+
+        self.write_part(f'ppt/media/{filename}', data)
+        self._media_extensions.add(ext)
+        self._media_by_hash[media_key] = filename
+        return filename
+
+    @property
+    def media_count(self) -> int:
+        """实际写入的（去重后的）媒体文件数量"""
+        return len(self._media_by_hash)
+
+    def add_package_relationship(self, rel_type: str, target: str):
+        """在包级关系文件 _rels/.rels 中登记一个关系"""
+        self._package_rels.append((rel_type, target))
+
+    def write_manifest(self, manifest: dict):
+        """写入导出清单部件，并通过包级关系引用它"""
+        data = json.dumps(manifest, ensure_ascii=False, indent=2, sort_keys=True)
+        self.write_part(MANIFEST_PART, data, CONTENT_TYPE_JSON)
+        self.add_package_relationship(REL_TYPE_EXPORT_MANIFEST, MANIFEST_PART)
+
+    def add_slide(
+        self,
+        slide_xml: str,
+        rels_xml: str,
+        notes_xml: Optional[str] = None,
+        notes_rels_xml: Optional[str] = None
+    ) -> int:
+        """
+        写入一张幻灯片（及可选的备注页）
+
+        幻灯片 XML 与关系文件需按 next_slide_num 生成。
+
+        Returns:
+            该幻灯片的序号
+        """
+        slide_num = self.next_slide_num
+        self.write_part(f'ppt/slides/slide{slide_num}.xml', slide_xml, CONTENT_TYPE_SLIDE)
+        self.write_part(f'ppt/slides/_rels/slide{slide_num}.xml.rels', rels_xml)
+
+        if notes_xml is not None:
+            self.write_part(f'ppt/notesSlides/notesSlide{slide_num}.xml', notes_xml, CONTENT_TYPE_NOTES_SLIDE)
+            if notes_rels_xml is not None:
+                self.write_part(f'ppt/notesSlides/_rels/notesSlide{slide_num}.xml.rels', notes_rels_xml)
+
+        self._slide_count = slide_num
+        return slide_num
+
+    def close(self):
+        """写入生成部件与骨架中未改动的部件，关闭压缩包并替换目标文件"""
+        if self._closed:
+            return
+        self._closed = True
+
+        try:
+            presentation_xml, presentation_rels = self._build_presentation_parts()
+            self._writestr('ppt/presentation.xml', presentation_xml)
+            self._writestr('ppt/_rels/presentation.xml.rels', presentation_rels)
+            self._writestr('[Content_Types].xml', self._build_content_types())
+            self._writestr('_rels/.rels', self._build_package_rels())
+
+            # 直接复制骨架中未改动的部件
+            for info in self._skeleton.infolist():
+                name = info.filename
+                if name in GENERATED_PARTS or name in self._written:
+                    continue
+                self._writestr(info, self._skeleton.read(name))
+            self._zip.close()
+            if self._temp_path is not None:
+                replace_with_temp(self._temp_path, self._output)
+                self._temp_path = None
+        except BaseException:
+            try:
+                self._zip.close()
+            finally:
+                self._remove_temp()
+            raise
+        finally:
+            self._skeleton.close()
+
+    def abort(self):
+        """放弃写入：不生成演示文稿部件，关闭压缩包并删除临时文件（目标文件保持不变）"""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._zip.close()
+        finally:
+            self._skeleton.close()
+            self._remove_temp()
+
+    def _remove_temp(self):
+        """删除尚未替换到目标位置的临时文件"""
+        if self._temp_path is not None:
+            try:
+                os.unlink(self._temp_path)
+            except OSError:
+                pass
+            self._temp_path = None
+
+    def _writestr(self, part: Union[str, zipfile.ZipInfo], data: Union[bytes, str]):
+        """按压缩策略写入一个 zip 条目"""
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        name = part.filename if isinstance(part, zipfile.ZipInfo) else part
+        compress_type, level = self._compression.choose(name, data)
+        self._zip.writestr(part, data, compress_type=compress_type, compresslevel=level)
+        self.bytes_written += self._zip.filelist[-1].compress_size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
+        return False
+
+    def _build_presentation_parts(self) -> Tuple[str, str]:
+        """在 presentation.xml 中登记幻灯片列表，并添加对应的关系"""
+        presentation_xml = self._skeleton.read('ppt/presentation.xml').decode('utf-8')
+        rels_xml = self._skeleton.read('ppt/_rels/presentation.xml.rels').decode('utf-8')
+
+        if self._slide_count == 0:
+            return presentation_xml, rels_xml
+
+        # 新关系 ID 从骨架中已有的最大编号之后开始
+        existing_ids = [int(n) for n in re.findall(r'Id="rId(\d+)"', rels_xml)]
+        next_rid = max(existing_ids, default=0) + 1
+
+        sld_ids = []
+        relationships = []
+        for slide_num in range(1, self._slide_count + 1):
+            rid = f'rId{next_rid}'
+            next_rid += 1
+            sld_ids.append(f'<p:sldId id="{FIRST_SLIDE_ID + slide_num - 1}" r:id="{rid}"/>')
+            relationships.append(
+                f'<Relationship Id="{rid}" Type="{REL_TYPE_SLIDE}" Target="slides/slide{slide_num}.xml"/>'
+            )
+
+        # sldIdLst 必须位于 sldSz 之前（位于各类 MasterIdLst 之后）
+        sld_id_lst = '<p:sldIdLst>' + ''.join(sld_ids) + '</p:sldIdLst>'
+        presentation_xml = presentation_xml.replace('<p:sldSz', sld_id_lst + '<p:sldSz', 1)
+        rels_xml = rels_xml.replace('</Relationships>', ''.join(relationships) + '</Relationships>')
+
+        return presentation_xml, rels_xml
+
+    def _build_package_rels(self) -> str:
+        """在骨架的 _rels/.rels 中补充包级关系"""
+        rels_xml = self._skeleton.read('_rels/.rels').decode('utf-8')
+        if not self._package_rels:
+            return rels_xml
+
+        existing_ids = [int(n) for n in re.findall(r'Id="rId(\d+)"', rels_xml)]
+        next_rid = max(existing_ids, default=0) + 1
+
+        relationships = []
+        for rel_type, target in self._package_rels:
+            relationships.append(f'<Relationship Id="rId{next_rid}" Type="{rel_type}" Target="{target}"/>')
+            next_rid += 1
+        return rels_xml.replace('</Relationships>', ''.join(relationships) + '</Relationships>')
+
+    def _build_content_types(self) -> str:
+        """在骨架的 [Content_Types].xml 中补充媒体类型与幻灯片/备注的 Override"""
+        content_types = self._skeleton.read('[Content_Types].xml').decode('utf-8')
+
+        entries = []
+        for ext in sorted(self._media_extensions):
+            if f'Extension="{ext}"' not in content_types and ext in MEDIA_CONTENT_TYPES:
+                entries.append(f'<Default Extension="{ext}" ContentType="{MEDIA_CONTENT_TYPES[ext]}"/>')
+        for part_name, content_type in self._overrides:
+            if f'PartName="{part_name}"' not in content_types:
+                entries.append(f'<Override PartName="{part_name}" ContentType="{content_type}"/>')
+
+        if entries:
+            content_types = content_types.replace('</Types>', ''.join(entries) + '</Types>')
+        return content_types
+
+
+def read_manifest(package: zipfile.ZipFile) -> Optional[dict]:
+    """
+    读取 PPTX 包中的导出清单
+
+    Args:
+        package: 已打开的 PPTX 压缩包
+
+    Returns:
+        清单字典；不存在或无法解析时返回 None
+    """
+    try:
+        return json.loads(package.read(MANIFEST_PART).decode('utf-8'))
+    except (KeyError, ValueError):
+        return None
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+PPT Master - PNG 渲染缓存
+
+为 svg_to_pptx.py 的 PNG 后备图片提供按内容寻址的磁盘缓存。
+缓存键由以下内容共同决定：
+    - SVG 文件内容的哈希
+    - SVG 引用的本地图片（路径、大小、修改时间）
+    - 输出像素尺寸
+    - 渲染器名称与版本（cairosvg / svglib）
+
+缓存总大小超过上限时按最近使用时间（LRU）淘汰。
+文档缩略图（JPEG）单独缓存在缓存目录的 thumbnail/ 子目录中。
+
+用法:
+    python3 tools/render_cache.py info            # 查看缓存目录、条目数与占用
+    python3 tools/render_cache.py clear           # 清空缓存
+    python3 tools/render_cache.py prune --max-mb 200
+
+环境变量:
+    PPT_MASTER_CACHE_DIR     缓存目录（默认 ~/.cache/ppt-master/png）
+    PPT_MASTER_CACHE_MAX_MB  缓存上限，单位 MB（默认 512）
+"""
+
+import os
+import re
+import sys
+import html
+import hashlib
+import argparse
+import tempfile
+from pathlib import Path
+from typing import Optional, List, Tuple
+
+
+# 默认缓存目录与容量上限
+DEFAULT_CACHE_DIR = Path.home() / '.cache' / 'ppt-master' / 'png'
+DEFAULT_MAX_MB = 512
+
+# 文档缩略图缓存（缓存目录下的子目录，条目为 JPEG）
+THUMBNAIL_CACHE_SUBDIR = 'thumbnail'
+
+# 缓存格式版本（键的组成方式变化时递增）
+CACHE_VERSION = 1
+
+# SVG 中引用的外部文件（排除 data: 内嵌与网络地址）
+EXTERNAL_HREF_PATTERN = re.compile(r'href="(?!data:|https?:|#)([^"]+)"')
+
+
+def get_default_cache_dir() -> Path:
+    """获取缓存目录（优先使用环境变量 PPT_MASTER_CACHE_DIR）"""
+    env_dir = os.environ.get('PPT_MASTER_CACHE_DIR')
+    return Path(env_dir).expanduser() if env_dir else DEFAULT_CACHE_DIR
+
+
+def get_default_max_bytes() -> int:
+    """获取缓存容量上限（优先使用环境变量 PPT_MASTER_CACHE_MAX_MB）"""
+    try:
+        max_mb = float(os.environ.get('PPT_MASTER_CACHE_MAX_MB', DEFAULT_MAX_MB))
+    except ValueError:
+        max_mb = DEFAULT_MAX_MB
+    return int(max_mb * 1024 * 1024)
+
+
+def format_size(size_bytes: int) -> str:
+    """将字节数转换为可读的大小"""
+    if size_bytes < 1024:
+        return f"{size_bytes} B"
+    elif size_bytes < 1024 * 1024:
+        return f"{size_bytes / 1024:.1f} KB"
+    else:
+        return f"{size_bytes / (1024 * 1024):.1f} MB"
+
+
+class RenderCache:
+    """按内容寻址的 PNG 渲染缓存（LRU 淘汰）"""
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_bytes: Optional[int] = None,
+                 extension: str = 'png'):
+        """
+        Args:
+            cache_dir: 缓存目录（默认见 get_default_cache_dir）
+            max_bytes: 缓存容量上限（字节，默认见 get_default_max_bytes）
+            extension: 条目文件扩展名（与缓存内容的格式一致）
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else get_default_cache_dir()
+        self.max_bytes = max_bytes if max_bytes is not None else get_default_max_bytes()
+        self.extension = extension
+        self.hits = 0
+        self.misses = 0
+
+    def make_key(self, svg_data: bytes, width: int, height: int, renderer: str,
+                 svg_dir: Optional[Path] = None) -> str:
+        """
+        计算缓存键
+
+        Args:
+            svg_data: SVG 文件内容
+            width: 输出宽度（像素）
+            height: 输出高度（像素）
+            renderer: 渲染器标识（含版本）
+            svg_dir: SVG 所在目录，用于定位引用的本地图片
+
+        Returns:
+            十六进制缓存键
+        """
+        digest = hashlib.sha256()
+        digest.update(f'v{CACHE_VERSION}|{renderer}|{width}x{height}|'.encode('utf-8'))
+        digest.update(svg_data)
+
+        # 未内嵌的本地图片变化时也需要重新渲染
+        if svg_dir is not None:
+            text = svg_data.decode('utf-8', errors='ignore')
+            for href in sorted(set(EXTERNAL_HREF_PATTERN.findall(text))):
+                ref_path = Path(html.unescape(href))
+                if not ref_path.is_absolute():
+                    ref_path = svg_dir / ref_path
+                try:
+                    stat = ref_path.stat()
+                    digest.update(f'|{href}:{stat.st_size}:{stat.st_mtime_ns}'.encode('utf-8'))
+                except OSError:
+                    digest.update(f'|{href}:missing'.encode('utf-8'))
+
+        return digest.hexdigest()
+
+    def thumbnail_cache(self) -> 'RenderCache':
+        """文档缩略图缓存（本缓存目录下的 thumbnail/，条目为 JPEG，与 PNG 条目分开统计与淘汰）"""
+        return RenderCache(self.cache_dir / THUMBNAIL_CACHE_SUBDIR, self.max_bytes, extension='jpeg')
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f'{key}.{self.extension}'
+
+    def get(self, key: str) -> Optional[bytes]:
+        """读取缓存，命中时刷新访问时间（用于 LRU）"""
+        path = self._entry_path(key)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            self.misses += 1
+            return None
+
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        self.hits += 1
+        return data
+
+    def put(self, key: str, data: bytes):
+        """写入缓存（先写临时文件再原子替换，多进程并发写入安全）"""
+        path = self._entry_path(key)
+        tmp_name = None
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=str(path.parent), suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_name, path)
+        except OSError:
+            # 缓存写入失败不影响导出，只清理写了一半的临时文件
+            if tmp_name is not None:
+                try:
+                    os.unlink(tmp_name)
+                except OSError:
+                    pass
+
+    def _list_entries(self) -> List[Tuple[float, int, Path]]:
+        """
+        列出全部缓存条目: (最近使用时间, 大小, 路径)
+
+        包括写入中断（如进程被终止）遗留的 *.tmp 临时文件，它们同样占用空间，
+        最近使用时间早于其他条目时在 prune/clear 中一并删除。
+        """
+        entries = []
+        if not self.cache_dir.exists():
+            return entries
+        paths = list(self.cache_dir.glob(f'*/*.{self.extension}')) + list(self.cache_dir.glob('*/*.tmp'))
+        for path in paths:
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def prune(self, max_bytes: Optional[int] = None) -> int:
+        """
+        按 LRU 淘汰缓存，直到总大小不超过上限
+
+        Returns:
+            删除的条目数
+        """
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        entries = self._list_entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+
+        for _, size, path in sorted(entries):
+            if total <= limit:
+                break
+            try:
+                path.unlink()
+                total -= size
+                removed += 1
+            except OSError:
+                pass
+        return removed
+
+    def clear(self) -> int:
+        """清空缓存，返回删除的条目数"""
+        return self.prune(max_bytes=0)
+
+    def stats(self) -> dict:
+        """缓存统计信息"""
+        entries = self._list_entries()
+        return {
+            'dir': str(self.cache_dir),
+            'entries': len(entries),
+            'bytes': sum(size for _, size, _ in entries),
+            'max_bytes': self.max_bytes,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='PPT Master - PNG 渲染缓存管理',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+示例:
+  %(prog)s info                  # 查看缓存信息
+  %(prog)s clear                 # 清空缓存
+  %(prog)s prune --max-mb 200    # 按 LRU 淘汰至 200 MB 以内
+
+环境变量:
+  PPT_MASTER_CACHE_DIR     缓存目录（默认 ~/.cache/ppt-master/png）
+  PPT_MASTER_CACHE_MAX_MB  缓存上限 MB（默认 512）
+        '''
+    )
+    parser.add_argument('command', choices=['info', 'clear', 'prune'], help='操作')
+    parser.add_argument('--cache-dir', type=Path, default=None, help='缓存目录')
+    parser.add_argument('--max-mb', type=float, default=None, help='prune 使用的容量上限（MB）')
+
+    args = parser.parse_args()
+
+    max_bytes = int(args.max_mb * 1024 * 1024) if args.max_mb is not None else None
+    cache = RenderCache(args.cache_dir, max_bytes)
+    thumbnails = cache.thumbnail_cache()
+
+    if args.command == 'info':
+        stats = cache.stats()
+        thumbnail_stats = thumbnails.stats()
+        print(f"缓存目录: {stats['dir']}")
+        print(f"条目数:   {stats['entries']}（另有缩略图 {thumbnail_stats['entries']} 个，"
+              f"{format_size(thumbnail_stats['bytes'])}）")
+        print(f"占用:     {format_size(stats['bytes'])} / {format_size(stats['max_bytes'])}")
+    elif args.command == 'clear':
+        removed = cache.clear() + thumbnails.clear()
+        print(f"[OK] 已清空缓存，删除 {removed} 个条目")
+    else:
+        removed = cache.prune() + thumbnails.prune()
+        print(f"[OK] 已淘汰 {removed} 个条目")
+        print(f"  当前占用: {format_size(cache.stats()['bytes'])}")
+
+    sys.exit(0)
+
+
+if __name__ == '__main__':
+    main()
@@ -16,6 +16,8 @@ from pathlib import Path
 from typing import List, Dict, Tuple
 from collections import defaultdict
 
+from canvas_scan import SlideCanvas, describe_canvas, find_canvas_mismatches, parse_svg_canvas
+
 try:
     from project_utils import CANVAS_FORMATS
     from error_helper import ErrorHelper
@@ -76,6 +78,9 @@ class SVGQualityChecker:
 
             # 1. 检查 viewBox
             self._check_viewbox(content, result, expected_format)
+            canvas_size = parse_svg_canvas(content).size
+            if canvas_size is not None:
+                result['info']['canvas'] = canvas_size
 
             # 2. 检查禁用元素
             self._check_forbidden_elements(content, result)
@@ -306,12 +311,42 @@ class SVGQualityChecker:
 
         print(f"\n[SCAN] 检查 {len(svg_files)} 个 SVG 文件...\n")
 
+        start = len(self.results)
         for svg_file in svg_files:
             result = self.check_file(str(svg_file), expected_format)
             self._print_result(result)
 
+        # 未指定格式时检查各页画布是否一致（指定格式时已在 viewBox 检查中报错）
+        if not expected_format:
+            self._check_canvas_consistency(self.results[start:])
+
         return self.results
 
+    def _check_canvas_consistency(self, results: List[Dict]):
+        """检查同一目录内各页的画布尺寸是否与第一页一致"""
+        checked = [result for result in results if 'canvas' in result.get('info', {})]
+        if len(checked) < 2:
+            return
+        canvases = [SlideCanvas(result['file'], *result['info']['canvas']) for result in checked]
+        reference = canvases[0].size
+        mismatched = find_canvas_mismatches(canvases, reference)
+        if not mismatched:
+            return
+
+        print(f"[WARN] 画布尺寸不一致: {len(mismatched)}/{len(canvases)} 页与第一页 "
+              f"{describe_canvas(reference)} 不同")
+        for index in mismatched:
+            result = checked[index]
+            if result['passed'] and not result['warnings']:
+                self.summary['passed'] -= 1
+                self.summary['warnings'] += 1
+            result['warnings'].append(
+                f"画布尺寸 {describe_canvas(canvases[index].size)} 与第一页 {describe_canvas(reference)} 不一致"
+            )
+            print(f"   - {result['file']}: {describe_canvas(canvases[index].size)}")
+        print(f"   导出时默认等比缩放居中（svg_to_pptx.py --canvas-mismatch split 可拆分为单独的演示文稿）")
+        print()
+
     def _print_result(self, result: Dict):
         """打印单个文件的检查结果"""
         if result['passed']:
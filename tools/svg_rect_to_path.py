@@ -75,38 +75,22 @@ def parse_float(val: str, default: float = 0.0) -> float:
         return default
 
 
-def process_svg(content: str, verbose: bool = False) -> Tuple[str, int]:
+def convert_rounded_rects(root: ET.Element, verbose: bool = False) -> int:
     """
-    处理 SVG 内容，将圆角矩形转换为 path
-    返回 (处理后的内容, 转换数量)
+    将已解析的 SVG 文档树中的圆角矩形转换为 path（原地修改）
+    返回转换数量
     """
     converted_count = 0
     
-    # 保存原始 XML 声明
-    xml_declaration = ''
-    if content.strip().startswith('<?xml'):
-        match = re.match(r'(<\?xml[^?]*\?>)', content)
-        if match:
-            xml_declaration = match.group(1) + '\n'
-    
-    # 注册 SVG 命名空间
-    ET.register_namespace('', 'http://www.w3.org/2000/svg')
-    ET.register_namespace('xlink', 'http://www.w3.org/1999/xlink')
-    
-    try:
-        root = ET.fromstring(content)
-    except ET.ParseError as e:
-        if verbose:
-            print(f"    XML 解析错误: {e}")
-        return content, 0
-    
     # 获取默认命名空间
     ns = ''
     if root.tag.startswith('{'):
         ns = root.tag.split('}')[0] + '}'
     
     def get_tag_name(tag):
-        """获取不带命名空间的标签名"""
+        """获取不带命名空间的标签名（注释等非元素节点返回空字符串）"""
+        if not isinstance(tag, str):
+            return ''
         if tag.startswith('{'):
             return tag.split('}')[1]
         return tag
@@ -160,6 +144,34 @@ def process_svg(content: str, verbose: bool = False) -> Tuple[str, int]:
     # 处理所有元素
     process_element(root)
     
+    return converted_count
+
+
+def process_svg(content: str, verbose: bool = False) -> Tuple[str, int]:
+    """
+    处理 SVG 内容，将圆角矩形转换为 path
+    返回 (处理后的内容, 转换数量)
+    """
+    # 保存原始 XML 声明
+    xml_declaration = ''
+    if content.strip().startswith('<?xml'):
+        match = re.match(r'(<\?xml[^?]*\?>)', content)
+        if match:
+            xml_declaration = match.group(1) + '\n'
+    
+    # 注册 SVG 命名空间
+    ET.register_namespace('', 'http://www.w3.org/2000/svg')
+    ET.register_namespace('xlink', 'http://www.w3.org/1999/xlink')
+    
+    try:
+        root = ET.fromstring(content)
+    except ET.ParseError as e:
+        if verbose:
+            print(f"    XML 解析错误: {e}")
+        return content, 0
+    
+    converted_count = convert_rounded_rects(root, verbose)
+    
     # 转换回字符串
     result = ET.tostring(root, encoding='unicode')
     
@@ -0,0 +1,1271 @@
+#!/usr/bin/env python3
+"""
+PPT Master - SVG 转 DrawingML 原生形状
+
+将项目规范内的 SVG 子集（rect/circle/ellipse/line/polyline/polygon/path/text/image，
+内联填充与描边，线性/径向渐变）转换为 PowerPoint 原生形状 XML：
+    - rect / circle / ellipse → p:sp + a:prstGeom（rect/roundRect/ellipse）
+    - path / polygon / line   → p:sp + a:custGeom（圆弧转换为三次贝塞尔曲线）
+    - text / tspan            → 文本框（p:sp txBox="1"），每个定位的 tspan 为一个段落
+    - image                   → p:pic（data URI 或本地文件）
+    - g                       → p:grpSp（保持分组，便于在 PowerPoint 中编辑）
+    - filter（投影、发光）     → a:effectLst（outerShdw / glow）
+
+无需光栅化，导出的形状可直接在 PowerPoint 中编辑。
+不支持的内容（其他滤镜、clipPath、mask、pattern、marker、<use>）会被跳过并给出警告。
+
+用法:
+    python3 tools/svg_to_drawingml.py <SVG 文件或目录>    # 检查转换情况
+
+依赖: 无（纯 XML 生成）
+"""
+
+import re
+import sys
+import math
+import base64
+import argparse
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional, List, Tuple, Dict
+from urllib.parse import unquote
+from xml.etree import ElementTree as ET
+
+
+# ============================================================================
+# 常量
+# ============================================================================
+
+SVG_NS = 'http://www.w3.org/2000/svg'
+XLINK_NS = 'http://www.w3.org/1999/xlink'
+
+EMU_PER_POINT = 12700
+
+# 文本基线到文本框顶部的距离（相对字号的经验值）
+TEXT_ASCENT_RATIO = 0.9
+# 未指定行距时的默认行高（相对字号）
+DEFAULT_LINE_HEIGHT = 1.2
+
+# 可继承的样式属性
+INHERITED_PROPERTIES = (
+    'fill', 'fill-opacity', 'fill-rule', 'stroke', 'stroke-width', 'stroke-opacity',
+    'stroke-dasharray', 'stroke-linecap', 'stroke-linejoin', 'color',
+    'font-family', 'font-size', 'font-weight', 'font-style', 'text-anchor',
+    'letter-spacing', 'text-decoration', 'visibility',
+)
+
+# 通用字体族名（不作为 PowerPoint 字体名）
+GENERIC_FONT_FAMILIES = {
+    'serif', 'sans-serif', 'monospace', 'cursive', 'fantasy', 'system-ui',
+    '-apple-system', 'blinkmacsystemfont', 'ui-sans-serif', 'ui-serif', 'ui-monospace',
+    'emoji', 'math', 'fangsong',
+}
+
+# 常用 CSS 颜色名
+NAMED_COLORS = {
+    'black': '000000', 'white': 'FFFFFF', 'red': 'FF0000', 'green': '008000',
+    'blue': '0000FF', 'yellow': 'FFFF00', 'orange': 'FFA500', 'purple': '800080',
+    'gray': '808080', 'grey': '808080', 'silver': 'C0C0C0', 'navy': '000080',
+    'teal': '008080', 'maroon': '800000', 'olive': '808000', 'lime': '00FF00',
+    'aqua': '00FFFF', 'cyan': '00FFFF', 'fuchsia': 'FF00FF', 'magenta': 'FF00FF',
+    'gold': 'FFD700', 'pink': 'FFC0CB', 'brown': 'A52A2A', 'darkgray': 'A9A9A9',
+    'darkgrey': 'A9A9A9', 'lightgray': 'D3D3D3', 'lightgrey': 'D3D3D3',
+    'whitesmoke': 'F5F5F5', 'gainsboro': 'DCDCDC', 'dimgray': '696969', 'dimgrey': '696969',
+}
+
+# 跳过且不提示的元素
+IGNORED_ELEMENTS = {
+    'defs', 'title', 'desc', 'metadata', 'style', 'linearGradient', 'radialGradient',
+    'filter', 'symbol', 'namedview',
+}
+
+# 不支持的元素及提示
+UNSUPPORTED_ELEMENTS = {
+    'clipPath': 'clipPath 裁剪路径',
+    'mask': 'mask 遮罩',
+    'pattern': 'pattern 图案填充',
+    'marker': 'marker 箭头',
+    'use': '<use> 引用（请先运行 finalize_svg.py 嵌入图标）',
+    'foreignObject': 'foreignObject',
+}
+
+IMAGE_EXTENSIONS = {
+    'image/png': 'png', 'image/jpeg': 'jpeg', 'image/jpg': 'jpeg', 'image/gif': 'gif',
+}
+
+Matrix = Tuple[float, float, float, float, float, float]
+IDENTITY: Matrix = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+
+
+@dataclass
+class NativeSlide:
+    """SVG 转换结果"""
+    shapes_xml: str
+    images: List[Tuple[str, bytes]] = field(default_factory=list)  # (扩展名, 内容)，关系 ID 依次为 rIdImg1...
+    warnings: List[str] = field(default_factory=list)
+    shape_count: int = 0
+
+
+# ============================================================================
+# 基础解析
+# ============================================================================
+
+def local_name(tag: str) -> str:
+    """去除命名空间前缀"""
+    return tag.rsplit('}', 1)[-1] if '}' in tag else tag.rsplit(':', 1)[-1]
+
+
+def parse_length(value: Optional[str], default: float = 0.0, reference: float = 0.0) -> float:
+    """解析长度（支持 px/pt/百分比，百分比相对 reference）"""
+    if value is None:
+        return default
+    value = value.strip()
+    match = re.match(r'^([+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)\s*(px|pt|%|em)?$', value)
+    if not match:
+        return default
+    number = float(match.group(1))
+    unit = match.group(2)
+    if unit == '%':
+        return number * reference / 100
+    if unit == 'pt':
+        return number * 96 / 72
+    if unit == 'em':
+        return number * 16
+    return number
+
+
+def parse_numbers(text: str) -> List[float]:
+    """解析数字列表（逗号或空白分隔）"""
+    return [float(n) for n in re.findall(r'[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?', text or '')]
+
+
+def parse_style(element: ET.Element) -> Dict[str, str]:
+    """合并元素的表现属性与 style 属性（style 优先）"""
+    props = {}
+    for key, value in element.attrib.items():
+        props[local_name(key)] = value
+    style = element.get('style')
+    if style:
+        for declaration in style.split(';'):
+            if ':' in declaration:
+                key, value = declaration.split(':', 1)
+                props[key.strip()] = value.strip()
+    return props
+
+
+def parse_color(value: Optional[str], current_color: str = '000000') -> Optional[str]:
+    """解析颜色为 RRGGBB；none/transparent 返回 None"""
+    if value is None:
+        return None
+    value = value.strip()
+    lower = value.lower()
+    if lower in ('none', 'transparent', ''):
+        return None
+    if lower == 'currentcolor':
+        return current_color
+    if value.startswith('#'):
+        hex_value = value[1:]
+        if len(hex_value) in (3, 4):
+            hex_value = ''.join(c * 2 for c in hex_value[:3])
+        if len(hex_value) >= 6 and re.match(r'^[0-9a-fA-F]{6}', hex_value):
+            return hex_value[:6].upper()
+        return None
+    match = re.match(r'rgba?\(([^)]*)\)', lower)
+    if match:
+        # rgb(1, 2, 3) / rgba(1, 2, 3, 0.5) / CSS4 rgb(1 2 3) / rgb(1 2 3 / 50%)（透明度不在此处理）
+        body = match.group(1).split('/')[0]
+        parts = [p for p in re.split(r'[\s,]+', body.strip()) if p]
+        if len(parts) == 4 and '/' not in match.group(1) and ',' in body:
+            parts = parts[:3]
+        if len(parts) != 3:
+            return None
+        channels = []
+        try:
+            for part in parts:
+                if part.endswith('%'):
+                    channels.append(round(float(part[:-1]) * 2.55))
+                else:
+                    channels.append(round(float(part)))
+        except ValueError:
+            return None
+        return ''.join(f'{max(0, min(255, c)):02X}' for c in channels)
+    return NAMED_COLORS.get(lower)
+
+
+def parse_opacity(value: Optional[str]) -> float:
+    """解析透明度（0-1，支持百分比）"""
+    if value is None:
+        return 1.0
+    value = value.strip()
+    try:
+        if value.endswith('%'):
+            return max(0.0, min(1.0, float(value[:-1]) / 100))
+        return max(0.0, min(1.0, float(value)))
+    except ValueError:
+        return 1.0
+
+
+# ============================================================================
+# 变换矩阵
+# ============================================================================
+
+def multiply(m1: Matrix, m2: Matrix) -> Matrix:
+    """矩阵相乘 m1 × m2（先应用 m2）"""
+    a1, b1, c1, d1, e1, f1 = m1
+    a2, b2, c2, d2, e2, f2 = m2
+    return (
+        a1 * a2 + c1 * b2,
+        b1 * a2 + d1 * b2,
+        a1 * c2 + c1 * d2,
+        b1 * c2 + d1 * d2,
+        a1 * e2 + c1 * f2 + e1,
+        b1 * e2 + d1 * f2 + f1,
+    )
+
+
+def parse_transform(value: Optional[str]) -> Matrix:
+    """解析 transform 属性"""
+    matrix = IDENTITY
+    if not value:
+        return matrix
+    for name, args in re.findall(r'(matrix|translate|scale|rotate|skewX|skewY)\s*\(([^)]*)\)', value):
+        nums = parse_numbers(args)
+        if name == 'matrix' and len(nums) == 6:
+            local = tuple(nums)
+        elif name == 'translate' and nums:
+            local = (1, 0, 0, 1, nums[0], nums[1] if len(nums) > 1 else 0)
+        elif name == 'scale' and nums:
+            local = (nums[0], 0, 0, nums[1] if len(nums) > 1 else nums[0], 0, 0)
+        elif name == 'rotate' and nums:
+            angle = math.radians(nums[0])
+            cos_a, sin_a = math.cos(angle), math.sin(angle)
+            local = (cos_a, sin_a, -sin_a, cos_a, 0, 0)
+            if len(nums) >= 3:
+                cx, cy = nums[1], nums[2]
+                local = multiply(multiply((1, 0, 0, 1, cx, cy), local), (1, 0, 0, 1, -cx, -cy))
+        elif name == 'skewX' and nums:
+            local = (1, 0, math.tan(math.radians(nums[0])), 1, 0, 0)
+        elif name == 'skewY' and nums:
+            local = (1, math.tan(math.radians(nums[0])), 0, 1, 0, 0)
+        else:
+            continue
+        matrix = multiply(matrix, local)
+    return matrix
+
+
+def apply(matrix: Matrix, x: float, y: float) -> Tuple[float, float]:
+    """对点应用变换"""
+    a, b, c, d, e, f = matrix
+    return a * x + c * y + e, b * x + d * y + f
+
+
+def matrix_scale(matrix: Matrix) -> float:
+    """矩阵的平均缩放系数（用于线宽、字号）"""
+    a, b, c, d, _, _ = matrix
+    return math.sqrt(abs(a * d - b * c))
+
+
+def is_axis_aligned(matrix: Matrix) -> bool:
+    """矩阵是否只包含平移与正向缩放（可使用预设形状）"""
+    a, b, c, d, _, _ = matrix
+    return abs(b) < 1e-9 and abs(c) < 1e-9 and a > 0 and d > 0
+
+
+# ============================================================================
+# 路径解析（统一转换为绝对坐标的 M/L/C/Z）
+# ============================================================================
+
+PATH_TOKEN = re.compile(r'([MmZzLlHhVvCcSsQqTtAa])|([+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)')
+PARAM_COUNTS = {'M': 2, 'L': 2, 'H': 1, 'V': 1, 'C': 6, 'S': 4, 'Q': 4, 'T': 2, 'A': 7, 'Z': 0}
+
+
+def tokenize_path(d: str) -> List:
+    """将 d 属性拆分为命令与数字（圆弧标志位可以紧凑书写，如 a1 1 0 01 5 5）"""
+    tokens = []
+    command = None
+    arg_index = 0
+    pos = 0
+    while pos < len(d):
+        char = d[pos]
+        if char in ' ,\t\r\n':
+            pos += 1
+            continue
+        if char.isalpha():
+            if char.upper() not in PARAM_COUNTS:
+                raise ValueError(f"未知路径命令: {char}")
+            command = char.upper()
+            arg_index = 0
+            tokens.append(char)
+            pos += 1
+            continue
+        # 圆弧的第 4、5 个参数为单字符标志位
+        if command == 'A' and arg_index % 7 in (3, 4) and char in '01':
+            tokens.append(float(char))
+            arg_index += 1
+            pos += 1
+            continue
+        match = PATH_TOKEN.match(d, pos)
+        if not match or match.group(2) is None:
+            raise ValueError(f"无法解析路径数据: {d[pos:pos + 20]}")
+        tokens.append(float(match.group(2)))
+        arg_index += 1
+        pos = match.end()
+    return tokens
+
+
+def arc_to_beziers(x1: float, y1: float, rx: float, ry: float, angle: float,
+                   large_arc: bool, sweep: bool, x2: float, y2: float) -> List[Tuple[float, ...]]:
+    """将 SVG 圆弧转换为三次贝塞尔曲线段（SVG 规范 F.6.5）"""
+    if rx == 0 or ry == 0:
+        return [(x1, y1, x2, y2, x2, y2)]
+    rx, ry = abs(rx), abs(ry)
+    phi = math.radians(angle % 360)
+    cos_phi, sin_phi = math.cos(phi), math.sin(phi)
+
+    dx, dy = (x1 - x2) / 2, (y1 - y2) / 2
+    x1p = cos_phi * dx + sin_phi * dy
+    y1p = -sin_phi * dx + cos_phi * dy
+
+    # 半径不足时按比例放大
+    lam = (x1p * x1p) / (rx * rx) + (y1p * y1p) / (ry * ry)
+    if lam > 1:
+        scale = math.sqrt(lam)
+        rx, ry = rx * scale, ry * scale
+
+    numerator = rx * rx * ry * ry - rx * rx * y1p * y1p - ry * ry * x1p * x1p
+    denominator = rx * rx * y1p * y1p + ry * ry * x1p * x1p
+    coef = math.sqrt(max(0.0, numerator / denominator)) if denominator else 0.0
+    if large_arc == sweep:
+        coef = -coef
+    cxp = coef * rx * y1p / ry
+    cyp = -coef * ry * x1p / rx
+    cx = cos_phi * cxp - sin_phi * cyp + (x1 + x2) / 2
+    cy = sin_phi * cxp + cos_phi * cyp + (y1 + y2) / 2
+
+    def vector_angle(ux, uy, vx, vy):
+        return math.atan2(ux * vy - uy * vx, ux * vx + uy * vy)
+
+    theta1 = vector_angle(1, 0, (x1p - cxp) / rx, (y1p - cyp) / ry)
+    delta = vector_angle((x1p - cxp) / rx, (y1p - cyp) / ry, (-x1p - cxp) / rx, (-y1p - cyp) / ry)
+    if not sweep and delta > 0:
+        delta -= 2 * math.pi
+    elif sweep and delta < 0:
+        delta += 2 * math.pi
+
+    segments = max(1, int(math.ceil(abs(delta) / (math.pi / 2) - 1e-9)))
+    step = delta / segments
+    kappa = 4 / 3 * math.tan(step / 4)
+
+    def point(theta):
+        cos_t, sin_t = math.cos(theta), math.sin(theta)
+        return (cx + rx * cos_phi * cos_t - ry * sin_phi * sin_t,
+                cy + rx * sin_phi * cos_t + ry * cos_phi * sin_t)
+
+    def derivative(theta):
+        cos_t, sin_t = math.cos(theta), math.sin(theta)
+        return (-rx * cos_phi * sin_t - ry * sin_phi * cos_t,
+                -rx * sin_phi * sin_t + ry * cos_phi * cos_t)
+
+    curves = []
+    theta = theta1
+    start = (x1, y1)
+    for index in range(segments):
+        theta_next = theta + step
+        end = (x2, y2) if index == segments - 1 else point(theta_next)
+        d1 = derivative(theta)
+        d2 = derivative(theta_next)
+        curves.append((
+            start[0] + kappa * d1[0], start[1] + kappa * d1[1],
+            end[0] - kappa * d2[0], end[1] - kappa * d2[1],
+            end[0], end[1],
+        ))
+        start = end
+        theta = theta_next
+    return curves
+
+
+def parse_path(d: str) -> List[Tuple]:
+    """
+    解析路径数据
+
+    Returns:
+        命令列表：('M', x, y) / ('L', x, y) / ('C', x1, y1, x2, y2, x, y) / ('Z',)
+    """
+    tokens = tokenize_path(d or '')
+    commands = []
+    x = y = start_x = start_y = 0.0
+    last_control = None  # 上一段三次曲线的第二控制点（S 命令使用）
+    last_quad = None     # 上一段二次曲线的控制点（T 命令使用）
+    index = 0
+    command = None
+
+    while index < len(tokens):
+        token = tokens[index]
+        if isinstance(token, str):
+            command = token
+            index += 1
+            if command in 'Zz':
+                commands.append(('Z',))
+                x, y = start_x, start_y
+                last_control = last_quad = None
+                continue
+        elif command is None:
+            raise ValueError("路径数据必须以命令开头")
+
+        upper = command.upper()
+        count = PARAM_COUNTS[upper]
+        args = tokens[index:index + count]
+        if len(args) < count or any(isinstance(a, str) for a in args):
+            break
+        index += count
+        relative = command.islower()
+        ox, oy = (x, y) if relative else (0.0, 0.0)
+
+        if upper == 'M':
+            x, y = args[0] + ox, args[1] + oy
+            start_x, start_y = x, y
+            commands.append(('M', x, y))
+            # M 之后的隐式坐标按 L 处理
+            command = 'l' if relative else 'L'
+            last_control = last_quad = None
+        elif upper in ('L', 'H', 'V'):
+            if upper == 'L':
+                x, y = args[0] + ox, args[1] + oy
+            elif upper == 'H':
+                x = args[0] + ox
+            else:
+                y = args[0] + oy
+            commands.append(('L', x, y))
+            last_control = last_quad = None
+        elif upper == 'C':
+            x1, y1 = args[0] + ox, args[1] + oy
+            x2, y2 = args[2] + ox, args[3] + oy
+            x, y = args[4] + ox, args[5] + oy
+            commands.append(('C', x1, y1, x2, y2, x, y))
+            last_control, last_quad = (x2, y2), None
+        elif upper == 'S':
+            x1, y1 = (2 * x - last_control[0], 2 * y - last_control[1]) if last_control else (x, y)
+            x2, y2 = args[0] + ox, args[1] + oy
+            x, y = args[2] + ox, args[3] + oy
+            commands.append(('C', x1, y1, x2, y2, x, y))
+            last_control, last_quad = (x2, y2), None
+        elif upper in ('Q', 'T'):
+            if upper == 'Q':
+                qx, qy = args[0] + ox, args[1] + oy
+                end_x, end_y = args[2] + ox, args[3] + oy
+            else:
+                qx, qy = (2 * x - last_quad[0], 2 * y - last_quad[1]) if last_quad else (x, y)
+                end_x, end_y = args[0] + ox, args[1] + oy
+            # 二次曲线升阶为三次曲线
+            commands.append(('C',
+                             x + 2 / 3 * (qx - x), y + 2 / 3 * (qy - y),
+                             end_x + 2 / 3 * (qx - end_x), end_y + 2 / 3 * (qy - end_y),
+                             end_x, end_y))
+            x, y = end_x, end_y
+            last_control, last_quad = None, (qx, qy)
+        elif upper == 'A':
+            end_x, end_y = args[5] + ox, args[6] + oy
+            for curve in arc_to_beziers(x, y, args[0], args[1], args[2],
+                                        bool(args[3]), bool(args[4]), end_x, end_y):
+                commands.append(('C',) + tuple(curve))
+            x, y = end_x, end_y
+            last_control = last_quad = None
+
+    return commands
+
+
+def rect_to_path(x: float, y: float, w: float, h: float, rx: float, ry: float) -> List[Tuple]:
+    """矩形（可带圆角）转换为路径命令"""
+    if rx <= 0 and ry <= 0:
+        return [('M', x, y), ('L', x + w, y), ('L', x + w, y + h), ('L', x, y + h), ('Z',)]
+    rx = min(rx or ry, w / 2)
+    ry = min(ry or rx, h / 2)
+    k = 0.5522847498
+    return [
+        ('M', x + rx, y), ('L', x + w - rx, y),
+        ('C', x + w - rx + k * rx, y, x + w, y + ry - k * ry, x + w, y + ry),
+        ('L', x + w, y + h - ry),
+        ('C', x + w, y + h - ry + k * ry, x + w - rx + k * rx, y + h, x + w - rx, y + h),
+        ('L', x + rx, y + h),
+        ('C', x + rx - k * rx, y + h, x, y + h - ry + k * ry, x, y + h - ry),
+        ('L', x, y + ry),
+        ('C', x, y + ry - k * ry, x + rx - k * rx, y, x + rx, y),
+        ('Z',),
+    ]
+
+
+def ellipse_to_path(cx: float, cy: float, rx: float, ry: float) -> List[Tuple]:
+    """椭圆转换为路径命令"""
+    k = 0.5522847498
+    return [
+        ('M', cx + rx, cy),
+        ('C', cx + rx, cy + k * ry, cx + k * rx, cy + ry, cx, cy + ry),
+        ('C', cx - k * rx, cy + ry, cx - rx, cy + k * ry, cx - rx, cy),
+        ('C', cx - rx, cy - k * ry, cx - k * rx, cy - ry, cx, cy - ry),
+        ('C', cx + k * rx, cy - ry, cx + rx, cy - k * ry, cx + rx, cy),
+        ('Z',),
+    ]
+
+
+# ============================================================================
+# 转换器
+# ============================================================================
+
+def escape_xml(text: str) -> str:
+    """转义 XML 特殊字符"""
+    return (text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+            .replace('"', '&quot;'))
+
+
+def emu(value: float) -> int:
+    """四舍五入为整数 EMU"""
+    return int(round(value))
+
+
+def estimate_text_width(text: str, font_size: float, letter_spacing: float = 0.0) -> float:
+    """估算文本宽度（CJK/全角字符按 1em，其余按 0.55em）"""
+    width = 0.0
+    for char in text:
+        code = ord(char)
+        if char == ' ':
+            width += 0.3
+        elif code >= 0x2E80 or 0xFF00 <= code <= 0xFFEF:
+            width += 1.0
+        elif char.isupper() or char in 'mwMW@%':
+            width += 0.7
+        else:
+            width += 0.55
+    return width * font_size + letter_spacing * len(text)
+
+
+def pick_font(family: Optional[str]) -> Optional[str]:
+    """从 font-family 列表中选出第一个具体字体名"""
+    if not family:
+        return None
+    for name in family.split(','):
+        name = name.strip().strip('"\'').strip()
+        if name and name.lower() not in GENERIC_FONT_FAMILIES:
+            return name
+    return None
+
+
+class DrawingMLConverter:
+    """将解析后的 SVG 树转换为 DrawingML 形状"""
+
+    def __init__(self, root: ET.Element, width_emu: int, height_emu: int,
+                 base_dir: Optional[Path] = None, offset: Tuple[int, int] = (0, 0)):
+        self.root = root
+        self.base_dir = base_dir
+        self.images: List[Tuple[str, bytes]] = []
+        self.warnings: List[str] = []
+        self.shape_count = 0
+        self._next_id = 2
+        self._gradients: Dict[str, ET.Element] = {}
+        self._filters: Dict[str, ET.Element] = {}
+
+        for element in root.iter():
+            name = local_name(element.tag)
+            if name in ('linearGradient', 'radialGradient') and element.get('id'):
+                self._gradients[element.get('id')] = element
+            elif name == 'filter' and element.get('id'):
+                self._filters[element.get('id')] = element
+
+        # viewBox → EMU 的根变换
+        viewbox = parse_numbers(root.get('viewBox', ''))
+        if len(viewbox) == 4 and viewbox[2] > 0 and viewbox[3] > 0:
+            vb_x, vb_y, vb_w, vb_h = viewbox
+        else:
+            vb_x, vb_y = 0.0, 0.0
+            vb_w = parse_length(root.get('width'), 1280)
+            vb_h = parse_length(root.get('height'), 720)
+        self.viewport = (vb_w, vb_h)
+        sx, sy = width_emu / vb_w, height_emu / vb_h
+        self.root_matrix: Matrix = (sx, 0.0, 0.0, sy, offset[0] - vb_x * sx, offset[1] - vb_y * sy)
+
+    def warn(self, message: str):
+        if message not in self.warnings:
+            self.warnings.append(message)
+
+    def next_id(self) -> int:
+        shape_id = self._next_id
+        self._next_id += 1
+        return shape_id
+
+    # ------------------------------------------------------------------
+    # 遍历
+    # ------------------------------------------------------------------
+
+    def convert(self) -> str:
+        """转换整页，返回 spTree 内的形状 XML"""
+        style = {'fill': '#000000'}
+        parts = self._convert_children(self.root, self.root_matrix, style)
+        return '\n'.join(xml for xml, _ in parts)
+
+    def _inherit(self, element: ET.Element, parent_style: Dict[str, str]) -> Dict[str, str]:
+        props = parse_style(element)
+        style = {key: parent_style[key] for key in INHERITED_PROPERTIES if key in parent_style}
+        # 透明度不继承，但沿祖先链相乘
+        style['_opacity'] = parent_style.get('_opacity', 1.0) * parse_opacity(props.get('opacity'))
+        for key in INHERITED_PROPERTIES:
+            if key in props and props[key] != 'inherit':
+                style[key] = props[key]
+        for key in ('x', 'y', 'dx', 'dy', 'filter', 'clip-path', 'mask', 'display'):
+            if key in props:
+                style['_' + key] = props[key]
+        return style
+
+    def _convert_children(self, element: ET.Element, matrix: Matrix,
+                          style: Dict[str, str]) -> List[Tuple[str, Tuple[float, float, float, float]]]:
+        parts = []
+        for child in element:
+            if not isinstance(child.tag, str):
+                continue
+            result = self._convert_element(child, matrix, style)
+            if result:
+                parts.extend(result)
+        return parts
+
+    def _convert_element(self, element: ET.Element, parent_matrix: Matrix,
+                         parent_style: Dict[str, str]) -> List[Tuple[str, Tuple]]:
+        name = local_name(element.tag)
+        if name in IGNORED_ELEMENTS:
+            return []
+        if name in UNSUPPORTED_ELEMENTS:
+            self.warn(f"未转换: {UNSUPPORTED_ELEMENTS[name]}")
+            return []
+
+        style = self._inherit(element, parent_style)
+        if style.get('_display') == 'none' or style.get('visibility') == 'hidden':
+            return []
+        if '_clip-path' in style or '_mask' in style:
+            self.warn("未转换: clip-path/mask 属性，形状按未裁剪导出")
+
+        matrix = multiply(parent_matrix, parse_transform(element.get('transform')))
+
+        try:
+            if name in ('g', 'a', 'svg', 'switch'):
+                return self._convert_group(element, matrix, style)
+            if name == 'rect':
+                return self._convert_rect(element, matrix, style)
+            if name in ('circle', 'ellipse'):
+                return self._convert_ellipse(element, matrix, style, name)
+            if name == 'line':
+                commands = [
+                    ('M', parse_length(element.get('x1')), parse_length(element.get('y1'))),
+                    ('L', parse_length(element.get('x2')), parse_length(element.get('y2'))),
+                ]
+                return self._freeform(commands, matrix, style, 'Line', fillable=False)
+            if name in ('polyline', 'polygon'):
+                points = parse_numbers(element.get('points', ''))
+                if len(points) < 4:
+                    return []
+                commands = [('M', points[0], points[1])]
+                commands += [('L', points[i], points[i + 1]) for i in range(2, len(points) - 1, 2)]
+                if name == 'polygon':
+                    commands.append(('Z',))
+                return self._freeform(commands, matrix, style, 'Freeform')
+            if name == 'path':
+                commands = parse_path(element.get('d', ''))
+                if not commands:
+                    return []
+                return self._freeform(commands, matrix, style, 'Freeform')
+            if name == 'text':
+                return self._convert_text(element, matrix, style)
+            if name == 'image':
+                return self._convert_image(element, matrix, style)
+        except (ValueError, ZeroDivisionError) as e:
+            self.warn(f"未转换: <{name}> ({e})")
+            return []
+
+        self.warn(f"未转换: <{name}>")
+        return []
+
+    def _convert_group(self, element: ET.Element, matrix: Matrix,
+                       style: Dict[str, str]) -> List[Tuple[str, Tuple]]:
+        parts = self._convert_children(element, matrix, style)
+        if len(parts) < 2:
+            return parts
+
+        left = min(bbox[0] for _, bbox in parts)
+        top = min(bbox[1] for _, bbox in parts)
+        right = max(bbox[2] for _, bbox in parts)
+        bottom = max(bbox[3] for _, bbox in parts)
+        off_x, off_y = emu(left), emu(top)
+        ext_x, ext_y = max(1, emu(right - left)), max(1, emu(bottom - top))
+        shape_id = self.next_id()
+        children = '\n'.join(xml for xml, _ in parts)
+        xml = f'''<p:grpSp>
+  <p:nvGrpSpPr><p:cNvPr id="{shape_id}" name="Group {shape_id}"/><p:cNvGrpSpPr/><p:nvPr/></p:nvGrpSpPr>
+  <p:grpSpPr><a:xfrm><a:off x="{off_x}" y="{off_y}"/><a:ext cx="{ext_x}" cy="{ext_y}"/><a:chOff x="{off_x}" y="{off_y}"/><a:chExt cx="{ext_x}" cy="{ext_y}"/></a:xfrm></p:grpSpPr>
+{children}
+</p:grpSp>'''
+        return [(xml, (left, top, right, bottom))]
+
+    # ------------------------------------------------------------------
+    # 填充与描边
+    # ------------------------------------------------------------------
+
+    def _color_xml(self, color: str, alpha: float) -> str:
+        if alpha >= 0.999:
+            return f'<a:srgbClr val="{color}"/>'
+        return f'<a:srgbClr val="{color}"><a:alpha val="{int(round(alpha * 100000))}"/></a:srgbClr>'
+
+    def _gradient_stops(self, gradient: ET.Element) -> List[ET.Element]:
+        """获取渐变色标（支持 href 引用其他渐变）"""
+        seen = set()
+        while gradient is not None:
+            stops = [s for s in gradient if local_name(s.tag) == 'stop']
+            if stops:
+                return stops
+            href = gradient.get(f'{{{XLINK_NS}}}href') or gradient.get('href') or ''
+            ref_id = href.lstrip('#')
+            if not ref_id or ref_id in seen:
+                break
+            seen.add(ref_id)
+            gradient = self._gradients.get(ref_id)
+        return []
+
+    def _paint_xml(self, paint: Optional[str], opacity: float, style: Dict[str, str]) -> Optional[str]:
+        """生成填充 XML（solidFill/gradFill），无填充返回 None"""
+        if paint is None:
+            return None
+        match = re.match(r'url\(\s*#([^)\s]+)\s*\)', paint.strip())
+        if match:
+            gradient = self._gradients.get(match.group(1))
+            if gradient is None:
+                self.warn(f"未转换: 引用的填充 #{match.group(1)} 不存在或不受支持")
+                return None
+            return self._gradient_xml(gradient, opacity, style)
+        color = parse_color(paint, parse_color(style.get('color'), '000000') or '000000')
+        if color is None:
+            return None
+        return f'<a:solidFill>{self._color_xml(color, opacity)}</a:solidFill>'
+
+    def _gradient_xml(self, gradient: ET.Element, opacity: float, style: Dict[str, str]) -> Optional[str]:
+        stops = self._gradient_stops(gradient)
+        if not stops:
+            return None
+        stop_xml = []
+        for stop in stops:
+            props = parse_style(stop)
+            offset = props.get('offset', '0').strip()
+            position = float(offset[:-1]) / 100 if offset.endswith('%') else float(offset or 0)
+            position = max(0.0, min(1.0, position))
+            color = parse_color(props.get('stop-color', '#000000')) or '000000'
+            alpha = parse_opacity(props.get('stop-opacity')) * opacity
+            stop_xml.append(f'<a:gs pos="{int(round(position * 100000))}">{self._color_xml(color, alpha)}</a:gs>')
+
+        if local_name(gradient.tag) == 'radialGradient':
+            shade = '<a:path path="circle"><a:fillToRect l="50000" t="50000" r="50000" b="50000"/></a:path>'
+        else:
+            x1 = parse_length(gradient.get('x1'), 0, 1)
+            y1 = parse_length(gradient.get('y1'), 0, 1)
+            x2 = parse_length(gradient.get('x2'), 1, 1)
+            y2 = parse_length(gradient.get('y2'), 0, 1)
+            angle = math.degrees(math.atan2(y2 - y1, x2 - x1)) % 360
+            shade = f'<a:lin ang="{int(round(angle * 60000)) % 21600000}" scaled="0"/>'
+        return f'<a:gradFill rotWithShape="1"><a:gsLst>{"".join(stop_xml)}</a:gsLst>{shade}</a:gradFill>'
+
+    def _fill_xml(self, style: Dict[str, str]) -> str:
+        opacity = style.get('_opacity', 1.0) * parse_opacity(style.get('fill-opacity'))
+        paint = self._paint_xml(style.get('fill', '#000000'), opacity, style)
+        return paint or '<a:noFill/>'
+
+    def _line_xml(self, style: Dict[str, str], matrix: Matrix) -> str:
+        stroke = style.get('stroke')
+        width = parse_length(style.get('stroke-width'), 1.0)
+        opacity = style.get('_opacity', 1.0) * parse_opacity(style.get('stroke-opacity'))
+        paint = self._paint_xml(stroke, opacity, style) if stroke else None
+        if paint is None or width <= 0:
+            return '<a:ln><a:noFill/></a:ln>'
+
+        width_emu = max(1, emu(width * matrix_scale(matrix)))
+        cap = {'round': ' cap="rnd"', 'square': ' cap="sq"'}.get(style.get('stroke-linecap', ''), '')
+        dash_xml = ''
+        dasharray = style.get('stroke-dasharray')
+        if dasharray and dasharray.strip() != 'none':
+            dashes = parse_numbers(dasharray)
+            if len(dashes) % 2:
+                dashes = dashes * 2
+            if dashes and width > 0:
+                segments = ''.join(
+                    f'<a:ds d="{int(round(dashes[i] / width * 100000))}" sp="{int(round(dashes[i + 1] / width * 100000))}"/>'
+                    for i in range(0, len(dashes), 2)
+                )
+                dash_xml = f'<a:custDash>{segments}</a:custDash>'
+        join = {'round': '<a:round/>', 'bevel': '<a:bevel/>'}.get(style.get('stroke-linejoin', ''), '')
+        return f'<a:ln w="{width_emu}"{cap}>{paint}{dash_xml}{join}</a:ln>'
+
+    def _effect_xml(self, style: Dict[str, str], matrix: Matrix, glow_color: Optional[str]) -> str:
+        """
+        常见滤镜 → a:effectLst
+
+        - feDropShadow，或 feOffset + feGaussianBlur（+ feFlood/feFuncA 颜色）→ 外部阴影 outerShdw
+        - feGaussianBlur 与原图合并（发光）→ glow
+        """
+        reference = style.get('_filter')
+        if not reference or reference.strip() == 'none':
+            return ''
+        match = re.match(r'url\(\s*#([^)\s]+)\s*\)', reference.strip())
+        element = self._filters.get(match.group(1)) if match else None
+        if element is None:
+            self.warn("未转换: 滤镜效果，形状按无滤镜导出")
+            return ''
+
+        primitives = {}
+        for child in element.iter():
+            name = local_name(child.tag)
+            if name.startswith('fe') and name not in primitives:
+                primitives[name] = parse_style(child)
+
+        scale = matrix_scale(matrix)
+        shadow = primitives.get('feDropShadow')
+        if shadow is not None or 'feOffset' in primitives:
+            if shadow is not None:
+                dx, dy = parse_length(shadow.get('dx'), 2), parse_length(shadow.get('dy'), 2)
+                blur = parse_length(shadow.get('stdDeviation'), 2)
+                color = parse_color(shadow.get('flood-color', '#000000')) or '000000'
+                alpha = parse_opacity(shadow.get('flood-opacity'))
+            else:
+                offset = primitives['feOffset']
+                dx, dy = parse_length(offset.get('dx')), parse_length(offset.get('dy'))
+                blur = parse_length(primitives.get('feGaussianBlur', {}).get('stdDeviation'), 0)
+                flood = primitives.get('feFlood', {})
+                color = parse_color(flood.get('flood-color', '#000000')) or '000000'
+                alpha = parse_opacity(flood.get('flood-opacity'))
+                if 'feFuncA' in primitives:
+                    alpha *= parse_opacity(primitives['feFuncA'].get('slope'))
+                elif not flood:
+                    alpha *= 0.5
+            distance = math.hypot(dx, dy) * scale
+            direction = math.degrees(math.atan2(dy, dx)) % 360
+            return (
+                f'<a:effectLst><a:outerShdw blurRad="{emu(blur * 2 * scale)}" dist="{emu(distance)}" '
+                f'dir="{int(round(direction * 60000)) % 21600000}" algn="ctr" rotWithShape="0">'
+                f'{self._color_xml(color, alpha)}</a:outerShdw></a:effectLst>'
+            )
+
+        blur = primitives.get('feGaussianBlur')
+        if blur is not None and 'feMerge' in primitives and glow_color:
+            radius = parse_length(blur.get('stdDeviation'), 3) * 2 * scale
+            return f'<a:effectLst><a:glow rad="{emu(radius)}">{self._color_xml(glow_color, 0.4)}</a:glow></a:effectLst>'
+
+        self.warn("未转换: 滤镜效果，形状按无滤镜导出")
+        return ''
+
+    def _glow_color(self, style: Dict[str, str]) -> Optional[str]:
+        """发光效果使用的颜色（填充色，无填充时取描边色）"""
+        for key in ('fill', 'stroke'):
+            color = parse_color(style.get(key)) if key in style else None
+            if color:
+                return color
+        return None
+
+    def _sp_xml(self, kind: str, off: Tuple[int, int], ext: Tuple[int, int],
+                geometry: str, style: Dict[str, str], matrix: Matrix, fillable: bool = True) -> str:
+        shape_id = self.next_id()
+        fill = self._fill_xml(style) if fillable else '<a:noFill/>'
+        self.shape_count += 1
+        return f'''<p:sp>
+  <p:nvSpPr><p:cNvPr id="{shape_id}" name="{kind} {shape_id}"/><p:cNvSpPr/><p:nvPr/></p:nvSpPr>
+  <p:spPr>
+    <a:xfrm><a:off x="{off[0]}" y="{off[1]}"/><a:ext cx="{ext[0]}" cy="{ext[1]}"/></a:xfrm>
+    {geometry}
+    {fill}
+    {self._line_xml(style, matrix)}
+    {self._effect_xml(style, matrix, self._glow_color(style))}
+  </p:spPr>
+</p:sp>'''
+
+    # ------------------------------------------------------------------
+    # 形状
+    # ------------------------------------------------------------------
+
+    def _convert_rect(self, element: ET.Element, matrix: Matrix, style: Dict[str, str]):
+        vw, vh = self.viewport
+        x = parse_length(style.get('_x'), 0, vw)
+        y = parse_length(style.get('_y'), 0, vh)
+        w = parse_length(element.get('width'), 0, vw)
+        h = parse_length(element.get('height'), 0, vh)
+        if w <= 0 or h <= 0:
+            return []
+        rx_attr, ry_attr = element.get('rx'), element.get('ry')
+        rx = parse_length(rx_attr if rx_attr is not None else ry_attr, 0, vw)
+        ry = parse_length(ry_attr if ry_attr is not None else rx_attr, 0, vh)
+
+        if not is_axis_aligned(matrix):
+            return self._freeform(rect_to_path(x, y, w, h, rx, ry), matrix, style, 'Freeform')
+
+        left, top = apply(matrix, x, y)
+        right, bottom = apply(matrix, x + w, y + h)
+        ext = (max(1, emu(right - left)), max(1, emu(bottom - top)))
+        if rx > 0 or ry > 0:
+            radius = min(max(rx, ry) / min(w, h), 0.5)
+            geometry = f'<a:prstGeom prst="roundRect"><a:avLst><a:gd name="adj" fmla="val {int(round(radius * 100000))}"/></a:avLst></a:prstGeom>'
+            kind = 'Rounded Rectangle'
+        else:
+            geometry = '<a:prstGeom prst="rect"><a:avLst/></a:prstGeom>'
+            kind = 'Rectangle'
+        xml = self._sp_xml(kind, (emu(left), emu(top)), ext, geometry, style, matrix)
+        return [(xml, (left, top, right, bottom))]
+
+    def _convert_ellipse(self, element: ET.Element, matrix: Matrix, style: Dict[str, str], name: str):
+        cx = parse_length(element.get('cx'))
+        cy = parse_length(element.get('cy'))
+        if name == 'circle':
+            rx = ry = parse_length(element.get('r'))
+        else:
+            rx = parse_length(element.get('rx'))
+            ry = parse_length(element.get('ry'), rx)
+        if rx <= 0 or ry <= 0:
+            return []
+
+        if not is_axis_aligned(matrix):
+            return self._freeform(ellipse_to_path(cx, cy, rx, ry), matrix, style, 'Freeform')
+
+        left, top = apply(matrix, cx - rx, cy - ry)
+        right, bottom = apply(matrix, cx + rx, cy + ry)
+        geometry = '<a:prstGeom prst="ellipse"><a:avLst/></a:prstGeom>'
+        xml = self._sp_xml('Oval', (emu(left), emu(top)),
+                           (max(1, emu(right - left)), max(1, emu(bottom - top))), geometry, style, matrix)
+        return [(xml, (left, top, right, bottom))]
+
+    def _freeform(self, commands: List[Tuple], matrix: Matrix, style: Dict[str, str],
+                  kind: str, fillable: bool = True):
+        """路径命令 → a:custGeom 自由形状"""
+        transformed = []
+        xs, ys = [], []
+        for command in commands:
+            if command[0] == 'Z':
+                transformed.append(('Z',))
+                continue
+            points = []
+            coords = command[1:]
+            for i in range(0, len(coords), 2):
+                px, py = apply(matrix, coords[i], coords[i + 1])
+                points.append((px, py))
+                xs.append(px)
+                ys.append(py)
+            transformed.append((command[0], points))
+        if not xs:
+            return []
+
+        left, top, right, bottom = min(xs), min(ys), max(xs), max(ys)
+        width, height = max(1, emu(right - left)), max(1, emu(bottom - top))
+
+        def pt(p):
+            return f'<a:pt x="{emu(p[0] - left)}" y="{emu(p[1] - top)}"/>'
+
+        segments = []
+        for command in transformed:
+            if command[0] == 'Z':
+                segments.append('<a:close/>')
+            elif command[0] == 'M':
+                segments.append(f'<a:moveTo>{pt(command[1][0])}</a:moveTo>')
+            elif command[0] == 'L':
+                segments.append(f'<a:lnTo>{pt(command[1][0])}</a:lnTo>')
+            else:
+                segments.append(f'<a:cubicBezTo>{"".join(pt(p) for p in command[1])}</a:cubicBezTo>')
+
+        geometry = (
+            '<a:custGeom><a:avLst/><a:gdLst/><a:ahLst/><a:cxnLst/>'
+            '<a:rect l="0" t="0" r="r" b="b"/>'
+            f'<a:pathLst><a:path w="{width}" h="{height}">{"".join(segments)}</a:path></a:pathLst>'
+            '</a:custGeom>'
+        )
+        xml = self._sp_xml(kind, (emu(left), emu(top)), (width, height), geometry, style, matrix, fillable)
+        return [(xml, (left, top, right, bottom))]
+
+    # ------------------------------------------------------------------
+    # 文本
+    # ------------------------------------------------------------------
+
+    def _run_props(self, style: Dict[str, str], matrix: Matrix) -> Tuple[str, float]:
+        """生成 a:rPr，返回 (XML, 字号（EMU）)"""
+        scale = matrix_scale(matrix)
+        font_size = parse_length(style.get('font-size'), 16) * scale
+        size_pt = max(1.0, min(4000.0, font_size / EMU_PER_POINT))
+        attrs = [f'lang="zh-CN" sz="{int(round(size_pt * 100))}"']
+
+        weight = (style.get('font-weight') or '').strip().lower()
+        if weight in ('bold', 'bolder') or (weight.isdigit() and int(weight) >= 600):
+            attrs.append('b="1"')
+        if (style.get('font-style') or '').strip().lower() in ('italic', 'oblique'):
+            attrs.append('i="1"')
+        if 'underline' in (style.get('text-decoration') or ''):
+            attrs.append('u="sng"')
+        spacing = parse_length(style.get('letter-spacing'), 0) * scale
+        if spacing:
+            attrs.append(f'spc="{int(round(spacing / EMU_PER_POINT * 100))}"')
+        attrs.append('dirty="0"')
+
+        fill = style.get('fill', '#000000')
+        opacity = style.get('_opacity', 1.0) * parse_opacity(style.get('fill-opacity'))
+        match = re.match(r'url\(\s*#([^)\s]+)\s*\)', fill.strip())
+        if match:
+            # 文本渐变填充取第一个色标颜色
+            stops = self._gradient_stops(self._gradients.get(match.group(1)))
+            fill = parse_style(stops[0]).get('stop-color', '#000000') if stops else '#000000'
+        color = parse_color(fill, parse_color(style.get('color'), '000000') or '000000')
+        fill_xml = f'<a:solidFill>{self._color_xml(color, opacity)}</a:solidFill>' if color else '<a:noFill/>'
+        fill_xml += self._effect_xml(style, matrix, color)
+
+        font = pick_font(style.get('font-family'))
+        font_xml = ''
+        if font:
+            font = escape_xml(font)
+            font_xml = f'<a:latin typeface="{font}"/><a:ea typeface="{font}"/><a:cs typeface="{font}"/>'
+        return f'<a:rPr {" ".join(attrs)}>{fill_xml}{font_xml}</a:rPr>', font_size
+
+    def _convert_text(self, element: ET.Element, matrix: Matrix, style: Dict[str, str]):
+        """text/tspan → 文本框；带 x/y/dy 定位的 tspan 开始新段落"""
+        scale = matrix_scale(matrix)
+        vw, vh = self.viewport
+        base_x = parse_numbers(style.get('_x', '0'))[:1] or [0.0]
+        base_y = parse_numbers(style.get('_y', '0'))[:1] or [0.0]
+        x0, y0 = base_x[0], base_y[0] + (parse_numbers(style.get('_dy', ''))[:1] or [0.0])[0]
+
+        # lines: [(y 坐标, [(文本, 样式)])]
+        lines: List[Tuple[float, List[Tuple[str, Dict[str, str]]]]] = [(y0, [])]
+
+        def add_run(text: Optional[str], run_style: Dict[str, str]):
+            if text is None:
+                return
+            text = re.sub(r'\s+', ' ', text)
+            if text.strip() or (text and lines[-1][1]):
+                lines[-1][1].append((text, run_style))
+
+        add_run(element.text, style)
+        current_y = y0
+        for child in element:
+            if not isinstance(child.tag, str) or local_name(child.tag) != 'tspan':
+                continue
+            child_style = self._inherit(child, style)
+            positioned = any(k in child_style for k in ('_x', '_y', '_dy'))
+            if '_y' in child_style:
+                current_y = (parse_numbers(child_style['_y'])[:1] or [current_y])[0]
+            if '_dy' in child_style:
+                current_y += (parse_numbers(child_style['_dy'])[:1] or [0.0])[0]
+            if positioned and lines[-1][1]:
+                lines.append((current_y, []))
+            elif positioned:
+                lines[-1] = (current_y, lines[-1][1])
+            add_run(child.text, child_style)
+            add_run(child.tail, style)
+
+        lines = [(y, [(t, s) for t, s in runs]) for y, runs in lines if ''.join(t for t, _ in runs).strip()]
+        if not lines:
+            return []
+        # 去除每行首尾空白
+        for _, runs in lines:
+            runs[0] = (runs[0][0].lstrip(), runs[0][1])
+            runs[-1] = (runs[-1][0].rstrip(), runs[-1][1])
+
+        font_size = parse_length(style.get('font-size'), 16)
+        letter_spacing = parse_length(style.get('letter-spacing'), 0)
+        line_gap = lines[1][0] - lines[0][0] if len(lines) > 1 else font_size * DEFAULT_LINE_HEIGHT
+        if line_gap <= 0:
+            line_gap = font_size * DEFAULT_LINE_HEIGHT
+
+        anchor = (style.get('text-anchor') or 'start').strip()
+        algn = {'middle': 'ctr', 'end': 'r'}.get(anchor, 'l')
+
+        # 在用户坐标系内计算文本框，再整体变换
+        width = max(estimate_text_width(''.join(t for t, _ in runs),
+                                        parse_length(runs[0][1].get('font-size'), font_size),
+                                        letter_spacing)
+                    for _, runs in lines)
+        width = max(width, font_size) * 1.05
+        height = line_gap * (len(lines) - 1) + font_size * DEFAULT_LINE_HEIGHT
+        left = x0 - (width / 2 if algn == 'ctr' else width if algn == 'r' else 0)
+        top = lines[0][0] - font_size * TEXT_ASCENT_RATIO
+
+        center = apply(matrix, left + width / 2, top + height / 2)
+        ext_w, ext_h = width * scale, height * scale
+        off = (emu(center[0] - ext_w / 2), emu(center[1] - ext_h / 2))
+        a, b = matrix[0], matrix[1]
+        rotation = math.degrees(math.atan2(b, a)) % 360
+        rot_attr = f' rot="{int(round(rotation * 60000))}"' if abs(rotation) > 0.01 and abs(rotation - 360) > 0.01 else ''
+
+        paragraphs = []
+        line_spacing = ''
+        if len(lines) > 1:
+            line_spacing = f'<a:lnSpc><a:spcPts val="{int(round(line_gap * scale / EMU_PER_POINT * 100))}"/></a:lnSpc>'
+        for _, runs in lines:
+            runs_xml = []
+            end_props = ''
+            for text, run_style in runs:
+                props, _ = self._run_props(run_style, matrix)
+                end_props = props.replace('<a:rPr ', '<a:endParaRPr ', 1).replace('</a:rPr>', '</a:endParaRPr>')
+                if text:
+                    runs_xml.append(f'<a:r>{props}<a:t>{escape_xml(text)}</a:t></a:r>')
+            paragraphs.append(f'<a:p><a:pPr algn="{algn}">{line_spacing}</a:pPr>{"".join(runs_xml)}{end_props}</a:p>')
+
+        shape_id = self.next_id()
+        self.shape_count += 1
+        xml = f'''<p:sp>
+  <p:nvSpPr><p:cNvPr id="{shape_id}" name="TextBox {shape_id}"/><p:cNvSpPr txBox="1"/><p:nvPr/></p:nvSpPr>
+  <p:spPr>
+    <a:xfrm{rot_attr}><a:off x="{off[0]}" y="{off[1]}"/><a:ext cx="{max(1, emu(ext_w))}" cy="{max(1, emu(ext_h))}"/></a:xfrm>
+    <a:prstGeom prst="rect"><a:avLst/></a:prstGeom>
+    <a:noFill/>
+  </p:spPr>
+  <p:txBody>
+    <a:bodyPr wrap="none" lIns="0" tIns="0" rIns="0" bIns="0" rtlCol="0" anchor="t"><a:noAutofit/></a:bodyPr>
+    <a:lstStyle/>
+    {"".join(paragraphs)}
+  </p:txBody>
+</p:sp>'''
+        corners = [apply(matrix, px, py) for px, py in
+                   ((left, top), (left + width, top), (left, top + height), (left + width, top + height))]
+        bbox = (min(c[0] for c in corners), min(c[1] for c in corners),
+                max(c[0] for c in corners), max(c[1] for c in corners))
+        return [(xml, bbox)]
+
+    # ------------------------------------------------------------------
+    # 图片
+    # ------------------------------------------------------------------
+
+    def _load_image(self, href: str) -> Optional[Tuple[str, bytes]]:
+        """读取 data URI 或本地图片，返回 (扩展名, 内容)"""
+        if href.startswith('data:'):
+            match = re.match(r'data:([^;,]+)(;base64)?,(.*)', href, re.S)
+            if not match:
+                return None
+            ext = IMAGE_EXTENSIONS.get(match.group(1).lower())
+            if ext is None:
+                self.warn(f"未转换: 不支持的内嵌图片类型 {match.group(1)}")
+                return None
+            payload = match.group(3)
+            data = base64.b64decode(payload) if match.group(2) else unquote(payload).encode('latin-1')
+            return ext, data
+        if re.match(r'^[a-z]+://', href):
+            self.warn("未转换: 网络图片")
+            return None
+        path = Path(unquote(href))
+        if not path.is_absolute() and self.base_dir is not None:
+            path = self.base_dir / path
+        ext = path.suffix.lower().lstrip('.')
+        ext = 'jpeg' if ext == 'jpg' else ext
+        if ext not in IMAGE_EXTENSIONS.values():
+            self.warn(f"未转换: 不支持的图片格式 {path.name}")
+            return None
+        try:
+            return ext, path.read_bytes()
+        except OSError:
+            self.warn(f"未转换: 找不到图片 {href}")
+            return None
+
+    def _convert_image(self, element: ET.Element, matrix: Matrix, style: Dict[str, str]):
+        href = element.get(f'{{{XLINK_NS}}}href') or element.get('href')
+        if not href:
+            return []
+        image = self._load_image(href.strip())
+        if image is None:
+            return []
+
+        vw, vh = self.viewport
+        x = parse_length(style.get('_x'), 0, vw)
+        y = parse_length(style.get('_y'), 0, vh)
+        w = parse_length(element.get('width'), 0, vw)
+        h = parse_length(element.get('height'), 0, vh)
+        if w <= 0 or h <= 0:
+            return []
+        if not is_axis_aligned(matrix):
+            self.warn("图片的旋转/斜切变换未转换，按外接矩形放置")
+
+        corners = [apply(matrix, px, py) for px, py in ((x, y), (x + w, y), (x, y + h), (x + w, y + h))]
+        left, top = min(c[0] for c in corners), min(c[1] for c in corners)
+        right, bottom = max(c[0] for c in corners), max(c[1] for c in corners)
+
+        self.images.append(image)
+        rid = f'rIdImg{len(self.images)}'
+        shape_id = self.next_id()
+        self.shape_count += 1
+        alpha = style.get('_opacity', 1.0)
+        alpha_xml = f'<a:alphaModFix amt="{int(round(alpha * 100000))}"/>' if alpha < 0.999 else ''
+        xml = f'''<p:pic>
+  <p:nvPicPr><p:cNvPr id="{shape_id}" name="Picture {shape_id}"/><p:cNvPicPr><a:picLocks noChangeAspect="1"/></p:cNvPicPr><p:nvPr/></p:nvPicPr>
+  <p:blipFill><a:blip r:embed="{rid}">{alpha_xml}</a:blip><a:stretch><a:fillRect/></a:stretch></p:blipFill>
+  <p:spPr>
+    <a:xfrm><a:off x="{emu(left)}" y="{emu(top)}"/><a:ext cx="{max(1, emu(right - left))}" cy="{max(1, emu(bottom - top))}"/></a:xfrm>
+    <a:prstGeom prst="rect"><a:avLst/></a:prstGeom>
+  </p:spPr>
+</p:pic>'''
+        return [(xml, (left, top, right, bottom))]
+
+
+def svg_to_native_shapes(svg_data: bytes, width_emu: int, height_emu: int,
+                         base_dir: Optional[Path] = None,
+                         offset: Tuple[int, int] = (0, 0)) -> NativeSlide:
+    """
+    将 SVG 转换为 DrawingML 形状
+
+    Args:
+        svg_data: SVG 内容
+        width_emu: 画布在幻灯片上的宽度（EMU），SVG viewBox 按此缩放
+        height_emu: 画布在幻灯片上的高度（EMU）
+        base_dir: 解析相对路径图片的目录
+        offset: 画布在幻灯片上的左上角位置（EMU，画布与幻灯片比例不同时居中放置）
+
+    Returns:
+        NativeSlide（形状 XML、图片列表、警告）
+
+    Raises:
+        ET.ParseError: SVG 不是合法的 XML
+    """
+    root = ET.fromstring(svg_data)
+    converter = DrawingMLConverter(root, width_emu, height_emu, base_dir, offset)
+    shapes_xml = converter.convert()
+    return NativeSlide(
+        shapes_xml=shapes_xml,
+        images=converter.images,
+        warnings=converter.warnings,
+        shape_count=converter.shape_count,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='PPT Master - SVG 转 DrawingML 原生形状（检查转换情况）',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+示例:
+  %(prog)s examples/ppt169_demo/svg_final            # 检查目录中全部 SVG
+  %(prog)s examples/ppt169_demo/svg_final/01_封面.svg
+
+导出原生形状 PPTX:
+  python3 tools/svg_to_pptx.py <项目路径> -s final --native
+        '''
+    )
+    parser.add_argument('path', type=str, help='SVG 文件或目录')
+    args = parser.parse_args()
+
+    path = Path(args.path)
+    svg_files = sorted(path.glob('*.svg')) if path.is_dir() else [path]
+    if not svg_files:
+        print("错误: 没有找到 SVG 文件")
+        sys.exit(1)
+
+    clean = 0
+    for svg_path in svg_files:
+        try:
+            result = svg_to_native_shapes(svg_path.read_bytes(), 12192000, 6858000, svg_path.parent)
+        except (OSError, ET.ParseError) as e:
+            print(f"  [ERROR] {svg_path.name}: {e}")
+            continue
+        if result.warnings:
+            print(f"  [WARN] {svg_path.name}: {result.shape_count} 个形状")
+            for warning in result.warnings:
+                print(f"         - {warning}")
+        else:
+            clean += 1
+            print(f"  [OK] {svg_path.name}: {result.shape_count} 个形状")
+
+    print()
+    print(f"完全转换: {clean}/{len(svg_files)}")
+    sys.exit(0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+PPT Master - SVG 转 PDF 工具（多页矢量讲义）
+
+将项目的全部页面写入一个矢量 PDF，无需先导出 PPTX 再用 PowerPoint 另存。
+SVG 目录定位、页面顺序与输出命名规则与 svg_to_pptx.py 相同（共用
+find_svg_files / plan_project_export），页面尺寸与 PPTX 一致（1px = 0.75pt）。
+
+渲染器与 PNG 后备图片相同（svg_to_pptx.PNG_RENDERER）：
+    - svglib: 渲染进程并行解析各页（SVG → reportlab 图形，耗时的主要部分），
+      主进程按页面顺序绘制到同一个 PDF
+    - cairosvg: 在主进程中逐页绘制到同一个多页 PDF 表面（页面随绘制写出）
+
+用法:
+    python3 tools/svg_to_pdf.py <项目目录> -s final
+    python3 tools/svg_to_pdf.py <项目目录> -s final -j 4 -o handout.pdf
+"""
+
+import sys
+import time
+import argparse
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from io import BytesIO
+from pathlib import Path
+from typing import Callable, List, Optional, Union
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from svg_to_pptx import (
+    PNG_RENDERER, SlideProgress, SlideSource, get_png_renderer_info, plan_project_export, resolve_jobs
+)
+from pptx_package import create_temp_file, replace_with_temp
+
+if PNG_RENDERER == 'cairosvg':
+    import cairosvg
+    from cairosvg.parser import Tree
+    from cairosvg.surface import PDFSurface
+
+    class _SharedPdfPage(PDFSurface):
+        """在共享的多页 PDF 表面上绘制一页（output 为 cairo PDF 表面）"""
+
+        def _create_surface(self, width, height):
+            self.output.set_size(width, height)
+            return self.output, width, height
+
+elif PNG_RENDERER == 'svglib':
+    from svglib.svglib import svg2rlg
+    from reportlab.graphics import renderPDF
+    from reportlab.pdfgen import canvas as pdf_canvas
+
+
+# SVG 像素到 PDF 点（与 PPTX 页面尺寸一致：1280×720 px = 13.33×7.5 英寸）
+POINTS_PER_PIXEL = 0.75
+
+
+def _parse_page_task(task: tuple) -> tuple:
+    """
+    进程池任务入口：将一页 SVG 解析为 reportlab 图形（svglib）
+
+    Returns:
+        (图形对象或 None, 错误信息)
+    """
+    name, svg_path, svg_data = task
+    try:
+        drawing = svg2rlg(str(svg_path) if svg_path is not None else BytesIO(svg_data))
+    except Exception as e:
+        return None, f"SVG 解析失败 ({name}): {e}"
+    if drawing is None:
+        return None, f"无法解析 SVG ({name})"
+    return drawing, None
+
+
+def _iter_parsed_pages(
+    slides: List[SlideSource],
+    jobs: int,
+    executor: Optional[Executor],
+    log: Optional[Callable[[str], None]]
+):
+    """按页面顺序产出 (图形对象, 错误信息)；并行时最多 jobs × 2 页在途"""
+    workers = resolve_jobs(jobs)
+    shared_executor = executor
+    if executor is None and workers > 1:
+        try:
+            executor = ProcessPoolExecutor(max_workers=workers)
+        except Exception as e:
+            if log is not None:
+                log(f"  警告: 并行渲染不可用，改为串行 ({e})")
+    window = max(workers, 2) * 2 if executor is not None else 1
+
+    def prepare(slide: SlideSource) -> dict:
+        try:
+            # 文件来源只传路径，避免向子进程复制 SVG 内容
+            svg_data = None if slide.path is not None and slide.svg is None else slide.read_svg()
+        except (OSError, ValueError) as e:
+            return {'error': str(e)}
+        task = (slide.name, slide.path if svg_data is None else None, svg_data)
+        entry = {'task': task, 'future': None}
+        if executor is not None:
+            entry['future'] = executor.submit(_parse_page_task, task)
+        return entry
+
+    pending: deque = deque()
+    next_index = 0
+    try:
+        while next_index < len(slides) or pending:
+            while next_index < len(slides) and len(pending) < window:
+                pending.append(prepare(slides[next_index]))
+                next_index += 1
+            entry = pending.popleft()
+            if 'error' in entry:
+                yield None, entry['error']
+                continue
+            try:
+                outcome = entry['future'].result() if entry['future'] is not None else _parse_page_task(entry['task'])
+            except Exception:
+                # 子进程异常（如进程池崩溃）时改为在本进程解析
+                outcome = _parse_page_task(entry['task'])
+            yield outcome
+    finally:
+        if executor is not None:
+            for entry in pending:
+                if entry.get('future') is not None:
+                    entry['future'].cancel()
+            if executor is not shared_executor:
+                executor.shutdown(wait=True)
+
+
+def build_pdf(
+    slides: List[SlideSource],
+    output_path: Union[str, Path],
+    jobs: int = 1,
+    executor: Optional[Executor] = None,
+    title: Optional[str] = None,
+    progress: Optional[Callable[[SlideProgress], None]] = None,
+    log: Optional[Callable[[str], None]] = print
+) -> dict:
+    """
+    将幻灯片写入一个多页矢量 PDF（库接口）
+
+    Args:
+        slides: 幻灯片列表（按页面顺序）
+        output_path: 输出 PDF 路径（先写入临时文件，完成后替换）
+        jobs: 并行解析进程数（svglib；0 表示使用全部 CPU 核心）
+        executor: 共享的进程池（提供时忽略 jobs，由调用方负责关闭）
+        title: PDF 文档标题（默认取输出文件名）
+        progress: 每页写入后的回调（SlideProgress，stage 为 'pdf'）
+        log: 警告输出函数（None 表示不输出）
+
+    Returns:
+        {'total', 'success', 'failed'（失败页面名称列表）, 'size', 'elapsed', 'renderer'}
+
+    Raises:
+        RuntimeError: 未安装 cairosvg 或 svglib
+    """
+    if PNG_RENDERER is None:
+        raise RuntimeError("未安装 SVG 渲染库，请运行: pip install cairosvg 或 pip install svglib reportlab")
+
+    start = time.perf_counter()
+    output_path = Path(output_path)
+    title = title or output_path.stem
+    total = len(slides)
+    failed: List[str] = []
+    # 同目录的唯一临时文件（并发运行或已有同名文件时互不覆盖），完成后替换输出文件
+    tmp_path = Path(create_temp_file(output_path))
+
+    def page_done(index: int, error: Optional[str]):
+        if error:
+            failed.append(slides[index].name)
+            if log is not None:
+                log(f"  警告: {error}")
+        if progress is not None:
+            progress(SlideProgress(stage='pdf', index=index + 1, total=total,
+                                   name=slides[index].name, error=error))
+
+    try:
+        if PNG_RENDERER == 'svglib':
+            pdf = pdf_canvas.Canvas(str(tmp_path), pageCompression=1)
+            pdf.setTitle(title)
+            pdf.setCreator('PPT Master')
+            for index, (drawing, error) in enumerate(_iter_parsed_pages(slides, jobs, executor, log)):
+                if drawing is not None:
+                    try:
+                        pdf.setPageSize((drawing.width * POINTS_PER_PIXEL, drawing.height * POINTS_PER_PIXEL))
+                        pdf.scale(POINTS_PER_PIXEL, POINTS_PER_PIXEL)
+                        renderPDF.draw(drawing, pdf, 0, 0)
+                        pdf.showPage()
+                    except Exception as e:
+                        error = f"PDF 绘制失败 ({slides[index].name}): {e}"
+                page_done(index, error)
+            pdf.save()
+        else:
+            with open(tmp_path, 'wb') as f:
+                surface = cairosvg.surface.cairo.PDFSurface(f, 1, 1)
+                if hasattr(surface, 'set_metadata'):  # cairo >= 1.16
+                    surface.set_metadata(cairosvg.surface.cairo.PDF_METADATA_TITLE, title)
+                    surface.set_metadata(cairosvg.surface.cairo.PDF_METADATA_CREATOR, 'PPT Master')
+                for index, slide in enumerate(slides):
+                    error = None
+                    try:
+                        if slide.path is not None and slide.svg is None:
+                            tree = Tree(url=str(slide.path))
+                        else:
+                            base_url = slide.base_dir.resolve().as_uri() + '/' if slide.base_dir is not None else None
+                            tree = Tree(bytestring=slide.read_svg(), url=base_url)
+                        _SharedPdfPage(tree, surface, 96)
+                        surface.show_page()
+                    except Exception as e:
+                        error = f"PDF 绘制失败 ({slide.name}): {e}"
+                    page_done(index, error)
+                surface.finish()
+        replace_with_temp(tmp_path, output_path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+    return {
+        'total': total,
+        'success': total - len(failed),
+        'failed': failed,
+        'size': output_path.stat().st_size,
+        'elapsed': time.perf_counter() - start,
+        'renderer': PNG_RENDERER,
+    }
+
+
+def export_project_pdf(
+    project_path: Union[str, Path],
+    source: str = 'output',
+    output: Optional[Union[str, Path]] = None,
+    log: Optional[Callable[[str], None]] = None,
+    **options
+) -> dict:
+    """
+    导出整个项目为 PDF（库接口，目录定位与输出命名同 svg_to_pptx.export_project）
+
+    Returns:
+        build_pdf 的结果字典，另含 output 与 source_dir
+
+    Raises:
+        FileNotFoundError: 项目目录不存在或未找到 SVG 文件
+    """
+    plan = plan_project_export(project_path, source, output, enable_notes=False, log=log, extension='.pdf')
+    slides = [SlideSource.from_file(svg_path) for svg_path in plan['svg_files']]
+    options.setdefault('title', Path(project_path).name)
+    result = build_pdf(slides, plan['output'], log=log, **options)
+    result['output'] = str(plan['output'])
+    result['source_dir'] = plan['source_dir']
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='PPT Master - SVG 转 PDF 工具（多页矢量讲义）',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+示例:
+  %(prog)s examples/ppt169_demo -s final            # 推荐：使用后处理完成的版本
+  %(prog)s examples/ppt169_demo -s final -j 4       # 4 进程并行解析页面
+  %(prog)s examples/ppt169_demo -s final -o handout.pdf
+
+说明:
+  - SVG 来源目录 (-s) 与默认输出命名同 svg_to_pptx.py（扩展名为 .pdf）
+  - 页面尺寸与 PPTX 相同（1px = 0.75pt），图形与文字保持矢量
+  - 渲染器同 PNG 后备图片：优先 cairosvg，降级到 svglib（渐变支持有限）
+  - -j 仅对 svglib 生效：并行解析，按页面顺序写入
+        '''
+    )
+    parser.add_argument('project_path', type=str, help='项目目录路径')
+    parser.add_argument('-o', '--output', type=str, default=None, help='输出文件路径')
+    parser.add_argument('-s', '--source', type=str, default='output',
+                        help='SVG 来源: output/final 或任意子目录名 (推荐 final)')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='并行解析进程数 (默认: 1，0 表示使用全部 CPU 核心)')
+    parser.add_argument('-q', '--quiet', action='store_true', help='只输出最终结果')
+
+    args = parser.parse_args()
+    verbose = not args.quiet
+
+    if PNG_RENDERER is None:
+        print("错误: 未安装 SVG 渲染库")
+        print("请运行: pip install cairosvg 或 pip install svglib reportlab")
+        sys.exit(1)
+
+    def report(event: SlideProgress):
+        if event.error:
+            print(f"  [{event.index}/{event.total}] {event.name} - 错误: {event.error}")
+        else:
+            print(f"  [{event.index}/{event.total}] {event.name}")
+
+    try:
+        plan_log = print if verbose else None
+        if verbose:
+            print("PPT Master - SVG 转 PDF 工具")
+            print("=" * 50)
+            print(f"  项目路径: {args.project_path}")
+            print(f"  渲染器: {PNG_RENDERER}")
+            if PNG_RENDERER == 'svglib':
+                print(f"  解析进程: {resolve_jobs(args.jobs)}")
+            print()
+        result = export_project_pdf(
+            args.project_path,
+            source=args.source,
+            output=args.output,
+            log=plan_log,
+            jobs=args.jobs,
+            progress=report if verbose else None,
+        )
+    except FileNotFoundError as e:
+        print(f"错误: {e}")
+        sys.exit(1)
+
+    if verbose:
+        print()
+    print(f"[完成] 已保存: {result['output']}")
+    print(f"  SVG 目录: {result['source_dir']}")
+    print(f"  成功: {result['success']}, 失败: {len(result['failed'])}")
+    print(f"  大小: {result['size'] / 1024:.1f} KB，耗时: {result['elapsed']:.2f} s")
+    if verbose and PNG_RENDERER == 'svglib':
+        hint = get_png_renderer_info()[2]
+        if hint:
+            print(f"  [提示] {hint}")
+
+    sys.exit(0 if not result['failed'] else 1)
+
+
+if __name__ == '__main__':
+    main()
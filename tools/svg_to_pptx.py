@@ -9,6 +9,7 @@ PPT Master - SVG 转 PPTX 工具
     python3 tools/svg_to_pptx.py <项目路径>
     python3 tools/svg_to_pptx.py <项目路径> -o output.pptx
     python3 tools/svg_to_pptx.py <项目路径> --use-final
+    python3 tools/svg_to_pptx.py <项目路径> -s final -j 8
 
 示例:
     python3 tools/svg_to_pptx.py examples/ppt169_demo
@@ -18,6 +19,10 @@ PPT Master - SVG 转 PPTX 工具
 依赖:
     pip install python-pptx
 
+库接口:
+    from svg_to_pptx import build_pptx, SlideSource
+    build_pptx([SlideSource('01_封面', svg=svg_text, notes=md)], BytesIO(), progress=callback)
+
 注意:
     - SVG 以原生矢量格式嵌入，保持可编辑性
     - 需要 PowerPoint 2016+ 才能正确显示
@@ -27,17 +32,21 @@ import sys
 import os
 import argparse
 import re
+import hashlib
+import time
 import zipfile
-import shutil
-import tempfile
+from io import BytesIO
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional, Tuple, List
+from typing import Optional, Tuple, List, Union, Callable, BinaryIO, Iterator
 from xml.etree import ElementTree as ET
 
 # 检查 python-pptx 是否已安装
 try:
-    from pptx import Presentation
-    from pptx.util import Emu
+    import pptx
 except ImportError:
     print("错误: 缺少 python-pptx 库")
     print("请运行: pip install python-pptx")
@@ -45,6 +54,14 @@ except ImportError:
 
 # 导入项目工具模块
 sys.path.insert(0, str(Path(__file__).parent))
+from pptx_package import PptxPackageWriter, ZipCompressionPolicy, create_skeleton, read_manifest
+from render_cache import RenderCache
+from export_profiler import ExportProfiler, NullProfiler
+from tiled_render import render_tiled, should_tile, wrap_svg_band
+from canvas_scan import (SlideCanvas, describe_canvas, find_canvas_mismatches, fit_rect, group_by_canvas,
+                         parse_svg_canvas, scan_svg_canvas)
+from svg_to_drawingml import svg_to_native_shapes
+
 try:
     from project_utils import get_project_info
     from config import CANVAS_FORMATS
@@ -67,15 +84,20 @@ except ImportError:
 # SVG 转 PNG 库检测（用于 Office 兼容模式）
 # 优先使用 CairoSVG（渲染质量更好），降级到 svglib
 PNG_RENDERER = None  # 'cairosvg' | 'svglib' | None
+PNG_RENDERER_ID = None  # 渲染器名称与版本，用于渲染缓存键
 
 try:
     import cairosvg
     PNG_RENDERER = 'cairosvg'
+    PNG_RENDERER_ID = f"cairosvg-{getattr(cairosvg, '__version__', '')}"
 except ImportError:
     try:
-        from svglib.svglib import svg2rlg
+        from svglib.svglib import svg2rlg, __version__ as SVGLIB_VERSION
         from reportlab.graphics import renderPM
+        from reportlab.graphics.shapes import Drawing, Group
+        import reportlab
         PNG_RENDERER = 'svglib'
+        PNG_RENDERER_ID = f"svglib-{SVGLIB_VERSION}-reportlab-{reportlab.Version}"
     except ImportError:
         pass
 
@@ -89,6 +111,116 @@ def get_png_renderer_info() -> tuple:
         return (None, '(未安装)', '安装方法: pip install cairosvg 或 pip install svglib reportlab')
 
 
+@dataclass(frozen=True)
+class PngQuality:
+    """
+    PNG 后备图片质量档位
+
+    scale 为相对画布像素尺寸的倍数；colors 为调色板颜色数（None 表示保留真彩色）；
+    compress_level 为重新编码时的 zlib 级别（None 且不量化时保留渲染器的原始输出）。
+    """
+    name: str
+    label: str
+    scale: float = 1.0
+    colors: Optional[int] = None
+    compress_level: Optional[int] = None
+
+
+# PNG 后备图片质量档位：较新的 Office 显示 SVG，PNG 仅在旧版本中可见
+PNG_QUALITY_TIERS = {
+    'low': PngQuality('low', '低 (0.5x, 256 色调色板)', scale=0.5, colors=256, compress_level=9),
+    'standard': PngQuality('standard', '标准 (1x, 真彩色)'),
+    'hidpi': PngQuality('hidpi', '高清 (2x, 真彩色)', scale=2.0),
+}
+DEFAULT_PNG_QUALITY = 'standard'
+
+# 文档缩略图（文件浏览器/文档门户无需打开演示文稿即可预览）
+THUMBNAIL_PART = 'docProps/thumbnail.jpeg'
+THUMBNAIL_MAX_SIZE = 256
+THUMBNAIL_JPEG_QUALITY = 85
+
+# 页面画布与演示文稿画布不一致时的处理方式
+CANVAS_MISMATCH_MODES = {
+    'fit': '等比缩放居中',
+    'split': '拆分为单独的演示文稿',
+    'stretch': '拉伸填满',
+}
+DEFAULT_CANVAS_MISMATCH = 'fit'
+
+# 画布不一致报告中最多列出的页面数
+CANVAS_MISMATCH_REPORT_LIMIT = 10
+
+
+def get_png_quality(quality: Union[str, PngQuality, None]) -> PngQuality:
+    """解析质量档位（名称或 PngQuality，None 为默认档位）"""
+    if isinstance(quality, PngQuality):
+        return quality
+    name = quality or DEFAULT_PNG_QUALITY
+    if name not in PNG_QUALITY_TIERS:
+        raise ValueError(f"未知的 PNG 质量档位: {name}（可选: {', '.join(PNG_QUALITY_TIERS)}）")
+    return PNG_QUALITY_TIERS[name]
+
+
+def get_render_id(quality: Optional[PngQuality] = None) -> Optional[str]:
+    """
+    渲染标识（渲染器版本 + 质量档位），用于渲染缓存键与增量构建设置
+
+    标准档位与未引入档位前的标识相同，已有缓存与导出清单继续有效。
+    """
+    if PNG_RENDERER_ID is None or quality is None or quality.name == DEFAULT_PNG_QUALITY:
+        return PNG_RENDERER_ID
+    return f"{PNG_RENDERER_ID}+{quality.name}"
+
+
+def apply_png_quality(png_data: bytes, quality: Optional[PngQuality]) -> bytes:
+    """按档位对渲染结果做调色板量化与重新编码（未安装 Pillow 时原样返回）"""
+    if quality is None or (quality.colors is None and quality.compress_level is None):
+        return png_data
+    try:
+        from PIL import Image
+    except ImportError:
+        return png_data
+
+    image = Image.open(BytesIO(png_data))
+    if quality.colors is not None:
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA')
+        # 快速八叉树量化（method=2）同时支持 RGB 与 RGBA
+        image = image.quantize(colors=quality.colors, method=2)
+    buffer = BytesIO()
+    image.save(buffer, format='PNG',
+               compress_level=quality.compress_level if quality.compress_level is not None else 6)
+    return buffer.getvalue()
+
+
+def get_thumbnail_size(width: int, height: int, max_size: int = THUMBNAIL_MAX_SIZE) -> Tuple[int, int]:
+    """按长边不超过 max_size 等比缩放画布尺寸"""
+    scale = max_size / max(width, height)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def create_thumbnail_jpeg(png_data: bytes, size: Tuple[int, int]) -> Optional[bytes]:
+    """将 PNG 缩放为 JPEG 缩略图（透明区域铺白底）；未安装 Pillow 或无法解码时返回 None"""
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+    try:
+        image = Image.open(BytesIO(png_data))
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel('A'))
+        background = background.resize(size, Image.LANCZOS)
+        buffer = BytesIO()
+        background.save(buffer, format='JPEG', quality=THUMBNAIL_JPEG_QUALITY, optimize=True)
+        return buffer.getvalue()
+    except (OSError, ValueError):
+        return None
+
+
+# 导出清单版本（清单结构变化时递增，旧清单将触发完整构建）
+MANIFEST_VERSION = 1
+
 # EMU 转换常量
 EMU_PER_INCH = 914400
 EMU_PER_PIXEL = EMU_PER_INCH / 96
@@ -106,6 +238,11 @@ for prefix, uri in NAMESPACES.items():
     ET.register_namespace(prefix, uri)
 
 
+def hash_bytes(data: bytes) -> str:
+    """计算内容的 SHA-256 哈希"""
+    return hashlib.sha256(data).hexdigest()
+
+
 def get_slide_dimensions(canvas_format: str, custom_pixels: Optional[Tuple[int, int]] = None) -> Tuple[int, int]:
     """获取幻灯片尺寸（EMU 单位）"""
     if custom_pixels:
@@ -140,26 +277,43 @@ def get_pixel_dimensions(canvas_format: str, custom_pixels: Optional[Tuple[int,
     return 1280, 720
 
 
+def parse_viewbox_dimensions(content: str) -> Optional[Tuple[int, int]]:
+    """从 SVG 内容的 viewBox 提取像素尺寸（返回整数）"""
+    match = re.search(r'viewBox="([^"]+)"', content)
+    if not match:
+        return None
+    
+    parts = re.split(r'[\s,]+', match.group(1).strip())
+    if len(parts) < 4:
+        return None
+    
+    try:
+        width = float(parts[2])
+        height = float(parts[3])
+    except ValueError:
+        return None
+    if width <= 0 or height <= 0:
+        return None
+    
+    return int(round(width)), int(round(height))
+
+
+def detect_format_from_content(content: str) -> Optional[str]:
+    """从 SVG 内容的 viewBox 检测画布格式"""
+    match = re.search(r'viewBox="([^"]+)"', content)
+    if match:
+        viewbox = match.group(1)
+        for fmt_key, fmt_info in CANVAS_FORMATS.items():
+            if fmt_info['viewbox'] == viewbox:
+                return fmt_key
+    return None
+
+
 def get_viewbox_dimensions(svg_path: Path) -> Optional[Tuple[int, int]]:
     """从 SVG 的 viewBox 提取像素尺寸（返回整数）"""
     try:
         with open(svg_path, 'r', encoding='utf-8') as f:
-            content = f.read(2000)
-        
-        match = re.search(r'viewBox="([^"]+)"', content)
-        if not match:
-            return None
-        
-        parts = re.split(r'[\s,]+', match.group(1).strip())
-        if len(parts) < 4:
-            return None
-        
-        width = float(parts[2])
-        height = float(parts[3])
-        if width <= 0 or height <= 0:
-            return None
-        
-        return int(round(width)), int(round(height))
+            return parse_viewbox_dimensions(f.read(2000))
     except Exception:
         return None
 
@@ -168,70 +322,485 @@ def detect_format_from_svg(svg_path: Path) -> Optional[str]:
     """从 SVG 文件的 viewBox 检测画布格式"""
     try:
         with open(svg_path, 'r', encoding='utf-8') as f:
-            content = f.read(2000)
-        
-        match = re.search(r'viewBox="([^"]+)"', content)
-        if match:
-            viewbox = match.group(1)
-            for fmt_key, fmt_info in CANVAS_FORMATS.items():
-                if fmt_info['viewbox'] == viewbox:
-                    return fmt_key
+            return detect_format_from_content(f.read(2000))
     except Exception:
-        pass
-    return None
+        return None
 
 
-def convert_svg_to_png(svg_path: Path, png_path: Path, width: int = None, height: int = None) -> bool:
+@dataclass
+class SlideSource:
     """
-    将 SVG 转换为 PNG
+    单页幻灯片输入（库接口）
     
-    Args:
-        svg_path: SVG 文件路径
-        png_path: 输出 PNG 文件路径
-        width: 输出宽度（像素）
-        height: 输出高度（像素）
+    svg 与 path 至少提供一个：svg 为内存中的 SVG 内容（bytes 或 str），
+    path 为 SVG 文件路径（未提供 svg 时按需读取）。
+    base_dir 用于解析 SVG 中相对路径引用的图片，默认取 path 所在目录。
+    """
+    name: str
+    svg: Union[bytes, str, None] = None
+    notes: str = ''
+    path: Optional[Path] = None
+    base_dir: Optional[Path] = None
+    
+    def __post_init__(self):
+        if self.path is not None:
+            self.path = Path(self.path)
+            if self.base_dir is None:
+                self.base_dir = self.path.parent
+        if self.base_dir is not None:
+            self.base_dir = Path(self.base_dir)
+    
+    @classmethod
+    def from_file(cls, svg_path: Path, notes: str = '') -> 'SlideSource':
+        """从 SVG 文件创建（页面名称取文件名，不含扩展名）"""
+        svg_path = Path(svg_path)
+        return cls(name=svg_path.stem, notes=notes, path=svg_path)
+    
+    def read_svg(self) -> bytes:
+        """获取 SVG 字节内容"""
+        if self.svg is None:
+            if self.path is None:
+                raise ValueError(f"幻灯片 {self.name} 未提供 SVG 内容")
+            return self.path.read_bytes()
+        if isinstance(self.svg, str):
+            return self.svg.encode('utf-8')
+        return bytes(self.svg)
+
+
+def scan_slide_canvases(
+    slides: List['SlideSource'],
+    svg_contents: Optional[List[bytes]] = None
+) -> List[SlideCanvas]:
+    """
+    预扫描每页的画布尺寸（只解析根元素，见 canvas_scan.py）
+    
+    已读入内存的页面（svg_contents 或 SlideSource.svg）直接解析，
+    文件来源只读取文件开头，不载入整个 SVG。
+    """
+    canvases = []
+    for index, slide in enumerate(slides):
+        if svg_contents is not None:
+            canvases.append(parse_svg_canvas(svg_contents[index], slide.name))
+        elif slide.svg is None and slide.path is not None:
+            canvases.append(scan_svg_canvas(slide.path, slide.name))
+        else:
+            try:
+                canvases.append(parse_svg_canvas(slide.read_svg(), slide.name))
+            except (OSError, ValueError) as e:
+                canvases.append(SlideCanvas(slide.name, error=str(e)))
+    return canvases
+
+
+def detect_deck_canvas(
+    canvases: List[SlideCanvas],
+    canvas_format: Optional[str] = None
+) -> Tuple[Optional[str], Optional[Tuple[int, int]]]:
+    """
+    确定演示文稿画布：未指定格式时取第一页的画布格式，非标准尺寸时取其 viewBox 尺寸
     
     Returns:
-        是否成功转换
+        (画布格式, 自定义像素尺寸)，均无法确定时为 (None, None)
     """
-    if PNG_RENDERER is None:
-        return False
+    if canvas_format is not None or not canvases:
+        return canvas_format, None
+    if canvases[0].format:
+        return canvases[0].format, None
+    return None, canvases[0].size
+
+
+def split_slides_by_canvas(
+    canvases: List[SlideCanvas],
+    canvas_format: Optional[str] = None
+) -> List[Tuple[Tuple[int, int], Optional[str], List[int]]]:
+    """
+    按画布尺寸拆分页面（--canvas-mismatch split）
     
+    与演示文稿画布一致（或尺寸未知）的页面为第一组并沿用 canvas_format，
+    其余页面按画布尺寸分组，各组从自身页面检测画布格式。
+    
+    Returns:
+        [(画布尺寸, 画布格式, 页面下标列表)]
+    """
+    deck_format, custom_pixels = detect_deck_canvas(canvases, canvas_format)
+    deck_size = get_pixel_dimensions(deck_format or 'ppt169', custom_pixels)
+    return [
+        (size, deck_format if size == deck_size else None, indices)
+        for size, indices in group_by_canvas(canvases, deck_size)
+    ]
+
+
+@dataclass
+class SlideProgress:
+    """
+    单页导出进度（库接口回调参数）
+    
+    stage 为 'render'（PNG 后备图片就绪）或 'package'（页面已写入 PPTX）。
+    native 表示该页已转换为原生形状，warnings 为未能转换的内容。
+    """
+    stage: str
+    index: int
+    total: int
+    name: str
+    has_png: bool = False
+    has_notes: bool = False
+    native: bool = False
+    warnings: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+def _render_png(
+    svg_path: Optional[Path],
+    svg_data: Optional[bytes],
+    base_dir: Optional[Path],
+    width: int = None,
+    height: int = None,
+    quality: Optional[PngQuality] = None
+) -> Tuple[Optional[bytes], Optional[str]]:
+    """
+    渲染 PNG（不使用缓存），返回 (PNG 字节, 错误信息)
+    
+    提供 svg_path 时直接从文件渲染（相对路径引用按文件位置解析）；
+    否则渲染内存中的 svg_data，相对路径引用按 base_dir 解析（svglib 不支持）。
+    quality 指定分辨率倍数、调色板量化与压缩级别（见 PNG_QUALITY_TIERS，默认标准档位）。
+    输出超过 tiled_render.TILE_MIN_PIXELS 像素时分块渲染，峰值内存由条带大小决定。
+    """
+    label = svg_path.name if svg_path is not None else '内存 SVG'
+    scale = quality.scale if quality is not None else 1.0
+    # 输出像素数超过阈值时按水平条带分块渲染（调色板量化需要整图，不分块）
+    tiling = quality is None or quality.colors is None
+    compress_level = quality.compress_level if quality is not None and quality.compress_level is not None else 6
     try:
         if PNG_RENDERER == 'cairosvg':
             # 使用 CairoSVG（渲染质量更好）
-            cairosvg.svg2png(
-                url=str(svg_path),
-                write_to=str(png_path),
-                output_width=width,
-                output_height=height
-            )
-            return True
+            if svg_path is not None:
+                source = {'url': str(svg_path)}
+            else:
+                base_url = base_dir.resolve().as_uri() + '/' if base_dir is not None else None
+                source = {'bytestring': svg_data, 'url': base_url}
+
+            if tiling and width and height and should_tile(round(width * scale), round(height * scale)):
+                out_width, out_height = round(width * scale), round(height * scale)
+                svg_text = (svg_path.read_bytes() if svg_path is not None else svg_data).decode('utf-8')
+                band_url = svg_path.resolve().as_uri() if svg_path is not None else source['url']
+
+                def render_band(top: int, rows: int) -> bytes:
+                    # 外层 SVG 的视口偏移到条带位置，原文档按完整画布布局
+                    band_svg = wrap_svg_band(svg_text, width, height, top * height / out_height,
+                                             rows * height / out_height)
+                    return cairosvg.svg2png(bytestring=band_svg.encode('utf-8'), url=band_url,
+                                            output_width=out_width, output_height=rows)
+
+                return render_tiled(out_width, out_height, render_band, compress_level), None
+
+            output_size = {
+                'output_width': round(width * scale) if width else None,
+                'output_height': round(height * scale) if height else None,
+                'scale': 1 if width else scale,
+            }
+            png_data = cairosvg.svg2png(**source, **output_size)
+            return apply_png_quality(png_data, quality), None
         
         elif PNG_RENDERER == 'svglib':
             # 使用 svglib（轻量级，但渐变支持有限）
-            drawing = svg2rlg(str(svg_path))
+            drawing = svg2rlg(str(svg_path) if svg_path is not None else BytesIO(svg_data))
             if drawing is None:
-                print(f"  警告: 无法解析 SVG ({svg_path.name})")
-                return False
+                return None, f"无法解析 SVG ({label})"
+
+            out_width, out_height = round(drawing.width * scale), round(drawing.height * scale)
+            if tiling and should_tile(out_width, out_height):
+                def render_band(top: int, rows: int) -> bytes:
+                    # 条带画布只覆盖 rows 行，内容整体下移使该条带落在画布内（reportlab 原点在左下角）
+                    band = Drawing(drawing.width, rows / scale)
+                    offset = drawing.height - (top + rows) / scale
+                    band.add(Group(*drawing.contents, transform=(1, 0, 0, 1, 0, -offset)))
+                    return renderPM.drawToString(band, fmt="PNG", dpi=72 * scale, configPIL={'quality': 95})
+
+                return render_tiled(out_width, out_height, render_band, compress_level), None
             
-            # 渲染为 PNG
-            renderPM.drawToFile(
+            # 渲染为 PNG（按 dpi 缩放，72 dpi 为 1x）
+            png_data = renderPM.drawToString(
                 drawing,
-                str(png_path),
                 fmt="PNG",
+                dpi=72 * scale,
                 configPIL={'quality': 95}
             )
-            return True
+            return apply_png_quality(png_data, quality), None
         
     except Exception as e:
-        print(f"  警告: SVG 转 PNG 失败 ({svg_path.name}): {e}")
+        return None, f"SVG 转 PNG 失败 ({label}): {e}"
+    
+    return None, None
+
+
+def render_thumbnail(
+    source: 'SlideSource',
+    svg_data: bytes,
+    width: int,
+    height: int,
+    png_data: Optional[bytes] = None,
+    cache: Optional[RenderCache] = None
+) -> Optional[bytes]:
+    """
+    生成文档缩略图（JPEG，长边 THUMBNAIL_MAX_SIZE 像素）
+    
+    已有 PNG 后备图片时直接缩放，否则按缩略图尺寸渲染 SVG；
+    结果按 SVG 内容缓存（cache 应为 RenderCache.thumbnail_cache()，缓存的是最终的 JPEG）。
+    无法生成时返回 None。
+    """
+    thumb_width, thumb_height = get_thumbnail_size(width, height)
+    key = None
+    if cache is not None:
+        key = cache.make_key(svg_data, thumb_width, thumb_height, f'{PNG_RENDERER_ID}+thumbnail',
+                             svg_dir=source.base_dir)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+    
+    if png_data is None:
+        if PNG_RENDERER is None:
+            return None
+        quality = PngQuality('thumbnail', '缩略图', scale=thumb_width / width)
+        from_file = source.path is not None and source.svg is None
+        png_data, _ = _render_png(source.path if from_file else None, None if from_file else svg_data,
+                                  source.base_dir, width, height, quality)
+        if png_data is None:
+            return None
+    
+    jpeg_data = create_thumbnail_jpeg(png_data, (thumb_width, thumb_height))
+    if jpeg_data is not None and key is not None:
+        cache.put(key, jpeg_data)
+    return jpeg_data
+
+
+def render_svg_to_png_bytes(
+    svg_path: Path,
+    width: int = None,
+    height: int = None,
+    cache: Optional[RenderCache] = None,
+    quality: Optional[PngQuality] = None
+) -> Optional[bytes]:
+    """
+    将 SVG 渲染为 PNG 字节（不落盘）
+    
+    Args:
+        svg_path: SVG 文件路径
+        width: 输出宽度（像素）
+        height: 输出高度（像素）
+        cache: PNG 渲染缓存（None 表示不使用缓存）
+        quality: PNG 质量档位（见 PNG_QUALITY_TIERS，默认标准档位；计入缓存键）
+    
+    Returns:
+        PNG 字节内容，失败时返回 None
+    """
+    if PNG_RENDERER is None:
+        return None
+    
+    if cache is not None:
+        cache_key = get_render_cache_key(cache, svg_path, width, height, quality)
+        png_data = cache.get(cache_key)
+        if png_data is None:
+            png_data = render_svg_to_png_bytes(svg_path, width=width, height=height, quality=quality)
+            if png_data is not None:
+                cache.put(cache_key, png_data)
+        return png_data
+    
+    png_data, error = _render_png(svg_path, None, svg_path.parent, width, height, quality)
+    if error:
+        print(f"  警告: {error}")
+    return png_data
+
+
+def get_render_cache_key(cache: RenderCache, svg_path: Path, width: int, height: int,
+                         quality: Optional[PngQuality] = None) -> str:
+    """计算 SVG 在当前渲染器、质量档位与输出尺寸下的缓存键"""
+    return cache.make_key(
+        svg_path.read_bytes(), width, height, get_render_id(quality),
+        svg_dir=svg_path.parent
+    )
+
+
+def convert_svg_to_png(
+    svg_path: Path,
+    png_path: Path,
+    width: int = None,
+    height: int = None,
+    cache: Optional[RenderCache] = None,
+    quality: Optional[PngQuality] = None
+) -> bool:
+    """
+    将 SVG 转换为 PNG
+    
+    Args:
+        svg_path: SVG 文件路径
+        png_path: 输出 PNG 文件路径
+        width: 输出宽度（像素）
+        height: 输出高度（像素）
+        cache: PNG 渲染缓存（命中时跳过渲染）
+        quality: PNG 质量档位（默认标准档位）
+    
+    Returns:
+        是否成功转换
+    """
+    png_data = render_svg_to_png_bytes(svg_path, width=width, height=height, cache=cache, quality=quality)
+    if png_data is None:
         return False
     
-    return False
+    with open(png_path, 'wb') as f:
+        f.write(png_data)
+    return True
 
 
-def find_svg_files(project_path: Path, source: str = 'output') -> Tuple[List[Path], str]:
+def _render_png_task(task: tuple) -> Tuple[Optional[bytes], Optional[str], tuple]:
+    """
+    进程池任务入口（需为模块级函数以便序列化）
+    
+    Returns:
+        (PNG 字节, 错误信息, 计时 (起点, 墙钟时间, CPU 时间, 进程 ID))，计时供 --profile 使用
+    """
+    svg_path, svg_data, base_dir, width, height, quality = task
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    png_data, error = _render_png(svg_path, svg_data, base_dir, width, height, quality)
+    timing = (start, time.perf_counter() - start, time.process_time() - cpu_start, os.getpid())
+    return png_data, error, timing
+
+
+def resolve_jobs(jobs: Optional[int]) -> int:
+    """解析并行进程数：None/1 为串行，0 或负数表示使用全部 CPU 核心"""
+    if jobs is None:
+        return 1
+    if jobs <= 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+def render_png_fallbacks(
+    sources: List[Union[Path, SlideSource]],
+    width: int,
+    height: int,
+    jobs: int = 1,
+    cache: Optional[RenderCache] = None,
+    log: Optional[Callable[[str], None]] = print,
+    on_result: Optional[Callable[[int, Optional[bytes]], None]] = None,
+    profiler: Optional[ExportProfiler] = None,
+    executor: Optional[Executor] = None,
+    quality: Optional[PngQuality] = None,
+    sizes: Optional[List[Tuple[int, int]]] = None
+) -> List[Optional[bytes]]:
+    """
+    批量生成 PNG 后备图片
+    
+    jobs > 1 时使用进程池并行渲染，结果顺序与 sources 一致；
+    单页失败不影响其他页面（对应页面返回 None，由调用方降级为纯 SVG）。
+    启用缓存时先在主进程查询缓存，仅将未命中的页面交给渲染器；
+    内容相同的页面只渲染一次。
+    
+    Args:
+        sources: SVG 文件路径或 SlideSource 列表
+        width: 输出宽度（像素）
+        height: 输出高度（像素）
+        jobs: 并行进程数
+        cache: PNG 渲染缓存（None 表示不使用缓存）
+        log: 警告输出函数（None 表示不输出）
+        on_result: 每页 PNG 就绪时的回调 (页面下标, PNG 字节或 None)
+        profiler: 性能分析器（记录 cache/render 阶段，见 export_profiler.py）
+        executor: 共享的渲染进程池（提供时忽略 jobs，由调用方负责关闭）
+        quality: PNG 质量档位（见 PNG_QUALITY_TIERS，默认标准档位）
+        sizes: 每页的输出尺寸（与 sources 一一对应，覆盖 width/height；用于画布与演示文稿不一致的页面）
+    
+    Returns:
+        每个 SVG 对应的 PNG 字节内容列表（失败为 None）
+    """
+    prof = profiler if profiler is not None else NullProfiler()
+    sources = [SlideSource.from_file(s) if isinstance(s, (str, Path)) else s for s in sources]
+    results: List[Optional[bytes]] = [None] * len(sources)
+    cache_keys: List[Optional[str]] = [None] * len(sources)
+    if sizes is None:
+        sizes = [(width, height)] * len(sources)
+    
+    # 内容相同（且位于同一目录）的 SVG 只渲染一次，输出的 PNG 也完全一致，便于媒体去重
+    pending_by_content: dict = {}
+    
+    for index, source in enumerate(sources):
+        try:
+            svg_data = source.read_svg()
+        except (OSError, ValueError):
+            pending_by_content.setdefault((None, index), []).append(index)
+            continue
+        if cache is not None and PNG_RENDERER is not None:
+            with prof.stage('cache', source.name):
+                cache_keys[index] = cache.make_key(
+                    svg_data, *sizes[index], get_render_id(quality), svg_dir=source.base_dir
+                )
+                results[index] = cache.get(cache_keys[index])
+        if results[index] is None:
+            content_key = (hash_bytes(svg_data), str(source.base_dir), sizes[index])
+            pending_by_content.setdefault(content_key, []).append(index)
+        elif on_result is not None:
+            on_result(index, results[index])
+    
+    groups = list(pending_by_content.values())
+    tasks = []
+    for group in groups:
+        source = sources[group[0]]
+        # 文件来源只传路径，避免向子进程复制 SVG 内容
+        svg_data = None if source.path is not None or source.svg is None else source.read_svg()
+        tasks.append((source.path, svg_data, source.base_dir, *sizes[group[0]], quality))
+    
+    def finish(task_index: int, outcome: Tuple[Optional[bytes], Optional[str], tuple]):
+        group = groups[task_index]
+        png_data, error, (start, wall, cpu, pid) = outcome
+        prof.add('render', sources[group[0]].name, wall, cpu, start=start, pid=pid)
+        if error and log is not None:
+            log(f"  警告: {error}")
+        if cache is not None and png_data is not None and cache_keys[group[0]]:
+            cache.put(cache_keys[group[0]], png_data)
+        for index in group:
+            results[index] = png_data
+            if on_result is not None:
+                on_result(index, png_data)
+    
+    done = 0
+    jobs = min(resolve_jobs(jobs), len(tasks))
+    if tasks and (executor is not None or jobs > 1):
+        pool = None
+        try:
+            # 只捕获进程池本身的故障（无法创建或子进程崩溃），剩余页面降级为串行渲染；
+            # finish / on_result / 缓存写入中的异常照常抛出
+            try:
+                pool = executor if executor is not None else ProcessPoolExecutor(max_workers=jobs)
+                # map 按提交顺序返回结果，保证页面顺序确定
+                outcomes = pool.map(_render_png_task, tasks)
+            except (BrokenProcessPool, OSError, NotImplementedError) as e:
+                outcomes = iter(())
+                if log is not None:
+                    log(f"  警告: 并行渲染不可用，改为串行 ({e})")
+            while True:
+                try:
+                    outcome = next(outcomes)
+                except StopIteration:
+                    break
+                except (BrokenProcessPool, OSError) as e:
+                    if log is not None:
+                        log(f"  警告: 并行渲染不可用，改为串行 ({e})")
+                    break
+                finish(done, outcome)
+                done += 1
+        finally:
+            if pool is not None and pool is not executor:
+                pool.shutdown(wait=True)
+    
+    for task_index in range(done, len(tasks)):
+        finish(task_index, _render_png_task(tasks[task_index]))
+    
+    return results
+
+
+def find_svg_files(
+    project_path: Path,
+    source: str = 'output',
+    log: Optional[Callable[[str], None]] = print
+) -> Tuple[List[Path], str]:
     """
     查找项目中的 SVG 文件
     
@@ -241,6 +810,7 @@ def find_svg_files(project_path: Path, source: str = 'output') -> Tuple[List[Pat
             - 'output': svg_output（原始版本）
             - 'final': svg_final（后处理完成，推荐）
             - 或任意子目录名称
+        log: 警告输出函数（None 表示不输出）
     
     Returns:
         (SVG 文件列表, 实际使用的目录名)
@@ -256,7 +826,8 @@ def find_svg_files(project_path: Path, source: str = 'output') -> Tuple[List[Pat
     svg_dir = project_path / dir_name
     
     if not svg_dir.exists():
-        print(f"  警告: {dir_name} 目录不存在，尝试 svg_output")
+        if log is not None:
+            log(f"  警告: {dir_name} 目录不存在，尝试 svg_output")
         dir_name = 'svg_output'
         svg_dir = project_path / dir_name
     
@@ -490,7 +1061,8 @@ def create_slide_xml_with_svg(
     transition: Optional[str] = None,
     transition_duration: float = 0.5,
     auto_advance: Optional[float] = None,
-    use_compat_mode: bool = True
+    use_compat_mode: bool = True,
+    offset_emu: Tuple[int, int] = (0, 0)
 ) -> str:
     """
     创建包含 SVG 图片的幻灯片 XML
@@ -499,12 +1071,13 @@ def create_slide_xml_with_svg(
         slide_num: 幻灯片序号
         png_rid: PNG 后备图片关系 ID
         svg_rid: SVG 关系 ID
-        width_emu: 宽度（EMU）
-        height_emu: 高度（EMU）
+        width_emu: 图片宽度（EMU）
+        height_emu: 图片高度（EMU）
         transition: 切换效果名称
         transition_duration: 切换持续时间（秒）
         auto_advance: 自动翻页间隔（秒）
         use_compat_mode: 是否使用兼容模式（PNG + SVG 双格式）
+        offset_emu: 图片左上角位置（EMU，画布与幻灯片比例不同时居中放置）
     """
     # 生成切换效果 XML
     transition_xml = ''
@@ -563,7 +1136,7 @@ def create_slide_xml_with_svg(
         </p:blipFill>
         <p:spPr>
           <a:xfrm>
-            <a:off x="0" y="0"/>
+            <a:off x="{offset_emu[0]}" y="{offset_emu[1]}"/>
             <a:ext cx="{width_emu}" cy="{height_emu}"/>
           </a:xfrm>
           <a:prstGeom prst="rect">
@@ -579,7 +1152,90 @@ def create_slide_xml_with_svg(
 </p:sld>'''
 
 
-def create_slide_rels_xml(png_rid: str, png_filename: str, svg_rid: str, svg_filename: str, use_compat_mode: bool = True) -> str:
+def create_native_slide_xml(
+    shapes_xml: str,
+    transition: Optional[str] = None,
+    transition_duration: float = 0.5,
+    auto_advance: Optional[float] = None
+) -> str:
+    """
+    创建由原生形状组成的幻灯片 XML（见 svg_to_drawingml.py）
+    
+    Args:
+        shapes_xml: spTree 内的形状 XML
+        transition: 切换效果名称
+        transition_duration: 切换持续时间（秒）
+        auto_advance: 自动翻页间隔（秒）
+    """
+    transition_xml = ''
+    if transition and ANIMATIONS_AVAILABLE:
+        transition_xml = '\n' + create_transition_xml(
+            effect=transition,
+            duration=transition_duration,
+            advance_after=auto_advance
+        )
+    
+    return f'''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<p:sld xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main"
+       xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+       xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main">
+  <p:cSld>
+    <p:spTree>
+      <p:nvGrpSpPr>
+        <p:cNvPr id="1" name=""/>
+        <p:cNvGrpSpPr/>
+        <p:nvPr/>
+      </p:nvGrpSpPr>
+      <p:grpSpPr>
+        <a:xfrm>
+          <a:off x="0" y="0"/>
+          <a:ext cx="0" cy="0"/>
+          <a:chOff x="0" y="0"/>
+          <a:chExt cx="0" cy="0"/>
+        </a:xfrm>
+      </p:grpSpPr>
+{shapes_xml}
+    </p:spTree>
+  </p:cSld>
+  <p:clrMapOvr>
+    <a:masterClrMapping/>
+  </p:clrMapOvr>{transition_xml}
+</p:sld>'''
+
+
+def create_native_slide_rels_xml(
+    image_filenames: List[str],
+    notes_slide_num: Optional[int] = None
+) -> str:
+    """
+    创建原生形状幻灯片的关系文件 XML（图片关系 ID 依次为 rIdImg1...）
+    
+    Args:
+        image_filenames: 幻灯片引用的图片文件名（与形状 XML 中的顺序一致）
+        notes_slide_num: 关联的备注页序号（None 表示无备注页）
+    """
+    relationships = [
+        '  <Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/slideLayout" Target="../slideLayouts/slideLayout1.xml"/>'
+    ]
+    for index, filename in enumerate(image_filenames, 1):
+        relationships.append(f'  <Relationship Id="rIdImg{index}" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/image" Target="../media/{filename}"/>')
+    if notes_slide_num is not None:
+        relationships.append(f'  <Relationship Id="rId10" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/notesSlide" Target="../notesSlides/notesSlide{notes_slide_num}.xml"/>')
+    
+    return '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+''' + '\n'.join(relationships) + '''
+</Relationships>'''
+
+
+def create_slide_rels_xml(
+    png_rid: str,
+    png_filename: str,
+    svg_rid: str,
+    svg_filename: str,
+    use_compat_mode: bool = True,
+    notes_slide_num: Optional[int] = None
+) -> str:
     """
     创建幻灯片关系文件 XML
     
@@ -589,292 +1245,976 @@ def create_slide_rels_xml(png_rid: str, png_filename: str, svg_rid: str, svg_fil
         svg_rid: SVG 关系 ID  
         svg_filename: SVG 文件名
         use_compat_mode: 是否使用兼容模式
+        notes_slide_num: 关联的备注页序号（None 表示无备注页）
     """
+    relationships = [
+        '  <Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/slideLayout" Target="../slideLayouts/slideLayout1.xml"/>'
+    ]
     if use_compat_mode:
-        return f'''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
-<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
-  <Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/slideLayout" Target="../slideLayouts/slideLayout1.xml"/>
-  <Relationship Id="{png_rid}" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/image" Target="../media/{png_filename}"/>
-  <Relationship Id="{svg_rid}" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/image" Target="../media/{svg_filename}"/>
-</Relationships>'''
-    else:
-        return f'''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+        relationships.append(f'  <Relationship Id="{png_rid}" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/image" Target="../media/{png_filename}"/>')
+    relationships.append(f'  <Relationship Id="{svg_rid}" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/image" Target="../media/{svg_filename}"/>')
+    if notes_slide_num is not None:
+        relationships.append(f'  <Relationship Id="rId10" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/notesSlide" Target="../notesSlides/notesSlide{notes_slide_num}.xml"/>')
+    
+    return '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
 <Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
-  <Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/slideLayout" Target="../slideLayouts/slideLayout1.xml"/>
-  <Relationship Id="{svg_rid}" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/image" Target="../media/{svg_filename}"/>
+''' + '\n'.join(relationships) + '''
 </Relationships>'''
 
 
-def create_pptx_with_native_svg(
-    svg_files: List[Path],
-    output_path: Path,
+# 按画布拆分导出的子演示文稿文件名：<主演示文稿名>_<宽>x<高>.pptx
+SPLIT_OUTPUT_PATTERN = re.compile(r'^(.+)_\d+x\d+$')
+
+
+def split_output_path(output_path: Path, size: Tuple[int, int]) -> Path:
+    """按画布拆分（--canvas-mismatch split）时，画布尺寸为 size 的子演示文稿路径"""
+    return output_path.with_name(f"{output_path.stem}_{size[0]}x{size[1]}{output_path.suffix}")
+
+
+def is_split_output(pptx_path: Path) -> bool:
+    """是否为按画布拆分导出的子演示文稿（同目录下存在对应的主演示文稿）"""
+    match = SPLIT_OUTPUT_PATTERN.match(pptx_path.stem)
+    return match is not None and pptx_path.with_name(match.group(1) + pptx_path.suffix).exists()
+
+
+def find_previous_export(directory: Path) -> Optional[Path]:
+    """
+    查找目录中最近一次导出的、带有导出清单的 PPTX（用于增量构建）
+    
+    按画布拆分导出的子演示文稿不作为基准（页面与设置均与主演示文稿不同），
+    其基准由 split_output_path 从主演示文稿推出。
+    
+    Args:
+        directory: 查找目录（通常为项目目录）
+    
+    Returns:
+        最新的 PPTX 路径，未找到时返回 None
+    """
+    candidates = sorted(directory.glob('*.pptx'), key=lambda p: p.stat().st_mtime, reverse=True)
+    for pptx_path in candidates:
+        if is_split_output(pptx_path):
+            continue
+        try:
+            with zipfile.ZipFile(pptx_path, 'r') as zf:
+                if read_manifest(zf) is not None:
+                    return pptx_path
+        except (OSError, zipfile.BadZipFile):
+            continue
+    return None
+
+
+class PreviousExport:
+    """上一次导出（增量构建基准），按需读取其中可复用的 PNG 后备图片"""
+    
+    def __init__(self, package: zipfile.ZipFile, manifest: dict):
+        self._package = package
+        self.slides: List[dict] = manifest.get('slides', [])
+        self._png_members: dict = {}
+        for slide in self.slides:
+            svg_hash = slide.get('svg_sha256')
+            png_name = slide.get('png')
+            if svg_hash and png_name and svg_hash not in self._png_members:
+                self._png_members[svg_hash] = f'ppt/media/{png_name}'
+    
+    def read_png(self, svg_hash: str) -> Optional[bytes]:
+        """读取与 SVG 哈希对应的 PNG，不存在时返回 None"""
+        member = self._png_members.get(svg_hash)
+        if member is None:
+            return None
+        try:
+            return self._package.read(member)
+        except KeyError:
+            return None
+    
+    def close(self):
+        self._package.close()
+
+
+def open_previous_export(
+    pptx_path: Path,
+    settings: dict,
+    log: Optional[Callable[[str], None]] = print
+) -> Optional[PreviousExport]:
+    """
+    打开上一次导出的 PPTX 作为增量构建基准（PNG 在使用时才读取，不整体载入内存）
+    
+    Args:
+        pptx_path: 上一次导出的 PPTX 路径
+        settings: 本次导出中影响 PNG 的设置（尺寸、渲染器等），与清单不一致时不复用
+        log: 日志输出函数（None 表示不输出）
+    
+    Returns:
+        PreviousExport（使用完毕后需调用 close）；无法复用时返回 None
+    """
+    try:
+        package = zipfile.ZipFile(pptx_path, 'r')
+    except (OSError, zipfile.BadZipFile) as e:
+        if log is not None:
+            log(f"  增量构建: 无法读取 {pptx_path.name} ({e})，执行完整构建")
+        return None
+    
+    manifest = read_manifest(package)
+    if not manifest or manifest.get('version') != MANIFEST_VERSION:
+        package.close()
+        if log is not None:
+            log(f"  增量构建: {pptx_path.name} 无可用导出清单，执行完整构建")
+        return None
+    if manifest.get('settings') != settings:
+        package.close()
+        if log is not None:
+            log(f"  增量构建: 导出设置已变化，执行完整构建")
+        return None
+    
+    return PreviousExport(package, manifest)
+
+
+def iter_slide_payloads(
+    slides: List[SlideSource],
+    width: int,
+    height: int,
+    use_compat_mode: bool = True,
+    jobs: int = 1,
+    cache: Optional[RenderCache] = None,
+    previous: Optional[PreviousExport] = None,
+    log: Optional[Callable[[str], None]] = print,
+    profiler: Optional[ExportProfiler] = None,
+    executor: Optional[Executor] = None,
+    quality: Optional[PngQuality] = None,
+    sizes: Optional[List[Tuple[int, int]]] = None
+) -> Iterator[Tuple[Optional[bytes], Optional[str], Optional[bytes], Optional[str]]]:
+    """
+    逐页产出 (SVG 内容, SVG 哈希, PNG 字节, 错误信息)，供流式导出使用
+    
+    与 render_png_fallbacks 不同，任意时刻只有少量页面驻留内存：
+    串行时读取一页、渲染一页；并行时最多 jobs × 2 页在途，仍按页面顺序产出。
+    读取失败的页面产出 (None, None, None, 错误信息)。
+    提供共享进程池 executor 时直接使用（由调用方负责关闭）。
+    sizes 为每页的输出尺寸（覆盖 width/height，见 render_png_fallbacks）。
+    """
+    prof = profiler if profiler is not None else NullProfiler()
+    workers = resolve_jobs(jobs) if use_compat_mode and PNG_RENDERER is not None else 1
+    shared_executor = executor
+    if executor is not None:
+        workers = max(workers, 2)
+    elif workers > 1:
+        try:
+            executor = ProcessPoolExecutor(max_workers=workers)
+        except Exception as e:
+            if log is not None:
+                log(f"  警告: 并行渲染不可用，改为串行 ({e})")
+    window = workers * 2 if executor is not None else 1
+    
+    def prepare(index: int) -> dict:
+        source = slides[index]
+        render_width, render_height = sizes[index] if sizes is not None else (width, height)
+        try:
+            with prof.stage('read', source.name):
+                svg_data = source.read_svg()
+        except (OSError, ValueError) as e:
+            return {'error': str(e)}
+        entry = {'name': source.name, 'svg': svg_data, 'hash': hash_bytes(svg_data),
+                 'png': None, 'key': None, 'task': None, 'future': None}
+        if not use_compat_mode:
+            return entry
+        with prof.stage('cache', source.name):
+            if previous is not None:
+                entry['png'] = previous.read_png(entry['hash'])
+            if entry['png'] is None and cache is not None and PNG_RENDERER is not None:
+                entry['key'] = cache.make_key(svg_data, render_width, render_height, get_render_id(quality),
+                                              svg_dir=source.base_dir)
+                entry['png'] = cache.get(entry['key'])
+        if entry['png'] is None:
+            # 文件来源只传路径，避免向子进程复制 SVG 内容
+            entry['task'] = (source.path, None if source.path is not None else svg_data,
+                             source.base_dir, render_width, render_height, quality)
+            if executor is not None:
+                entry['future'] = executor.submit(_render_png_task, entry['task'])
+        return entry
+    
+    pending: deque = deque()
+    next_index = 0
+    try:
+        while next_index < len(slides) or pending:
+            while next_index < len(slides) and len(pending) < window:
+                pending.append(prepare(next_index))
+                next_index += 1
+            entry = pending.popleft()
+            if 'error' in entry:
+                yield None, None, None, entry['error']
+                continue
+            if entry['task'] is not None:
+                try:
+                    outcome = entry['future'].result() if entry['future'] is not None else _render_png_task(entry['task'])
+                except Exception:
+                    # 子进程异常（如进程池崩溃）时改为在本进程渲染
+                    outcome = _render_png_task(entry['task'])
+                png_data, error, (start, wall, cpu, pid) = outcome
+                prof.add('render', entry['name'], wall, cpu, start=start, pid=pid)
+                if error and log is not None:
+                    log(f"  警告: {error}")
+                if png_data is not None and cache is not None and entry['key']:
+                    cache.put(entry['key'], png_data)
+                entry['png'] = png_data
+            yield entry['svg'], entry['hash'], entry['png'], None
+    finally:
+        if executor is not None:
+            for entry in pending:
+                if entry.get('future') is not None:
+                    entry['future'].cancel()
+            if executor is not shared_executor:
+                executor.shutdown(wait=True)
+
+
+def get_peak_memory() -> Optional[Tuple[int, int]]:
+    """获取峰值常驻内存 (本进程, 渲染子进程中的最大值)，单位字节；不支持的平台返回 None"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    # macOS 上 ru_maxrss 单位为字节，Linux 上为 KB
+    scale = 1 if sys.platform == 'darwin' else 1024
+    return (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale,
+            resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale)
+
+
+def format_incremental_summary(previous_slides: List[dict], current_slides: List[dict]) -> str:
+    """生成增量构建的页面变化统计（按页面名称对应新旧页面）"""
+    def slide_key(slide: dict) -> tuple:
+        return (slide.get('svg_sha256'), slide.get('notes_sha256'))
+    
+    previous_by_name = {slide.get('name'): slide_key(slide) for slide in previous_slides}
+    current_names = {slide.get('name') for slide in current_slides}
+    
+    unchanged = modified = added = 0
+    for slide in current_slides:
+        name = slide.get('name')
+        if name not in previous_by_name:
+            added += 1
+        elif previous_by_name[name] == slide_key(slide):
+            unchanged += 1
+        else:
+            modified += 1
+    removed = sum(1 for name in previous_by_name if name not in current_names)
+    
+    return f"  增量构建: 未变化 {unchanged} 页, 修改 {modified} 页, 新增 {added} 页, 移除 {removed} 页"
+
+
+def build_pptx(
+    slides: List[Union[SlideSource, bytes, str]],
+    output: Union[str, Path, BinaryIO],
     canvas_format: Optional[str] = None,
-    verbose: bool = True,
     transition: Optional[str] = None,
     transition_duration: float = 0.5,
     auto_advance: Optional[float] = None,
     use_compat_mode: bool = True,
-    notes: Optional[dict] = None,
-    enable_notes: bool = True
-) -> bool:
+    native: bool = False,
+    enable_notes: bool = True,
+    jobs: int = 1,
+    use_cache: bool = True,
+    previous_pptx: Optional[Path] = None,
+    compression: Optional[ZipCompressionPolicy] = None,
+    streaming: bool = False,
+    progress: Optional[Callable[[SlideProgress], None]] = None,
+    log: Optional[Callable[[str], None]] = None,
+    profiler: Optional[ExportProfiler] = None,
+    executor: Optional[Executor] = None,
+    png_quality: Union[str, PngQuality] = DEFAULT_PNG_QUALITY,
+    thumbnail: Optional[bool] = None,
+    canvas_mismatch: str = DEFAULT_CANVAS_MISMATCH,
+    canvases: Optional[List[SlideCanvas]] = None
+) -> dict:
     """
-    创建包含原生 SVG 的 PPTX 文件
+    生成包含原生 SVG 的 PPTX（库接口）
+    
+    输入为内存中的 SVG 内容，输出可以是文件路径或任意可写二进制流（如 BytesIO），
+    默认不向控制台输出任何内容。
+    
+    示例:
+        buffer = BytesIO()
+        result = build_pptx(
+            [SlideSource('01_封面', svg=svg_text, notes='# 开场'), svg_bytes],
+            buffer,
+            progress=lambda p: print(p.stage, p.index, p.total),
+        )
+        pptx_bytes = buffer.getvalue()
     
     Args:
-        svg_files: SVG 文件列表
-        output_path: 输出路径
-        canvas_format: 画布格式
-        verbose: 是否输出详细信息
+        slides: 幻灯片列表（SlideSource，或直接传入 SVG 的 bytes/str，自动命名为 slide01...）
+        output: 输出路径或可写二进制流
+        canvas_format: 画布格式（默认从第一页 viewBox 检测）
         transition: 切换效果 (fade/push/wipe/split/reveal/cover/random)
         transition_duration: 切换持续时间（秒）
         auto_advance: 自动翻页间隔（秒）
         use_compat_mode: 使用 Office 兼容模式（PNG + SVG 双格式，默认开启）
-        notes: 备注字典，key 为幻灯片编号，value 为备注内容
-        enable_notes: 是否启用备注嵌入（默认开启）
+        native: 转换为 PowerPoint 原生形状（DrawingML，不渲染 PNG；转换失败的页面降级为纯 SVG）
+        enable_notes: 是否嵌入备注（备注取自 SlideSource.notes，Markdown 格式）
+        jobs: PNG 后备图片并行渲染进程数（默认 1 串行，0 表示使用全部 CPU 核心）
+        use_cache: 是否使用 PNG 渲染缓存（见 render_cache.py）
+        previous_pptx: 增量构建所依据的上一次导出（未变化页面直接复用其 PNG 后备图片）
+        compression: zip 压缩策略（默认：已压缩媒体直接存储，XML 以级别 6 压缩）
+        streaming: 流式导出（逐页完成读取、渲染与写入并释放缓冲区，内存占用不随页数增长）
+        progress: 进度回调，每页在 PNG 就绪与写入 PPTX 后各调用一次
+        log: 文本日志输出函数（如 print；None 表示不输出）
+        profiler: 性能分析器，记录各阶段/各页的耗时与写入字节数（见 export_profiler.py）
+        executor: 共享的 PNG 渲染进程池（多个导出同时进行时共用，提供时忽略 jobs；由调用方负责关闭）
+        png_quality: PNG 后备图片质量档位 low/standard/hidpi（见 PNG_QUALITY_TIERS）
+        thumbnail: 以第一页生成文档缩略图 docProps/thumbnail.jpeg（需要 Pillow）；None（默认）表示
+            原生形状模式下不生成（该模式没有 PNG 后备图片，生成缩略图需要单独渲染），其余模式生成
+        canvas_mismatch: 页面画布与演示文稿不一致时的处理方式 fit（等比缩放居中）/stretch（拉伸）；
+            split 需由调用方按 split_slides_by_canvas 分组后分别导出
+        canvases: 预扫描的页面画布（与 slides 一一对应，默认在导出开始时扫描，见 scan_slide_canvases）
+    
+    Returns:
+        导出结果字典：total/success/failed（失败页面名称列表）/compat（实际是否使用兼容模式）/
+        native_slides/png_fallbacks/cache_hits/media_count/media_deduplicated_bytes/incremental_summary/
+        thumbnail（是否写入了缩略图）/canvas_mismatches（画布与演示文稿不一致的页面名称列表）/
+        peak_memory/peak_memory_children（峰值常驻内存字节数，不支持的平台为 None）
     """
-    if not svg_files:
-        print("错误: 没有找到 SVG 文件")
-        return False
+    def emit(message: str = ''):
+        if log is not None:
+            log(message)
+    
+    prof = profiler if profiler is not None else NullProfiler()
+    slides = [
+        s if isinstance(s, SlideSource) else SlideSource(name=f'slide{i:02d}', svg=s)
+        for i, s in enumerate(slides, 1)
+    ]
+    if not slides:
+        raise ValueError("没有可导出的幻灯片")
+    total = len(slides)
+    quality = get_png_quality(png_quality)
+    if canvas_mismatch not in ('fit', 'stretch'):
+        raise ValueError(f"不支持的画布处理方式: {canvas_mismatch}（split 需先按 split_slides_by_canvas 分组）")
+    
+    # 原生形状模式不需要 PNG 后备图片
+    if native:
+        use_compat_mode = False
     
     # 检查兼容模式依赖
     renderer_name, renderer_status, renderer_hint = get_png_renderer_info()
     if use_compat_mode and PNG_RENDERER is None:
-        print("警告: 未安装 PNG 渲染库，无法使用兼容模式")
-        print(f"  {renderer_hint}")
-        print("  将使用纯 SVG 模式（可能在 Office LTSC 2021 等版本中不显示）")
+        emit("警告: 未安装 PNG 渲染库，无法使用兼容模式")
+        emit(f"  {renderer_hint}")
+        emit("  将使用纯 SVG 模式（可能在 Office LTSC 2021 等版本中不显示）")
         use_compat_mode = False
     
-    # 自动检测画布格式或从 viewBox 获取尺寸
-    custom_pixels: Optional[Tuple[int, int]] = None
-    if canvas_format is None:
-        canvas_format = detect_format_from_svg(svg_files[0])
-        if canvas_format and verbose:
-            format_name = CANVAS_FORMATS.get(canvas_format, {}).get('name', canvas_format)
-            print(f"  检测到画布格式: {format_name}")
+    # 流式模式不预先读取页面（只扫描根元素检测画布），页面在打包时逐页读取
+    svg_contents: Optional[List[bytes]] = None
+    if not streaming:
+        svg_contents = []
+        for slide in slides:
+            with prof.stage('read', slide.name):
+                svg_contents.append(slide.read_svg())
     
-    if canvas_format is None:
-        custom_pixels = get_viewbox_dimensions(svg_files[0])
-        if custom_pixels and verbose:
-            print(f"  使用 SVG viewBox 尺寸: {custom_pixels[0]} x {custom_pixels[1]} px")
+    # 预扫描每页画布：自动检测画布格式或从 viewBox 获取尺寸，并找出尺寸不一致的页面
+    custom_pixels: Optional[Tuple[int, int]] = None
+    with prof.stage('detect'):
+        if canvases is None:
+            canvases = scan_slide_canvases(slides, svg_contents)
+        if canvas_format is None:
+            canvas_format, custom_pixels = detect_deck_canvas(canvases)
+            if canvas_format:
+                format_name = CANVAS_FORMATS.get(canvas_format, {}).get('name', canvas_format)
+                emit(f"  检测到画布格式: {format_name}")
+            elif custom_pixels:
+                emit(f"  使用 SVG viewBox 尺寸: {custom_pixels[0]} x {custom_pixels[1]} px")
     
     if canvas_format is None and custom_pixels is None:
         canvas_format = 'ppt169'
-        if verbose:
-            print(f"  使用默认格式: PPT 16:9")
+        emit(f"  使用默认格式: PPT 16:9")
     
     width_emu, height_emu = get_slide_dimensions(canvas_format or 'ppt169', custom_pixels)
     pixel_width, pixel_height = get_pixel_dimensions(canvas_format or 'ppt169', custom_pixels)
     
-    if verbose:
-        print(f"  幻灯片尺寸: {pixel_width} x {pixel_height} px")
-        print(f"  SVG 文件数: {len(svg_files)}")
-        if use_compat_mode:
-            print(f"  兼容模式: 开启 (PNG + SVG 双格式)")
-            print(f"  PNG 渲染: {renderer_name} {renderer_status}")
-        else:
-            print(f"  兼容模式: 关闭 (纯 SVG)")
-        if transition:
-            trans_name = TRANSITIONS.get(transition, {}).get('name', transition) if TRANSITIONS else transition
-            print(f"  切换效果: {trans_name}")
-        if enable_notes and notes:
-            print(f"  演讲备注: {len(notes)} 页")
-        elif enable_notes:
-            print(f"  演讲备注: 已启用（未找到备注文件）")
-        else:
-            print(f"  演讲备注: 已禁用")
-        print()
+    # 每页的 PNG 输出尺寸与图片位置（EMU）；fit 模式下不一致的页面等比缩放居中
+    mismatched = find_canvas_mismatches(canvases, (pixel_width, pixel_height))
+    render_sizes = [(pixel_width, pixel_height)] * total
+    placements = [(0, 0, width_emu, height_emu)] * total
+    if canvas_mismatch == 'fit':
+        for index in mismatched:
+            canvas_width, canvas_height = canvases[index].size
+            placements[index] = fit_rect(canvas_width, canvas_height, width_emu, height_emu)
+            render_sizes[index] = fit_rect(canvas_width, canvas_height, pixel_width, pixel_height)[2:]
     
-    # 创建临时目录
-    temp_dir = Path(tempfile.mkdtemp())
+    notes_count = sum(1 for slide in slides if slide.notes)
+    emit(f"  幻灯片尺寸: {pixel_width} x {pixel_height} px")
+    emit(f"  SVG 文件数: {total}")
+    if mismatched:
+        emit(f"  画布不一致: {len(mismatched)} 页与演示文稿画布 {describe_canvas((pixel_width, pixel_height))} 不同"
+             f"（{CANVAS_MISMATCH_MODES[canvas_mismatch]}）")
+        for index in mismatched[:CANVAS_MISMATCH_REPORT_LIMIT]:
+            emit(f"    - {slides[index].name}: {describe_canvas(canvases[index].size)}")
+        if len(mismatched) > CANVAS_MISMATCH_REPORT_LIMIT:
+            emit(f"    ... 还有 {len(mismatched) - CANVAS_MISMATCH_REPORT_LIMIT} 页")
+    if native:
+        emit(f"  导出模式: 原生形状 (DrawingML，无需渲染)")
+    elif use_compat_mode:
+        emit(f"  兼容模式: 开启 (PNG + SVG 双格式)")
+        emit(f"  PNG 渲染: {renderer_name} {renderer_status}")
+        if quality.name != DEFAULT_PNG_QUALITY:
+            emit(f"  PNG 质量: {quality.label}")
+        if resolve_jobs(jobs) > 1:
+            emit(f"  并行渲染: {resolve_jobs(jobs)} 进程")
+    else:
+        emit(f"  兼容模式: 关闭 (纯 SVG)")
+    if streaming:
+        emit(f"  流式导出: 开启（逐页处理，内存占用恒定）")
+    if transition:
+        trans_name = TRANSITIONS.get(transition, {}).get('name', transition) if TRANSITIONS else transition
+        emit(f"  切换效果: {trans_name}")
+    if enable_notes and notes_count:
+        emit(f"  演讲备注: {notes_count} 页")
+    elif enable_notes:
+        emit(f"  演讲备注: 已启用（未找到备注文件）")
+    else:
+        emit(f"  演讲备注: 已禁用")
+    emit()
+    
+    # 影响 PNG 后备图片的导出设置（增量构建时需与上一次一致）
+    export_settings = {
+        'slide_size_emu': [width_emu, height_emu],
+        'pixel_size': [pixel_width, pixel_height],
+        'compat': use_compat_mode,
+        'renderer': get_render_id(quality) if use_compat_mode else None,
+        'native': native,
+    }
+    # 只在存在不一致页面时记录处理方式（画布一致的演示文稿沿用原有清单）
+    if mismatched:
+        export_settings['canvas_mismatch'] = canvas_mismatch
+    
+    # 增量构建：复用上一次导出中未变化页面的 PNG（使用时才从上一次导出中读取）
+    previous = None
+    if previous_pptx is not None:
+        previous = open_previous_export(Path(previous_pptx), export_settings, log)
+    
+    cache = RenderCache() if use_cache and use_compat_mode else None
+    failed: List[str] = []
+    png_fallbacks = 0
+    native_slides = 0
+    manifest_slides = []
+    payloads = None
+    # 缩略图取第一个成功写入的页面，只尝试一次
+    thumbnail_pending = (not native) if thumbnail is None else thumbnail
+    thumbnail_written = False
     
     try:
-        # 首先用 python-pptx 创建基础 PPTX
-        prs = Presentation()
-        prs.slide_width = width_emu
-        prs.slide_height = height_emu
-        
-        # 添加空白幻灯片作为占位
-        blank_layout = prs.slide_layouts[6]
-        for _ in svg_files:
-            prs.slides.add_slide(blank_layout)
-        
-        # 保存基础 PPTX
-        base_pptx = temp_dir / 'base.pptx'
-        prs.save(str(base_pptx))
-        
-        # 解压 PPTX
-        extract_dir = temp_dir / 'pptx_content'
-        with zipfile.ZipFile(base_pptx, 'r') as zf:
-            zf.extractall(extract_dir)
-        
-        # 创建 media 目录
-        media_dir = extract_dir / 'ppt' / 'media'
-        media_dir.mkdir(exist_ok=True)
-        
-        # 处理每个 SVG 文件
-        success_count = 0
-        any_png_generated = False
-        
-        for i, svg_path in enumerate(svg_files, 1):
-            slide_num = i
-            svg_filename = f'image{i}.svg'
-            png_filename = f'image{i}.png'
-            png_rid = 'rId2'
-            svg_rid = 'rId3' if use_compat_mode else 'rId2'
+        if streaming:
+            # 流式导出：读取、渲染与写入逐页进行，只有少量页面同时驻留内存
+            payloads = iter_slide_payloads(
+                slides, pixel_width, pixel_height, use_compat_mode=use_compat_mode,
+                jobs=jobs, cache=cache, previous=previous, log=log, profiler=profiler,
+                executor=executor, quality=quality, sizes=render_sizes
+            )
+        else:
+            svg_hashes = [hash_bytes(svg_data) for svg_data in svg_contents]
             
-            try:
-                # 复制 SVG 到 media 目录
-                shutil.copy(svg_path, media_dir / svg_filename)
+            # 兼容模式：预先生成全部 PNG 后备图片（可并行）
+            png_results: List[Optional[bytes]] = [None] * total
+            if use_compat_mode:
+                if previous is not None:
+                    reused = {}
+                    for index, svg_hash in enumerate(svg_hashes):
+                        with prof.stage('cache', slides[index].name):
+                            if svg_hash not in reused:
+                                reused[svg_hash] = previous.read_png(svg_hash)
+                            png_results[index] = reused[svg_hash]
                 
-                # 兼容模式：生成 PNG 后备图片
-                slide_has_png = False
-                if use_compat_mode:
-                    png_path = media_dir / png_filename
-                    png_success = convert_svg_to_png(
-                        svg_path, 
-                        png_path,
-                        width=pixel_width,
-                        height=pixel_height
-                    )
-                    if png_success:
-                        slide_has_png = True
-                        any_png_generated = True
-                    else:
-                        # PNG 生成失败，降级为纯 SVG
-                        if verbose:
-                            print(f"  [{i}/{len(svg_files)}] {svg_path.name} - PNG 生成失败，使用纯 SVG")
-                        svg_rid = 'rId2'
+                to_render = [index for index, png_data in enumerate(png_results) if png_data is None]
                 
-                # 更新幻灯片 XML
-                slide_xml_path = extract_dir / 'ppt' / 'slides' / f'slide{slide_num}.xml'
-                slide_xml = create_slide_xml_with_svg(
-                    slide_num, 
-                    png_rid=png_rid,
-                    svg_rid=svg_rid, 
-                    width_emu=width_emu, 
-                    height_emu=height_emu,
-                    transition=transition,
-                    transition_duration=transition_duration,
-                    auto_advance=auto_advance,
-                    use_compat_mode=(use_compat_mode and slide_has_png)
-                )
-                with open(slide_xml_path, 'w', encoding='utf-8') as f:
-                    f.write(slide_xml)
+                def report_render(index: int, png_data: Optional[bytes]):
+                    if progress is not None:
+                        slide_index = to_render[index]
+                        progress(SlideProgress('render', slide_index + 1, total, slides[slide_index].name,
+                                               has_png=png_data is not None))
+                
+                if progress is not None:
+                    for index, png_data in enumerate(png_results):
+                        if png_data is not None:
+                            progress(SlideProgress('render', index + 1, total, slides[index].name, has_png=True))
                 
-                # 创建/更新关系文件
-                rels_dir = extract_dir / 'ppt' / 'slides' / '_rels'
-                rels_dir.mkdir(exist_ok=True)
-                rels_path = rels_dir / f'slide{slide_num}.xml.rels'
-                rels_xml = create_slide_rels_xml(
-                    png_rid=png_rid,
-                    png_filename=png_filename,
-                    svg_rid=svg_rid, 
-                    svg_filename=svg_filename,
-                    use_compat_mode=(use_compat_mode and slide_has_png)
+                rendered = render_png_fallbacks(
+                    [slides[index] for index in to_render], pixel_width, pixel_height,
+                    jobs=jobs, cache=cache, log=log, on_result=report_render, profiler=profiler,
+                    executor=executor, quality=quality, sizes=[render_sizes[index] for index in to_render]
                 )
-                with open(rels_path, 'w', encoding='utf-8') as f:
-                    f.write(rels_xml)
+                for index, png_data in zip(to_render, rendered):
+                    png_results[index] = png_data
+                if cache is not None and cache.hits:
+                    emit(f"  渲染缓存: 命中 {cache.hits}/{total} 页")
+                    emit()
+            
+            payloads = iter(list(zip(svg_contents, svg_hashes, png_results, [None] * total)))
+        
+        # 流式写入 PPTX：骨架部件直接复制，幻灯片/关系/备注/媒体在内存中生成后写入
+        with prof.stage('skeleton'):
+            skeleton = create_skeleton(width_emu, height_emu)
+        # 写入器先写临时文件，成功关闭后才替换输出文件（中断时原有文件保持不变）
+        with PptxPackageWriter(output, skeleton, compression=compression) as writer:
+            for i, (slide, payload) in enumerate(zip(slides, payloads), 1):
+                svg_data, svg_hash, png_data, read_error = payload
+                if streaming and use_compat_mode and progress is not None:
+                    progress(SlideProgress('render', i, total, slide.name,
+                                           has_png=png_data is not None, error=read_error))
                 
-                # 处理备注
-                notes_content = ''
-                if enable_notes:
-                    # 按文件名匹配（新逻辑）或按序号匹配（向后兼容）
-                    svg_stem = svg_path.stem
-                    notes_content = notes.get(svg_stem, '') if notes else ''
-                    if notes_content:
-                        notes_text = markdown_to_plain_text(notes_content)
+                png_rid = 'rId2'
+                svg_rid = 'rId3' if use_compat_mode else 'rId2'
+                x_emu, y_emu, cx_emu, cy_emu = placements[i - 1]
+                
+                try:
+                    if read_error is not None:
+                        raise ValueError(read_error)
+                    slide_num = writer.next_slide_num
+                    
+                    # 兼容模式：使用 PNG 后备图片（生成失败时降级为纯 SVG）
+                    slide_has_png = use_compat_mode and png_data is not None
+                    if use_compat_mode and not slide_has_png:
+                        svg_rid = 'rId2'
+                    
+                    # 原生形状模式：转换失败时降级为纯 SVG 图片
+                    native_slide = None
+                    native_warnings: List[str] = []
+                    if native:
+                        with prof.stage('native', slide.name):
+                            try:
+                                native_slide = svg_to_native_shapes(svg_data, cx_emu, cy_emu, slide.base_dir,
+                                                                    offset=(x_emu, y_emu))
+                                native_warnings = native_slide.warnings
+                            except (ET.ParseError, ValueError) as e:
+                                native_warnings = [f"原生形状转换失败，使用纯 SVG ({e})"]
+                    
+                    # 处理备注
+                    notes_text = ''
+                    notes_xml = None
+                    notes_rels_xml = None
+                    if enable_notes:
+                        with prof.stage('notes', slide.name):
+                            notes_text = markdown_to_plain_text(slide.notes) if slide.notes else ''
+                            notes_xml = create_notes_slide_xml(slide_num, notes_text)
+                            notes_rels_xml = create_notes_slide_rels_xml(slide_num)
+                    
+                    # 生成幻灯片 XML 与关系文件（含备注关联），写入媒体文件
+                    if native_slide is not None:
+                        # 原生形状：只写入 SVG 中引用的图片
+                        with prof.stage('xml', slide.name):
+                            slide_xml = create_native_slide_xml(
+                                native_slide.shapes_xml,
+                                transition=transition,
+                                transition_duration=transition_duration,
+                                auto_advance=auto_advance
+                            )
+                        with prof.stage('zip', slide.name) as timer:
+                            bytes_before = writer.bytes_written
+                            image_filenames = [
+                                writer.add_media(f'image{slide_num}_{index}.{ext}', data)
+                                for index, (ext, data) in enumerate(native_slide.images, 1)
+                            ]
+                            timer.bytes = writer.bytes_written - bytes_before
+                        with prof.stage('xml', slide.name):
+                            rels_xml = create_native_slide_rels_xml(
+                                image_filenames,
+                                notes_slide_num=slide_num if enable_notes else None
+                            )
+                        svg_filename = None
+                        native_slides += 1
                     else:
-                        notes_text = ''  # 空备注
+                        with prof.stage('xml', slide.name):
+                            slide_xml = create_slide_xml_with_svg(
+                                slide_num, 
+                                png_rid=png_rid,
+                                svg_rid=svg_rid, 
+                                width_emu=cx_emu, 
+                                height_emu=cy_emu,
+                                transition=transition,
+                                transition_duration=transition_duration,
+                                auto_advance=auto_advance,
+                                use_compat_mode=slide_has_png,
+                                offset_emu=(x_emu, y_emu)
+                            )
+                        with prof.stage('zip', slide.name) as timer:
+                            bytes_before = writer.bytes_written
+                            svg_filename = writer.add_media(f'image{slide_num}.svg', svg_data)
+                            png_filename = f'image{slide_num}.png'
+                            if slide_has_png:
+                                png_filename = writer.add_media(png_filename, png_data)
+                                png_fallbacks += 1
+                            timer.bytes = writer.bytes_written - bytes_before
+                        
+                        with prof.stage('xml', slide.name):
+                            rels_xml = create_slide_rels_xml(
+                                png_rid=png_rid,
+                                png_filename=png_filename,
+                                svg_rid=svg_rid, 
+                                svg_filename=svg_filename,
+                                use_compat_mode=slide_has_png,
+                                notes_slide_num=slide_num if enable_notes else None
+                            )
                     
-                    # 创建 notesSlides 目录
-                    notes_slides_dir = extract_dir / 'ppt' / 'notesSlides'
-                    notes_slides_dir.mkdir(exist_ok=True)
+                    with prof.stage('zip', slide.name) as timer:
+                        bytes_before = writer.bytes_written
+                        writer.add_slide(slide_xml, rels_xml, notes_xml, notes_rels_xml)
+                        timer.bytes = writer.bytes_written - bytes_before
+                    manifest_slides.append({
+                        'name': slide.name,
+                        'svg_sha256': svg_hash,
+                        'notes_sha256': hash_bytes(notes_text.encode('utf-8')) if enable_notes else None,
+                        'svg': svg_filename,
+                        'png': png_filename if slide_has_png else None,
+                    })
                     
-                    # 创建备注幻灯片 XML
-                    notes_xml_path = notes_slides_dir / f'notesSlide{slide_num}.xml'
-                    notes_xml = create_notes_slide_xml(slide_num, notes_text)
-                    with open(notes_xml_path, 'w', encoding='utf-8') as f:
-                        f.write(notes_xml)
+                    if thumbnail_pending:
+                        thumbnail_pending = False
+                        with prof.stage('thumbnail', slide.name) as timer:
+                            bytes_before = writer.bytes_written
+                            # 单独的缩略图缓存（JPEG 条目），不计入 PNG 缓存命中统计
+                            thumbnail_data = render_thumbnail(
+                                slide, svg_data, *render_sizes[i - 1],
+                                png_data=png_data if slide_has_png else None,
+                                cache=RenderCache().thumbnail_cache() if use_cache else None
+                            )
+                            if thumbnail_data is not None:
+                                writer.write_part(THUMBNAIL_PART, thumbnail_data)
+                                thumbnail_written = True
+                            timer.bytes = writer.bytes_written - bytes_before
                     
-                    # 创建备注幻灯片关系文件
-                    notes_rels_dir = notes_slides_dir / '_rels'
-                    notes_rels_dir.mkdir(exist_ok=True)
-                    notes_rels_path = notes_rels_dir / f'notesSlide{slide_num}.xml.rels'
-                    notes_rels_xml = create_notes_slide_rels_xml(slide_num)
-                    with open(notes_rels_path, 'w', encoding='utf-8') as f:
-                        f.write(notes_rels_xml)
+                    if progress is not None:
+                        progress(SlideProgress('package', i, total, slide.name, has_png=slide_has_png,
+                                               has_notes=enable_notes and bool(slide.notes),
+                                               native=native_slide is not None, warnings=native_warnings))
                     
-                    # 更新 slide.xml.rels 添加备注关联
-                    with open(rels_path, 'r', encoding='utf-8') as f:
-                        slide_rels_content = f.read()
-                    notes_rel = f'  <Relationship Id="rId10" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/notesSlide" Target="../notesSlides/notesSlide{slide_num}.xml"/>'
-                    slide_rels_content = slide_rels_content.replace('</Relationships>', notes_rel + '\n</Relationships>')
-                    with open(rels_path, 'w', encoding='utf-8') as f:
-                        f.write(slide_rels_content)
+                except Exception as e:
+                    failed.append(slide.name)
+                    if progress is not None:
+                        progress(SlideProgress('package', i, total, slide.name, error=str(e)))
                 
-                if verbose:
-                    mode_str = " (PNG+SVG)" if (use_compat_mode and slide_has_png) else " (SVG)"
-                    has_notes = enable_notes and bool(notes_content)
-                    notes_str = " +备注" if has_notes else ""
-                    print(f"  [{i}/{len(svg_files)}] {svg_path.name}{mode_str}{notes_str}")
-                
-                success_count += 1
-                
-            except Exception as e:
-                if verbose:
-                    print(f"  [{i}/{len(svg_files)}] {svg_path.name} - 错误: {e}")
-        
-        # 更新 [Content_Types].xml 添加 SVG 和 PNG 类型
-        content_types_path = extract_dir / '[Content_Types].xml'
-        with open(content_types_path, 'r', encoding='utf-8') as f:
-            content_types = f.read()
-        
-        # 添加 SVG 扩展类型（如果不存在）
-        types_to_add = []
-        if 'Extension="svg"' not in content_types:
-            types_to_add.append('  <Default Extension="svg" ContentType="image/svg+xml"/>')
-        if any_png_generated and 'Extension="png"' not in content_types:
-            types_to_add.append('  <Default Extension="png" ContentType="image/png"/>')
-        
-        if types_to_add:
-            content_types = content_types.replace(
-                '</Types>',
-                '\n'.join(types_to_add) + '\n</Types>'
-            )
-            with open(content_types_path, 'w', encoding='utf-8') as f:
-                f.write(content_types)
-        
-        # 添加 notesSlides 内容类型
-        if enable_notes:
-            for i in range(1, len(svg_files) + 1):
-                override = f'  <Override PartName="/ppt/notesSlides/notesSlide{i}.xml" ContentType="application/vnd.openxmlformats-officedocument.presentationml.notesSlide+xml"/>'
-                if override not in content_types:
-                    content_types = content_types.replace('</Types>', override + '\n</Types>')
-            with open(content_types_path, 'w', encoding='utf-8') as f:
-                f.write(content_types)
+                # 释放本页缓冲区，流式模式下内存占用不随页数增长
+                payload = svg_data = png_data = native_slide = None
+            
+            # 写入导出清单（供下一次增量构建使用）
+            with prof.stage('finalize') as timer:
+                bytes_before = writer.bytes_written
+                writer.write_manifest({
+                    'version': MANIFEST_VERSION,
+                    'settings': export_settings,
+                    'slides': manifest_slides,
+                    # 区分导出生成的缩略图与模板自带的默认缩略图（总览图工具据此使用）
+                    'thumbnail': thumbnail_written,
+                })
+                # 输出可能与上一次导出是同一文件：替换前先关闭
+                if previous is not None:
+                    previous.close()
+                writer.close()
+                timer.bytes = writer.bytes_written - bytes_before
+    finally:
+        # 提前结束时关闭页面生成器，取消尚未开始的渲染任务
+        if streaming and payloads is not None:
+            payloads.close()
+        if previous is not None:
+            previous.close()
+    
+    cache_hits = 0
+    if cache is not None:
+        cache.prune()
+        cache_hits = cache.hits
+        if streaming and cache.hits:
+            emit()
+            emit(f"  渲染缓存: 命中 {cache.hits}/{total} 页")
+    
+    incremental_summary = None
+    if previous is not None:
+        incremental_summary = format_incremental_summary(previous.slides, manifest_slides)
+        emit()
+        emit(incremental_summary)
+    
+    if writer.media_deduplicated_bytes:
+        emit()
+        emit(f"  媒体去重: {writer.media_added} -> {writer.media_count} 个文件, "
+             f"节省 {writer.media_deduplicated_bytes / 1024:.1f} KB")
+    
+    if profiler is not None:
+        profiler.finish()
+    
+    peak_memory = get_peak_memory()
+    return {
+        'total': total,
+        'success': total - len(failed),
+        'failed': failed,
+        'compat': use_compat_mode,
+        'native_slides': native_slides,
+        'png_fallbacks': png_fallbacks,
+        'cache_hits': cache_hits,
+        'media_count': writer.media_count,
+        'media_deduplicated_bytes': writer.media_deduplicated_bytes,
+        'incremental_summary': incremental_summary,
+        'thumbnail': thumbnail_written,
+        'canvas_mismatches': [slides[index].name for index in mismatched],
+        'peak_memory': peak_memory[0] if peak_memory else None,
+        'peak_memory_children': peak_memory[1] if peak_memory else None,
+    }
+
+
+def create_pptx_with_native_svg(
+    svg_files: List[Path],
+    output_path: Path,
+    canvas_format: Optional[str] = None,
+    verbose: bool = True,
+    transition: Optional[str] = None,
+    transition_duration: float = 0.5,
+    auto_advance: Optional[float] = None,
+    use_compat_mode: bool = True,
+    native: bool = False,
+    notes: Optional[dict] = None,
+    enable_notes: bool = True,
+    jobs: int = 1,
+    use_cache: bool = True,
+    previous_pptx: Optional[Path] = None,
+    compression: Optional[ZipCompressionPolicy] = None,
+    streaming: bool = False,
+    profiler: Optional[ExportProfiler] = None,
+    png_quality: str = DEFAULT_PNG_QUALITY,
+    thumbnail: Optional[bool] = None,
+    canvas_mismatch: str = DEFAULT_CANVAS_MISMATCH
+) -> bool:
+    """
+    创建包含原生 SVG 的 PPTX 文件（命令行入口，内部调用 build_pptx）
+    
+    Args:
+        svg_files: SVG 文件列表
+        output_path: 输出路径
+        canvas_format: 画布格式
+        verbose: 是否输出详细信息
+        transition: 切换效果 (fade/push/wipe/split/reveal/cover/random)
+        transition_duration: 切换持续时间（秒）
+        auto_advance: 自动翻页间隔（秒）
+        use_compat_mode: 使用 Office 兼容模式（PNG + SVG 双格式，默认开启）
+        native: 转换为 PowerPoint 原生形状（DrawingML，不渲染 PNG）
+        notes: 备注字典，key 为 SVG 文件名（不含扩展名），value 为备注内容
+        enable_notes: 是否启用备注嵌入（默认开启）
+        jobs: PNG 后备图片并行渲染进程数（默认 1 串行，0 表示使用全部 CPU 核心）
+        use_cache: 是否使用 PNG 渲染缓存（默认开启，见 render_cache.py）
+        previous_pptx: 增量构建所依据的上一次导出（未变化页面直接复用其 PNG 后备图片；
+            拆分导出时各子演示文稿以上一次导出对应的 <基准名>_<宽>x<高>.pptx 为基准）
+        compression: zip 压缩策略（默认：已压缩媒体直接存储，XML 以级别 6 压缩）
+        streaming: 流式导出（逐页处理，适合超大演示文稿；完成后输出峰值内存）
+        profiler: 性能分析器（见 export_profiler.py，由调用方输出报告）
+        png_quality: PNG 后备图片质量档位 low/standard/hidpi
+        thumbnail: 以第一页生成文档缩略图（None 表示原生形状模式下不生成，其余模式生成）
+        canvas_mismatch: 页面画布与演示文稿不一致时的处理方式 fit/split/stretch
+            （split: 不一致的页面按画布尺寸另存为 <输出名>_<宽>x<高>.pptx）
+    """
+    if not svg_files:
+        print("错误: 没有找到 SVG 文件")
+        return False
+    
+    # 检查兼容模式依赖（静默模式下也提示）
+    renderer_hint = get_png_renderer_info()[2]
+    if use_compat_mode and not native and PNG_RENDERER is None:
+        print("警告: 未安装 PNG 渲染库，无法使用兼容模式")
+        print(f"  {renderer_hint}")
+        print("  将使用纯 SVG 模式（可能在 Office LTSC 2021 等版本中不显示）")
+        use_compat_mode = False
+    
+    notes = notes or {}
+    slides = [SlideSource.from_file(svg_path, notes=notes.get(svg_path.stem, '')) for svg_path in svg_files]
+    
+    # 预扫描画布（拆分时用于分组，并传给 build_pptx 避免重复扫描）
+    canvases = scan_slide_canvases(slides)
+    if canvas_mismatch == 'split':
+        groups = split_slides_by_canvas(canvases, canvas_format)
+    else:
+        groups = [(None, canvas_format, list(range(len(slides))))]
+    
+    if verbose and len(groups) > 1:
+        print(f"  画布拆分: {len(groups)} 个演示文稿")
+        for size, _, indices in groups:
+            print(f"    - {describe_canvas(size)}: {len(indices)} 页")
+        print()
+    
+    group_files: List[Path] = svg_files
+    
+    def report(event: SlideProgress):
+        if event.stage != 'package':
+            return
+        filename = group_files[event.index - 1].name
+        prefix = f"  [{event.index}/{event.total}] {filename}"
+        if event.error:
+            print(f"{prefix} - 错误: {event.error}")
+            return
+        if use_compat_mode and not native and not event.has_png:
+            print(f"{prefix} - PNG 生成失败，使用纯 SVG")
+        if event.native:
+            mode_str = " (原生形状)"
+        else:
+            mode_str = " (PNG+SVG)" if event.has_png else " (SVG)"
+        notes_str = " +备注" if event.has_notes else ""
+        print(f"{prefix}{mode_str}{notes_str}")
+        for warning in event.warnings:
+            print(f"      - {warning}")
+    
+    success = True
+    for group_index, (size, group_format, indices) in enumerate(groups):
+        group_files = [svg_files[index] for index in indices]
+        group_output = output_path
+        group_previous = previous_pptx
+        if group_index > 0:
+            group_output = split_output_path(output_path, size)
+            # 增量构建基准：上一次导出中同一画布尺寸的子演示文稿
+            group_previous = None
+            if previous_pptx is not None and split_output_path(Path(previous_pptx), size).exists():
+                group_previous = split_output_path(Path(previous_pptx), size)
+            if verbose:
+                print()
+                print(f"[{describe_canvas(size)}] {group_output.name}")
         
-        # 重新打包 PPTX
-        with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as zf:
-            for file_path in extract_dir.rglob('*'):
-                if file_path.is_file():
-                    arcname = file_path.relative_to(extract_dir)
-                    zf.write(file_path, arcname)
+        result = build_pptx(
+            [slides[index] for index in indices],
+            group_output,
+            canvas_format=group_format,
+            transition=transition,
+            transition_duration=transition_duration,
+            auto_advance=auto_advance,
+            use_compat_mode=use_compat_mode,
+            native=native,
+            enable_notes=enable_notes,
+            jobs=jobs,
+            use_cache=use_cache,
+            previous_pptx=group_previous,
+            compression=compression,
+            streaming=streaming,
+            progress=report if verbose else None,
+            log=print if verbose else None,
+            profiler=profiler,
+            png_quality=png_quality,
+            thumbnail=thumbnail,
+            canvas_mismatch='fit' if canvas_mismatch == 'split' else canvas_mismatch,
+            canvases=[canvases[index] for index in indices]
+        )
         
         if verbose:
             print()
-            print(f"[完成] 已保存: {output_path}")
-            print(f"  成功: {success_count}, 失败: {len(svg_files) - success_count}")
-            if use_compat_mode and any_png_generated:
+            print(f"[完成] 已保存: {group_output}")
+            print(f"  成功: {result['success']}, 失败: {len(result['failed'])}")
+            if result['native_slides']:
+                print(f"  模式: 原生形状 ({result['native_slides']} 页可直接在 PowerPoint 中编辑)")
+            elif result['compat'] and result['png_fallbacks']:
                 print(f"  模式: Office 兼容模式 (支持所有 Office 版本)")
                 # 如果使用 svglib，给出升级提示
                 if PNG_RENDERER == 'svglib' and renderer_hint:
                     print(f"  [提示] {renderer_hint}")
-        
-        return success_count == len(svg_files)
-        
-    finally:
-        # 清理临时目录
-        shutil.rmtree(temp_dir, ignore_errors=True)
+            if streaming and result['peak_memory'] is not None:
+                print(f"  峰值内存: {result['peak_memory'] / (1024 * 1024):.0f} MB"
+                      f"（渲染子进程 {result['peak_memory_children'] / (1024 * 1024):.0f} MB）")
+        success = success and not result['failed']
+    
+    return success
+
+
+def plan_project_export(
+    project_path: Union[str, Path],
+    source: str = 'output',
+    output: Optional[Union[str, Path]] = None,
+    canvas_format: Optional[str] = None,
+    enable_notes: bool = True,
+    log: Optional[Callable[[str], None]] = None,
+    extension: str = '.pptx'
+) -> dict:
+    """
+    按与命令行相同的规则定位项目的 SVG 目录与备注、检测画布格式并确定输出路径
+    
+    extension 为默认输出文件的扩展名（svg_to_pdf.py 使用 .pdf）。
+    
+    Returns:
+        {'svg_files', 'source_dir', 'output', 'canvas_format', 'notes'}
+    
+    Raises:
+        FileNotFoundError: 项目目录不存在或未找到 SVG 文件
+    """
+    project_path = Path(project_path)
+    if not project_path.is_dir():
+        raise FileNotFoundError(f"路径不存在: {project_path}")
+    
+    try:
+        project_info = get_project_info(str(project_path))
+        project_name = project_info.get('name', project_path.name)
+        detected_format = project_info.get('format')
+    except Exception:
+        project_name = project_path.name
+        detected_format = None
+    
+    if canvas_format is None and detected_format and detected_format != 'unknown':
+        canvas_format = detected_format
+    
+    svg_files, source_dir_name = find_svg_files(project_path, source, log=log)
+    if not svg_files:
+        raise FileNotFoundError(f"未找到 SVG 文件: {project_path}")
+    
+    if output:
+        output_path = Path(output)
+    else:
+        # 默认带时间戳；同一秒内重复导出时追加序号，避免互相覆盖
+        from datetime import datetime
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_path = project_path / f"{project_name}_{timestamp}{extension}"
+        counter = 2
+        while output_path.exists():
+            output_path = project_path / f"{project_name}_{timestamp}_{counter}{extension}"
+            counter += 1
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    
+    notes = find_notes_files(project_path, svg_files) if enable_notes else {}
+    return {
+        'svg_files': svg_files,
+        'source_dir': source_dir_name,
+        'output': output_path,
+        'canvas_format': canvas_format,
+        'notes': notes,
+    }
+
+
+def export_project(
+    project_path: Union[str, Path],
+    source: str = 'output',
+    output: Optional[Union[str, Path]] = None,
+    canvas_format: Optional[str] = None,
+    enable_notes: bool = True,
+    log: Optional[Callable[[str], None]] = None,
+    **options
+) -> dict:
+    """
+    导出整个项目目录（库接口，供 export_daemon.py 等常驻/批量场景使用）
+    
+    按与命令行相同的规则定位 SVG 目录与备注、检测画布格式并确定输出路径
+    （见 plan_project_export），然后调用 build_pptx（默认不输出导出日志）。
+    
+    Args:
+        project_path: 项目目录路径
+        source: SVG 来源（output/final 或任意子目录名）
+        output: 输出路径（默认为项目目录下带时间戳的文件名）
+        canvas_format: 画布格式（默认从项目目录名或第一页 viewBox 检测）
+        enable_notes: 是否嵌入 notes/ 目录中的演讲备注
+        log: 日志输出函数（None 表示不输出）
+        **options: 传递给 build_pptx 的其余参数（native、transition、jobs 等）
+    
+    Returns:
+        build_pptx 的结果字典，另含 output（输出路径）与 source_dir（实际使用的 SVG 目录名）
+    
+    Raises:
+        FileNotFoundError: 项目目录不存在或未找到 SVG 文件
+    """
+    plan = plan_project_export(project_path, source, output, canvas_format, enable_notes, log)
+    slides = [SlideSource.from_file(svg_path, notes=plan['notes'].get(svg_path.stem, ''))
+              for svg_path in plan['svg_files']]
+    
+    result = build_pptx(
+        slides,
+        plan['output'],
+        canvas_format=plan['canvas_format'],
+        enable_notes=enable_notes,
+        log=log,
+        **options
+    )
+    result['output'] = str(plan['output'])
+    result['source_dir'] = plan['source_dir']
+    return result
 
 
 def main():
@@ -890,6 +2230,10 @@ def main():
     %(prog)s examples/ppt169_demo             # 使用原始版本
     %(prog)s examples/ppt169_demo -o presentation.pptx
     %(prog)s examples/ppt169_demo --no-compat # 禁用兼容模式（仅纯 SVG）
+    %(prog)s examples/ppt169_demo -s final --native  # 转换为可编辑的原生形状
+    %(prog)s examples/ppt169_demo -s final -j 8  # 8 进程并行渲染 PNG 后备图片
+    %(prog)s big_project -s final --stream -j 4  # 超大演示文稿：流式导出，内存占用恒定
+    %(prog)s examples/ppt169_demo -s final --profile-trace trace.json  # 性能分析
     
     # 添加页面切换效果
     %(prog)s examples/ppt169_demo --transition fade
@@ -909,6 +2253,32 @@ SVG 来源目录 (-s):
     - 新版 Office 仍显示 SVG（可编辑），旧版显示 PNG
     - 需要安装 svglib: pip install svglib reportlab
     - 使用 --no-compat 可禁用（仅 Office 2019+ 支持）
+    - 使用 -j/--jobs N 并行渲染 PNG（大型演示文稿显著提速）
+    - PNG 按内容缓存，未修改的页面再次导出时直接复用（--no-cache 禁用）
+    - --incremental 基于上一次导出增量构建，仅重新生成新增/修改的页面
+    - --stream 流式导出：逐页完成读取、渲染与写入，内存占用不随页数增长（并输出峰值内存）
+    - --png-quality 选择 PNG 后备图片档位：low（0.5x、256 色，最小最快）/
+      standard（1x，默认）/ hidpi（2x，高分屏上的旧版 Office）
+    - 以第一页生成文档缩略图 docProps/thumbnail.jpeg（文件浏览器预览；--no-thumbnail 禁用，
+      --native 模式下默认不生成，--thumbnail 启用）
+
+画布不一致 (--canvas-mismatch):
+    - 导出前扫描每页 SVG 根元素的 viewBox，报告与演示文稿画布（-f 或第一页）不同的页面
+    - fit     - 等比缩放并居中（默认）
+    - split   - 不一致的页面按画布尺寸另存为 <输出名>_<宽>x<高>.pptx
+    - stretch - 拉伸填满整页（旧版行为）
+
+原生形状模式 (--native):
+    - 将 SVG 转换为 PowerPoint 原生形状（矩形/自由形状/文本框/图片），可直接编辑
+    - 无需渲染 PNG，导出更快、文件更小
+    - 滤镜阴影近似为形状阴影；clipPath/mask/pattern 等不支持的内容会被跳过并提示
+    - 使用 svg_to_drawingml.py <目录> 可预先检查转换情况
+
+性能分析 (--profile):
+    - 按阶段（detect/read/cache/render/native/notes/xml/zip/finalize）与页面统计
+      墙钟时间、CPU 时间与写入字节数，导出结束后输出汇总表与最慢的页面
+    - --profile-json FILE 保存完整数据；--profile-trace FILE 保存 Chrome Trace
+      （在 chrome://tracing 或 https://ui.perfetto.dev 中打开）
 
 演讲备注 (默认开启):
     - 自动读取 notes/ 目录中的 Markdown 备注文件
@@ -925,10 +2295,40 @@ SVG 来源目录 (-s):
                         help='SVG 来源: output/final 或任意子目录名 (推荐 final)')
     parser.add_argument('-f', '--format', type=str, choices=list(CANVAS_FORMATS.keys()), default=None, help='指定画布格式')
     parser.add_argument('-q', '--quiet', action='store_true', help='静默模式')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='PNG 后备图片并行渲染进程数 (默认: 1，0 表示使用全部 CPU 核心)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='不使用 PNG 渲染缓存（缓存管理见 render_cache.py）')
+    parser.add_argument('--zip-level', type=int, choices=range(0, 10), default=6, metavar='0-9',
+                        help='XML/SVG 部件的压缩级别 (默认: 6；PNG 等已压缩媒体始终直接存储)')
+    parser.add_argument('--incremental', nargs='?', const='auto', default=None, metavar='PREV_PPTX',
+                        help='增量构建：复用上一次导出中未变化页面（默认自动查找输出目录中最新的导出）')
+    parser.add_argument('--stream', action='store_true',
+                        help='流式导出：逐页处理并释放内存，适合数百页以上的演示文稿')
+    
+    # 性能分析参数
+    parser.add_argument('--profile', action='store_true',
+                        help='输出各阶段/各页的耗时与写入字节数汇总')
+    parser.add_argument('--profile-json', type=str, default=None, metavar='FILE',
+                        help='将性能分析数据保存为 JSON（隐含 --profile）')
+    parser.add_argument('--profile-trace', type=str, default=None, metavar='FILE',
+                        help='将性能分析数据保存为 Chrome Trace 格式（隐含 --profile）')
     
     # 兼容模式参数
+    parser.add_argument('--native', action='store_true',
+                        help='转换为 PowerPoint 原生形状（DrawingML，可编辑，不渲染 PNG）')
     parser.add_argument('--no-compat', action='store_true',
                         help='禁用 Office 兼容模式（仅使用纯 SVG，需要 Office 2019+）')
+    parser.add_argument('--png-quality', type=str, choices=list(PNG_QUALITY_TIERS.keys()),
+                        default=DEFAULT_PNG_QUALITY,
+                        help='PNG 后备图片质量档位 (默认: standard)')
+    parser.add_argument('--thumbnail', action='store_true',
+                        help='--native 模式下也生成文档缩略图（需要单独渲染第一页，默认不生成）')
+    parser.add_argument('--no-thumbnail', action='store_true',
+                        help='不生成文档缩略图（默认以第一页生成 docProps/thumbnail.jpeg）')
+    parser.add_argument('--canvas-mismatch', type=str, choices=list(CANVAS_MISMATCH_MODES.keys()),
+                        default=DEFAULT_CANVAS_MISMATCH,
+                        help='页面画布与演示文稿不一致时的处理方式 (默认: fit 等比缩放居中)')
     
     # 切换效果参数
     parser.add_argument('-t', '--transition', type=str, choices=transition_choices, default=None,
@@ -949,41 +2349,33 @@ SVG 来源目录 (-s):
         print(f"错误: 路径不存在: {project_path}")
         sys.exit(1)
     
+    # 与库接口相同的规则定位 SVG 目录与备注、检测画布格式并确定输出路径
     try:
-        project_info = get_project_info(str(project_path))
-        project_name = project_info.get('name', project_path.name)
-        detected_format = project_info.get('format')
-    except Exception:
-        project_name = project_path.name
-        detected_format = None
-    
-    canvas_format = args.format
-    if canvas_format is None and detected_format and detected_format != 'unknown':
-        canvas_format = detected_format
-    
-    svg_files, source_dir_name = find_svg_files(project_path, args.source)
-    
-    if not svg_files:
-        print("错误: 未找到 SVG 文件")
+        plan = plan_project_export(project_path, args.source, args.output, args.format,
+                                   enable_notes=not args.no_notes, log=print)
+    except FileNotFoundError as e:
+        print(f"错误: {e}")
         sys.exit(1)
-    
-    if args.output:
-        output_path = Path(args.output)
-    else:
-        # 默认带时间戳，避免覆盖之前的版本
-        from datetime import datetime
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_path = project_path / f"{project_name}_{timestamp}.pptx"
-    
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+    svg_files = plan['svg_files']
+    source_dir_name = plan['source_dir']
+    output_path = plan['output']
+    canvas_format = plan['canvas_format']
     
     verbose = not args.quiet
     
-    # 读取备注文件
+    # 增量构建：定位上一次导出
+    previous_pptx = None
+    if args.incremental == 'auto':
+        previous_pptx = find_previous_export(output_path.parent)
+        if previous_pptx is None and output_path.parent != project_path:
+            previous_pptx = find_previous_export(project_path)
+        if previous_pptx is None and verbose:
+            print("  增量构建: 未找到上一次导出，执行完整构建")
+    elif args.incremental:
+        previous_pptx = Path(args.incremental)
+    
     enable_notes = not args.no_notes
-    notes = {}
-    if enable_notes:
-        notes = find_notes_files(project_path, svg_files)
+    notes = plan['notes']
     
     if verbose:
         print("PPT Master - SVG 转 PPTX 工具（原生 SVG）")
@@ -991,8 +2383,14 @@ SVG 来源目录 (-s):
         print(f"  项目路径: {project_path}")
         print(f"  SVG 目录: {source_dir_name}")
         print(f"  输出文件: {output_path}")
+        if previous_pptx is not None:
+            print(f"  增量基准: {previous_pptx}")
         print()
     
+    profiler = None
+    if args.profile or args.profile_json or args.profile_trace:
+        profiler = ExportProfiler()
+    
     success = create_pptx_with_native_svg(
         svg_files,
         output_path,
@@ -1002,10 +2400,30 @@ SVG 来源目录 (-s):
         transition_duration=args.transition_duration,
         auto_advance=args.auto_advance,
         use_compat_mode=not args.no_compat,
+        native=args.native,
         notes=notes,
-        enable_notes=enable_notes
+        enable_notes=enable_notes,
+        jobs=args.jobs,
+        use_cache=not args.no_cache,
+        previous_pptx=previous_pptx,
+        compression=ZipCompressionPolicy(xml_level=args.zip_level),
+        streaming=args.stream,
+        profiler=profiler,
+        png_quality=args.png_quality,
+        thumbnail=False if args.no_thumbnail else (True if args.thumbnail else None),
+        canvas_mismatch=args.canvas_mismatch
     )
     
+    if profiler is not None:
+        print()
+        print(profiler.format_report())
+        if args.profile_json:
+            profiler.write_json(args.profile_json)
+            print(f"  性能分析数据: {args.profile_json}")
+        if args.profile_trace:
+            profiler.write_chrome_trace(args.profile_trace)
+            print(f"  Chrome Trace: {args.profile_trace}")
+    
     sys.exit(0 if success else 1)
 
 
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+PPT Master - 分块渲染模块
+
+大尺寸 PNG 后备图片（竖版画布、2x/3x 输出）按水平条带逐块光栅化，
+逐行写入同一个 PNG 编码器：每个渲染进程的峰值内存由条带大小决定，
+而不随画布尺寸增长。svg_to_pptx.py 在输出像素数超过 TILE_MIN_PIXELS
+时自动使用（调色板量化的档位除外）。
+
+    - plan_bands: 按输出宽度划分条带（每条不超过 TILE_BAND_PIXELS 像素）
+    - PngStreamWriter: 流式 PNG 编码器，只在内存中保留压缩后的数据
+    - render_tiled: 逐条带调用渲染函数并拼接为一张 PNG（需要 Pillow 解码条带）
+    - wrap_svg_band: 生成只显示某一条带的外层 SVG（视口偏移，供 cairosvg 使用）
+
+用法（库接口）:
+    # render_band(top, rows) 返回输出图像第 top 行起 rows 行的 PNG 字节
+    png_data = render_tiled(width, height, render_band, compress_level=6)
+"""
+
+import re
+import struct
+import zlib
+from io import BytesIO
+from typing import Callable, List, Tuple
+
+
+# 输出像素数超过该值时分块渲染（约 4 MP，RGBA 缓冲区约 16 MB）
+TILE_MIN_PIXELS = 4 * 1024 * 1024
+
+# 每个条带的像素数上限（约 1 MP，RGBA 缓冲区约 4 MB）
+TILE_BAND_PIXELS = 1024 * 1024
+
+# 条带的最小行数（过窄的条带会显著增加重复的矢量处理开销）
+TILE_MIN_ROWS = 64
+
+# 单个 IDAT 块的大小
+IDAT_CHUNK_SIZE = 64 * 1024
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# PIL 图像模式 -> (PNG 颜色类型, 每像素字节数)
+PNG_COLOR_TYPES = {
+    'L': (0, 1),
+    'RGB': (2, 3),
+    'RGBA': (6, 4),
+}
+
+
+def should_tile(width: int, height: int) -> bool:
+    """输出尺寸是否需要分块渲染"""
+    return width * height > TILE_MIN_PIXELS
+
+
+def plan_bands(width: int, height: int, band_pixels: int = TILE_BAND_PIXELS) -> List[Tuple[int, int]]:
+    """
+    划分水平条带
+
+    Returns:
+        [(起始行, 行数)]，覆盖 0..height
+    """
+    rows = max(TILE_MIN_ROWS, band_pixels // max(width, 1))
+    return [(top, min(rows, height - top)) for top in range(0, height, rows)]
+
+
+def _chunk(chunk_type: bytes, data: bytes) -> bytes:
+    return struct.pack('>I', len(data)) + chunk_type + data + struct.pack('>I', zlib.crc32(chunk_type + data))
+
+
+class PngStreamWriter:
+    """
+    流式 PNG 编码器
+
+    按行写入原始像素（无行过滤，8 位），压缩数据累积到一定大小后
+    写成一个 IDAT 块；任意时刻只持有压缩后的数据与当前写入的行。
+    """
+
+    def __init__(self, width: int, height: int, mode: str = 'RGB', compress_level: int = 6):
+        """
+        Args:
+            width: 图像宽度（像素）
+            height: 图像高度（像素）
+            mode: 像素格式（L / RGB / RGBA）
+            compress_level: zlib 压缩级别（0-9）
+        """
+        if mode not in PNG_COLOR_TYPES:
+            raise ValueError(f"不支持的像素格式: {mode}")
+        color_type, bytes_per_pixel = PNG_COLOR_TYPES[mode]
+        self.width = width
+        self.height = height
+        self.mode = mode
+        self.stride = width * bytes_per_pixel
+        self.rows_written = 0
+        self._compressor = zlib.compressobj(compress_level)
+        self._pending: List[bytes] = []
+        self._pending_size = 0
+        self._parts: List[bytes] = [
+            PNG_SIGNATURE,
+            _chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, color_type, 0, 0, 0)),
+        ]
+
+    def write_rows(self, data: bytes):
+        """写入若干完整的像素行（长度须为 stride 的整数倍）"""
+        if len(data) % self.stride:
+            raise ValueError("像素数据长度不是整行")
+        rows = len(data) // self.stride
+        if self.rows_written + rows > self.height:
+            raise ValueError("写入的行数超过图像高度")
+        view = memoryview(data)
+        for row in range(rows):
+            # 每行前加过滤类型 0（None）
+            self._append(self._compressor.compress(b'\x00'))
+            self._append(self._compressor.compress(view[row * self.stride:(row + 1) * self.stride]))
+        self.rows_written += rows
+
+    def _append(self, data: bytes):
+        if data:
+            self._pending.append(data)
+            self._pending_size += len(data)
+            if self._pending_size >= IDAT_CHUNK_SIZE:
+                self._flush_idat()
+
+    def _flush_idat(self):
+        if self._pending:
+            self._parts.append(_chunk(b'IDAT', b''.join(self._pending)))
+            self._pending = []
+            self._pending_size = 0
+
+    def finish(self) -> bytes:
+        """结束编码并返回完整的 PNG 字节"""
+        if self.rows_written != self.height:
+            raise ValueError(f"图像不完整: 已写入 {self.rows_written}/{self.height} 行")
+        self._append(self._compressor.flush())
+        self._flush_idat()
+        self._parts.append(_chunk(b'IEND', b''))
+        return b''.join(self._parts)
+
+
+def render_tiled(
+    width: int,
+    height: int,
+    render_band: Callable[[int, int], bytes],
+    compress_level: int = 6,
+    band_pixels: int = TILE_BAND_PIXELS
+) -> bytes:
+    """
+    分块渲染并编码为一张 PNG
+
+    Args:
+        width: 输出宽度（像素）
+        height: 输出高度（像素）
+        render_band: 渲染函数 (起始行, 行数) -> 该条带的 PNG 字节
+        compress_level: zlib 压缩级别（0-9）
+        band_pixels: 每个条带的像素数上限
+
+    Returns:
+        PNG 字节（像素格式取第一个条带的格式）
+    """
+    from PIL import Image
+
+    writer = None
+    for top, rows in plan_bands(width, height, band_pixels):
+        band = Image.open(BytesIO(render_band(top, rows)))
+        if band.mode not in PNG_COLOR_TYPES:
+            band = band.convert('RGBA')
+        if writer is None:
+            writer = PngStreamWriter(width, height, band.mode, compress_level)
+        elif band.mode != writer.mode:
+            band = band.convert(writer.mode)
+        # 渲染器按 DPI 取整时条带尺寸可能相差 1 像素，统一裁剪到计划尺寸
+        if band.size != (width, rows):
+            band = band.crop((0, 0, width, rows))
+        writer.write_rows(band.tobytes())
+        band.close()
+    return writer.finish()
+
+
+def wrap_svg_band(svg_text: str, width: float, height: float, top: float, rows: float) -> str:
+    """
+    生成只显示某一水平条带的 SVG
+
+    原文档作为内层 <svg> 按画布尺寸完整布局（百分比长度仍相对整个画布解析），
+    外层 <svg> 的 viewBox 偏移到条带位置，视口高度为条带高度。
+
+    Args:
+        svg_text: 原 SVG 文本
+        width: 画布宽度（用户单位）
+        height: 画布高度（用户单位）
+        top: 条带起始位置（用户单位）
+        rows: 条带高度（用户单位）
+    """
+    # 去掉 XML 声明与 DOCTYPE，使原文档可以嵌入
+    body = re.sub(r'^\s*(<\?xml[^>]*\?>\s*)?(<!DOCTYPE[^>]*>\s*)?', '', svg_text, count=1)
+    match = re.search(r'<svg\b[^>]*>', body)
+    if match is None:
+        raise ValueError("未找到 <svg> 根元素")
+    root = match.group(0)
+    new_root = re.sub(r'\s(?:x|y|width|height)="[^"]*"', '', root)
+    if 'viewBox=' not in new_root:
+        new_root = new_root.replace('<svg', f'<svg viewBox="0 0 {width:g} {height:g}"', 1)
+    new_root = new_root.replace('<svg', f'<svg x="0" y="0" width="{width:g}" height="{height:g}"', 1)
+    body = body[:match.start()] + new_root + body[match.end():]
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width:g}" height="{rows:g}" '
+        f'viewBox="0 {top:g} {width:g} {rows:g}">{body}</svg>'
+    )
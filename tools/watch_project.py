@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+PPT Master - 监视模式（持续后处理与导出）
+
+监视项目中的 svg_output/*.svg、notes/*.md 与 images/ 下的图片，文件变化并
+稳定一段时间（防抖）后自动执行一轮更新：
+
+    1. 增量后处理：只处理受影响的页面（源文件或其引用的图标/图片有变化，
+       见 finalize_manifest.py），删除源文件已不存在的页面
+    2. 质量检查：只检查本轮处理的页面（svg_quality_checker.py）
+    3. 增量导出：以上一次导出的预览 PPTX 为基准，未变化的页面直接复用
+       PNG 后备图片（并行渲染时渲染进程池在各轮之间保持常驻）
+
+用于 AI 逐页写入 SVG 的创作过程，保持一份实时更新的预览演示文稿。
+采用轮询检测文件变化（只读取文件大小与修改时间），不依赖第三方库。
+
+用法:
+    python3 tools/watch_project.py <项目目录>
+    python3 tools/watch_project.py <项目目录> -o preview.pptx --interval 1 --debounce 2
+    python3 tools/watch_project.py <项目目录> --no-export        # 只后处理与检查
+"""
+
+import sys
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from build_project import default_finalize_options
+from finalize_svg import FINALIZE_STEPS, run_finalize
+from svg_quality_checker import SVGQualityChecker
+from svg_to_pptx import PNG_RENDERER, export_project, resolve_jobs
+
+
+# 轮询间隔与防抖时间（秒）
+DEFAULT_INTERVAL = 0.5
+DEFAULT_DEBOUNCE = 1.0
+
+# 监视的图片类型（images/cropped/ 为后处理的输出，不监视）
+IMAGE_SUFFIXES = {'.png', '.jpg', '.jpeg', '.gif', '.webp', '.svg'}
+
+
+def snapshot_project(project_dir: Path) -> Dict[str, Tuple[int, int]]:
+    """
+    项目中受监视文件的快照
+
+    Returns:
+        {相对路径: (大小, 修改时间)}
+    """
+    files: List[Path] = []
+    for pattern_dir, pattern in (('svg_output', '*.svg'), ('notes', '*.md')):
+        if (project_dir / pattern_dir).is_dir():
+            files.extend((project_dir / pattern_dir).glob(pattern))
+    images_dir = project_dir / 'images'
+    if images_dir.is_dir():
+        files.extend(path for path in images_dir.rglob('*')
+                     if path.suffix.lower() in IMAGE_SUFFIXES and 'cropped' not in path.relative_to(images_dir).parts)
+
+    snapshot = {}
+    for path in files:
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        snapshot[path.relative_to(project_dir).as_posix()] = (stat.st_size, stat.st_mtime_ns)
+    return snapshot
+
+
+def diff_snapshots(old: Dict[str, Tuple[int, int]], new: Dict[str, Tuple[int, int]]) -> List[str]:
+    """新增、修改或删除的文件（相对路径，已排序）"""
+    return sorted(path for path in set(old) | set(new) if old.get(path) != new.get(path))
+
+
+def format_changes(changed: List[str], limit: int = 5) -> str:
+    """变化文件的显示文本（超过 limit 个时省略）"""
+    text = ', '.join(changed[:limit])
+    if len(changed) > limit:
+        text += f" 等 {len(changed)} 个文件"
+    return text
+
+
+class ProjectWatcher:
+    """项目监视器：每轮执行增量后处理、质量检查与增量导出"""
+
+    def __init__(
+        self,
+        project_dir: Path,
+        output: Optional[Path] = None,
+        finalize_options: Optional[dict] = None,
+        jobs: int = 1,
+        check: bool = True,
+        export: bool = True,
+        log: Callable[[str], None] = print,
+        **export_options
+    ):
+        """
+        Args:
+            project_dir: 项目目录
+            output: 预览 PPTX 路径（默认为项目目录下的 <项目名>_preview.pptx）
+            finalize_options: 后处理选项（见 finalize_svg.FINALIZE_STEPS，默认全部执行）
+            jobs: 后处理与 PNG 渲染的并行进程数（1 为串行，0 表示使用全部 CPU 核心）
+            check: 是否检查本轮处理的页面
+            export: 是否导出预览 PPTX
+            log: 日志输出函数
+            **export_options: 传递给 build_pptx 的其余参数（native、use_compat_mode 等）
+        """
+        self.project_dir = Path(project_dir)
+        self.output = Path(output) if output else self.project_dir / f'{self.project_dir.name}_preview.pptx'
+        self.finalize_options = finalize_options if finalize_options is not None else default_finalize_options()
+        self.jobs = resolve_jobs(jobs)
+        self.check = check
+        self.export = export
+        self.log = log
+        self.export_options = export_options
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.cycles = 0
+
+    def close(self):
+        """关闭常驻的渲染进程池"""
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+
+    def rebuild(self, changed: Optional[List[str]] = None) -> dict:
+        """
+        执行一轮更新
+
+        Args:
+            changed: 触发本轮的变化文件（仅用于输出；None 表示首轮）
+
+        Returns:
+            {'finalized': 处理的页面, 'removed': 删除的页面, 'errors': 检查错误数,
+             'warnings': 检查警告数, 'export': build_pptx 结果或 None}
+        """
+        self.cycles += 1
+        stamp = datetime.now().strftime('%H:%M:%S')
+        if changed is None:
+            self.log(f"[{stamp}] 首次构建")
+        else:
+            self.log(f"[{stamp}] 变化: {format_changes(changed)}")
+
+        summary = {'finalized': [], 'removed': [], 'errors': 0, 'warnings': 0, 'export': None}
+        svg_output = self.project_dir / 'svg_output'
+        if not svg_output.is_dir() or not any(svg_output.glob('*.svg')):
+            self.log("  等待 svg_output/ 中的 SVG 文件...")
+            return summary
+
+        # 1. 增量后处理
+        start = time.perf_counter()
+        plan = run_finalize(self.project_dir, self.finalize_options, self.jobs)
+        summary['finalized'], summary['removed'] = plan.stale, plan.removed
+        removed_text = f"，删除 {len(plan.removed)} 页" if plan.removed else ""
+        self.log(f"  后处理: 处理 {len(plan.stale)} 页，复用 {len(plan.reused)} 页{removed_text} "
+                 f"({time.perf_counter() - start:.2f} s)")
+
+        # 2. 检查本轮处理的页面（检查源文件，与创作时的规范一致）
+        if self.check and plan.stale:
+            checker = SVGQualityChecker()
+            for name in plan.stale:
+                result = checker.check_file(str(svg_output / name))
+                summary['errors'] += len(result['errors'])
+                summary['warnings'] += len(result['warnings'])
+                for error in result['errors']:
+                    self.log(f"    [ERROR] {name}: {error}")
+                for warning in result['warnings']:
+                    self.log(f"    [WARN] {name}: {warning}")
+            self.log(f"  检查: {len(plan.stale)} 页，{summary['errors']} 个错误，{summary['warnings']} 个警告")
+
+        # 3. 增量导出（未变化的页面复用上一次导出）
+        if self.export:
+            start = time.perf_counter()
+            if self.executor is None and self.jobs > 1 and PNG_RENDERER is not None:
+                self.executor = ProcessPoolExecutor(max_workers=self.jobs)
+            try:
+                result = export_project(
+                    self.project_dir, source='final', output=self.output,
+                    previous_pptx=self.output if self.output.exists() else None,
+                    executor=self.executor, **self.export_options
+                )
+            except Exception as e:
+                # 预览文件被占用（如在 PowerPoint 中打开）等情况下保持监视，下一轮重试
+                self.log(f"  导出失败: {e}")
+            else:
+                summary['export'] = result
+                incremental = result.get('incremental_summary')
+                detail = incremental.strip() if incremental else "完整构建"
+                self.log(f"  导出: {self.output.name}，{result['success']}/{result['total']} 页，{detail} "
+                         f"({time.perf_counter() - start:.2f} s)")
+        return summary
+
+    def run(self, interval: float = DEFAULT_INTERVAL, debounce: float = DEFAULT_DEBOUNCE,
+            max_cycles: Optional[int] = None):
+        """
+        持续监视，直到 Ctrl+C（或完成 max_cycles 轮更新，首轮计入）
+
+        检测到变化后等待文件在 debounce 秒内不再变化再更新，避免逐页写入时
+        每写一个文件就触发一轮；更新期间发生的变化在下一轮处理。
+        """
+        previous = snapshot_project(self.project_dir)
+        self.rebuild()
+        while max_cycles is None or self.cycles < max_cycles:
+            time.sleep(interval)
+            current = snapshot_project(self.project_dir)
+            if current == previous:
+                continue
+
+            # 防抖：等待文件稳定
+            stable_since = time.monotonic()
+            while time.monotonic() - stable_since < debounce:
+                time.sleep(min(interval, debounce))
+                latest = snapshot_project(self.project_dir)
+                if latest != current:
+                    current, stable_since = latest, time.monotonic()
+
+            changed = diff_snapshots(previous, current)
+            previous = current
+            if changed:
+                self.rebuild(changed)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='PPT Master - 监视模式（持续后处理与导出）',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+示例:
+  %(prog)s projects/my_project                      # 监视并保持 <项目名>_preview.pptx 最新
+  %(prog)s projects/my_project -o preview.pptx -j 4
+  %(prog)s projects/my_project --no-export          # 只后处理与检查
+  %(prog)s projects/my_project --only embed-icons fix-rounded
+
+监视范围:
+  svg_output/*.svg、notes/*.md、images/ 下的图片（不含 images/cropped/）
+  轮询文件大小与修改时间；变化稳定 --debounce 秒后执行一轮更新，Ctrl+C 退出
+        '''
+    )
+    parser.add_argument('project_dir', type=Path, help='项目目录路径')
+    parser.add_argument('-o', '--output', type=Path, default=None,
+                        help='预览 PPTX 路径 (默认: 项目目录下的 <项目名>_preview.pptx)')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='后处理与 PNG 渲染的并行进程数 (默认: 1，0 表示使用全部 CPU 核心)')
+    parser.add_argument('--interval', type=float, default=DEFAULT_INTERVAL,
+                        help=f'轮询间隔，秒 (默认: {DEFAULT_INTERVAL})')
+    parser.add_argument('--debounce', type=float, default=DEFAULT_DEBOUNCE,
+                        help=f'防抖时间：变化后等待文件稳定的秒数 (默认: {DEFAULT_DEBOUNCE})')
+    parser.add_argument('--only', nargs='+', metavar='OPTION',
+                        choices=[key.replace('_', '-') for key, _, _, _ in FINALIZE_STEPS],
+                        help='只执行指定的后处理（同 finalize_svg.py --only）')
+    parser.add_argument('--no-check', action='store_true', help='不执行质量检查')
+    parser.add_argument('--no-export', action='store_true', help='不导出预览 PPTX')
+    parser.add_argument('--native', action='store_true', help='转换为 PowerPoint 原生形状')
+    parser.add_argument('--no-notes', action='store_true', help='禁用演讲备注嵌入')
+
+    args = parser.parse_args()
+
+    if not args.project_dir.is_dir():
+        print(f"错误: 项目目录不存在: {args.project_dir}")
+        sys.exit(1)
+
+    watcher = ProjectWatcher(
+        args.project_dir,
+        output=args.output,
+        finalize_options=default_finalize_options(args.only),
+        jobs=args.jobs,
+        check=not args.no_check,
+        export=not args.no_export,
+        native=args.native,
+        enable_notes=not args.no_notes,
+    )
+
+    print("PPT Master - 监视模式")
+    print("=" * 50)
+    print(f"  项目: {args.project_dir}")
+    if watcher.export:
+        print(f"  预览: {watcher.output}")
+    print(f"  轮询间隔: {args.interval} s，防抖: {args.debounce} s（Ctrl+C 退出）")
+    print()
+
+    try:
+        watcher.run(args.interval, args.debounce)
+    except KeyboardInterrupt:
+        print()
+        print("[退出] 已停止监视")
+    finally:
+        watcher.close()
+
+
+if __name__ == '__main__':
+    main()